@@ -0,0 +1,459 @@
+"""Replay per-venue quote history through the arbitrage scanner, strategy and executor.
+
+Each ordered venue pair is one route. The scanner evaluates a route once,
+at unit prices, which yields its fees, slippage, suggested size, transfer
+type and ETA from ``arb_limits.yaml``; since the gross spread only depends
+on the ratio of the two venue prices, the estimated net ROI of every
+snapshot then follows in one vectorised pass over the mid prices.
+
+Replay walks the snapshots that have a route passing the
+:class:`ArbitrageFilters`. As in auto mode, the top ``top_k`` routes are
+narrowed to those the rate limiter allows (on the replay clock) and whose
+capital is not still in transit, :class:`ArbitrageStrategy` picks one and
+:class:`SafeArbitrageExecutor` runs it in simulation mode against a pinned
+state, so a live global stop or equity change cannot leak into the replay. The realised
+fill buys at the recorded ask once the venue latency has passed and sells
+at the recorded bid once the transfer ETA has passed, so quotes that
+decay while the coins are moving show up as the gap between estimated
+and realised ROI. :meth:`ArbitrageReplay.sweep` repeats the replay for a
+grid of filter settings on a process pool.
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import math
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from ..core.ai.batch import np
+from ..core.ai.parallel import DEFAULT_START_METHOD
+from ..core.portfolio.portfolio import Portfolio
+from ..core.risk.manager import RiskLimits, RiskManager
+from ..core.risk.rate_limit import MemoryRateLimitBackend, RateLimitConfig, RateLimiter
+from ..services.arbitrage.executor_safe import SafeArbitrageExecutor
+from ..services.arbitrage.scanner import ArbitrageFilters, ArbitrageOpportunity, ArbitrageScanner
+from ..services.arbitrage.strategy import ArbitrageStrategy
+from .optimize import OPT_WORKERS, grid
+from .synthetic import Quotes
+
+logger = logging.getLogger(__name__)
+
+LIMITS_PATH = Path(__file__).resolve().parents[1] / "infra" / "limits" / "arb_limits.yaml"
+
+
+class _ReplayClient:
+    """Stands in for an exchange client; the scanner only asks it for prices."""
+
+    price = 1.0
+
+    def get_price(self, symbol: str) -> float:
+        return self.price
+
+
+@dataclass
+class _Route:
+    buy: str
+    sell: str
+    template: ArbitrageOpportunity
+    spread_factor: float  # scanner bid/ask ratio at equal mid prices
+    cost_pct: float  # fees and slippage
+    multiplier: float  # research priority weighting
+
+    @property
+    def name(self) -> str:
+        return f"{self.buy}->{self.sell}"
+
+
+@dataclass
+class ReplayFill:
+    route: str
+    ts: float
+    settled_ts: float
+    transfer_type: str
+    qty_usd: float
+    buy_price: float
+    sell_price: float
+    estimated_roi_pct: float
+    realised_roi_pct: float
+
+    @property
+    def estimated_pnl_usd(self) -> float:
+        return self.qty_usd * self.estimated_roi_pct / 100
+
+    @property
+    def realised_pnl_usd(self) -> float:
+        return self.qty_usd * self.realised_roi_pct / 100
+
+
+@dataclass
+class ReplayResult:
+    filters: ArbitrageFilters
+    ticks: int
+    fills: List[ReplayFill] = field(default_factory=list)
+    rejected: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def estimated_pnl_usd(self) -> float:
+        return sum(fill.estimated_pnl_usd for fill in self.fills)
+
+    @property
+    def realised_pnl_usd(self) -> float:
+        return sum(fill.realised_pnl_usd for fill in self.fills)
+
+    def routes(self) -> Dict[str, Dict[str, float]]:
+        """Estimated versus realised ROI and PnL per route."""
+
+        grouped: Dict[str, List[ReplayFill]] = {}
+        for fill in self.fills:
+            grouped.setdefault(fill.route, []).append(fill)
+        report: Dict[str, Dict[str, float]] = {}
+        for route, fills in sorted(grouped.items()):
+            count = len(fills)
+            report[route] = {
+                "executions": count,
+                "estimated_roi_pct": sum(f.estimated_roi_pct for f in fills) / count,
+                "realised_roi_pct": sum(f.realised_roi_pct for f in fills) / count,
+                "estimated_pnl_usd": sum(f.estimated_pnl_usd for f in fills),
+                "realised_pnl_usd": sum(f.realised_pnl_usd for f in fills),
+                "win_rate": sum(1 for f in fills if f.realised_roi_pct > 0) / count,
+            }
+        return report
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filters": asdict(self.filters),
+            "ticks": self.ticks,
+            "executions": len(self.fills),
+            "estimated_pnl_usd": round(self.estimated_pnl_usd, 6),
+            "realised_pnl_usd": round(self.realised_pnl_usd, 6),
+            "rejected": dict(self.rejected),
+            "routes": {
+                route: {key: round(value, 6) for key, value in stats.items()}
+                for route, stats in self.routes().items()
+            },
+        }
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for arbitrage replays")
+
+
+class ArbitrageReplay:
+    """Replay aligned per-venue bid/ask snapshots of one symbol."""
+
+    def __init__(
+        self,
+        quotes: Mapping[str, Quotes],
+        *,
+        symbol: str,
+        timestamps: Optional[Sequence[float]] = None,
+        interval_sec: float = 1.0,
+        qty_usd: float = 1_000.0,
+        limits_path: Optional[Path] = None,
+        arb_state: Optional[Mapping[str, Any]] = None,
+        priority_scores: Optional[Mapping[str, float]] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+        risk_limits: Optional[RiskLimits] = None,
+        equity_usd: Optional[float] = None,
+    ) -> None:
+        _require_numpy()
+        if len(quotes) < 2:
+            raise ValueError("at least two venues are required")
+        self.symbol = symbol
+        self.venues = list(quotes)
+        self.bids = {venue: np.asarray(q.bid, dtype=np.float64) for venue, q in quotes.items()}
+        self.asks = {venue: np.asarray(q.ask, dtype=np.float64) for venue, q in quotes.items()}
+        size = len(self.bids[self.venues[0]])
+        if any(len(self.bids[v]) != size or len(self.asks[v]) != size for v in self.venues):
+            raise ValueError("quotes must be aligned to the same snapshots")
+        if timestamps is None:
+            self.ts = np.arange(size, dtype=np.float64) * float(interval_sec)
+        else:
+            self.ts = np.asarray(timestamps, dtype=np.float64)
+            if len(self.ts) != size:
+                raise ValueError("timestamps must match the number of snapshots")
+        self.qty_usd = float(qty_usd)
+        self.limits_path = Path(limits_path) if limits_path is not None else LIMITS_PATH
+        self.arb_state = dict(arb_state) if arb_state is not None else {}
+        self.priority_scores = dict(priority_scores) if priority_scores is not None else {}
+        self.rate_limit = rate_limit if rate_limit is not None else RateLimitConfig()
+        self.risk_limits = risk_limits
+        self._routes = self._build_routes()
+        self.equity_usd = float(equity_usd) if equity_usd is not None else self._default_equity()
+        mids = {venue: (self.bids[venue] + self.asks[venue]) / 2 for venue in self.venues}
+        self.estimates = np.empty((len(self._routes), size), dtype=np.float64)
+        for row, route in enumerate(self._routes):
+            # the scanner's gross spread at mid ratio r is (spread_factor * r - 1)
+            out = self.estimates[row]
+            np.divide(mids[route.sell], mids[route.buy], out=out)
+            out *= route.spread_factor
+            out -= 1
+            out *= 100
+            out -= route.cost_pct
+            out *= route.multiplier
+
+    @classmethod
+    def from_store(
+        cls,
+        store: Any,
+        symbol: str,
+        venues: Sequence[str],
+        *,
+        start: float,
+        end: float,
+        interval_sec: float = 1.0,
+        **kwargs: Any,
+    ) -> "ArbitrageReplay":
+        """Sample recorded quotes of ``venues`` every ``interval_sec`` over ``[start, end)``.
+
+        Each snapshot holds the last quote of every venue at that time;
+        snapshots before every venue has quoted are dropped.
+        """
+
+        from ..core.marketdata import venue_key
+
+        _require_numpy()
+        grid_ts = np.arange(float(start), float(end), float(interval_sec))
+        first = 0
+        sampled: Dict[str, Quotes] = {}
+        for venue in venues:
+            frame = store.quotes(venue_key(venue, symbol), None, end, columns=("bid", "ask"))
+            rows = np.searchsorted(frame.ts, grid_ts, side="right") - 1
+            first = max(first, int(np.searchsorted(rows, 0)))
+            rows = np.maximum(rows, 0)
+            sampled[venue] = (frame["bid"], frame["ask"], rows)
+        if first >= len(grid_ts):
+            raise ValueError(f"no overlapping quotes for {symbol} on {', '.join(venues)}")
+        quotes = {
+            venue: Quotes(bid=np.asarray(bid)[rows[first:]], ask=np.asarray(ask)[rows[first:]])
+            for venue, (bid, ask, rows) in sampled.items()
+        }
+        return cls(quotes, symbol=symbol, timestamps=grid_ts[first:], **kwargs)
+
+    def _build_routes(self) -> List[_Route]:
+        clients = {venue: _ReplayClient() for venue in self.venues}
+        scanner = ArbitrageScanner(
+            clients,
+            [self.symbol],
+            self.qty_usd,
+            limits_path=self.limits_path,
+            arb_state=self.arb_state,
+            priority_scores=self.priority_scores,
+        )
+        routes: List[_Route] = []
+        for buy, sell in itertools.permutations(self.venues, 2):
+            opportunity = scanner._evaluate(self.symbol, buy, sell)
+            if opportunity is None:
+                continue
+            priority = opportunity.meta["qty"]["priority_weight"]
+            routes.append(
+                _Route(
+                    buy=buy,
+                    sell=sell,
+                    template=opportunity,
+                    spread_factor=opportunity.sell_price / opportunity.buy_price,
+                    cost_pct=opportunity.fees_total_pct + opportunity.slippage_est_pct,
+                    multiplier=1 + priority if priority else 1.0,
+                )
+            )
+        return routes
+
+    def _default_equity(self) -> float:
+        """``arb_state["portfolio_equity"]``, else the equity at which the largest
+        route size just fits the per-symbol risk limit."""
+
+        if "portfolio_equity" in self.arb_state:
+            return float(self.arb_state["portfolio_equity"])
+        largest = max((route.template.qty_usd for route in self._routes), default=self.qty_usd)
+        limits = self.risk_limits or RiskLimits()
+        return largest * 100 / max(limits.max_symbol_risk_pct, 1e-9)
+
+    @property
+    def routes(self) -> List[str]:
+        return [route.name for route in self._routes]
+
+    def opportunity(self, route: int, tick: int) -> ArbitrageOpportunity:
+        """The scanner's view of ``route`` at snapshot ``tick``."""
+
+        spec = self._routes[route]
+        mid_buy = (self.bids[spec.buy][tick] + self.asks[spec.buy][tick]) / 2
+        mid_sell = (self.bids[spec.sell][tick] + self.asks[spec.sell][tick]) / 2
+        template = spec.template
+        ask = mid_buy * template.buy_price
+        bid = mid_sell * template.sell_price
+        net_roi_pct = float(self.estimates[route, tick])
+        ts = float(self.ts[tick])
+        meta = dict(template.meta, raw_prices={"ask": ask, "bid": bid})
+        return replace(
+            template,
+            proposal_id=f"{self.symbol}:{spec.name}:{int(ts * 1000)}",
+            buy_price=float(ask),
+            sell_price=float(bid),
+            gross_spread_pct=float((bid - ask) / ask * 100),
+            net_roi_pct=net_roi_pct,
+            net_profit_usd=template.qty_usd * net_roi_pct / 100,
+            created_at=ts,
+            meta=meta,
+        )
+
+    def _delays(self, seconds: float) -> "np.ndarray":
+        """Index of the first snapshot at least ``seconds`` after each snapshot."""
+
+        return np.searchsorted(self.ts, self.ts + seconds, side="left")
+
+    def run(self, filters: Optional[ArbitrageFilters] = None, *, strategy: Optional[ArbitrageStrategy] = None) -> ReplayResult:
+        filters = filters or ArbitrageFilters()
+        strategy = strategy or ArbitrageStrategy()
+        size = len(self.ts)
+        result = ReplayResult(filters=filters, ticks=size)
+        if not self._routes or not size:
+            return result
+        estimates = self.estimates
+        qty = np.array([route.template.qty_usd for route in self._routes])[:, None]
+        profit = estimates * qty / 100
+        passing = (estimates >= filters.min_net_roi_pct) & (estimates <= filters.max_net_roi_pct)
+        passing &= profit >= filters.min_net_usd
+        ticks = np.flatnonzero(passing.any(axis=0))
+        if not len(ticks):
+            return result
+        key = profit if filters.sort_key == "net_profit_usd" else estimates
+        if filters.sort_dir.lower() == "asc":
+            key = -key
+        ranked = np.where(passing[:, ticks], key[:, ticks], -np.inf)
+        order = np.argsort(-ranked, axis=0, kind="stable")[: max(1, filters.top_k)]
+
+        entries, exits = [], []
+        for route in self._routes:
+            entry = self._delays(route.template.latency_ms / 1000)
+            entry = np.minimum(entry, size - 1)
+            eta = float(route.template.meta["transfer"]["eta_sec"])
+            entries.append(entry)
+            exits.append(np.searchsorted(self.ts, self.ts[entry] + eta, side="left"))
+
+        clock = [float(self.ts[0])]
+        limiter = RateLimiter(self.rate_limit, backend=MemoryRateLimitBackend(), time_fn=lambda: clock[0])
+        # pinned state: a live global stop or equity change must not leak into the replay
+        executor = SafeArbitrageExecutor(
+            Portfolio(record=False),
+            RiskManager(self.risk_limits),
+            rate_limiter=limiter,
+            record=False,
+            state={"global_stop": False, "exec_mode": "simulation", "portfolio_equity": self.equity_usd},
+        )
+        busy_until = [-1] * len(self._routes)
+        rejected: Counter = Counter()
+        for col, tick in enumerate(ticks.tolist()):
+            clock[0] = float(self.ts[tick])
+            chosen = None
+            for route in order[:, col].tolist():
+                if not passing[route, tick]:
+                    break
+                spec = self._routes[route]
+                if busy_until[route] > tick:
+                    rejected["in_transit"] += 1
+                    continue
+                if exits[route][tick] >= size:
+                    rejected["unsettled"] += 1
+                    continue
+                if not limiter.allow(spec.buy, spec.sell, self.symbol)[0]:
+                    rejected["rate_limited"] += 1
+                    continue
+                chosen = route
+                break
+            if chosen is None:
+                continue
+            decision = strategy.select([self.opportunity(chosen, tick)], filters)
+            if decision.opportunity is None:
+                rejected[decision.reason] += 1
+                continue
+            spec = self._routes[chosen]
+            entry, exit_ = int(entries[chosen][tick]), int(exits[chosen][tick])
+            fill = replace(
+                decision.opportunity,
+                buy_price=float(self.asks[spec.buy][entry]),
+                sell_price=float(self.bids[spec.sell][exit_]),
+            )
+            try:
+                executor.execute(fill, mode="simulation")
+            except (RuntimeError, ValueError) as exc:
+                rejected[str(exc)] += 1
+                continue
+            busy_until[chosen] = exit_
+            result.fills.append(
+                ReplayFill(
+                    route=spec.name,
+                    ts=float(self.ts[tick]),
+                    settled_ts=float(self.ts[exit_]),
+                    transfer_type=fill.transfer_type,
+                    qty_usd=fill.qty_usd,
+                    buy_price=fill.buy_price,
+                    sell_price=fill.sell_price,
+                    estimated_roi_pct=fill.net_roi_pct,
+                    realised_roi_pct=(fill.sell_price / fill.buy_price - 1) * 100 - spec.cost_pct,
+                )
+            )
+        result.rejected = dict(rejected)
+        logger.info(
+            "Arbitrage replay %s ticks=%d executions=%d realised_pnl_usd=%.2f",
+            self.symbol,
+            size,
+            len(result.fills),
+            result.realised_pnl_usd,
+        )
+        return result
+
+    def sweep(
+        self,
+        space: Mapping[str, Sequence[Any]],
+        *,
+        base: Optional[ArbitrageFilters] = None,
+        workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ) -> List[ReplayResult]:
+        """Replay every combination of ``space`` (``ArbitrageFilters`` field -> values).
+
+        Results are sorted by realised PnL, best first.
+        """
+
+        base = base or ArbitrageFilters()
+        candidates = [replace(base, **_coerce(point)) for point in grid(space)]
+        workers = max(1, min(len(candidates), int(workers or OPT_WORKERS or 1)))
+        if workers == 1:
+            results = [self.run(filters) for filters in candidates]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context(start_method or DEFAULT_START_METHOD),
+                initializer=_init_worker,
+                initargs=(self,),
+            ) as pool:
+                results = list(pool.map(_run_filters, candidates, chunksize=max(1, math.ceil(len(candidates) / (4 * workers)))))
+        results.sort(key=lambda item: item.realised_pnl_usd, reverse=True)
+        return results
+
+
+def _coerce(point: Mapping[str, Any]) -> Dict[str, Any]:
+    values = dict(point)
+    if "top_k" in values:
+        values["top_k"] = int(values["top_k"])
+    return values
+
+
+_SHARED: Dict[str, ArbitrageReplay] = {}
+
+
+def _init_worker(replay: ArbitrageReplay) -> None:
+    _SHARED["replay"] = replay
+
+
+def _run_filters(filters: ArbitrageFilters) -> ReplayResult:
+    return _SHARED["replay"].run(filters)
+
+
+__all__ = ["ArbitrageReplay", "LIMITS_PATH", "ReplayFill", "ReplayResult"]
@@ -0,0 +1,371 @@
+"""Background backtest jobs with progress, cancellation and a result cache.
+
+Jobs run on a small, lazily started process pool whose workers are
+re-niced, so backtests cannot starve the request threads of the live
+trading API. Workers start with forkserver or spawn, never by forking
+the threaded API process. At most ``BACKTEST_JOB_WORKERS`` jobs run at once and at most
+``BACKTEST_JOB_QUEUE`` more may wait; further submissions are refused with
+:class:`QueueFull`.
+
+Each active job owns a slot in two shared arrays: workers publish progress
+in one and poll a cancel flag in the other, so neither needs a round trip
+through the parent. Results are memoised under a content hash of the
+strategies, their weights and parameters, the parts of the runtime state
+a backtest reads (:func:`backtest_state`) and the price data, in memory
+and on disk, and identical submissions share one job.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from ..core.ai.batch import np
+from ..core.ai.parallel import DEFAULT_START_METHOD
+from .engine import BacktestEngine
+from .optimize import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("BACKTEST_JOB_WORKERS", "1") or 1)
+JOB_QUEUE = int(os.getenv("BACKTEST_JOB_QUEUE", "8") or 8)
+JOB_NICE = int(os.getenv("BACKTEST_JOB_NICE", "10") or 0)
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class QueueFull(RuntimeError):
+    """Raised when the job queue is at capacity."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker to abort a cancelled run."""
+
+
+@dataclass
+class BacktestJob:
+    job_id: str
+    key: str
+    request: Dict[str, Any]
+    status: str = QUEUED
+    progress: float = 0.0
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cached: bool = False
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    slot: Optional[int] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "progress": round(self.progress, 4),
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cached": self.cached,
+            "error": self.error,
+            "request": {key: value for key, value in self.request.items() if key != "state"},
+        }
+
+
+# Worker side -----------------------------------------------------------------------
+_SHARED: Dict[str, Any] = {}
+
+
+def _init_worker(progress, cancelled, nice: int) -> None:
+    _SHARED.update(progress=progress, cancelled=cancelled)
+    if nice:
+        try:
+            os.nice(nice)
+        except OSError:  # pragma: no cover - not permitted on this host
+            pass
+
+
+def _run_job(slot: int, request: Mapping[str, Any], prices: Sequence[float]) -> Dict[str, Any]:
+    progress, cancelled = _SHARED["progress"], _SHARED["cancelled"]
+    if cancelled[slot]:
+        raise JobCancelled()
+    progress[slot] = 0.0
+
+    def report(fraction: float) -> None:
+        progress[slot] = fraction
+        if cancelled[slot]:
+            raise JobCancelled()
+
+    strategies = list(request["strategies"])
+    engine = BacktestEngine(
+        strategies=strategies,
+        weights=request.get("weights") or {name: 1.0 for name in strategies},
+        state=request.get("state"),
+        context=request.get("params") or {},
+        initial_equity=float(request.get("initial_equity", 10_000.0)),
+    )
+    result = engine.run(prices, symbol=str(request["symbol"]), progress=report)
+    return result.to_dict(curve_points=int(request.get("curve_points", 500)))
+
+
+# Manager ---------------------------------------------------------------------------
+# spot settings the engine reads; weights come from the request instead
+_SPOT_KEYS = (
+    "sl_pct_default",
+    "tp_pct_default",
+    "max_trade_pct",
+    "risk_per_trade_pct",
+    "max_symbol_exposure_pct",
+    "max_positions",
+)
+
+
+def backtest_state(state: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """The parts of a runtime state that change a backtest: stop/take defaults and sizing.
+
+    Toggles elsewhere in the state must not invalidate cached results.
+    """
+
+    state = state or {}
+    spot = state.get("spot") or {}
+    ops = state.get("ops") or {}
+    capital = ops.get("capital") or {} if isinstance(ops, Mapping) else {}
+    reduced: Dict[str, Any] = {"spot": {key: spot[key] for key in _SPOT_KEYS if key in spot}}
+    if state.get("reserves"):
+        reduced["reserves"] = state["reserves"]
+    if "cap_pct" in capital:
+        reduced["ops"] = {"capital": {"cap_pct": capital["cap_pct"]}}
+    return reduced
+
+
+def _normalise(request: Mapping[str, Any]) -> Dict[str, Any]:
+    request = json.loads(json.dumps(dict(request), default=str))
+    strategies = list(request["strategies"])
+    request["weights"] = request.get("weights") or {name: 1.0 for name in strategies}
+    request["state"] = backtest_state(request.get("state"))
+    return request
+
+
+def content_key(request: Mapping[str, Any], prices: Sequence[float]) -> str:
+    """Hash of everything that determines a result: strategies, weights, parameters,
+    the relevant state and the price data."""
+
+    digest = hashlib.sha256(json.dumps(_normalise(request), sort_keys=True).encode())
+    data = np.ascontiguousarray(prices, dtype=np.float64) if np is not None else list(map(float, prices))
+    digest.update(data.tobytes() if np is not None else json.dumps(data).encode())
+    return digest.hexdigest()
+
+
+class BacktestJobs:
+    """Submit, track, cancel and fetch background backtests."""
+
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        nice: Optional[int] = None,
+        start_method: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+        cache_size: int = 128,
+        keep_jobs: int = 256,
+    ) -> None:
+        self.workers = max(1, int(workers if workers is not None else JOB_WORKERS))
+        self.queue_depth = max(0, int(queue_depth if queue_depth is not None else JOB_QUEUE))
+        self.nice = int(nice if nice is not None else JOB_NICE)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR / "jobs"
+        self.cache_size = max(0, int(cache_size))
+        self.keep_jobs = max(1, int(keep_jobs))
+        self._ctx = get_context(start_method or DEFAULT_START_METHOD)
+        slots = self.workers + self.queue_depth
+        self._progress = self._ctx.Array("d", slots, lock=False)
+        self._cancelled = self._ctx.Array("b", slots, lock=False)
+        self._free: List[int] = list(range(slots))
+        self._jobs: "OrderedDict[str, BacktestJob]" = OrderedDict()
+        self._by_key: Dict[str, str] = {}
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._ctx,
+                initializer=_init_worker,
+                initargs=(self._progress, self._cancelled, self.nice),
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.finished:
+                    self._cancel(job)
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # Result cache --------------------------------------------------------------------
+    def _cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            return result
+        try:
+            result = json.loads((self.cache_dir / f"{key}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._remember(key, result, persist=False)
+        return result
+
+    def _remember(self, key: str, result: Dict[str, Any], *, persist: bool = True) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        if persist:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = self.cache_dir / f".{key}.tmp"
+                tmp.write_text(json.dumps(result), encoding="utf-8")
+                os.replace(tmp, self.cache_dir / f"{key}.json")
+            except OSError as exc:
+                logger.warning("Could not persist backtest result %s: %s", key, exc)
+
+    # Jobs ----------------------------------------------------------------------------
+    def _track(self, job: BacktestJob) -> None:
+        self._jobs[job.job_id] = job
+        self._by_key[job.key] = job.job_id
+        while len(self._jobs) > self.keep_jobs:
+            oldest = next((jid for jid, entry in self._jobs.items() if entry.finished), None)
+            if oldest is None:
+                break
+            dropped = self._jobs.pop(oldest)
+            if self._by_key.get(dropped.key) == oldest:
+                self._by_key.pop(dropped.key, None)
+
+    def submit(self, request: Mapping[str, Any], prices: Sequence[float]) -> BacktestJob:
+        """Queue a backtest of ``prices``; ``request`` needs ``strategies`` and ``symbol``.
+
+        Returns a finished job straight away when the result is cached, and
+        the existing job when an identical one is still queued or running.
+        """
+
+        request = _normalise(request)
+        key = content_key(request, prices)
+        with self._lock:
+            existing = self._jobs.get(self._by_key.get(key, ""))
+            if existing is not None and existing.status in (QUEUED, RUNNING, DONE):
+                return existing
+            job = BacktestJob(job_id=uuid.uuid4().hex, key=key, request=request)
+            result = self._cached_result(key)
+            if result is not None:
+                now = time.time()
+                job.status, job.progress, job.cached, job.result = DONE, 1.0, True, result
+                job.started_at = job.finished_at = now
+                self._track(job)
+                return job
+            if not self._free:
+                raise QueueFull(f"{self.workers + self.queue_depth} backtest jobs already queued or running")
+            job.slot = self._free.pop()
+            self._progress[job.slot] = -1.0  # the worker sets 0.0 when it picks the job up
+            self._cancelled[job.slot] = 0
+            self._track(job)
+            payload = np.ascontiguousarray(prices, dtype=np.float64) if np is not None else list(prices)
+            job.future = self._executor().submit(_run_job, job.slot, request, payload)
+        job.future.add_done_callback(lambda future, job=job: self._finish(job, future))
+        logger.info("Backtest job %s queued strategies=%s", job.job_id, request.get("strategies"))
+        return job
+
+    def _finish(self, job: BacktestJob, future: Future) -> None:
+        with self._lock:
+            # a job cancelled while handed to the pool stays cancelled, whatever the worker did
+            cancelled = job.status == CANCELLED
+            job.finished_at = job.finished_at if cancelled else time.time()
+            try:
+                result = future.result()
+            except (CancelledError, JobCancelled):
+                job.status = CANCELLED
+            except Exception as exc:
+                if not cancelled:
+                    job.status, job.error = FAILED, f"{type(exc).__name__}: {exc}"
+                    logger.warning("Backtest job %s failed: %s", job.job_id, job.error)
+            else:
+                self._remember(job.key, result)
+                if not cancelled:
+                    job.status, job.progress, job.result = DONE, 1.0, result
+            if job.status != DONE and self._by_key.get(job.key) == job.job_id:
+                self._by_key.pop(job.key, None)
+            if job.slot is not None:
+                self._free.append(job.slot)
+                job.slot = None
+
+    def _refresh(self, job: BacktestJob) -> None:
+        if job.finished or job.slot is None:
+            return
+        fraction = self._progress[job.slot]
+        if fraction < 0:
+            return
+        if job.status == QUEUED:
+            job.status, job.started_at = RUNNING, time.time()
+        job.progress = max(job.progress, fraction)
+
+    def get(self, job_id: str) -> Optional[BacktestJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                self._refresh(job)
+            return job
+
+    def list(self) -> List[BacktestJob]:
+        with self._lock:
+            for job in self._jobs.values():
+                self._refresh(job)
+            return list(self._jobs.values())
+
+    def _cancel(self, job: BacktestJob) -> None:
+        if job.future is not None and job.future.cancel():
+            return  # never started; _finish marks it cancelled
+        if job.slot is None:
+            return
+        self._cancelled[job.slot] = 1
+        self._refresh(job)
+        if job.status == QUEUED:
+            # already handed to the pool's call queue: the worker drops it on
+            # pickup, and the slot is released when that happens
+            job.status, job.finished_at = CANCELLED, time.time()
+
+    def cancel(self, job_id: str) -> Optional[BacktestJob]:
+        """Cancel a queued or running job; finished jobs are returned unchanged."""
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            self._cancel(job)
+            return job
+
+
+__all__ = [
+    "BacktestJob",
+    "BacktestJobs",
+    "JobCancelled",
+    "QueueFull",
+    "backtest_state",
+    "content_key",
+]
@@ -0,0 +1,440 @@
+"""Parameter sweeps and walk-forward optimisation on top of :class:`BacktestEngine`.
+
+A trial is one strategy run with a set of strategy-context overrides
+(``sl_pct_default``, ``tp_pct_default``, ``grid_step_pct``,
+``bollinger_k``, ``vol_breakout_mult`` ...) over a range of bars. Trials
+run on a process pool. The price arrays are copied once into shared
+memory, and workers map them instead of receiving a pickled copy per task.
+Metrics are cached on disk under a hash of the trial, the engine settings
+and the price data, so repeated sweeps only pay for new points.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from multiprocessing import get_context, shared_memory
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ..core.ai.batch import np
+from ..core.ai.parallel import DEFAULT_START_METHOD
+from ..core.ai.strategies import REGISTRY
+from ..core.state import get_state
+from .engine import BacktestEngine, FillModel
+
+logger = logging.getLogger(__name__)
+
+OPT_WORKERS = int(os.getenv("BACKTEST_OPT_WORKERS", "0") or 0)
+CACHE_DIR = Path(os.getenv("BACKTEST_CACHE_DIR") or Path(__file__).resolve().parents[2] / "data" / "optimize")
+
+OBJECTIVES = ("sharpe", "total_return_pct", "calmar")
+
+Space = Mapping[str, Union[Sequence[float], Tuple[float, float]]]
+
+
+def grid(space: Mapping[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """Every combination of the listed values."""
+
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(space[name]) for name in names))]
+
+
+def random_search(space: Space, samples: int, *, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """``samples`` random points: tuples ``(lo, hi)`` are uniform ranges, lists are choices."""
+
+    rng = random.Random(seed)
+    names = sorted(space)
+    points: List[Dict[str, float]] = []
+    for _ in range(max(0, int(samples))):
+        point: Dict[str, float] = {}
+        for name in names:
+            values = space[name]
+            if isinstance(values, tuple) and len(values) == 2:
+                point[name] = rng.uniform(float(values[0]), float(values[1]))
+            else:
+                point[name] = rng.choice(list(values))
+        points.append(point)
+    return points
+
+
+@dataclass(frozen=True)
+class Trial:
+    strategy: str
+    params: Tuple[Tuple[str, float], ...] = ()
+    start: int = 0
+    end: Optional[int] = None
+
+    @classmethod
+    def of(cls, strategy: str, params: Mapping[str, float], start: int = 0, end: Optional[int] = None) -> "Trial":
+        return cls(strategy, tuple(sorted((str(k), float(v)) for k, v in params.items())), int(start), end)
+
+    @property
+    def context(self) -> Dict[str, float]:
+        return dict(self.params)
+
+
+@dataclass
+class TrialResult:
+    strategy: str
+    params: Dict[str, float]
+    start: int
+    end: int
+    score: float
+    trades: int
+    win_rate: float
+    total_return_pct: float
+    max_drawdown_pct: float
+    sharpe: float
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class WalkForwardResult:
+    strategy: str
+    folds: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def out_of_sample_return_pct(self) -> float:
+        growth = 1.0
+        for fold in self.folds:
+            growth *= 1 + fold["test"]["total_return_pct"] / 100
+        return (growth - 1) * 100
+
+    def best_params(self) -> Dict[str, float]:
+        """Parameters chosen most often across folds (latest fold breaks ties)."""
+
+        if not self.folds:
+            return {}
+        keys = [json.dumps(fold["params"], sort_keys=True) for fold in self.folds]
+        best = max(reversed(keys), key=keys.count)
+        return json.loads(best)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "folds": self.folds,
+            "out_of_sample_return_pct": self.out_of_sample_return_pct,
+            "best_params": self.best_params(),
+        }
+
+
+# Worker side -----------------------------------------------------------------------
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(shm_name: str, shape: Tuple[int, int], symbols: List[str], config: Dict[str, Any]) -> None:
+    # workers share the parent's resource tracker, so attaching here does not
+    # add a second owner: the parent alone unlinks the segment in close()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _WORKER.update(shm=shm, prices=np.ndarray(shape, dtype=np.float64, buffer=shm.buf), symbols=symbols, config=config)
+
+
+def _evaluate(prices: "np.ndarray", symbols: List[str], config: Mapping[str, Any], trial: Trial) -> Dict[str, Any]:
+    end = trial.end if trial.end is not None else prices.shape[1]
+    engine = BacktestEngine(
+        strategies=[trial.strategy],
+        weights={trial.strategy: 1.0},
+        state=config["state"],
+        context=trial.context,
+        initial_equity=config["initial_equity"],
+        fill_model=FillModel(**config["fill_model"]),
+    )
+    result = engine.run({symbol: prices[row, trial.start : end] for row, symbol in enumerate(symbols)})
+    returns = np.asarray(result.returns, dtype=np.float64)
+    sharpe = 0.0
+    if returns.size > 1 and returns.std(ddof=1) > 0:
+        sharpe = float(returns.mean() / returns.std(ddof=1) * math.sqrt(config["periods_per_year"]))
+    return {
+        "trades": len(result.trades),
+        "win_rate": result.win_rate,
+        "total_return_pct": result.total_return_pct,
+        "max_drawdown_pct": result.max_drawdown_pct,
+        "sharpe": sharpe,
+    }
+
+
+def _run_in_worker(trial: Trial) -> Dict[str, Any]:
+    return _evaluate(_WORKER["prices"], _WORKER["symbols"], _WORKER["config"], trial)
+
+
+# Optimiser -------------------------------------------------------------------------
+class Optimizer:
+    """Run trials over one price dataset, in parallel and with a result cache.
+
+    ``prices`` is one series or a ``symbol -> series`` mapping of equal
+    lengths. ``objective`` ranks trials: ``sharpe`` (annualised with
+    ``periods_per_year``), ``total_return_pct`` or ``calmar`` (return over
+    drawdown). Use it as a context manager, or call :meth:`close`, to stop
+    the pool and release the shared memory.
+    """
+
+    def __init__(
+        self,
+        prices: Union[Sequence[float], Mapping[str, Sequence[float]]],
+        *,
+        symbol: str = "BTCUSDT",
+        state: Optional[Mapping[str, Any]] = None,
+        initial_equity: float = 10_000.0,
+        fill_model: Optional[FillModel] = None,
+        objective: str = "sharpe",
+        periods_per_year: float = 525_600,
+        workers: Optional[int] = None,
+        start_method: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+        use_cache: bool = True,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for parameter optimisation")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {', '.join(OBJECTIVES)}")
+        series = dict(prices) if isinstance(prices, Mapping) else {symbol: prices}
+        self.symbols = list(series)
+        self.prices = np.ascontiguousarray(np.vstack([np.asarray(values, dtype=np.float64) for values in series.values()]))
+        self.bars = self.prices.shape[1]
+        self.objective = objective
+        self.workers = max(1, int(workers or OPT_WORKERS or os.cpu_count() or 1))
+        self.start_method = start_method
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+        self.use_cache = use_cache
+        fills = fill_model or FillModel()
+        self.config: Dict[str, Any] = {
+            "state": json.loads(json.dumps(dict(state if state is not None else get_state()), default=str)),
+            "initial_equity": float(initial_equity),
+            "fill_model": {"fee_bps": fills.fee_bps, "slippage_bps": fills.slippage_bps},
+            "periods_per_year": float(periods_per_year),
+        }
+        digest = hashlib.blake2b(self.prices.tobytes(), digest_size=16)
+        digest.update(json.dumps(self.symbols).encode())
+        self._data_key = digest.hexdigest()
+        self._config_key = hashlib.sha256(json.dumps(self.config, sort_keys=True).encode()).hexdigest()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+
+    # Lifecycle -----------------------------------------------------------------------
+    def __enter__(self) -> "Optimizer":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, self.prices.nbytes))
+            np.ndarray(self.prices.shape, dtype=np.float64, buffer=self._shm.buf)[...] = self.prices
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context(self.start_method or DEFAULT_START_METHOD),
+                initializer=_init_worker,
+                initargs=(self._shm.name, self.prices.shape, self.symbols, self.config),
+            )
+        return self._pool
+
+    # Cache ---------------------------------------------------------------------------
+    def _key(self, trial: Trial) -> str:
+        payload = json.dumps(
+            {"trial": [trial.strategy, trial.params, trial.start, trial.end], "config": self._config_key, "data": self._data_key},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _cached(self, trial: Trial) -> Optional[Dict[str, Any]]:
+        if not self.use_cache:
+            return None
+        path = self.cache_dir / f"{self._key(trial)}.json"
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, trial: Trial, metrics: Mapping[str, Any]) -> None:
+        if not self.use_cache:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{self._key(trial)}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(metrics), encoding="utf-8")
+        os.replace(tmp, path)
+
+    # Trials --------------------------------------------------------------------------
+    def _score(self, metrics: Mapping[str, Any]) -> float:
+        if self.objective == "calmar":
+            return metrics["total_return_pct"] / max(metrics["max_drawdown_pct"], 1e-9)
+        return float(metrics[self.objective])
+
+    def run(self, trials: Iterable[Trial]) -> List[TrialResult]:
+        """Evaluate ``trials`` (cached ones are not re-run); best score first."""
+
+        trials = list(dict.fromkeys(trials))
+        for trial in trials:
+            if trial.strategy not in REGISTRY:
+                raise ValueError(f"unknown strategy {trial.strategy!r}")
+        metrics: Dict[Trial, Dict[str, Any]] = {}
+        cached: Dict[Trial, bool] = {}
+        pending: List[Trial] = []
+        for trial in trials:
+            hit = self._cached(trial)
+            if hit is not None:
+                metrics[trial], cached[trial] = hit, True
+            else:
+                pending.append(trial)
+        started = time.perf_counter()
+        if pending:
+            if self.workers > 1 and len(pending) > 1:
+                outputs = list(self._executor().map(_run_in_worker, pending))
+            else:
+                outputs = [_evaluate(self.prices, self.symbols, self.config, trial) for trial in pending]
+            for trial, output in zip(pending, outputs):
+                metrics[trial], cached[trial] = output, False
+                self._store(trial, output)
+        logger.info(
+            "Optimiser ran trials=%d cached=%d workers=%d in %.2fs",
+            len(pending),
+            len(trials) - len(pending),
+            self.workers,
+            time.perf_counter() - started,
+        )
+        results = [
+            TrialResult(
+                strategy=trial.strategy,
+                params=trial.context,
+                start=trial.start,
+                end=trial.end if trial.end is not None else self.bars,
+                score=self._score(metrics[trial]),
+                cached=cached[trial],
+                **metrics[trial],
+            )
+            for trial in trials
+        ]
+        results.sort(key=lambda result: result.score, reverse=True)
+        return results
+
+    def search(
+        self,
+        strategy: str,
+        space: Space,
+        *,
+        samples: Optional[int] = None,
+        seed: Optional[int] = None,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> List[TrialResult]:
+        """Grid search over ``space``, or a random search when ``samples`` is given."""
+
+        points = random_search(space, samples, seed=seed) if samples is not None else grid(space)
+        return self.run(Trial.of(strategy, point, start, end) for point in points or [{}])
+
+    def walk_forward(
+        self,
+        strategy: str,
+        space: Space,
+        *,
+        train_bars: int,
+        test_bars: int,
+        step: Optional[int] = None,
+        samples: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> WalkForwardResult:
+        """Optimise on each training window and score the winner on the window after it.
+
+        Test windows start cold, so strategies warm up again at the start of each one.
+        """
+
+        points = (random_search(space, samples, seed=seed) if samples is not None else grid(space)) or [{}]
+        step = int(step or test_bars)
+        windows = [
+            (begin, begin + train_bars, begin + train_bars + test_bars)
+            for begin in range(0, self.bars - train_bars - test_bars + 1, max(1, step))
+        ]
+        train = self.run(Trial.of(strategy, point, lo, mid) for lo, mid, _ in windows for point in points)
+        best: Dict[Tuple[int, int], TrialResult] = {}
+        for result in train:  # already ranked, so the first hit per window wins
+            best.setdefault((result.start, result.end), result)
+        chosen = [best[(lo, mid)] for lo, mid, _ in windows]
+        tests = {
+            (result.start, result.end): result
+            for result in self.run(Trial.of(strategy, pick.params, mid, hi) for pick, (_, mid, hi) in zip(chosen, windows))
+        }
+        outcome = WalkForwardResult(strategy)
+        for pick, (lo, mid, hi) in zip(chosen, windows):
+            outcome.folds.append(
+                {
+                    "train": [lo, mid],
+                    "test": {"bars": [mid, hi], **tests[(mid, hi)].to_dict()},
+                    "params": pick.params,
+                    "train_score": pick.score,
+                }
+            )
+        return outcome
+
+    def propose_weights(
+        self,
+        results: Mapping[str, Sequence[TrialResult]],
+        *,
+        total: float = 1.0,
+    ) -> Dict[str, float]:
+        """``spot.weights`` proportional to each strategy's best positive score.
+
+        Weights sum to ``total``; strategies whose best trial does not score
+        above zero get 0. The result can be posted as ``{"weights": ...}`` to
+        ``/spot/strategies``.
+        """
+
+        scores = {name: max((r.score for r in ranked), default=0.0) for name, ranked in results.items()}
+        positive = {name: score for name, score in scores.items() if score > 0 and math.isfinite(score)}
+        norm = sum(positive.values())
+        return {name: round(total * positive.get(name, 0.0) / norm, 4) if norm else 0.0 for name in scores}
+
+
+def write_report(
+    path: Path,
+    results: Mapping[str, Sequence[TrialResult]],
+    *,
+    walk_forward: Optional[Mapping[str, WalkForwardResult]] = None,
+    weights: Optional[Mapping[str, float]] = None,
+    top: int = 20,
+) -> Path:
+    """Write a JSON report: the ``top`` ranked trials per strategy, walk-forward folds
+    and the proposed ``spot.weights``."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "generated_at": time.time(),
+        "strategies": {name: [result.to_dict() for result in ranked[:top]] for name, ranked in results.items()},
+        "walk_forward": {name: wf.to_dict() for name, wf in (walk_forward or {}).items()},
+        "proposed": {"weights": dict(weights or {})},
+    }
+    path.write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+__all__ = [
+    "OBJECTIVES",
+    "Optimizer",
+    "Trial",
+    "TrialResult",
+    "WalkForwardResult",
+    "grid",
+    "random_search",
+    "write_report",
+]
@@ -0,0 +1,625 @@
+"""Deterministic full-stack replay of recorded or simulated market data.
+
+:class:`FullReplay` drives the production objects rather than models of
+them: price ticks from the spot venue are published on an in-memory bus
+to a :class:`Supervisor`, whose signals reach an :class:`Agent` with its
+:class:`RiskManager` and :class:`Portfolio`; every ``scan_interval_sec``
+an :class:`ArbitrageScanner` scans all venues and hands the result to an
+:class:`ArbitrageAutoManager` executing through a
+:class:`SafeArbitrageExecutor` in simulation mode.
+
+While a replay runs, the hot modules see a :class:`VirtualClock` in place
+of ``time.time`` and ``datetime.utcnow``, a pinned runtime state instead
+of the live one, and the replay bus; exchange calls are answered from the
+current quote of each venue. Journals, the reporting database and the
+trade log are bypassed, and the risk log goes to the output directory.
+Nothing waits on the wall clock, so a replay runs as fast as the CPU
+allows, and the same input always produces the same event log, whose
+digest makes behaviour comparable across versions. Per-stage latencies
+are measured with ``perf_counter`` alongside.
+
+The patches are process-wide: run replays from a script or a worker
+process, never inside the live API process.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import copy
+import hashlib
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..core.ai import agent as agent_module
+from ..core.ai import price_history as price_history_module
+from ..core.ai import supervisor as supervisor_module
+from ..core.ai.agent import Agent
+from ..core.ai.batch import np
+from ..core.ai.runner import StrategyRunner
+from ..core.ai.supervisor import Supervisor
+from ..core.bus.redis_bus import RedisBus, RedisBusConfig
+from ..core.exchange.klines import Klines, interval_seconds, synthetic_klines
+from ..core.portfolio.portfolio import Portfolio
+from ..core.risk import manager as risk_module
+from ..core.risk.manager import RiskLimits, RiskManager
+from ..core.risk.rate_limit import MemoryRateLimitBackend, RateLimitConfig, RateLimiter
+from ..core.state import _DEFAULT_STATE
+from ..services.arbitrage import auto_manager as auto_manager_module
+from ..services.arbitrage import executor_safe as executor_module
+from ..services.arbitrage import scanner as scanner_module
+from ..services.arbitrage import transfer as transfer_module
+from ..services.arbitrage.auto_manager import ArbitrageAutoManager, AutoResult
+from ..services.arbitrage.executor_safe import SafeArbitrageExecutor
+from ..services.arbitrage.scanner import ArbitrageFilters, ArbitrageOpportunity, ArbitrageScanner
+from .synthetic import Venue, simulate_paths, venue_quotes
+
+logger = logging.getLogger(__name__)
+
+QuoteColumns = Mapping[str, Sequence[float]]
+
+# Modules whose ``time`` / ``datetime`` globals follow the virtual clock.
+CLOCKED_MODULES = (
+    supervisor_module,
+    agent_module,
+    price_history_module,
+    scanner_module,
+    auto_manager_module,
+    executor_module,
+    transfer_module,
+)
+# Modules whose ``get_state`` reads the pinned replay state.
+STATEFUL_MODULES = (supervisor_module, agent_module, scanner_module, auto_manager_module, executor_module)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("numpy is required for full-stack replays")
+
+
+class VirtualClock:
+    """Replay time; only moves when the replay advances it."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = float(start)
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, ts: float) -> None:
+        if ts > self.now:
+            self.now = float(ts)
+
+
+class _ClockedTime:
+    """Stand-in for the ``time`` module whose ``time()`` reads a virtual clock."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.time = clock.time
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(time, name)
+
+
+def _clocked_datetime(clock: VirtualClock) -> type:
+    class ClockedDatetime(datetime):
+        @classmethod
+        def utcnow(cls) -> datetime:  # type: ignore[override]
+            return datetime.fromtimestamp(clock.now, timezone.utc).replace(tzinfo=None)
+
+        @classmethod
+        def now(cls, tz=None) -> datetime:  # type: ignore[override]
+            return datetime.fromtimestamp(clock.now, tz)
+
+    return ClockedDatetime
+
+
+def replay_state(overrides: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Default runtime state with trading and arbitrage auto mode on, plus ``overrides``.
+
+    Built from the defaults rather than the live state file so a replay does
+    not depend on the host it runs on; nested dicts merge one level deep, as
+    they do when the state file is loaded.
+    """
+
+    state = copy.deepcopy(_DEFAULT_STATE)
+    state.update(global_stop=False, trading_on=True, arb_on=True)
+    state["arb"]["auto_mode"] = True
+    for key, value in (overrides or {}).items():
+        if isinstance(state.get(key), dict) and isinstance(value, dict):
+            state[key].update(copy.deepcopy(value))
+        else:
+            state[key] = copy.deepcopy(value)
+    return state
+
+
+@contextlib.contextmanager
+def virtualised(
+    clock: VirtualClock,
+    state: Mapping[str, Any],
+    bus: RedisBus,
+    log_dir: Path,
+) -> Iterator[None]:
+    """Point the hot modules at the replay clock, state and bus; restored on exit."""
+
+    saved: List[Tuple[object, str, object]] = []
+
+    def patch(module: object, name: str, value: object) -> None:
+        if hasattr(module, name):
+            saved.append((module, name, getattr(module, name)))
+            setattr(module, name, value)
+
+    pinned = copy.deepcopy(dict(state))
+    clocked_time = _ClockedTime(clock)
+    clocked_datetime = _clocked_datetime(clock)
+    try:
+        for module in CLOCKED_MODULES:
+            patch(module, "time", clocked_time)
+            patch(module, "datetime", clocked_datetime)
+        for module in STATEFUL_MODULES:
+            patch(module, "get_state", lambda: copy.deepcopy(pinned))
+        patch(supervisor_module, "state_version", lambda: -1)
+        patch(agent_module, "get_bus", lambda: bus)
+        patch(agent_module, "get_journal", lambda: None)
+        patch(scanner_module, "record_arbitrage_proposal", lambda *args, **kwargs: None)
+        patch(risk_module, "LOG_PATH", log_dir / "risk.log")
+        patch(supervisor_module, "LOG_PATH", log_dir / "supervisor.log")
+        yield
+    finally:
+        for module, name, value in reversed(saved):
+            setattr(module, name, value)
+
+
+class ReplayExchange:
+    """Exchange client answering from the replay's current quotes."""
+
+    def __init__(
+        self,
+        venue: str,
+        book: Mapping[Tuple[str, str], Tuple[float, float]],
+        emit: Callable[..., None],
+        time_fn: Callable[[], float] = time.time,
+    ) -> None:
+        self.venue = venue
+        self._book = book
+        self._emit = emit
+        self._time_fn = time_fn
+        self._orders = 0
+
+    def _quote(self, symbol: str) -> Tuple[float, float]:
+        try:
+            return self._book[(self.venue, symbol.upper())]
+        except KeyError:
+            raise ValueError(f"no {symbol} quote on {self.venue} yet") from None
+
+    def get_price(self, symbol: str) -> float:
+        bid, ask = self._quote(symbol)
+        return (bid + ask) / 2
+
+    def get_book_ticker(self, symbol: str) -> Dict[str, object]:
+        bid, ask = self._quote(symbol)
+        return {"symbol": symbol.upper(), "bidPrice": bid, "askPrice": ask, "bidQty": 0.0, "askQty": 0.0}
+
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        *,
+        limit: Optional[int] = None,
+    ) -> Klines:
+        """Synthetic bars around the current mid, ending at replay time by default."""
+
+        step = interval_seconds(interval)
+        end = self._time_fn() if end is None else float(end)
+        start = end - (limit or 1000) * step if start is None else float(start)
+        return synthetic_klines(symbol, interval, start, end, price=self.get_price(symbol))
+
+    def place_order(self, symbol: str, side: str, qty: float, type: str = "MARKET") -> Dict[str, object]:
+        """Market orders fill in full at the touch: buys at the ask, sells at the bid."""
+
+        bid, ask = self._quote(symbol)
+        side = side.upper()
+        price = ask if side == "BUY" else bid
+        self._orders += 1
+        order_id = f"{self.venue}-{self._orders}"
+        self._emit("order", venue=self.venue, symbol=symbol.upper(), side=side, qty=qty, price=price, order_id=order_id)
+        return {
+            "orderId": order_id,
+            "symbol": symbol.upper(),
+            "side": side,
+            "type": type,
+            "status": "FILLED",
+            "price": price,
+            "executedQty": qty,
+        }
+
+    def cancel_order(self, order_id: str) -> Dict[str, object]:
+        return {"orderId": order_id, "status": "CANCELED"}
+
+    def get_position(self, symbol: str) -> Optional[Dict[str, object]]:
+        return None
+
+
+def _clean(value: Any) -> Any:
+    """Round floats to 12 significant digits so event logs diff cleanly."""
+
+    if isinstance(value, float):
+        return float(f"{value:.12g}") if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(item) for item in value]
+    return value
+
+
+def _latency(samples: Sequence[float]) -> Dict[str, float]:
+    """Percentiles of per-call latencies, in microseconds."""
+
+    if not samples:
+        return {"count": 0}
+    values = np.asarray(samples, dtype=np.float64) * 1e6
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]).tolist()
+    return {
+        "count": int(values.size),
+        "mean_us": float(values.mean()),
+        "p50_us": p50,
+        "p90_us": p90,
+        "p99_us": p99,
+        "max_us": float(values.max()),
+    }
+
+
+@dataclass
+class ReplayReport:
+    """Event log of one replay with its throughput and latency figures."""
+
+    events: List[Dict[str, Any]]
+    digest: str
+    ticks: int
+    virtual_sec: float
+    wall_sec: float
+    latency: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def ticks_per_sec(self) -> float:
+        return self.ticks / self.wall_sec if self.wall_sec > 0 else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """Replayed market time per second of wall time."""
+
+        return self.virtual_sec / self.wall_sec if self.wall_sec > 0 else 0.0
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for event in self.events:
+            counts[event["type"]] = counts.get(event["type"], 0) + 1
+        return dict(sorted(counts.items()))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "digest": self.digest,
+            "ticks": self.ticks,
+            "events": len(self.events),
+            "counts": self.counts(),
+            "virtual_sec": self.virtual_sec,
+            "wall_sec": round(self.wall_sec, 4),
+            "ticks_per_sec": round(self.ticks_per_sec, 1),
+            "speedup": round(self.speedup, 1),
+            "latency": self.latency,
+        }
+
+    def write(self, out_dir: Path) -> Path:
+        """Write ``events.jsonl`` and ``report.json`` to ``out_dir``."""
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with (out_dir / "events.jsonl").open("w", encoding="utf-8") as fp:
+            fp.write("".join(json.dumps(event, sort_keys=True) + "\n" for event in self.events))
+        path = out_dir / "report.json"
+        path.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True), encoding="utf-8")
+        return path
+
+
+class FullReplay:
+    """Replay ``{(venue, symbol): {"ts", "bid", "ask"}}`` quote columns through the live stack.
+
+    Ticks from ``spot_venue`` drive the spot path; the arbitrage path scans
+    every symbol quoted on at least two venues. ``state`` overrides the
+    pinned runtime state (see :func:`replay_state`).
+    """
+
+    def __init__(
+        self,
+        quotes: Mapping[Tuple[str, str], QuoteColumns],
+        *,
+        spot_venue: Optional[str] = None,
+        state: Optional[Mapping[str, Any]] = None,
+        scan_interval_sec: float = 5.0,
+        filters: Optional[ArbitrageFilters] = None,
+        limits_path: Optional[Path] = None,
+        rate_limit: Optional[RateLimitConfig] = None,
+        risk_limits: Optional[RiskLimits] = None,
+        arbitrage: bool = True,
+    ) -> None:
+        _require_numpy()
+        if not quotes:
+            raise ValueError("nothing to replay")
+        self.quotes = {
+            (venue.lower(), symbol.upper()): {
+                column: np.asarray(columns[column], dtype=np.float64) for column in ("ts", "bid", "ask")
+            }
+            for (venue, symbol), columns in sorted(quotes.items())
+        }
+        self.venues = sorted({venue for venue, _ in self.quotes})
+        self.spot_venue = (spot_venue or self.venues[0]).lower()
+        if self.spot_venue not in self.venues:
+            raise ValueError(f"no quotes from spot venue {self.spot_venue}")
+        self.spot_symbols = sorted(symbol for venue, symbol in self.quotes if venue == self.spot_venue)
+        quoted_on: Dict[str, int] = {}
+        for _, symbol in self.quotes:
+            quoted_on[symbol] = quoted_on.get(symbol, 0) + 1
+        self.arb_symbols = sorted(symbol for symbol, venues in quoted_on.items() if venues > 1) if arbitrage else []
+        self.state = replay_state(state)
+        self.scan_interval_sec = float(scan_interval_sec)
+        self.filters = filters or ArbitrageFilters(**self.state["arb"]["filters"])
+        self.limits_path = limits_path
+        self.rate_limit = rate_limit or RateLimitConfig()
+        self.risk_limits = risk_limits or RiskLimits()
+
+    @classmethod
+    def from_recordings(
+        cls,
+        root: Optional[Path] = None,
+        *,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        **kwargs: Any,
+    ) -> "FullReplay":
+        """Replay what the :class:`QuoteRecorder` captured in ``[start, end)``."""
+
+        from ..core.marketdata.recorder import load_quotes
+
+        return cls(load_quotes(root, start=start, end=end), **kwargs)
+
+    @classmethod
+    def from_store(
+        cls,
+        store: Any,
+        symbols: Sequence[str],
+        venues: Sequence[str],
+        *,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        **kwargs: Any,
+    ) -> "FullReplay":
+        """Replay quotes kept in a :class:`MarketDataStore` under ``venue_key`` names."""
+
+        from ..core.marketdata import venue_key
+
+        quotes: Dict[Tuple[str, str], QuoteColumns] = {}
+        for venue in venues:
+            for symbol in symbols:
+                frame = store.quotes(venue_key(venue, symbol), start, end, columns=("bid", "ask"))
+                if len(frame):
+                    quotes[(venue, symbol)] = {"ts": frame.ts, "bid": frame["bid"], "ask": frame["ask"]}
+        return cls(quotes, **kwargs)
+
+    @classmethod
+    def synthetic(
+        cls,
+        prices: Mapping[str, float],
+        venues: Mapping[str, Venue],
+        steps: int,
+        *,
+        start_ts: float = 0.0,
+        interval_sec: float = 1.0,
+        sigma: float = 0.001,
+        seed: Optional[int] = None,
+        **kwargs: Any,
+    ) -> "FullReplay":
+        """Replay simulated quotes: one path per symbol in ``prices``, quoted by every venue."""
+
+        _require_numpy()
+        rng = np.random.default_rng(seed)
+        symbols = list(prices)
+        paths = simulate_paths([prices[s] for s in symbols], steps, assets=len(symbols), sigma=sigma, seed=rng)
+        ts = start_ts + np.arange(steps) * float(interval_sec)
+        quotes: Dict[Tuple[str, str], QuoteColumns] = {}
+        for symbol, mid in zip(symbols, paths):
+            for venue, q in venue_quotes(mid, venues, seed=rng).items():
+                quotes[(venue, symbol)] = {"ts": ts, "bid": q.bid, "ask": q.ask}
+        return cls(quotes, **kwargs)
+
+    def _feed(self) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray", List[Tuple[str, str]]]:
+        """All quotes merged in time order; ties keep (venue, symbol) order."""
+
+        keys = list(self.quotes)
+        ts = np.concatenate([self.quotes[key]["ts"] for key in keys])
+        source = np.concatenate([np.full(len(self.quotes[key]["ts"]), i, dtype=np.int32) for i, key in enumerate(keys)])
+        row = np.concatenate([np.arange(len(self.quotes[key]["ts"])) for key in keys])
+        order = np.argsort(ts, kind="stable")
+        return ts[order], source[order], row[order], keys
+
+    def run(self, out_dir: Optional[Path] = None) -> ReplayReport:
+        """Replay every quote; writes the event log and report to ``out_dir`` when given."""
+
+        events: List[Dict[str, Any]] = []
+        clock = VirtualClock()
+
+        def emit(kind: str, **payload: Any) -> None:
+            payload = _clean(payload)
+            payload.update(type=kind, ts=clock.now)
+            events.append(payload)
+
+        book: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        clients = {venue: ReplayExchange(venue, book, emit, clock.time) for venue in self.venues}
+        bus = RedisBus(RedisBusConfig(enabled=False))
+        ts, source, rows, keys = self._feed()
+        clock.advance(float(ts[0]))
+        latency: Dict[str, List[float]] = {"tick": [], "scan": [], "auto": []}
+        log_dir = Path(out_dir) if out_dir is not None else Path(__file__).resolve().parents[2] / "logs" / "replay"
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        with virtualised(clock, self.state, bus, log_dir):
+            # subscribed before the agent, so a signal is logged ahead of its orders
+            bus.subscribe(
+                supervisor_module.SIGNALS_CHANNEL,
+                lambda signal: emit(
+                    "signal",
+                    **{key: signal.get(key) for key in ("symbol", "side", "strategy", "qty", "price", "score")},
+                ),
+            )
+            supervisor = Supervisor(
+                client=clients[self.spot_venue],
+                runner=StrategyRunner(cycle_budget_ms=0, strategy_budget_ms=0),
+                time_fn=clock.time,
+                bus=bus,
+            )
+            agent = Agent(
+                client=clients[self.spot_venue],
+                risk=RiskManager(self.risk_limits),
+                supervisor=supervisor,
+                portfolio=Portfolio(record=False),
+                default_equity_usd=float(self.state.get("portfolio_equity", 10_000.0)),
+                batch_workers=1,
+            )
+
+            def log_trades(records: Any) -> None:
+                for record in records:
+                    emit(
+                        "trade",
+                        **{
+                            key: record.get(key)
+                            for key in ("symbol", "side", "qty", "price", "status", "reason", "strategy", "order_id")
+                        },
+                    )
+
+            agent._log_trades = log_trades  # type: ignore[method-assign]
+            supervisor.subscribe(bus, symbols=self.spot_symbols)
+
+            auto = None
+            if self.arb_symbols:
+                limiter = RateLimiter(self.rate_limit, backend=MemoryRateLimitBackend(), time_fn=clock.time)
+                scanner = ArbitrageScanner(
+                    clients,
+                    self.arb_symbols,
+                    float(self.state["arb"].get("qty_usd", 100.0)),
+                    self.limits_path,
+                    arb_state=self.state["arb"],
+                    priority_scores={},
+                )
+                executor = SafeArbitrageExecutor(
+                    Portfolio(record=False), RiskManager(self.risk_limits), rate_limiter=limiter, record=False
+                )
+
+                def execute(opportunity: ArbitrageOpportunity) -> None:
+                    result = executor.execute(opportunity, mode="simulation", auto_trigger=True)
+                    emit(
+                        "arb_execution",
+                        route=f"{opportunity.buy_exchange}->{opportunity.sell_exchange}",
+                        symbol=opportunity.symbol,
+                        status=result.status,
+                        pnl_usd=result.pnl_usd,
+                        fees_usd=result.fees_usd,
+                        message=result.message,
+                    )
+
+                def on_result(result: AutoResult) -> None:
+                    opportunity = result.decision.opportunity
+                    emit(
+                        "arb_decision",
+                        reason=result.decision.reason,
+                        executed=result.executed,
+                        route=None if opportunity is None else f"{opportunity.buy_exchange}->{opportunity.sell_exchange}",
+                        net_roi_pct=None if opportunity is None else opportunity.net_roi_pct,
+                    )
+
+                auto = ArbitrageAutoManager(scanner.scan, execute, rate_limiter=limiter, on_result=on_result)
+            next_scan = float(ts[0])
+
+            started = time.perf_counter()
+            perf = time.perf_counter
+            columns = [self.quotes[key] for key in keys]
+            spot = [key[0] == self.spot_venue and key[1] in self.spot_symbols for key in keys]
+            for stamp, src, row in zip(ts.tolist(), source.tolist(), rows.tolist()):
+                clock.advance(stamp)
+                data = columns[src]
+                bid, ask = float(data["bid"][row]), float(data["ask"][row])
+                book[keys[src]] = (bid, ask)
+                if spot[src]:
+                    t0 = perf()
+                    bus.publish(supervisor_module.PRICES_CHANNEL, {"symbol": keys[src][1], "price": (bid + ask) / 2, "ts": stamp})
+                    latency["tick"].append(perf() - t0)
+                if auto is not None and stamp >= next_scan:
+                    next_scan = stamp + self.scan_interval_sec
+                    t0 = perf()
+                    opportunities = scanner.scan(self.filters)
+                    t1 = perf()
+                    auto.handle(opportunities, self.filters)
+                    latency["scan"].append(t1 - t0)
+                    latency["auto"].append(perf() - t1)
+            wall = time.perf_counter() - started
+
+        digest = hashlib.sha256(
+            "".join(json.dumps(event, sort_keys=True) + "\n" for event in events).encode("utf-8")
+        ).hexdigest()
+        report = ReplayReport(
+            events=events,
+            digest=digest,
+            ticks=int(ts.size),
+            virtual_sec=float(ts[-1] - ts[0]),
+            wall_sec=wall,
+            latency={stage: _latency(samples) for stage, samples in latency.items()},
+        )
+        if out_dir is not None:
+            report.write(Path(out_dir))
+        logger.info("Replayed %d ticks in %.2fs digest=%s", report.ticks, wall, digest[:12])
+        return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded quotes through the trading stack")
+    parser.add_argument("--recordings", type=Path, help="quote recorder directory (default: MARKET_RECORDER_DIR)")
+    parser.add_argument("--start", type=float, help="first epoch second to replay")
+    parser.add_argument("--end", type=float, help="epoch second to stop before")
+    parser.add_argument("--spot-venue", help="venue whose ticks drive the spot path")
+    parser.add_argument("--scan-interval", type=float, default=5.0, help="arbitrage scan interval in replay seconds")
+    parser.add_argument("--state", type=Path, help="JSON runtime state overrides")
+    parser.add_argument("--out", type=Path, required=True, help="directory for events.jsonl and report.json")
+    args = parser.parse_args(argv)
+
+    state = json.loads(args.state.read_text(encoding="utf-8")) if args.state else None
+    replay = FullReplay.from_recordings(
+        args.recordings,
+        start=args.start,
+        end=args.end,
+        spot_venue=args.spot_venue,
+        scan_interval_sec=args.scan_interval,
+        state=state,
+    )
+    report = replay.run(args.out)
+    print(json.dumps(report.to_dict(), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
+
+
+__all__ = [
+    "CLOCKED_MODULES",
+    "FullReplay",
+    "ReplayExchange",
+    "ReplayReport",
+    "VirtualClock",
+    "replay_state",
+    "virtualised",
+]
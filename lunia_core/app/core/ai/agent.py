@@ -3,14 +3,18 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from ..bus import get_bus
 from ..exchange.base import IExchange
+from ..journal import ExecutionJournal, get_journal
 from ..metrics import (
     orders_rejected_total,
     orders_total,
@@ -19,17 +23,21 @@ from ..metrics import (
     spot_positions_open,
     spot_pnl_total_usd,
     spot_risk_reject_total,
+    spot_signals_netted_total,
     spot_success_rate_pct,
     spot_trades_total,
 )
 from ..state import get_state
 from ..portfolio.portfolio import Portfolio
 from ..risk.manager import RiskManager
+from .netting import net_signals
 from .supervisor import Supervisor
 
 logger = logging.getLogger(__name__)
 LOG_PATH = Path(__file__).resolve().parents[4] / "logs" / "trades.jsonl"
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+# concurrent order submissions per execution batch
+EXEC_WORKERS = int(os.getenv("SPOT_EXEC_WORKERS", "8"))
 
 
 @dataclass
@@ -42,19 +50,27 @@ class Agent:
     portfolio: Portfolio = field(default_factory=Portfolio)
     default_equity_usd: float = 10_000.0
     subscribe_bus: bool = True
+    netting: bool = True
+    batch_execution: bool = True
+    batch_workers: int = EXEC_WORKERS
     bus: object = field(init=False, repr=False, default=None)
     executed_count: int = 0
     success_count: int = 0
     daily_pnl: float = 0.0
+    journal: Optional[ExecutionJournal] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
         self.bus = get_bus()
+        if self.journal is None:
+            self.journal = get_journal()
         if self.subscribe_bus and self.bus:
             self.bus.subscribe("signals", self._handle_signal)
         if hasattr(self.supervisor, "risk"):
             self.supervisor.risk = self.risk
         if hasattr(self.supervisor, "portfolio"):
             self.supervisor.portfolio = self.portfolio
+        if getattr(self.supervisor, "bus", False) is None:
+            self.supervisor.bus = self.bus
 
     def _handle_signal(self, message: Dict[str, object]) -> None:
         logger.info("Agent received signal via bus: %s", message)
@@ -72,6 +88,7 @@ class Agent:
         stop_pct: float | None = None,
         take_pct: float | None = None,
         notional_usd: float | None = None,
+        allocations: Optional[Iterable[Mapping[str, object]]] = None,
     ) -> Dict[str, object]:
         runtime = get_state()
         if runtime.get("global_stop") or not runtime.get("trading_on", True):
@@ -137,7 +154,29 @@ class Agent:
             self._log_trade(record)
             return {"ok": False, "reason": reason}
 
-        response = self.client.place_order(symbol, side_upper, qty)
+        exec_id = uuid.uuid4().hex
+        journal = self.journal
+        if journal is not None:
+            journal.begin(exec_id, "spot", {"symbol": symbol, "side": side_upper, "qty": qty, "strategy": strategy})
+            journal.intent(exec_id, "order", {"exchange": type(self.client).__name__, "price": market_price})
+        try:
+            response = self.client.place_order(symbol, side_upper, qty)
+        except Exception as exc:
+            if journal is not None:
+                journal.outcome(exec_id, "order", {"error": str(exc)})
+                journal.end(exec_id, "FAILED")
+            raise
+        if journal is not None:
+            journal.outcome(
+                exec_id,
+                "order",
+                {
+                    "order_id": response.get("orderId"),
+                    "status": response.get("status", "FILLED"),
+                    "price": response.get("price"),
+                    "executed_qty": response.get("executedQty", qty),
+                },
+            )
         orders_total.labels(symbol=symbol, side=side_upper).inc()
         spot_trades_total.labels(strategy=strategy or "unknown", symbol=symbol, side=side_upper).inc()
         record.update(
@@ -158,6 +197,7 @@ class Agent:
             strategy=strategy,
             stop_pct=stop_pct,
             take_pct=take_pct,
+            allocations=allocations,
         )
         self.risk.register_pnl(pnl_delta)
         pnl_total.set(self.portfolio.realized_pnl)
@@ -165,6 +205,8 @@ class Agent:
         self.daily_pnl += pnl_delta
         spot_daily_pnl_usd.set(self.daily_pnl)
         spot_positions_open.set(self.portfolio.open_positions())
+        if journal is not None:
+            journal.end(exec_id, str(record["status"]))
 
         logger.info("Order executed with status %s", record["status"])
         self._log_trade(record)
@@ -185,7 +227,18 @@ class Agent:
 
         total_processed = 0
         successful = 0
-        for signal in decision.get("signals", []):
+        signals = list(decision.get("signals", []))
+        if self.netting and len(signals) > 1:
+            signals, cancelled = net_signals(signals)
+            folded = sum(len(order.get("allocations", ())) - 1 for order in signals)
+            if folded:
+                spot_signals_netted_total.labels(outcome="merged").inc(folded)
+            for entry in cancelled:
+                spot_signals_netted_total.labels(outcome="cancelled").inc(len(entry["allocations"]))
+                logger.info("Signals for %s offset each other; no order placed", entry["symbol"])
+        if self.batch_execution and len(signals) > 1:
+            return self.execute_batch(signals, runtime=runtime)
+        for signal in signals:
             symbol = str(signal.get("symbol", "BTCUSDT"))
             side = str(signal.get("side", "BUY")).upper()
             qty = float(signal.get("qty", 0.0))
@@ -207,6 +260,7 @@ class Agent:
                 stop_pct=float(signal.get("stop_pct", 0.0) or 0.0),
                 take_pct=float(signal.get("take_pct", 0.0) or 0.0),
                 notional_usd=notional,
+                allocations=signal.get("allocations"),
             )
             total_processed += 1
             if result.get("ok"):
@@ -228,14 +282,205 @@ class Agent:
                     }
                 )
 
-        if total_processed:
-            self.executed_count += total_processed
-            self.success_count += successful
-            ratio = self.success_count / max(self.executed_count, 1)
-            spot_success_rate_pct.set(ratio * 100)
+        self._record_success(total_processed, successful)
+        return {"executed": executed, "errors": errors}
 
+    def execute_batch(
+        self,
+        signals: Sequence[Mapping[str, object]],
+        *,
+        runtime: Optional[Mapping[str, object]] = None,
+    ) -> Dict[str, List[Dict[str, object]]]:
+        """Execute several signals against one runtime snapshot.
+
+        Missing prices are quoted once per symbol, every order is validated
+        against a single equity figure, the survivors are submitted
+        concurrently after one journal fsync, and fills, trade rows and log
+        lines are committed together. Exchange errors fail only their order.
+        """
+
+        runtime = get_state() if runtime is None else runtime
+        executed: List[Dict[str, object]] = []
+        errors: List[Dict[str, object]] = []
+        quotes: Dict[str, float] = {}
+        orders: List[Dict[str, object]] = []
+        for signal in signals:
+            symbol = str(signal.get("symbol", "BTCUSDT"))
+            side = str(signal.get("side", "BUY")).upper()
+            qty = float(signal.get("qty", 0.0))
+            price = signal.get("price")
+            if not price:
+                if symbol not in quotes:
+                    quotes[symbol] = float(self.client.get_price(symbol))
+                price = quotes[symbol]
+            price = float(price)
+            notional = float(signal.get("notional_usd", price * qty))
+            if qty <= 0 and notional > 0:
+                qty = notional / price
+            if qty <= 0:
+                reason = "invalid-qty"
+                orders_rejected_total.labels(symbol=symbol, side=side, reason=reason).inc()
+                errors.append({"symbol": symbol, "side": side, "reason": reason})
+                continue
+            orders.append(
+                {
+                    "symbol": symbol,
+                    "side": side,
+                    "qty": qty,
+                    "price": price,
+                    "notional_usd": notional,
+                    "strategy": str(signal.get("strategy", "generic")),
+                    "stop_pct": float(signal.get("stop_pct", 0.0) or 0.0),
+                    "take_pct": float(signal.get("take_pct", 0.0) or 0.0),
+                    "allocations": signal.get("allocations"),
+                }
+            )
+        if not orders:
+            return {"executed": executed, "errors": errors}
+
+        equity_runtime = runtime.get("portfolio_equity", self.default_equity_usd)
+        equity = max(self.portfolio.get_equity_usd({"USDT": equity_runtime}), equity_runtime)
+        for order in orders:
+            position = self.portfolio.get_position(order["symbol"])
+            order["position_exists"] = bool(position and position.quantity != 0)
+            order["current_symbol_exposure_pct"] = (
+                abs(position.quantity * order["price"]) / equity * 100 if position and equity > 0 else 0.0
+            )
+        verdicts = self.risk.validate_spot_batch(
+            equity_usd=equity,
+            orders=orders,
+            open_positions=self.portfolio.open_positions(),
+            limits={
+                "max_symbol_exposure_pct": runtime.get("spot", {}).get("max_symbol_exposure_pct", 0.35) * 100,
+                "max_symbol_risk_pct": self.risk.limits.max_symbol_risk_pct,
+            },
+        )
+
+        timestamp = datetime.utcnow().isoformat()
+        records: List[Dict[str, object]] = []
+        approved: List[Tuple[Dict[str, object], Dict[str, object]]] = []
+        for order, (ok, reason) in zip(orders, verdicts):
+            record = {
+                "timestamp": timestamp,
+                "symbol": order["symbol"],
+                "side": order["side"],
+                "qty": order["qty"],
+                "price": order["price"],
+                "status": "PENDING" if ok else "REJECTED",
+                "reason": reason,
+                "strategy": order["strategy"],
+            }
+            records.append(record)
+            if ok:
+                approved.append((order, record))
+                continue
+            logger.warning("Risk validation failed: %s", reason)
+            orders_rejected_total.labels(symbol=order["symbol"], side=order["side"], reason=reason).inc()
+            spot_risk_reject_total.labels(reason=reason).inc()
+            errors.append({"symbol": order["symbol"], "side": order["side"], "reason": reason})
+
+        journal = self.journal
+        exchange = type(self.client).__name__
+        for order, _ in approved:
+            order["exec_id"] = uuid.uuid4().hex
+            if journal is not None:
+                journal.begin(
+                    order["exec_id"],
+                    "spot",
+                    {"symbol": order["symbol"], "side": order["side"], "qty": order["qty"], "strategy": order["strategy"]},
+                )
+                journal.intent(order["exec_id"], "order", {"exchange": exchange, "price": order["price"]}, sync=False)
+        if journal is not None and approved:
+            journal.sync()
+
+        fills: List[Dict[str, object]] = []
+        for (order, record), (response, exc) in zip(approved, self._submit([order for order, _ in approved])):
+            exec_id = order["exec_id"]
+            if exc is not None:
+                logger.error("Order submission failed for %s: %s", order["symbol"], exc)
+                if journal is not None:
+                    journal.outcome(exec_id, "order", {"error": str(exc)})
+                    journal.end(exec_id, "FAILED")
+                record.update({"status": "FAILED", "reason": str(exc)})
+                errors.append({"symbol": order["symbol"], "side": order["side"], "reason": str(exc)})
+                continue
+            if journal is not None:
+                journal.outcome(
+                    exec_id,
+                    "order",
+                    {
+                        "order_id": response.get("orderId"),
+                        "status": response.get("status", "FILLED"),
+                        "price": response.get("price"),
+                        "executed_qty": response.get("executedQty", order["qty"]),
+                    },
+                )
+            orders_total.labels(symbol=order["symbol"], side=order["side"]).inc()
+            spot_trades_total.labels(strategy=order["strategy"], symbol=order["symbol"], side=order["side"]).inc()
+            record.update(
+                {
+                    "status": response.get("status", "FILLED"),
+                    "order_id": response.get("orderId"),
+                    "response": response,
+                }
+            )
+            fills.append(
+                {
+                    "symbol": order["symbol"],
+                    "side": order["side"],
+                    "qty": float(response.get("executedQty", order["qty"])),
+                    "price": float(response.get("price") or order["price"]),
+                    "strategy": order["strategy"],
+                    "stop_pct": order["stop_pct"],
+                    "take_pct": order["take_pct"],
+                    "allocations": order["allocations"],
+                }
+            )
+            executed.append(
+                {"symbol": order["symbol"], "side": order["side"], "status": response.get("status", "FILLED")}
+            )
+
+        if fills:
+            pnl_delta = sum(self.portfolio.update_on_fills(fills))
+            self.risk.register_pnl(pnl_delta)
+            pnl_total.set(self.portfolio.realized_pnl)
+            spot_pnl_total_usd.set(self.portfolio.realized_pnl)
+            self.daily_pnl += pnl_delta
+            spot_daily_pnl_usd.set(self.daily_pnl)
+            spot_positions_open.set(self.portfolio.open_positions())
+        if journal is not None:
+            for order, record in approved:
+                if record["status"] != "FAILED":
+                    journal.end(order["exec_id"], str(record["status"]))
+
+        logger.info("Batch executed orders=%d filled=%d errors=%d", len(orders), len(fills), len(errors))
+        self._log_trades(records)
+        self._record_success(len(orders), len(fills))
         return {"executed": executed, "errors": errors}
 
+    def _submit(
+        self, orders: Sequence[Mapping[str, object]]
+    ) -> List[Tuple[Optional[Dict[str, object]], Optional[Exception]]]:
+        def place(order: Mapping[str, object]) -> Tuple[Optional[Dict[str, object]], Optional[Exception]]:
+            try:
+                return self.client.place_order(order["symbol"], order["side"], order["qty"]), None
+            except Exception as exc:
+                return None, exc
+
+        workers = min(max(1, self.batch_workers), len(orders))
+        if workers <= 1:
+            return [place(order) for order in orders]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spot-exec") as pool:
+            return list(pool.map(place, orders))
+
+    def _record_success(self, processed: int, successful: int) -> None:
+        if not processed:
+            return
+        self.executed_count += processed
+        self.success_count += successful
+        ratio = self.success_count / max(self.executed_count, 1)
+        spot_success_rate_pct.set(ratio * 100)
+
     def run_demo_cycle(self) -> None:  # pragma: no cover - long-running loop
         from ..metrics import ensure_metrics_server
 
@@ -246,6 +491,13 @@ class Agent:
             time.sleep(60)
 
     def _log_trade(self, record: Dict[str, object]) -> None:
+        self._log_trades([record])
+
+    def _log_trades(self, records: Iterable[Dict[str, object]]) -> None:
+        records = list(records)
+        if not records:
+            return
         with LOG_PATH.open("a", encoding="utf-8") as fp:
-            fp.write(json.dumps(record) + "\n")
-        logger.debug("Trade logged: %s", record)
+            fp.write("".join(json.dumps(record) + "\n" for record in records))
+        for record in records:
+            logger.debug("Trade logged: %s", record)
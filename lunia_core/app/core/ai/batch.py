@@ -0,0 +1,148 @@
+"""Vectorised evaluation of strategies across many symbols at once.
+
+A batch strategy receives a :class:`BatchInput` (a symbols x window price
+matrix plus aligned feature arrays) and returns :class:`BatchSignals`, one
+row per symbol, or a list of them when it reports signals under several
+names (see :func:`signal_sets`). Strategies that declare ``references`` also
+get the window of each row's first reference symbol. Requires NumPy;
+without it the Supervisor stays on the per-symbol path.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, List, Mapping, Optional, Sequence, Union
+
+from .features import Feature
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy optional
+    np = None  # type: ignore
+
+# Features computed from the price window itself; everything else indicator-like
+# carries state across ticks and is read from the shared IndicatorEngine.
+WINDOW_KINDS = frozenset({"mean", "stdev", "pstdev", "min", "max", "median", "median_high", "wma"})
+STATEFUL_KINDS = frozenset({"ema", "rsi", "macd"})
+
+BUY = 1
+SELL = -1
+
+
+def window_feature(prices: "np.ndarray", kind: str, n: int) -> "np.ndarray":
+    """Row-wise rolling statistic over the last ``n`` columns."""
+
+    window = prices[:, -n:]
+    if kind == "mean":
+        return window.mean(axis=1)
+    if kind == "stdev":
+        return window.std(axis=1, ddof=1) if n > 1 else np.zeros(len(window))
+    if kind == "pstdev":
+        return window.std(axis=1)
+    if kind == "min":
+        return window.min(axis=1)
+    if kind == "max":
+        return window.max(axis=1)
+    if kind == "median":
+        return np.median(window, axis=1)
+    if kind == "median_high":
+        return np.sort(window, axis=1)[:, n // 2]
+    if kind == "wma":
+        weights = np.arange(1, n + 1, dtype=np.float64)
+        return window @ weights / weights.sum()
+    raise KeyError(f"not a window feature: {kind}")
+
+
+@dataclass
+class BatchInput:
+    symbols: List[str]
+    prices: "np.ndarray"
+    params: Mapping[str, object]
+    stateful: Mapping[Feature, "np.ndarray"] = field(default_factory=dict)
+    # window of each row's first declared reference symbol; NaN rows have none
+    references: Optional["np.ndarray"] = None
+    _cache: Dict[Feature, object] = field(default_factory=dict, repr=False)
+
+    @property
+    def last(self) -> "np.ndarray":
+        return self.prices[:, -1]
+
+    def full(self, value: float) -> "np.ndarray":
+        return np.full(len(self.symbols), float(value))
+
+    def param(self, name: str, default: float) -> float:
+        return float(self.params.get(name, default))
+
+    def feature(self, kind: str, *params: Hashable):
+        key = Feature(kind, params)
+        if key in self._cache:
+            return self._cache[key]
+        if kind in WINDOW_KINDS:
+            value: object = window_feature(self.prices, kind, int(params[0]))
+        elif kind == "context":
+            value = self.params.get(str(params[0]), params[1] if len(params) > 1 else None)
+        else:
+            value = self.stateful[key]
+        self._cache[key] = value
+        return value
+
+
+@dataclass
+class BatchSignals:
+    """Per-symbol outputs; ``side`` is +1 (BUY), -1 (SELL) or 0 (no signal).
+
+    ``meta`` values are per-row arrays or one value for every row;
+    ``strategy`` overrides the name the signals are reported under.
+    """
+
+    side: "np.ndarray"
+    score: "np.ndarray"
+    stop: "np.ndarray"
+    take: "np.ndarray"
+    meta: Dict[str, object] = field(default_factory=dict)
+    strategy: Optional[str] = None
+
+    def meta_row(self, row: int) -> Dict[str, object]:
+        return {
+            name: float(values[row]) if np.ndim(values) else values  # type: ignore[index]
+            for name, values in self.meta.items()
+        }
+
+
+def sides(buy: "np.ndarray", sell: "np.ndarray") -> "np.ndarray":
+    """+1 where ``buy``, -1 where ``sell`` and 0 elsewhere; BUY wins if both hold."""
+
+    return np.where(buy, BUY, np.where(sell, SELL, 0)).astype(np.int8)
+
+
+BatchResult = Union[BatchSignals, Sequence[BatchSignals]]
+BatchFunc = Callable[[BatchInput], BatchResult]
+
+
+def signal_sets(result: BatchResult) -> List[BatchSignals]:
+    """A batch function's result as a list of signal sets."""
+
+    return [result] if isinstance(result, BatchSignals) else list(result)
+
+
+def batch_window(min_history: int, features: Sequence[Feature]) -> int:
+    """Number of trailing prices a batch strategy needs."""
+
+    windows = [int(f.params[0]) for f in features if f.kind in WINDOW_KINDS]
+    return max([min_history, 1, *windows])
+
+
+__all__ = [
+    "BUY",
+    "SELL",
+    "STATEFUL_KINDS",
+    "WINDOW_KINDS",
+    "BatchFunc",
+    "BatchInput",
+    "BatchResult",
+    "BatchSignals",
+    "batch_window",
+    "np",
+    "sides",
+    "signal_sets",
+    "window_feature",
+]
@@ -0,0 +1,118 @@
+"""Declared strategy features and the per-cycle feature store."""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Dict, Hashable, Iterator, Mapping, NamedTuple, Sequence, Tuple
+
+from .indicators import Indicator, IndicatorEngine, IndicatorView, Key
+
+# Indicator features map onto IndicatorView accessors of the same name.
+INDICATOR_KINDS = frozenset(
+    {"ema", "rsi", "macd", "mean", "stdev", "pstdev", "min", "max", "median", "median_high", "wma"}
+)
+
+
+class Feature(NamedTuple):
+    """A value a strategy reads, e.g. ``Feature("ema", (9,))``.
+
+    ``kind`` is an indicator name, ``"window"`` (the last ``n`` prices) or
+    ``"context"`` (a per-cycle market stat such as ``orderbook_depth_ratio``,
+    with an optional default as second parameter).
+    """
+
+    kind: str
+    params: Tuple[Hashable, ...] = ()
+
+
+class FeatureView(IndicatorView):
+    """Indicator view for one symbol and one cycle that computes each feature once."""
+
+    def __init__(
+        self,
+        engine: IndicatorEngine,
+        symbol: str,
+        history: Sequence[float],
+        context: Mapping[str, object],
+    ) -> None:
+        super().__init__(engine, symbol, history)
+        self._context = context
+        self._indicators: Dict[Key, Indicator] = {}
+        self._values: Dict[Feature, object] = {}
+
+    def _get(self, key, factory):
+        indicator = self._indicators.get(key)
+        if indicator is None:
+            indicator = super()._get(key, factory)
+            self._indicators[key] = indicator
+        return indicator
+
+    def value(self, feature: Feature) -> object:
+        if feature in self._values:
+            return self._values[feature]
+        kind, params = feature
+        if kind == "window":
+            result: object = self._history[-int(params[0]) :]
+        elif kind == "context":
+            name = str(params[0])
+            result = self._context.get(name, params[1] if len(params) > 1 else None)
+        elif kind in INDICATOR_KINDS:
+            result = getattr(self, kind)(*params)
+        else:
+            raise KeyError(f"unknown feature kind: {kind}")
+        self._values[feature] = result
+        return result
+
+    def prepare(self, features: Sequence[Feature]) -> None:
+        for feature in features:
+            self.value(feature)
+
+
+class StrategyContext(Mapping[str, object]):
+    """Read-only context handed to a strategy for one symbol.
+
+    Behaves like the legacy ``ctx`` mapping (``ctx.get("sl_pct_default")``)
+    and additionally exposes typed attributes and the feature view.
+    """
+
+    __slots__ = ("symbol", "features", "reference_prices", "_items")
+
+    def __init__(
+        self,
+        symbol: str,
+        params: Mapping[str, object],
+        features: FeatureView,
+        reference_prices: Mapping[str, Sequence[float]],
+    ) -> None:
+        object.__setattr__(self, "symbol", symbol)
+        object.__setattr__(self, "features", features)
+        # wrapped, not copied: the Supervisor passes a lazy view over its price history
+        object.__setattr__(self, "reference_prices", MappingProxyType(reference_prices))
+        items = dict(params)
+        items.update(symbol=symbol, features=features, reference_prices=self.reference_prices)
+        object.__setattr__(self, "_items", MappingProxyType(items))
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("StrategyContext is read-only")
+
+    def __getitem__(self, key: str) -> object:
+        return self._items[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def sl_pct_default(self) -> float:
+        return float(self._items.get("sl_pct_default", 0.15))
+
+    @property
+    def tp_pct_default(self) -> float:
+        return float(self._items.get("tp_pct_default", 0.30))
+
+    def feature(self, kind: str, *params: Hashable) -> object:
+        return self.features.value(Feature(kind, params))
+
+
+__all__ = ["Feature", "FeatureView", "StrategyContext", "INDICATOR_KINDS"]
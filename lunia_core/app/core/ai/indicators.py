@@ -0,0 +1,528 @@
+"""Incremental indicators shared by the spot strategies.
+
+The :class:`IndicatorEngine` keeps one state object per
+``(symbol, indicator, params)``; the Supervisor feeds it every tick and each
+indicator updates in O(1) (the rolling median in O(log n)). Strategies read
+values through :func:`indicator_view`, so an EMA(9) is computed once per tick
+no matter how many strategies use it. An indicator first requested mid-stream
+is seeded from the price history it is read with.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass, field
+from math import sqrt
+from typing import Any, Callable, Deque, Dict, Hashable, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+
+class Indicator(Protocol):
+    def update(self, x: float) -> None:
+        ...
+
+
+class EMA:
+    """Exponential moving average seeded with the first observation."""
+
+    def __init__(self, period: int) -> None:
+        self.alpha = 2 / (period + 1)
+        self.value = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> None:
+        self.value = x if self.count == 0 else (x - self.value) * self.alpha + self.value
+        self.count += 1
+
+
+class WilderRSI:
+    """RSI with Wilder smoothing; 50 until ``period`` deltas have been seen."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.period = period
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.deltas = 0
+        self.prev: Optional[float] = None
+
+    def update(self, x: float) -> None:
+        if self.prev is None:
+            self.prev = x
+            return
+        delta = x - self.prev
+        self.prev = x
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        self.deltas += 1
+        if self.deltas <= self.period:
+            # the first average is a plain mean of the initial deltas
+            self.avg_gain += (gain - self.avg_gain) / self.deltas
+            self.avg_loss += (loss - self.avg_loss) / self.deltas
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+    @property
+    def value(self) -> float:
+        if self.deltas < self.period:
+            return 50.0
+        if self.avg_loss == 0:
+            return 100.0
+        if self.avg_gain == 0:
+            return 0.0
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+
+class MACD:
+    """MACD line, signal line and histogram."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+
+    def update(self, x: float) -> None:
+        self.fast.update(x)
+        self.slow.update(x)
+        self.signal.update(self.fast.value - self.slow.value)
+
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        line = self.fast.value - self.slow.value
+        return line, self.signal.value, line - self.signal.value
+
+
+def ema_series(prices: Sequence[float], period: int) -> List[float]:
+    """:class:`EMA` value after each price, computed in one tight loop with identical arithmetic."""
+
+    alpha = 2 / (period + 1)
+    out: List[float] = []
+    append = out.append
+    it = iter(prices)
+    for value in it:
+        append(value)
+        for x in it:
+            value = (x - value) * alpha + value
+            append(value)
+    return out
+
+
+def rsi_series(prices: Sequence[float], period: int = 14) -> List[float]:
+    """:class:`WilderRSI` value after each price, computed in one tight loop with identical arithmetic."""
+
+    out: List[float] = []
+    append = out.append
+    avg_gain = avg_loss = 0.0
+    deltas = 0
+    prev: Optional[float] = None
+    for x in prices:
+        if prev is None:
+            prev = x
+            append(50.0)
+            continue
+        delta = x - prev
+        prev = x
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        deltas += 1
+        if deltas <= period:
+            avg_gain += (gain - avg_gain) / deltas
+            avg_loss += (loss - avg_loss) / deltas
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+        if deltas < period:
+            append(50.0)
+        elif avg_loss == 0:
+            append(100.0)
+        elif avg_gain == 0:
+            append(0.0)
+        else:
+            append(100 - 100 / (1 + avg_gain / avg_loss))
+    return out
+
+
+def macd_series(prices: Sequence[float], fast: int = 12, slow: int = 26, signal: int = 9) -> List[Tuple[float, float, float]]:
+    """:class:`MACD` value after each price (line, signal, histogram)."""
+
+    lines = [f - s for f, s in zip(ema_series(prices, fast), ema_series(prices, slow))]
+    return [(line, sig, line - sig) for line, sig in zip(lines, ema_series(lines, signal))]
+
+
+class RollingStats:
+    """Mean and variance over the last ``window`` values (sliding Welford update)."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values: Deque[float] = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x: float) -> None:
+        if len(self.values) < self.window:
+            self.values.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(self.values)
+            self._m2 += delta * (x - self.mean)
+            return
+        old = self.values.popleft()
+        self.values.append(x)
+        prev_mean = self.mean
+        self.mean += (x - old) / self.window
+        self._m2 = max(0.0, self._m2 + (x - old) * (x - self.mean + old - prev_mean))
+
+    def variance(self, ddof: int = 1) -> float:
+        n = len(self.values)
+        if n <= ddof:
+            return 0.0
+        return self._m2 / (n - ddof)
+
+    def stdev(self, ddof: int = 1) -> float:
+        return sqrt(self.variance(ddof))
+
+
+class RollingExtrema:
+    """Rolling minimum and maximum via monotonic deques."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.count = 0
+        self._min: Deque[Tuple[int, float]] = deque()
+        self._max: Deque[Tuple[int, float]] = deque()
+
+    def update(self, x: float) -> None:
+        idx = self.count
+        self.count += 1
+        while self._min and self._min[-1][1] >= x:
+            self._min.pop()
+        while self._max and self._max[-1][1] <= x:
+            self._max.pop()
+        self._min.append((idx, x))
+        self._max.append((idx, x))
+        oldest = idx - self.window + 1
+        if self._min[0][0] < oldest:
+            self._min.popleft()
+        if self._max[0][0] < oldest:
+            self._max.popleft()
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1] if self._min else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1] if self._max else 0.0
+
+
+class RollingMedian:
+    """Median over the last ``window`` values kept in a sorted window."""
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values: Deque[float] = deque()
+        self._sorted: list[float] = []
+
+    def update(self, x: float) -> None:
+        self.values.append(x)
+        insort(self._sorted, x)
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+
+    @property
+    def value(self) -> float:
+        n = len(self._sorted)
+        if not n:
+            return 0.0
+        mid = n // 2
+        return self._sorted[mid] if n % 2 else (self._sorted[mid - 1] + self._sorted[mid]) / 2
+
+    @property
+    def high(self) -> float:
+        """Larger of the two middle values, like :func:`statistics.median_high`."""
+
+        return self._sorted[len(self._sorted) // 2] if self._sorted else 0.0
+
+
+class RollingWeightedMean:
+    """Linearly weighted mean (weights ``1..n``, newest heaviest) over ``window`` values."""
+
+    _RESYNC_EVERY = 4096
+
+    def __init__(self, window: int) -> None:
+        self.window = window
+        self.values: Deque[float] = deque()
+        self._sum = 0.0
+        self._weighted = 0.0
+        self._updates = 0
+
+    def update(self, x: float) -> None:
+        n = len(self.values)
+        if n < self.window:
+            self.values.append(x)
+            self._weighted += (n + 1) * x
+            self._sum += x
+        else:
+            # every existing weight drops by one and the oldest value leaves
+            old = self.values.popleft()
+            self.values.append(x)
+            self._weighted += self.window * x - self._sum
+            self._sum += x - old
+        self._updates += 1
+        if self._updates % self._RESYNC_EVERY == 0:
+            self._sum = sum(self.values)
+            self._weighted = sum(w * v for w, v in enumerate(self.values, start=1))
+
+    @property
+    def value(self) -> float:
+        n = len(self.values)
+        if not n:
+            return 0.0
+        return self._weighted / (n * (n + 1) / 2)
+
+
+Key = Tuple[Hashable, ...]
+
+_KINDS: Dict[str, type] = {
+    cls.__name__: cls
+    for cls in (EMA, WilderRSI, MACD, RollingStats, RollingExtrema, RollingMedian, RollingWeightedMean)
+}
+
+
+def _encode(value: Any) -> Any:
+    if type(value).__name__ in _KINDS:
+        return {"indicator": dump_indicator(value)}
+    if isinstance(value, deque):
+        return {"deque": [_encode(item) for item in value]}
+    if isinstance(value, tuple):
+        return {"tuple": [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"cannot encode indicator field of type {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "indicator" in value:
+            return load_indicator(value["indicator"])
+        if "deque" in value:
+            return deque(_decode(item) for item in value["deque"])
+        if "tuple" in value:
+            return tuple(_decode(item) for item in value["tuple"])
+        raise ValueError(f"unknown indicator field encoding {sorted(value)}")
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def dump_indicator(indicator: Indicator) -> Dict[str, Any]:
+    """JSON-safe state of one of the built-in indicators."""
+
+    kind = type(indicator).__name__
+    if _KINDS.get(kind) is not type(indicator):
+        raise TypeError(f"cannot snapshot indicator {kind}")
+    return {"kind": kind, "state": {name: _encode(value) for name, value in vars(indicator).items()}}
+
+
+def load_indicator(data: Mapping[str, Any]) -> Indicator:
+    """Rebuild an indicator from :func:`dump_indicator` output."""
+
+    cls = _KINDS.get(str(data.get("kind")))
+    if cls is None:
+        raise ValueError(f"unknown indicator kind {data.get('kind')!r}")
+    indicator = cls.__new__(cls)
+    for name, value in dict(data["state"]).items():
+        setattr(indicator, name, _decode(value))
+    return indicator
+
+
+@dataclass
+class _SymbolState:
+    ticks: int = 0
+    last: Optional[float] = None
+    indicators: Dict[Key, Indicator] = field(default_factory=dict)
+
+
+class IndicatorEngine:
+    """Per-symbol registry of incrementally updated indicators."""
+
+    def __init__(self) -> None:
+        self._symbols: Dict[str, _SymbolState] = {}
+        self._lock = threading.RLock()
+
+    def update(self, symbol: str, price: float) -> None:
+        """Feed one tick to every indicator registered for ``symbol``."""
+
+        with self._lock:
+            state = self._symbols.setdefault(symbol, _SymbolState())
+            state.ticks += 1
+            state.last = price
+            for indicator in state.indicators.values():
+                indicator.update(price)
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._symbols.clear()
+            else:
+                self._symbols.pop(symbol, None)
+
+    def ticks(self, symbol: str) -> int:
+        state = self._symbols.get(symbol)
+        return state.ticks if state else 0
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-safe per-symbol state, restorable with :meth:`restore`."""
+
+        with self._lock:
+            snapshot: Dict[str, Dict[str, Any]] = {}
+            for symbol, state in self._symbols.items():
+                indicators = []
+                for key, indicator in state.indicators.items():
+                    try:
+                        indicators.append([list(key), dump_indicator(indicator)])
+                    except TypeError:
+                        continue  # custom indicators are re-seeded from history instead
+                snapshot[symbol] = {"ticks": state.ticks, "last": state.last, "indicators": indicators}
+            return snapshot
+
+    def restore(self, symbol: str, data: Mapping[str, Any]) -> None:
+        """Replace ``symbol``'s state with one entry of :meth:`snapshot`."""
+
+        state = _SymbolState(ticks=int(data.get("ticks", 0)), last=data.get("last"))
+        for key, dumped in data.get("indicators", []):
+            state.indicators[tuple(key)] = load_indicator(dumped)
+        with self._lock:
+            self._symbols[symbol] = state
+
+    def indicator(
+        self,
+        symbol: str,
+        key: Key,
+        factory: Callable[[], Indicator],
+        history: Sequence[float],
+    ) -> Indicator:
+        """Return the shared indicator for ``key``, creating and seeding it on first use.
+
+        ``history`` must be the recent ticks of ``symbol`` (oldest first). If it
+        does not end with the last tick the engine saw, the symbol is rebuilt
+        from it, so the engine never serves values for a different series.
+        """
+
+        with self._lock:
+            state = self._symbols.get(symbol)
+            if len(history) and (state is None or state.last != history[-1] or state.ticks < len(history)):
+                state = _SymbolState(ticks=len(history), last=history[-1])
+                self._symbols[symbol] = state
+            elif state is None:
+                state = self._symbols.setdefault(symbol, _SymbolState())
+            indicator = state.indicators.get(key)
+            if indicator is None:
+                indicator = factory()
+                for price in history:
+                    indicator.update(price)
+                state.indicators[key] = indicator
+            return indicator
+
+
+class IndicatorView:
+    """Read-only accessors for one symbol's indicators."""
+
+    def __init__(self, engine: IndicatorEngine, symbol: str, history: Sequence[float]) -> None:
+        self._engine = engine
+        self._symbol = symbol
+        self._history = history
+
+    @property
+    def symbol(self) -> str:
+        return self._symbol
+
+    def _get(self, key: Key, factory: Callable[[], Indicator]) -> Indicator:
+        return self._engine.indicator(self._symbol, key, factory, self._history)
+
+    def ema(self, period: int) -> float:
+        return self._get(("ema", period), lambda: EMA(period)).value
+
+    def rsi(self, period: int = 14) -> float:
+        return self._get(("rsi", period), lambda: WilderRSI(period)).value
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
+        """Return ``(macd, signal, histogram)``."""
+
+        return self._get(("macd", fast, slow, signal), lambda: MACD(fast, slow, signal)).value
+
+    def _stats(self, window: int) -> RollingStats:
+        return self._get(("stats", window), lambda: RollingStats(window))
+
+    def mean(self, window: int) -> float:
+        return self._stats(window).mean
+
+    def stdev(self, window: int) -> float:
+        """Sample standard deviation."""
+
+        return self._stats(window).stdev(1)
+
+    def pstdev(self, window: int) -> float:
+        """Population standard deviation."""
+
+        return self._stats(window).stdev(0)
+
+    def _extrema(self, window: int) -> RollingExtrema:
+        return self._get(("extrema", window), lambda: RollingExtrema(window))
+
+    def min(self, window: int) -> float:
+        return self._extrema(window).min
+
+    def max(self, window: int) -> float:
+        return self._extrema(window).max
+
+    def median(self, window: int) -> float:
+        return self._get(("median", window), lambda: RollingMedian(window)).value
+
+    def median_high(self, window: int) -> float:
+        return self._get(("median", window), lambda: RollingMedian(window)).high
+
+    def wma(self, window: int) -> float:
+        """Linearly weighted mean with the newest value weighted heaviest."""
+
+        return self._get(("wma", window), lambda: RollingWeightedMean(window)).value
+
+
+def indicator_view(symbol: str, prices: Sequence[float], ctx: Mapping[str, object]) -> IndicatorView:
+    """Return the view strategies read from.
+
+    Prefers the Supervisor's per-cycle feature view (``ctx["features"]``),
+    then the shared engine in ``ctx["indicators"]``; direct callers without
+    either get a private engine seeded from ``prices``.
+    """
+
+    if not isinstance(ctx, Mapping):
+        return IndicatorView(IndicatorEngine(), symbol, prices)
+    features = ctx.get("features")
+    if isinstance(features, IndicatorView) and features.symbol == symbol:
+        return features
+    engine = ctx.get("indicators")
+    if not isinstance(engine, IndicatorEngine):
+        engine = IndicatorEngine()
+    return IndicatorView(engine, symbol, prices)
+
+
+__all__ = [
+    "EMA",
+    "MACD",
+    "IndicatorEngine",
+    "IndicatorView",
+    "RollingExtrema",
+    "RollingMedian",
+    "RollingStats",
+    "RollingWeightedMean",
+    "WilderRSI",
+    "dump_indicator",
+    "ema_series",
+    "indicator_view",
+    "load_indicator",
+    "macd_series",
+    "rsi_series",
+]
@@ -0,0 +1,80 @@
+"""Net per-strategy spot signals into one order per symbol before execution."""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+
+def _signed(signal: Mapping[str, object]) -> float:
+    qty = float(signal.get("qty", 0.0) or 0.0)
+    return -qty if str(signal.get("side", "BUY")).upper() == "SELL" else qty
+
+
+def _weighted(legs: List[Mapping[str, object]], key: str, total_qty: float) -> float:
+    return sum(float(leg.get(key, 0.0) or 0.0) * float(leg["qty"]) for leg in legs) / total_qty
+
+
+def net_signals(
+    signals: Iterable[Mapping[str, object]],
+) -> Tuple[List[Dict[str, object]], List[Dict[str, object]]]:
+    """Aggregate ``signals`` per symbol into net orders.
+
+    Returns ``(orders, cancelled)``. Each order keeps the signal keys the
+    agent reads (``symbol``, ``side``, ``qty``, ``price``, ``notional_usd``,
+    ``stop_pct``, ``take_pct``, ``score``, ``strategy``) plus ``allocations``:
+    one ``{"strategy", "side", "qty"}`` leg per contributing signal, so a
+    fill can be split back across strategies. Stop and take are averaged
+    over the legs on the net side, weighted by quantity; ``strategy`` names
+    the largest of them. Symbols whose legs cancel out exactly are returned
+    in ``cancelled``. Signals without a positive quantity pass through
+    unchanged, as do single-signal symbols apart from the added leg.
+    """
+
+    groups: Dict[str, List[Mapping[str, object]]] = {}
+    passthrough: List[Dict[str, object]] = []
+    for signal in signals:
+        if float(signal.get("qty", 0.0) or 0.0) <= 0:
+            passthrough.append(dict(signal))
+            continue
+        groups.setdefault(str(signal.get("symbol", "")), []).append(signal)
+
+    orders: List[Dict[str, object]] = []
+    cancelled: List[Dict[str, object]] = []
+    for symbol, legs in groups.items():
+        allocations = [
+            {
+                "strategy": str(leg.get("strategy", "generic")),
+                "side": str(leg.get("side", "BUY")).upper(),
+                "qty": float(leg["qty"]),
+            }
+            for leg in legs
+        ]
+        net_qty = sum(_signed(leg) for leg in legs)
+        total_qty = sum(float(leg["qty"]) for leg in legs)
+        price = sum(float(leg.get("price") or 0.0) * float(leg["qty"]) for leg in legs) / total_qty
+        if abs(net_qty) <= 1e-12 * total_qty:
+            cancelled.append({"symbol": symbol, "allocations": allocations})
+            continue
+        side = "BUY" if net_qty > 0 else "SELL"
+        winners = [leg for leg in legs if str(leg.get("side", "BUY")).upper() == side]
+        winner_qty = sum(float(leg["qty"]) for leg in winners)
+        lead = max(winners, key=lambda leg: float(leg["qty"]))
+        qty = abs(net_qty)
+        order: Dict[str, object] = {
+            "symbol": symbol,
+            "side": side,
+            "strategy": str(lead.get("strategy", "generic")),
+            "qty": qty,
+            "score": sum(float(leg.get("score", 0.0) or 0.0) for leg in winners),
+            "stop_pct": _weighted(winners, "stop_pct", winner_qty),
+            "take_pct": _weighted(winners, "take_pct", winner_qty),
+            "allocations": allocations,
+        }
+        if price > 0:
+            # without a price the agent quotes the market itself
+            order.update(price=price, notional_usd=qty * price)
+        orders.append(order)
+    orders.extend(passthrough)
+    return orders, cancelled
+
+
+__all__ = ["net_signals"]
@@ -0,0 +1,276 @@
+"""Shard spot signal generation for large universes across worker processes.
+
+Each worker owns a plain :class:`Supervisor` (its own price history and
+indicator state) for the symbols hashed to it, plus copies of any symbols
+those strategies reference. Ticks are buffered in the parent and shipped
+with the next evaluation request, so a cycle costs one round-trip per
+shard. Budgets are computed once per cycle in the parent and shipped with
+the request; shards weight and size their own signals, and the parent
+merges them for global ranking.
+
+Workers are started with ``forkserver`` (``spawn`` where unavailable) rather
+than forked from the multithreaded API process. A shard that dies is
+restarted and re-seeded from the parent's history; if the replacement fails
+too, its symbols are evaluated in-process for that cycle.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .runner import Profile, merge_profiles
+from .strategies import REGISTRY, spec_for
+from .supervisor import Supervisor
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_WORKERS = int(os.getenv("SPOT_SIGNAL_WORKERS", "0") or 0)
+# forking a process that runs threads (Flask, bus, schedulers) can copy held locks
+DEFAULT_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+Tick = Tuple[str, float, float]
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """Stable shard index for ``symbol`` (same in every process)."""
+
+    return zlib.crc32(symbol.encode("utf-8")) % max(1, shards)
+
+
+def _shard_main(conn, history_limit: int, batch_mode: bool) -> None:
+    supervisor = Supervisor(client=None, history_limit=history_limit, batch_mode=batch_mode)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message[0] == "close":
+            break
+        _, ticks, symbols, params, priorities, scoring = message
+        try:
+            for symbol, price, ts in ticks:
+                supervisor.update_price(symbol, price, ts)
+            supervisor.ai_priorities = priorities
+            conn.send(("ok", supervisor._generate(symbols, params, **scoring)))
+        except Exception as exc:
+            conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    conn.close()
+
+
+@dataclass
+class ShardedSupervisor(Supervisor):
+    """Supervisor whose strategy evaluation runs on ``workers`` processes.
+
+    The parent keeps the full price history (for callers such as the
+    backtest endpoint) but no indicator state. Workers start lazily and are
+    seeded from the parent's history, so indicators that need more than
+    ``history_limit`` ticks warm up again after a restart.
+    """
+
+    workers: int = field(default_factory=lambda: SIGNAL_WORKERS or os.cpu_count() or 1)
+    start_method: Optional[str] = None
+    _conns: List[object] = field(default_factory=list, init=False, repr=False)
+    _processes: List[object] = field(default_factory=list, init=False, repr=False)
+    _pending: List[List[Tick]] = field(default_factory=list, init=False, repr=False)
+    _readers: Dict[str, Set[int]] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.workers = max(1, int(self.workers))
+
+    # Workers -------------------------------------------------------------------
+    @property
+    def started(self) -> bool:
+        return bool(self._processes)
+
+    def _spawn(self, index: int) -> Tuple[object, object]:
+        context = multiprocessing.get_context(self.start_method or DEFAULT_START_METHOD)
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_shard_main,
+            args=(child_conn, self.history_limit, self.batch_mode),
+            name=f"signal-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return parent_conn, process
+
+    def start(self) -> None:
+        with self._lock:
+            if self.started:
+                return
+            symbols = self.price_history.symbols()
+            for symbol in symbols:
+                self._route(symbol)
+            for index in range(self.workers):
+                conn, process = self._spawn(index)
+                self._conns.append(conn)
+                self._processes.append(process)
+                self._pending.append([])
+            for symbol in symbols:
+                for shard in self._readers[symbol]:
+                    self._seed(shard, symbol)
+            logger.info("Started %s signal shards", self.workers)
+
+    def _restart(self, shard: int) -> None:
+        """Replace shard ``shard`` with a fresh process seeded from the parent's history.
+
+        The parent's history holds every tick, including any that were
+        buffered for the dead shard, so re-seeding loses nothing.
+        """
+
+        conn, process = self._conns[shard], self._processes[shard]
+        try:
+            conn.close()
+        except OSError:  # pragma: no cover - already closed
+            pass
+        if process.is_alive():
+            process.terminate()
+        process.join(timeout=5)
+        logger.warning("Signal shard %s died (exit code %s); restarting", shard, process.exitcode)
+        self._conns[shard], self._processes[shard] = self._spawn(shard)
+        self._pending[shard] = []
+        for symbol, readers in self._readers.items():
+            if shard in readers:
+                self._seed(shard, symbol)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._conns:
+                try:
+                    conn.send(("close",))
+                    conn.close()
+                except (OSError, ValueError):  # pragma: no cover - worker already gone
+                    pass
+            for process in self._processes:
+                process.join(timeout=5)
+            self._conns.clear()
+            self._processes.clear()
+            self._pending.clear()
+
+    def __enter__(self) -> "ShardedSupervisor":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # Routing -------------------------------------------------------------------
+    def _route(self, symbol: str) -> Set[int]:
+        """Shards holding ``symbol``: its owner plus owners of symbols referencing it."""
+
+        readers = self._readers.get(symbol)
+        if readers is not None:
+            return readers
+        owner = shard_of(symbol, self.workers)
+        readers = self._readers[symbol] = {owner}
+        for name in list(REGISTRY):
+            for reference in spec_for(name).reference_symbols(symbol):
+                shards = self._route(reference)
+                if owner not in shards:
+                    shards.add(owner)
+                    if self.started:
+                        self._seed(owner, reference)
+        return readers
+
+    def _seed(self, shard: int, symbol: str) -> None:
+        prices = self.price_history.window(symbol)
+        stamps = self.price_history.timestamps(symbol)
+        self._pending[shard].extend((symbol, float(p), float(t)) for p, t in zip(prices, stamps))
+
+    def update_price(self, symbol: str, price: float, ts: Optional[float] = None) -> None:
+        stamp = self.time_fn() if ts is None else ts
+        with self._lock:
+            self.price_history.append(symbol, price, stamp)
+            shards = self._route(symbol)
+            if self.started:
+                for shard in shards:
+                    self._pending[shard].append((symbol, float(price), float(stamp)))
+
+    # Evaluation ----------------------------------------------------------------
+    def _send(self, shard: int, owned: List[str], params: Mapping[str, object], scoring: Mapping[str, object]) -> bool:
+        ticks, self._pending[shard] = self._pending[shard], []
+        priorities = {symbol: self.ai_priorities[symbol] for symbol in owned if symbol in self.ai_priorities}
+        try:
+            self._conns[shard].send(("generate", ticks, owned, dict(params), priorities, dict(scoring)))
+        except (OSError, ValueError):
+            return False  # the dropped ticks are re-seeded from history on restart
+        return True
+
+    def _recv(self, shard: int) -> Optional[Tuple[str, object]]:
+        try:
+            return self._conns[shard].recv()
+        except (EOFError, OSError):
+            return None
+
+    def _generate(
+        self,
+        symbols: Sequence[str],
+        params: Mapping[str, object],
+        **scoring: object,
+    ) -> Tuple[List[Dict[str, object]], List[Dict[str, object]], Dict[str, int], Profile]:
+        with self._lock:
+            self.start()
+            for shard, process in enumerate(self._processes):
+                if not process.is_alive():
+                    self._restart(shard)
+            groups: Dict[int, List[str]] = {}
+            for symbol in dict.fromkeys(symbols):
+                self._route(symbol)
+                groups.setdefault(shard_of(symbol, self.workers), []).append(symbol)
+            sent: List[int] = []
+            lost: List[int] = []
+            for shard in range(self.workers):
+                owned = groups.get(shard, [])
+                if owned or self._pending[shard]:
+                    (sent if self._send(shard, owned, params, scoring) else lost).append(shard)
+            # read every reply requested before handling failures, so the pipes stay in step
+            replies: Dict[int, Tuple[str, object]] = {}
+            for shard in sent:
+                reply = self._recv(shard)
+                if reply is None:
+                    lost.append(shard)
+                else:
+                    replies[shard] = reply
+            for shard in lost:
+                self._restart(shard)
+                owned = groups.get(shard, [])
+                reply = self._recv(shard) if self._send(shard, owned, params, scoring) else None
+                if reply is None:
+                    logger.error("Signal shard %s failed after restart; evaluating %s symbols in-process", shard, len(owned))
+                    for symbol in owned:
+                        self.indicators.reset(symbol)  # the parent's indicator state is not kept current
+                    reply = ("ok", Supervisor._generate(self, owned, params, **scoring))
+                replies[shard] = reply
+
+            accepted: List[Dict[str, object]] = []
+            rejected: List[Dict[str, object]] = []
+            warming_up: Dict[str, int] = {}
+            profiles: List[Profile] = []
+            errors = []
+            for shard, (status, payload) in sorted(replies.items()):
+                if status != "ok":
+                    errors.append(f"shard {shard}: {payload}")
+                    continue
+                shard_accepted, shard_rejected, shard_warming, shard_profile = payload
+                accepted.extend(shard_accepted)
+                rejected.extend(shard_rejected)
+                profiles.append(shard_profile)
+                for name, count in shard_warming.items():
+                    warming_up[name] = warming_up.get(name, 0) + count
+            if errors:
+                raise RuntimeError("signal shard failed: " + "; ".join(errors))
+            # shards profile their own cycles; fold them into the parent's runner
+            profile = merge_profiles(profiles)
+            self.runner.record(profile)
+            return accepted, rejected, warming_up, profile
+
+
+__all__ = ["DEFAULT_START_METHOD", "SIGNAL_WORKERS", "ShardedSupervisor", "shard_of"]
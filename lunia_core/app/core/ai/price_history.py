@@ -0,0 +1,207 @@
+"""Fixed-capacity price history backed by one contiguous float64 buffer."""
+from __future__ import annotations
+
+import threading
+import time
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy optional
+    np = None  # type: ignore
+
+
+class PriceHistory:
+    """Per-symbol ring buffers of prices and timestamps.
+
+    Each symbol owns a slot of ``2 * capacity`` floats and every tick is
+    written twice, at ``pos`` and ``pos + capacity``, so the latest ``n``
+    values are always one contiguous range. :meth:`window` therefore returns
+    a zero-copy view (a NumPy array when NumPy is installed, otherwise a
+    ``memoryview``) instead of a new list. Views alias the buffer and are
+    only stable until the next tick for that symbol.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 200,
+        *,
+        initial_slots: int = 16,
+        time_fn: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.capacity = max(1, int(capacity))
+        self._time_fn = time_fn or time.time
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._heads: List[int] = []
+        self._counts: List[int] = []
+        self._versions: List[int] = []
+        self._slots = 0
+        self._values = self._alloc(0)
+        self._stamps = self._alloc(0)
+        self._grow(max(1, initial_slots))
+
+    # Storage -----------------------------------------------------------------
+    def _alloc(self, slots: int):
+        size = slots * 2 * self.capacity
+        if np is not None:
+            return np.zeros(size, dtype=np.float64)
+        return memoryview(array("d", bytes(8 * size)))
+
+    def _grow(self, slots: int) -> None:
+        values = self._alloc(slots)
+        stamps = self._alloc(slots)
+        used = self._slots * 2 * self.capacity
+        values[:used] = self._values[:used]
+        stamps[:used] = self._stamps[:used]
+        # existing views keep pointing at the old buffers, which stay valid
+        self._values, self._stamps, self._slots = values, stamps, slots
+
+    def _slot(self, symbol: str) -> int:
+        slot = self._index.get(symbol)
+        if slot is None:
+            slot = len(self._index)
+            if slot >= self._slots:
+                self._grow(self._slots * 2)
+            self._index[symbol] = slot
+            self._heads.append(0)
+            self._counts.append(0)
+            self._versions.append(0)
+        return slot
+
+    # Writing -----------------------------------------------------------------
+    def append(self, symbol: str, price: float, ts: Optional[float] = None) -> None:
+        stamp = self._time_fn() if ts is None else ts
+        with self._lock:
+            slot = self._slot(symbol)
+            base = slot * 2 * self.capacity
+            pos = self._heads[slot]
+            for offset in (base + pos, base + pos + self.capacity):
+                self._values[offset] = price
+                self._stamps[offset] = stamp
+            self._heads[slot] = (pos + 1) % self.capacity
+            self._counts[slot] = min(self._counts[slot] + 1, self.capacity)
+            self._versions[slot] += 1
+
+    def load(self, symbol: str, prices: Sequence[float], stamps: Sequence[float]) -> None:
+        """Replace ``symbol``'s series with ``prices`` (oldest first); keeps the latest ``capacity``."""
+
+        if len(prices) != len(stamps):
+            raise ValueError("prices and stamps differ in length")
+        prices, stamps = prices[-self.capacity :], stamps[-self.capacity :]
+        count = len(prices)
+        with self._lock:
+            slot = self._slot(symbol)
+            base = slot * 2 * self.capacity
+            for offset in (base, base + self.capacity):
+                self._values[offset : offset + count] = array("d", prices)
+                self._stamps[offset : offset + count] = array("d", stamps)
+            self._heads[slot] = count % self.capacity
+            self._counts[slot] = count
+            self._versions[slot] += 1
+
+    def snapshot(self) -> Dict[str, Tuple[array, array]]:
+        """Copies of every symbol's prices and timestamps, oldest first."""
+
+        with self._lock:
+            return {
+                symbol: (array("d", self.window(symbol)), array("d", self.timestamps(symbol)))
+                for symbol in self._index
+            }
+
+    def clear(self, symbol: str) -> None:
+        with self._lock:
+            slot = self._index.get(symbol)
+            if slot is not None:
+                self._heads[slot] = 0
+                self._counts[slot] = 0
+                self._versions[slot] += 1
+
+    # Reading -----------------------------------------------------------------
+    def _range(self, symbol: str, n: Optional[int]) -> tuple[int, int]:
+        slot = self._index.get(symbol)
+        if slot is None:
+            return 0, 0
+        count = self._counts[slot]
+        n = count if n is None else max(0, min(int(n), count))
+        last = (self._heads[slot] - 1) % self.capacity + self.capacity
+        end = slot * 2 * self.capacity + last + 1
+        return end - n, end
+
+    def window(self, symbol: str, n: Optional[int] = None) -> Sequence[float]:
+        """Return the latest ``n`` prices (all retained ones by default), oldest first."""
+
+        start, end = self._range(symbol, n)
+        return self._values[start:end]
+
+    def matrix(self, symbols: Sequence[str], n: int):
+        """Stack the latest ``n`` prices of ``symbols`` into a ``len(symbols) x n`` array.
+
+        Requires NumPy and at least ``n`` retained prices per symbol. Rows are
+        gathered from the shared buffer with one fancy-index copy.
+        """
+
+        if np is None:
+            raise RuntimeError("PriceHistory.matrix requires numpy")
+        n = int(n)
+        if not 0 < n <= self.capacity:
+            raise ValueError(f"window must be between 1 and {self.capacity}")
+        ends = np.empty(len(symbols), dtype=np.int64)
+        for row, symbol in enumerate(symbols):
+            start, end = self._range(symbol, n)
+            if end - start < n:
+                raise ValueError(f"{symbol} has fewer than {n} prices")
+            ends[row] = end
+        return self._values[ends[:, None] - n + np.arange(n)]
+
+    def timestamps(self, symbol: str, n: Optional[int] = None) -> Sequence[float]:
+        """Timestamps matching :meth:`window`."""
+
+        start, end = self._range(symbol, n)
+        return self._stamps[start:end]
+
+    def count(self, symbol: str) -> int:
+        slot = self._index.get(symbol)
+        return self._counts[slot] if slot is not None else 0
+
+    def version(self, symbol: str) -> int:
+        """Monotonic per-symbol change counter (0 for unknown symbols)."""
+
+        slot = self._index.get(symbol)
+        return self._versions[slot] if slot is not None else 0
+
+    def last_timestamp(self, symbol: str) -> Optional[float]:
+        stamps = self.timestamps(symbol, 1)
+        return float(stamps[0]) if len(stamps) else None
+
+    def slot(self, symbol: str) -> Optional[int]:
+        """Row of ``symbol`` in the shared buffer, if it has been seen."""
+
+        return self._index.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return list(self._index)
+
+    # Mapping-style access kept for existing callers -----------------------------
+    def get(self, symbol: str, default: Optional[Sequence[float]] = None) -> Optional[Sequence[float]]:
+        if symbol not in self._index:
+            return default
+        return self.window(symbol)
+
+    def __getitem__(self, symbol: str) -> Sequence[float]:
+        if symbol not in self._index:
+            raise KeyError(symbol)
+        return self.window(symbol)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._index))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+__all__ = ["PriceHistory"]
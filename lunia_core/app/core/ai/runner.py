@@ -0,0 +1,219 @@
+"""Time-budgeted strategy calls with per-strategy profiling.
+
+Python cannot safely pre-empt a running strategy, so budgets are enforced
+between calls: once a strategy has used its per-cycle budget, or the cycle
+as a whole is over budget, the remaining calls are deferred and flagged.
+Symbols deferred in one cycle are evaluated first in the next.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+from ..metrics import (
+    spot_strategy_calls_total,
+    spot_strategy_cycle_ms,
+    spot_strategy_deferred_total,
+    spot_strategy_errors_total,
+    spot_strategy_signals_total,
+)
+
+logger = logging.getLogger(__name__)
+
+CYCLE_BUDGET_MS = float(os.getenv("SPOT_CYCLE_BUDGET_MS", "2000"))
+STRATEGY_BUDGET_MS = float(os.getenv("SPOT_STRATEGY_BUDGET_MS", "500"))
+
+# Per-cycle profile of one strategy: {"calls", "signals", "errors", "deferred", "total_ms", "max_ms"}.
+Profile = Dict[str, Dict[str, float]]
+
+
+def _empty() -> Dict[str, float]:
+    return {"calls": 0, "signals": 0, "errors": 0, "deferred": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+
+def merge_profiles(profiles: Iterable[Profile]) -> Profile:
+    """Combine per-shard profiles: counts and time add up, ``max_ms`` is the max."""
+
+    merged: Profile = {}
+    for profile in profiles:
+        for name, entry in profile.items():
+            target = merged.setdefault(name, _empty())
+            for key, value in entry.items():
+                target[key] = max(target[key], value) if key == "max_ms" else target[key] + value
+    return merged
+
+
+@dataclass
+class StrategyStats:
+    calls: int = 0
+    signals: int = 0
+    errors: int = 0
+    deferred: int = 0
+    cycles: int = 0
+    over_budget_cycles: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_cycle_ms: float = 0.0
+    ewma_cycle_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        payload = asdict(self)
+        payload["avg_call_ms"] = self.total_ms / self.calls if self.calls else 0.0
+        return payload
+
+
+class StrategyCycle:
+    """Budget and timings for one ``gather_signals`` cycle."""
+
+    def __init__(self, runner: "StrategyRunner") -> None:
+        self._runner = runner
+        self._time_fn = runner.time_fn
+        self.started = self._time_fn()
+        self.profile: Profile = {}
+        self.deferred_symbols: Set[str] = set()
+
+    def _entry(self, name: str) -> Dict[str, float]:
+        entry = self.profile.get(name)
+        if entry is None:
+            entry = self.profile[name] = _empty()
+        return entry
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (self._time_fn() - self.started) * 1000
+
+    def blocked(self, name: str) -> Optional[str]:
+        """Reason the next call of ``name`` must be deferred, or ``None``."""
+
+        if self._runner.cycle_budget_ms > 0 and self.elapsed_ms >= self._runner.cycle_budget_ms:
+            return "cycle-budget"
+        entry = self.profile.get(name)
+        if entry and self._runner.strategy_budget_ms > 0 and entry["total_ms"] >= self._runner.strategy_budget_ms:
+            return "strategy-budget"
+        return None
+
+    def call(self, name: str, func: Callable[..., List[object]], *args: object, mode: str = "scalar") -> List[object]:
+        """Run ``func`` timed; an exception is counted and yields no signals."""
+
+        entry = self._entry(name)
+        started = self._time_fn()
+        try:
+            result = list(func(*args))
+        except Exception as exc:
+            entry["errors"] += 1
+            logger.warning("Strategy %s failed: %s", name, exc)
+            result = []
+        elapsed = (self._time_fn() - started) * 1000
+        entry["calls"] += 1
+        entry["signals"] += len(result)
+        entry["total_ms"] += elapsed
+        entry["max_ms"] = max(entry["max_ms"], elapsed)
+        spot_strategy_calls_total.labels(strategy=name, mode=mode).inc()
+        return result
+
+    def defer(self, name: str, symbols: Sequence[str], reason: str) -> None:
+        if not symbols:
+            return
+        self._entry(name)["deferred"] += len(symbols)
+        self.deferred_symbols.update(symbols)
+        spot_strategy_deferred_total.labels(strategy=name, reason=reason).inc(len(symbols))
+
+    def finish(self) -> Profile:
+        self._runner.finish_cycle(self)
+        return self.profile
+
+
+class StrategyRunner:
+    """Aggregates strategy profiles across cycles and exports them as metrics."""
+
+    def __init__(
+        self,
+        *,
+        cycle_budget_ms: Optional[float] = None,
+        strategy_budget_ms: Optional[float] = None,
+        time_fn: Optional[Callable[[], float]] = None,
+        ewma_alpha: float = 0.2,
+    ) -> None:
+        self.cycle_budget_ms = CYCLE_BUDGET_MS if cycle_budget_ms is None else float(cycle_budget_ms)
+        self.strategy_budget_ms = STRATEGY_BUDGET_MS if strategy_budget_ms is None else float(strategy_budget_ms)
+        self.time_fn = time_fn or time.perf_counter
+        self.ewma_alpha = ewma_alpha
+        self._stats: Dict[str, StrategyStats] = {}
+        self._deferred: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def cycle(self) -> StrategyCycle:
+        return StrategyCycle(self)
+
+    def prioritise(self, symbols: Iterable[str]) -> List[str]:
+        """Order ``symbols`` so the ones deferred last cycle run first."""
+
+        symbols = list(symbols)
+        with self._lock:
+            deferred = self._deferred
+        if not deferred:
+            return symbols
+        return [s for s in symbols if s in deferred] + [s for s in symbols if s not in deferred]
+
+    def finish_cycle(self, cycle: StrategyCycle) -> None:
+        with self._lock:
+            self._deferred = set(cycle.deferred_symbols)
+        self.record(cycle.profile)
+
+    def record(self, profile: Mapping[str, Mapping[str, float]]) -> None:
+        with self._lock:
+            for name, entry in profile.items():
+                stats = self._stats.setdefault(name, StrategyStats())
+                cycle_ms = float(entry["total_ms"])
+                stats.calls += int(entry["calls"])
+                stats.signals += int(entry["signals"])
+                stats.errors += int(entry["errors"])
+                stats.deferred += int(entry["deferred"])
+                stats.total_ms += cycle_ms
+                stats.max_ms = max(stats.max_ms, float(entry["max_ms"]))
+                stats.last_cycle_ms = cycle_ms
+                if stats.cycles == 0:
+                    stats.ewma_cycle_ms = cycle_ms
+                else:
+                    stats.ewma_cycle_ms += self.ewma_alpha * (cycle_ms - stats.ewma_cycle_ms)
+                stats.cycles += 1
+                if entry["deferred"]:
+                    stats.over_budget_cycles += 1
+        for name, entry in profile.items():
+            if entry["calls"]:
+                spot_strategy_cycle_ms.labels(strategy=name).observe(entry["total_ms"])
+            if entry["signals"]:
+                spot_strategy_signals_total.labels(strategy=name).inc(entry["signals"])
+            if entry["errors"]:
+                spot_strategy_errors_total.labels(strategy=name).inc(entry["errors"])
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def hottest(self, limit: int = 10, *, key: str = "total_ms") -> List[Dict[str, object]]:
+        """Strategies sorted by ``key`` (any :class:`StrategyStats` field), hottest first."""
+
+        items = [{"strategy": name, **values} for name, values in self.stats().items()]
+        items.sort(key=lambda item: item.get(key, 0.0), reverse=True)
+        return items[: max(0, int(limit))]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._deferred = set()
+
+
+__all__ = [
+    "CYCLE_BUDGET_MS",
+    "STRATEGY_BUDGET_MS",
+    "Profile",
+    "StrategyCycle",
+    "StrategyRunner",
+    "StrategyStats",
+    "merge_profiles",
+]
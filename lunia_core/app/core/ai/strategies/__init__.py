@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Dict, Iterable, List, Sequence
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from ..batch import BatchFunc, BatchInput, BatchSignals, batch_window
+from ..features import Feature, StrategyContext
 
 
 @dataclass
@@ -17,13 +20,97 @@ class StrategySignal:
     meta: Dict[str, float]
 
 
-StrategyFunc = Callable[[str, Sequence[float], Dict[str, float]], List[StrategySignal]]
+StrategyFunc = Callable[[str, Sequence[float], Mapping[str, object]], List[StrategySignal]]
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    """Registered strategy plus what it needs from the Supervisor.
+
+    ``min_history`` is the warm-up in ticks: the strategy is not called for a
+    symbol with fewer prices. ``features`` are computed once per symbol and
+    cycle in the feature store before any strategy runs, and ``references``
+    names the other symbols whose history the strategy reads. ``batch`` is an
+    optional vectorised twin of ``func`` that scores every ready symbol in one
+    call; it must produce the same signals as ``func`` row for row.
+    """
+
+    name: str
+    func: StrategyFunc
+    min_history: int = 0
+    features: Tuple[Feature, ...] = ()
+    references: Optional[Callable[[str], Iterable[str]]] = None
+    batch: Optional[BatchFunc] = None
+
+    def reference_symbols(self, symbol: str) -> List[str]:
+        return list(self.references(symbol)) if self.references else []
+
+    @property
+    def batch_window(self) -> int:
+        return batch_window(self.min_history, self.features)
+
 
 REGISTRY: Dict[str, StrategyFunc] = {}
+SPECS: Dict[str, StrategySpec] = {}
 
 
-def register(name: str, func: StrategyFunc) -> None:
+def register(
+    name: str,
+    func: StrategyFunc,
+    *,
+    min_history: int = 0,
+    features: Iterable[Feature] = (),
+    references: Optional[Callable[[str], Iterable[str]]] = None,
+    batch: Optional[BatchFunc] = None,
+) -> StrategySpec:
+    """Register a strategy; plain ``register(name, func)`` keeps working."""
+
+    spec = StrategySpec(
+        name=name,
+        func=func,
+        min_history=max(0, int(min_history)),
+        features=tuple(features),
+        references=references,
+        batch=batch,
+    )
     REGISTRY[name] = func
+    SPECS[name] = spec
+    return spec
+
+
+def strategy(
+    name: str,
+    *,
+    min_history: int = 0,
+    features: Iterable[Feature] = (),
+    references: Optional[Callable[[str], Iterable[str]]] = None,
+    batch: Optional[BatchFunc] = None,
+) -> Callable[[StrategyFunc], StrategyFunc]:
+    """Decorator form of :func:`register` for plugin strategies."""
+
+    def decorator(func: StrategyFunc) -> StrategyFunc:
+        register(
+            name,
+            func,
+            min_history=min_history,
+            features=features,
+            references=references,
+            batch=batch,
+        )
+        return func
+
+    return decorator
+
+
+def spec_for(name: str) -> StrategySpec:
+    """Return the spec for ``name``, wrapping functions put into REGISTRY directly."""
+
+    spec = SPECS.get(name)
+    func = REGISTRY[name]
+    if spec is None or spec.func is not func:
+        spec = StrategySpec(name=name, func=func)
+        SPECS[name] = spec
+    return spec
 
 
 def strategies() -> Iterable[str]:
@@ -43,4 +130,19 @@ from . import (  # noqa: E402,F401  (register on import)
     vwap_reversion,
 )
 
-__all__ = ["StrategySignal", "StrategyFunc", "REGISTRY", "register", "strategies"]
+__all__ = [
+    "BatchFunc",
+    "BatchInput",
+    "BatchSignals",
+    "Feature",
+    "REGISTRY",
+    "SPECS",
+    "StrategyContext",
+    "StrategyFunc",
+    "StrategySignal",
+    "StrategySpec",
+    "register",
+    "spec_for",
+    "strategies",
+    "strategy",
+]
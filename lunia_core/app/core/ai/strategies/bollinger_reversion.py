@@ -1,31 +1,24 @@
 """Bollinger band reversion strategy."""
 from __future__ import annotations
 
-from math import sqrt
-from statistics import mean
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
-
-
-def _stdev(values: Sequence[float]) -> float:
-    if len(values) < 2:
-        return 0.0
-    mu = mean(values)
-    variance = sum((x - mu) ** 2 for x in values) / (len(values) - 1)
-    return sqrt(max(variance, 0.0))
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     if len(prices) < 20:
         return []
-    window = prices[-20:]
-    mid = mean(window)
-    deviation = _stdev(window)
+    indicators = indicator_view(symbol, prices, ctx)
+    mid = indicators.mean(20)
+    deviation = indicators.stdev(20)
     if deviation == 0:
         return []
-    upper = mid + 2 * deviation
-    lower = mid - 2 * deviation
+    width = float(ctx.get("bollinger_k", 2.0))
+    upper = mid + width * deviation
+    lower = mid - width * deviation
     price = prices[-1]
     side = "BUY" if price <= lower else ("SELL" if price >= upper else "")
     if not side:
@@ -48,4 +41,27 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("bollinger_reversion", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    price = batch.last
+    mid = batch.feature("mean", 20)
+    deviation = batch.feature("stdev", 20)
+    width = batch.param("bollinger_k", 2.0)
+    side = sides(price <= mid - width * deviation, price >= mid + width * deviation)
+    side[deviation == 0] = 0
+    score = np.minimum(np.abs(price - mid) / np.maximum(mid, 1.0) * 100, 5.0)
+    return BatchSignals(
+        side=side,
+        score=score,
+        stop=batch.full(batch.param("sl_pct_default", 0.15) * 0.85),
+        take=batch.full(batch.param("tp_pct_default", 0.30) * 1.1),
+        meta={"mid": mid, "band_width": deviation},
+    )
+
+
+register(
+    "bollinger_reversion",
+    generate,
+    min_history=20,
+    features=(Feature("mean", (20,)), Feature("stdev", (20,))),
+    batch=generate_batch,
+)
@@ -3,45 +3,19 @@ from __future__ import annotations
 
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
-
-
-def _ema(prices: Sequence[float], period: int) -> float:
-    if not prices:
-        return 0.0
-    multiplier = 2 / (period + 1)
-    ema = prices[0]
-    for price in prices[1:]:
-        ema = (price - ema) * multiplier + ema
-    return ema
-
-
-def _rsi(prices: Sequence[float], period: int = 14) -> float:
-    if len(prices) < period + 1:
-        return 50.0
-    gains = 0.0
-    losses = 0.0
-    for idx in range(-period, 0):
-        delta = prices[idx] - prices[idx - 1]
-        if delta > 0:
-            gains += delta
-        else:
-            losses += abs(delta)
-    if losses == 0:
-        return 100.0
-    if gains == 0:
-        return 0.0
-    rs = gains / losses
-    return 100 - (100 / (1 + rs))
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     if len(prices) < 30:
         return []
     price = prices[-1]
-    ema_fast = _ema(prices[-20:], 9)
-    ema_slow = _ema(prices[-30:], 21)
-    rsi = _rsi(prices[-20:])
+    indicators = indicator_view(symbol, prices, ctx)
+    ema_fast = indicators.ema(9)
+    ema_slow = indicators.ema(21)
+    rsi = indicators.rsi(14)
     if ema_fast > ema_slow and rsi > 55:
         side = "BUY"
         score = min((rsi - 50) / 10, 5.0)
@@ -66,4 +40,25 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("ema_rsi_trend", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    ema_fast = batch.feature("ema", 9)
+    ema_slow = batch.feature("ema", 21)
+    rsi = batch.feature("rsi", 14)
+    side = sides((ema_fast > ema_slow) & (rsi > 55), (ema_fast < ema_slow) & (rsi < 45))
+    score = np.minimum(np.abs(rsi - 50) / 10, 5.0)
+    return BatchSignals(
+        side=side,
+        score=score,
+        stop=batch.full(batch.param("sl_pct_default", 0.15)),
+        take=batch.full(batch.param("tp_pct_default", 0.30)),
+        meta={"ema_fast": ema_fast, "ema_slow": ema_slow, "rsi": rsi},
+    )
+
+
+register(
+    "ema_rsi_trend",
+    generate,
+    min_history=30,
+    features=(Feature("ema", (9,)), Feature("ema", (21,)), Feature("rsi", (14,))),
+    batch=generate_batch,
+)
@@ -3,14 +3,16 @@ from __future__ import annotations
 
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     if len(prices) < 12:
         return []
     price = prices[-1]
-    median = sorted(prices[-12:])[len(prices[-12:]) // 2]
+    median = indicator_view(symbol, prices, ctx).median_high(12)
     deviation = (price - median) / max(median, 1.0)
     if abs(deviation) < 0.001:
         return []
@@ -33,4 +35,19 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("grid_light", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    median = batch.feature("median_high", 12)
+    deviation = (batch.last - median) / np.maximum(median, 1.0)
+    active = np.abs(deviation) >= 0.001
+    side = sides(active & (deviation <= 0), active & (deviation > 0))
+    grid_step = batch.param("grid_step_pct", 0.25)
+    return BatchSignals(
+        side=side,
+        score=np.minimum(np.abs(deviation) * 100, 3.0),
+        stop=batch.full(grid_step * 0.8),
+        take=batch.full(grid_step),
+        meta={"deviation": deviation, "grid_step": batch.full(grid_step)},
+    )
+
+
+register("grid_light", generate, min_history=12, features=(Feature("median_high", (12,)),), batch=generate_batch)
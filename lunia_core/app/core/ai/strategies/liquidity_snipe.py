@@ -1,9 +1,10 @@
 """Liquidity snipe strategy producing aggressive/safe variants."""
 from __future__ import annotations
 
-from typing import Dict, Sequence
+from typing import Dict, List, Sequence
 
-from . import StrategySignal, register
+from ..batch import BUY, SELL, BatchInput, BatchSignals, np
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
@@ -42,4 +43,40 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("liquidity_snipe", generate)
+def generate_batch(batch: BatchInput) -> List[BatchSignals]:
+    depth_ratio = batch.param("orderbook_depth_ratio", 0.5)
+    volatility = batch.param("volatility", 0.01)
+    side = np.full(len(batch.symbols), BUY if depth_ratio > 0.5 else SELL, dtype=np.int8)
+    base_score = min(max(volatility * 100, 0.1), 5.0)
+    safe_stop = batch.param("sl_pct_default", 0.15) * 1.1
+    safe_take = batch.param("tp_pct_default", 0.30) * 0.9
+    return [
+        BatchSignals(
+            side=side,
+            score=batch.full(base_score),
+            stop=batch.full(safe_stop),
+            take=batch.full(safe_take),
+            meta={"variant": "safe", "depth_ratio": depth_ratio},
+            strategy="liquidity_snipe_safe",
+        ),
+        BatchSignals(
+            side=side,
+            score=batch.full(base_score * 1.2),
+            stop=batch.full(safe_stop * 0.6),
+            take=batch.full(safe_take * 1.3),
+            meta={"variant": "aggressive", "depth_ratio": depth_ratio},
+            strategy="liquidity_snipe_aggressive",
+        ),
+    ]
+
+
+register(
+    "liquidity_snipe",
+    generate,
+    min_history=5,
+    features=(
+        Feature("context", ("orderbook_depth_ratio", 0.5)),
+        Feature("context", ("volatility", 0.01)),
+    ),
+    batch=generate_batch,
+)
@@ -3,27 +3,15 @@ from __future__ import annotations
 
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
-
-
-def _ema(prices: Sequence[float], period: int) -> float:
-    if not prices:
-        return 0.0
-    multiplier = 2 / (period + 1)
-    ema = prices[0]
-    for price in prices[1:]:
-        ema = (price - ema) * multiplier + ema
-    return ema
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     if len(prices) < 26:
         return []
-    fast = _ema(prices[-26:], 12)
-    slow = _ema(prices[-26:], 26)
-    signal_line = _ema([fast - slow for _ in range(9)], 9)
-    macd_value = fast - slow
-    histogram = macd_value - signal_line
+    macd_value, signal_line, histogram = indicator_view(symbol, prices, ctx).macd(12, 26, 9)
     if abs(histogram) < 0.0001:
         return []
     side = "BUY" if histogram > 0 else "SELL"
@@ -45,4 +33,18 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("macd_crossover", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    values = batch.feature("macd", 12, 26, 9)
+    macd_value, histogram = values[:, 0], values[:, 2]
+    active = np.abs(histogram) >= 0.0001
+    side = sides(active & (histogram > 0), active & (histogram <= 0))
+    return BatchSignals(
+        side=side,
+        score=np.minimum(np.abs(histogram) * 1000, 5.0),
+        stop=batch.full(batch.param("sl_pct_default", 0.15)),
+        take=batch.full(batch.param("tp_pct_default", 0.30)),
+        meta={"macd": macd_value, "hist": histogram},
+    )
+
+
+register("macd_crossover", generate, min_history=26, features=(Feature("macd", (12, 26, 9)),), batch=generate_batch)
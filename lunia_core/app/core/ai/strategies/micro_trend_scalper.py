@@ -1,10 +1,11 @@
 """Micro trend scalper strategy implementation."""
 from __future__ import annotations
 
-from statistics import mean
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def _momentum(prices: Sequence[float]) -> float:
@@ -21,7 +22,7 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
         return []
     side = "BUY" if momentum > 0 else "SELL"
     price = prices[-1]
-    base_score = abs(momentum) / max(mean(prices[-5:]), 1.0) * 100
+    base_score = abs(momentum) / max(indicator_view(symbol, prices, ctx).mean(5), 1.0) * 100
     score = min(base_score, 5.0)
     stop_pct = ctx.get("sl_pct_default", 0.15) * 0.9
     take_pct = ctx.get("tp_pct_default", 0.30) * 0.8
@@ -39,4 +40,17 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("micro_trend_scalper", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    momentum = batch.prices[:, -1] - batch.prices[:, -3]
+    side = sides(momentum > 0, momentum < 0)
+    score = np.minimum(np.abs(momentum) / np.maximum(batch.feature("mean", 5), 1.0) * 100, 5.0)
+    return BatchSignals(
+        side=side,
+        score=score,
+        stop=batch.full(batch.param("sl_pct_default", 0.15) * 0.9),
+        take=batch.full(batch.param("tp_pct_default", 0.30) * 0.8),
+        meta={"momentum": momentum},
+    )
+
+
+register("micro_trend_scalper", generate, min_history=5, features=(Feature("mean", (5,)),), batch=generate_batch)
@@ -1,23 +1,24 @@
 """Scalping breakout strategy with adaptive targets."""
 from __future__ import annotations
 
-from statistics import mean
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     if len(prices) < 10:
         return []
     price = prices[-1]
-    window = prices[-10:]
-    high = max(window)
-    low = min(window)
+    indicators = indicator_view(symbol, prices, ctx)
+    high = indicators.max(10)
+    low = indicators.min(10)
     range_pct = (high - low) / max(low, 1.0)
     if range_pct < 0.001:
         return []
-    mean_price = mean(window)
+    mean_price = indicators.mean(10)
     side = "BUY" if price >= high else ("SELL" if price <= low else "")
     if not side:
         return []
@@ -45,4 +46,30 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("scalping_breakout", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    price = batch.last
+    high = batch.feature("max", 10)
+    low = batch.feature("min", 10)
+    range_pct = (high - low) / np.maximum(low, 1.0)
+    active = range_pct >= 0.001
+    side = sides(active & (price >= high), active & (price <= low))
+    adaptive_factor = np.minimum(range_pct * 100, 5.0)
+    buy = side > 0
+    stop_pct = batch.param("sl_pct_default", 0.15)
+    take_pct = batch.param("tp_pct_default", 0.30)
+    return BatchSignals(
+        side=side,
+        score=adaptive_factor,
+        stop=np.where(buy, stop_pct * 0.8, stop_pct * 0.9),
+        take=np.where(buy, take_pct * (1 + adaptive_factor / 10), take_pct * (1 + adaptive_factor / 8)),
+        meta={"range_pct": range_pct, "mean": batch.feature("mean", 10)},
+    )
+
+
+register(
+    "scalping_breakout",
+    generate,
+    min_history=10,
+    features=(Feature("max", (10,)), Feature("min", (10,)), Feature("mean", (10,))),
+    batch=generate_batch,
+)
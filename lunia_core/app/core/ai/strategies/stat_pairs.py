@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from typing import Dict, Sequence
 
+from ..batch import BatchInput, BatchSignals, np, sides
 from . import StrategySignal, register
 
 
@@ -16,7 +17,7 @@ PAIR_REL = {
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     ref_symbol = PAIR_REL.get(symbol)
     ref_series = ctx.get("reference_prices", {}).get(ref_symbol)
-    if not ref_series or len(prices) < 10 or len(ref_series) < 10:
+    if ref_series is None or len(prices) < 10 or len(ref_series) < 10:
         return []
     price_ratio = prices[-1] / max(ref_series[-1], 1e-6)
     average_ratio = sum(p / max(r, 1e-6) for p, r in zip(prices[-10:], ref_series[-10:])) / 10
@@ -41,4 +42,29 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("stat_pairs", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    rows = len(batch.symbols)
+    references = batch.references if batch.references is not None else np.full((rows, 10), np.nan)
+    ratios = batch.prices[:, -10:] / np.maximum(references[:, -10:], 1e-6)
+    price_ratio = ratios[:, -1]
+    average_ratio = ratios.mean(axis=1)
+    deviation = (price_ratio - average_ratio) / np.maximum(average_ratio, 1e-6)
+    # rows without a reference are NaN and never trade
+    deviation = np.where(np.isnan(deviation), 0.0, deviation)
+    active = np.abs(deviation) >= 0.01
+    return BatchSignals(
+        side=sides(active & (deviation < 0), active & (deviation > 0)),
+        score=np.minimum(np.abs(deviation) * 50, 5.0),
+        stop=batch.full(batch.param("sl_pct_default", 0.15)),
+        take=batch.full(batch.param("tp_pct_default", 0.30)),
+        meta={"ratio": price_ratio, "avg_ratio": average_ratio},
+    )
+
+
+register(
+    "stat_pairs",
+    generate,
+    min_history=10,
+    references=lambda symbol: [PAIR_REL[symbol]] if symbol in PAIR_REL else [],
+    batch=generate_batch,
+)
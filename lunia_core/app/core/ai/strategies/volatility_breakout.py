@@ -1,22 +1,22 @@
 """Volatility breakout strategy."""
 from __future__ import annotations
 
-from statistics import pstdev
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     if len(prices) < 25:
         return []
-    window = prices[-25:]
-    price = window[-1]
-    vol = pstdev(window)
+    price = prices[-1]
+    vol = indicator_view(symbol, prices, ctx).pstdev(25)
     if vol == 0:
         return []
-    threshold = vol * 1.5
-    move = price - window[-2]
+    threshold = vol * float(ctx.get("vol_breakout_mult", 1.5))
+    move = price - prices[-2]
     if abs(move) < threshold:
         return []
     side = "BUY" if move > 0 else "SELL"
@@ -37,4 +37,19 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("volatility_breakout", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    vol = batch.feature("pstdev", 25)
+    threshold = vol * batch.param("vol_breakout_mult", 1.5)
+    move = batch.prices[:, -1] - batch.prices[:, -2]
+    active = (vol != 0) & (np.abs(move) >= threshold)
+    side = sides(active & (move > 0), active & (move <= 0))
+    return BatchSignals(
+        side=side,
+        score=np.minimum(np.abs(move) / np.maximum(threshold, 1e-6), 5.0),
+        stop=batch.full(batch.param("sl_pct_default", 0.15)),
+        take=batch.full(batch.param("tp_pct_default", 0.30) * 1.2),
+        meta={"vol": vol, "move": move},
+    )
+
+
+register("volatility_breakout", generate, min_history=25, features=(Feature("pstdev", (25,)),), batch=generate_batch)
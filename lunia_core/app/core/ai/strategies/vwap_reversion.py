@@ -3,16 +3,16 @@ from __future__ import annotations
 
 from typing import Dict, Sequence
 
-from . import StrategySignal, register
+from ..batch import BatchInput, BatchSignals, np, sides
+from ..indicators import indicator_view
+from . import Feature, StrategySignal, register
 
 
 def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> list[StrategySignal]:
     if len(prices) < 15:
         return []
     price = prices[-1]
-    weights = list(range(1, len(prices[-15:]) + 1))
-    weighted_sum = sum(p * w for p, w in zip(prices[-15:], weights))
-    vwap = weighted_sum / sum(weights)
+    vwap = indicator_view(symbol, prices, ctx).wma(15)
     deviation = (price - vwap) / max(vwap, 1.0)
     if abs(deviation) < 0.002:
         return []
@@ -34,4 +34,18 @@ def generate(symbol: str, prices: Sequence[float], ctx: Dict[str, float]) -> lis
     ]
 
 
-register("vwap_reversion", generate)
+def generate_batch(batch: BatchInput) -> BatchSignals:
+    vwap = batch.feature("wma", 15)
+    deviation = (batch.last - vwap) / np.maximum(vwap, 1.0)
+    active = np.abs(deviation) >= 0.002
+    side = sides(active & (deviation < 0), active & (deviation >= 0))
+    return BatchSignals(
+        side=side,
+        score=np.minimum(np.abs(deviation) * 200, 5.0),
+        stop=batch.full(batch.param("sl_pct_default", 0.15)),
+        take=batch.full(batch.param("tp_pct_default", 0.30) * 0.9),
+        meta={"vwap": vwap, "deviation": deviation},
+    )
+
+
+register("vwap_reversion", generate, min_history=15, features=(Feature("wma", (15,)),), batch=generate_batch)
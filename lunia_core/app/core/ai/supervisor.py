@@ -1,54 +1,139 @@
 """Multi-strategy supervisor that fuses signals and applies capital caps."""
 from __future__ import annotations
 
+import copy
 import logging
-from collections import deque
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Deque, Dict, Iterable, List, Mapping, MutableMapping, Optional
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 from ..capital.allocator import AllocationResult, CapitalAllocator
-from ..metrics import signals_total, spot_risk_reject_total
+from ..metrics import (
+    signals_total,
+    spot_risk_reject_total,
+    spot_signal_cache_total,
+    spot_tick_signal_ms,
+)
 from ..portfolio.portfolio import Portfolio
 from ..risk.manager import RiskManager
-from ..state import get_state
-from .strategies import REGISTRY, StrategySignal
+from ..state import get_state, state_version
+from .batch import STATEFUL_KINDS, BatchInput, np, signal_sets
+from .indicators import IndicatorEngine
+from .price_history import PriceHistory
+from .runner import Profile, StrategyRunner
+from .features import FeatureView, StrategyContext
+from .strategies import REGISTRY, StrategySignal, StrategySpec, spec_for
 
 logger = logging.getLogger(__name__)
 
 LOG_PATH = Path(__file__).resolve().parents[4] / "logs" / "supervisor.log"
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Within this interval after a symbol's last tick, gather_signals reuses it
+# instead of polling the exchange, so repeated reads can hit the decision cache.
+PRICE_REFRESH_MS = float(os.getenv("SPOT_PRICE_REFRESH_MS", "1000"))
+PUSH_MODE = os.getenv("SPOT_PUSH_MODE", "false").lower() == "true"
+PRICES_CHANNEL = "prices"
+SIGNALS_CHANNEL = "signals"
+
 
 def _write_log(message: str) -> None:
     with LOG_PATH.open("a", encoding="utf-8") as fp:
         fp.write(message + "\n")
 
 
+class _ReferencePrices(Mapping[str, Sequence[float]]):
+    """Read-only ``symbol -> price window`` view resolved on access.
+
+    Built once per symbol and cycle, so it must not copy the cycle's symbol
+    set: construction is O(1) and only the windows a strategy reads are sliced.
+    """
+
+    __slots__ = ("_history", "_symbols", "_extra")
+
+    def __init__(self, history: PriceHistory, symbols: AbstractSet[str], extra: Iterable[str] = ()) -> None:
+        self._history = history
+        self._symbols = symbols
+        self._extra = [symbol for symbol in dict.fromkeys(extra) if symbol not in symbols]
+
+    def __getitem__(self, symbol: str) -> Sequence[float]:
+        if symbol not in self._symbols and symbol not in self._extra:
+            raise KeyError(symbol)
+        return self._history.window(symbol)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._symbols
+        yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self._symbols) + len(self._extra)
+
+
 @dataclass
 class Supervisor:
-    """Generate ranked trading signals across multiple strategies."""
+    """Generate ranked trading signals across multiple strategies.
+
+    Strategies that provide a ``batch`` implementation are evaluated once per
+    cycle over all ready symbols when NumPy is available (``batch_mode``);
+    the rest run per symbol.
+
+    Decisions are memoised per symbol set and context, keyed on the price
+    history, runtime state, strategy weights and equity they were derived
+    from; an unchanged repeat call returns a copy of the cached decision.
+
+    In push mode (:meth:`subscribe`, or a feed calling :meth:`on_tick`) each
+    tick updates history and indicators, re-evaluates only the ticked symbol
+    and the symbols whose strategies reference it, and publishes the
+    resulting signals on the ``signals`` channel.
+    """
 
     client: Optional["IExchange"] = None
     history_limit: int = 200
     risk: Optional[RiskManager] = None
     portfolio: Optional[Portfolio] = None
-    price_history: MutableMapping[str, Deque[float]] = field(
-        default_factory=lambda: {}
-    )
     ai_priorities: MutableMapping[str, float] = field(default_factory=dict)
+    indicators: IndicatorEngine = field(default_factory=IndicatorEngine)
+    batch_mode: bool = True
+    runner: StrategyRunner = field(default_factory=StrategyRunner, repr=False)
+    price_refresh_ms: float = PRICE_REFRESH_MS
+    memo_size: int = 64
+    time_fn: Callable[[], float] = field(default=time.time, repr=False)
+    bus: Optional[Any] = field(default=None, repr=False)
+    price_history: PriceHistory = field(init=False, repr=False)
+    _memo: "OrderedDict[Tuple[object, ...], Tuple[Tuple[object, ...], Dict[str, object]]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _memo_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # serialises history writes with evaluations: price windows are views of the ring buffer
+    _push_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _push_symbols: Optional[AbstractSet[str]] = field(default=None, init=False, repr=False)
+    _dependents_key: Tuple[object, ...] = field(default=(), init=False, repr=False)
+    _dependents_index: Dict[str, Dict[str, AbstractSet[str]]] = field(default_factory=dict, init=False, repr=False)
 
-    def _ensure_history(self, symbol: str) -> Deque[float]:
-        history = self.price_history.get(symbol)
-        if history is None:
-            history = deque(maxlen=self.history_limit)
-            self.price_history[symbol] = history
-        return history
+    def __post_init__(self) -> None:
+        self.price_history = PriceHistory(self.history_limit, time_fn=self.time_fn)
 
-    def update_price(self, symbol: str, price: float) -> None:
-        history = self._ensure_history(symbol)
-        history.append(price)
+    def update_price(self, symbol: str, price: float, ts: Optional[float] = None) -> None:
+        self.price_history.append(symbol, price, ts)
+        self.indicators.update(symbol, price)
 
     def _allocator_from_state(self, state: Mapping[str, object]) -> CapitalAllocator:
         spot_cfg = state.get("spot", {})
@@ -59,13 +144,20 @@ class Supervisor:
             max_positions=int(spot_cfg.get("max_positions", 5)),
         )
 
-    def _collect_prices(self, symbol: str) -> List[float]:
-        history = self.price_history.get(symbol)
-        return list(history) if history else []
+    def _collect_prices(self, symbol: str) -> Sequence[float]:
+        """Zero-copy view of the retained prices; valid until the next tick."""
+
+        return self.price_history.window(symbol)
 
     def _ai_weight(self, symbol: str) -> float:
         return max(0.1, float(self.ai_priorities.get(symbol, 1.0)))
 
+    def _equity(self, state: Mapping[str, object]) -> float:
+        equity = float(state.get("portfolio_equity", 10_000))
+        if self.portfolio is not None:
+            equity = self.portfolio.get_equity_usd({"USDT": equity})
+        return equity
+
     def _allocations(
         self,
         *,
@@ -77,9 +169,7 @@ class Supervisor:
         ops_cfg = state.get("ops", {})
         capital_cfg = ops_cfg.get("capital", {}) if isinstance(ops_cfg, Mapping) else {}
         cap_pct = float(capital_cfg.get("cap_pct", 0.25))
-        equity = float(state.get("portfolio_equity", 10_000))
-        if self.portfolio is not None:
-            equity = self.portfolio.get_equity_usd({"USDT": equity})
+        equity = self._equity(state)
         weights = spot_cfg.get("weights", {}) if isinstance(spot_cfg, Mapping) else {}
         return allocator.compute_budgets(
             equity=equity,
@@ -102,100 +192,412 @@ class Supervisor:
             return 0.0
         return notional / price
 
-    def gather_signals(
+    def _run_batch(
+        self,
+        spec: StrategySpec,
+        symbols: Sequence[str],
+        params: Mapping[str, object],
+        features_for: Callable[[str], FeatureView],
+    ) -> List[Tuple[str, StrategySignal]]:
+        stateful = {
+            feature: np.asarray([features_for(symbol).value(feature) for symbol in symbols], dtype=np.float64)
+            for feature in spec.features
+            if feature.kind in STATEFUL_KINDS
+        }
+        window = spec.batch_window
+        references = None
+        if spec.references is not None:
+            references = np.full((len(symbols), window), np.nan)
+            for row, symbol in enumerate(symbols):
+                for reference in spec.reference_symbols(symbol)[:1]:
+                    if self.price_history.count(reference) >= window:
+                        references[row] = self.price_history.matrix([reference], window)[0]
+        batch = BatchInput(list(symbols), self.price_history.matrix(symbols, window), params, stateful, references)
+        last = batch.last
+        outputs: List[Tuple[str, StrategySignal]] = []
+        for result in signal_sets(spec.batch(batch)):
+            for row in np.flatnonzero(result.side):
+                symbol = batch.symbols[row]
+                signal = StrategySignal(
+                    symbol=symbol,
+                    side="BUY" if result.side[row] > 0 else "SELL",
+                    score=float(result.score[row]),
+                    price=float(last[row]),
+                    stop_pct=float(result.stop[row]),
+                    take_pct=float(result.take[row]),
+                    strategy=result.strategy or spec.name,
+                    meta=result.meta_row(row),
+                )
+                outputs.append((symbol, signal))
+        return outputs
+
+    def _evaluate(
         self,
+        symbols: Sequence[str],
+        params: Mapping[str, object],
+        only: Optional[Mapping[str, AbstractSet[str]]] = None,
+    ) -> Tuple[List[Tuple[str, StrategySignal]], Dict[str, int], Profile]:
+        """Run every registered strategy over ``symbols`` within the runner's budgets.
+
+        ``only`` restricts the listed symbols to the named strategies; symbols
+        not in it run everything. Returns raw signals, warm-up counts and the
+        cycle's per-strategy profile.
+        """
+
+        params = dict(params, indicators=self.indicators)
+        specs = [spec_for(name) for name in list(REGISTRY)]
+        warming_up: Dict[str, int] = {}
+        cycle = self.runner.cycle()
+
+        history: Dict[str, Sequence[float]] = {}
+        for symbol in self.runner.prioritise(symbols):
+            prices = self._collect_prices(symbol)
+            if len(prices) > 0:
+                history[symbol] = prices
+
+        views: Dict[str, FeatureView] = {}
+
+        def features_for(symbol: str) -> FeatureView:
+            view = views.get(symbol)
+            if view is None:
+                view = views[symbol] = FeatureView(self.indicators, symbol, history[symbol], params)
+            return view
+
+        outputs: List[Tuple[str, StrategySignal]] = []
+        runnable: Dict[str, List[StrategySpec]] = {symbol: [] for symbol in history}
+        use_batch = self.batch_mode and np is not None
+        for spec in specs:
+            eligible = history
+            if only:
+                eligible = {s: p for s, p in history.items() if s not in only or spec.name in only[s]}
+            ready = [symbol for symbol, prices in eligible.items() if len(prices) >= spec.min_history]
+            if len(ready) < len(eligible):
+                warming_up[spec.name] = len(eligible) - len(ready)
+            if use_batch and spec.batch is not None:
+                window = spec.batch_window
+                vectorised = [symbol for symbol in ready if len(history[symbol]) >= window]
+                if vectorised:
+                    reason = cycle.blocked(spec.name)
+                    if reason:
+                        cycle.defer(spec.name, vectorised, reason)
+                    else:
+                        outputs.extend(
+                            cycle.call(spec.name, self._run_batch, spec, vectorised, params, features_for, mode="batch")
+                        )
+                    ready = [symbol for symbol in ready if len(history[symbol]) < window]
+            for symbol in ready:
+                runnable[symbol].append(spec)
+
+        cycle_symbols = frozenset(symbols)
+        for symbol, symbol_specs in runnable.items():
+            if not symbol_specs:
+                continue
+            features = features_for(symbol)
+            declared: List[str] = []
+            for spec in symbol_specs:
+                features.prepare(spec.features)
+                declared.extend(spec.reference_symbols(symbol))
+            ctx = StrategyContext(
+                symbol,
+                params,
+                features,
+                _ReferencePrices(self.price_history, cycle_symbols, declared),
+            )
+            for spec in symbol_specs:
+                reason = cycle.blocked(spec.name)
+                if reason:
+                    cycle.defer(spec.name, [symbol], reason)
+                    continue
+                signals = cycle.call(spec.name, spec.func, symbol, history[symbol], ctx)
+                outputs.extend((symbol, signal) for signal in signals)
+        return outputs, warming_up, cycle.finish()
+
+    def _score(
+        self,
+        outputs: Iterable[Tuple[str, StrategySignal]],
         *,
-        symbols: Optional[Iterable[str]] = None,
-        context: Optional[Mapping[str, float]] = None,
-    ) -> Dict[str, object]:
-        runtime = get_state()
+        weights: Mapping[str, float],
+        allocator: CapitalAllocator,
+        allocation: AllocationResult,
+    ) -> Tuple[List[Dict[str, object]], List[Dict[str, object]]]:
+        """Weight and size raw signals against the cycle's allocation."""
+
+        accepted: List[Dict[str, object]] = []
+        rejected: List[Dict[str, object]] = []
+        for symbol, signal in outputs:
+            base = self._strategy_base(signal.strategy, weights)
+            weight = float(weights.get(base, 0.0))
+            if weight <= 0:
+                rejected.append({"strategy": signal.strategy, "reason": "weight-zero"})
+                continue
+            priority = self._ai_weight(symbol)
+            combined_score = signal.score * weight * priority
+            notional_cap = allocation.per_strategy.get(base, 0.0)
+            risk_size = allocator.risk_size(
+                equity=allocation.tradable_equity,
+                stop_pct=max(signal.stop_pct, 0.0001),
+            )
+            notional = min(notional_cap, risk_size)
+            qty = self._compute_qty(notional, signal.price)
+            if qty <= 0:
+                rejected.append({"strategy": signal.strategy, "reason": "no-budget"})
+                continue
+            accepted.append(
+                {
+                    "symbol": symbol,
+                    "side": signal.side,
+                    "strategy": signal.strategy,
+                    "qty": qty,
+                    "price": signal.price,
+                    "notional_usd": notional,
+                    "score": combined_score,
+                    "stop_pct": signal.stop_pct,
+                    "take_pct": signal.take_pct,
+                }
+            )
+        return accepted, rejected
+
+    def _generate(
+        self,
+        symbols: Sequence[str],
+        params: Mapping[str, object],
+        **scoring: object,
+    ) -> Tuple[List[Dict[str, object]], List[Dict[str, object]], Dict[str, int], Profile]:
+        """Evaluate and score ``symbols``; the unit of work a shard runs."""
+
+        outputs, warming_up, profile = self._evaluate(symbols, params)
+        accepted, rejected = self._score(outputs, **scoring)
+        return accepted, rejected, warming_up, profile
+
+    def _refresh_prices(self, symbols: Sequence[str]) -> None:
+        now = self.time_fn()
+        fresh: Dict[str, float] = {}
+        for symbol in symbols:
+            last = self.price_history.last_timestamp(symbol)
+            if last is not None and (now - last) * 1000 < self.price_refresh_ms:
+                continue
+            try:
+                fresh[symbol] = self.client.get_price(symbol)
+            except Exception as exc:  # pragma: no cover - network errors
+                logger.warning("Failed to refresh price for %s: %s", symbol, exc)
+        # fetched outside the lock so pushed ticks do not wait on the network
+        with self._push_lock:
+            for symbol, price in fresh.items():
+                self.update_price(symbol, price)
+
+    def _memo_versions(self, symbols: Sequence[str], state: Mapping[str, object]) -> Tuple[object, ...]:
+        """Everything a decision depends on besides the request itself."""
+
+        watched = dict.fromkeys(symbols)
+        for name in list(REGISTRY):
+            spec = spec_for(name)
+            if spec.references is not None:
+                for symbol in symbols:
+                    watched.update(dict.fromkeys(spec.reference_symbols(symbol)))
+        return (
+            tuple(self.price_history.version(symbol) for symbol in watched),
+            state_version(),
+            tuple(REGISTRY.items()),
+            tuple(self.ai_priorities.items()),
+            self._equity(state),
+        )
+
+    def warmup_status(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, object]]:
+        """Retained samples per symbol and, per strategy, how many more it needs."""
+
+        specs = [spec_for(name) for name in list(REGISTRY)]
+        status: Dict[str, Dict[str, object]] = {}
+        for symbol in self.price_history.symbols() if symbols is None else symbols:
+            samples = self.price_history.count(symbol)
+            waiting = {spec.name: spec.min_history - samples for spec in specs if samples < spec.min_history}
+            status[symbol] = {"samples": samples, "ready": not waiting, "waiting": waiting}
+        return status
+
+    def invalidate(self) -> None:
+        """Drop memoised decisions, e.g. after changing strategy code paths."""
+
+        with self._memo_lock:
+            self._memo.clear()
+
+    def _halted(self, runtime: Mapping[str, object]) -> Optional[Dict[str, object]]:
         if runtime.get("global_stop") or not runtime.get("trading_on", True):
             logger.info("Supervisor halted by runtime state")
             return {"enable": {"SPOT": 0}, "signals": [], "meta": {"reason": "halted"}}
         spot_cfg = runtime.get("spot", {})
         if not spot_cfg.get("enabled", True):
             return {"enable": {"SPOT": 0}, "signals": [], "meta": {"reason": "spot-disabled"}}
+        return None
 
-        symbols = list(symbols or [runtime.get("default_pair", "BTCUSDT") or "BTCUSDT"])
+    def _decide(
+        self,
+        symbols: Sequence[str],
+        runtime: Mapping[str, object],
+        context: Optional[Mapping[str, float]] = None,
+        only: Optional[Mapping[str, AbstractSet[str]]] = None,
+    ) -> Dict[str, object]:
+        """Evaluate, size and rank signals for ``symbols`` into a decision."""
+
+        spot_cfg = runtime.get("spot", {})
         allocator = self._allocator_from_state(runtime)
         allocation = self._allocations(allocator=allocator, state=runtime)
 
-        ctx_extra: Dict[str, float] = dict(context or {})
-        ctx_extra.setdefault("sl_pct_default", spot_cfg.get("sl_pct_default", 0.15))
-        ctx_extra.setdefault("tp_pct_default", spot_cfg.get("tp_pct_default", 0.30))
-
-        reference_map = {
-            sym: self._collect_prices(sym)
-            for sym in symbols
-        }
-        ctx_extra["reference_prices"] = reference_map
-
-        accepted: List[Dict[str, object]] = []
-        rejected: List[Dict[str, object]] = []
+        # cycle-wide parameters, fixed before any strategy runs
+        params: Dict[str, object] = dict(context or {})
+        params.setdefault("sl_pct_default", spot_cfg.get("sl_pct_default", 0.15))
+        params.setdefault("tp_pct_default", spot_cfg.get("tp_pct_default", 0.30))
+        params.setdefault("orderbook_depth_ratio", 0.5)
+        params.setdefault("volatility", 0.01)
 
         weight_map = spot_cfg.get("weights", {}) if isinstance(spot_cfg, Mapping) else {}
+        scoring = {"weights": weight_map, "allocator": allocator, "allocation": allocation}
 
-        for symbol in symbols:
-            try:
-                if self.client is not None:
-                    latest = self.client.get_price(symbol)
-                    self.update_price(symbol, latest)
-            except Exception as exc:  # pragma: no cover - network errors
-                logger.warning("Failed to refresh price for %s: %s", symbol, exc)
-            prices = self._collect_prices(symbol)
-            if not prices:
-                continue
-            for name, strategy in REGISTRY.items():
-                ctx_extra.setdefault("orderbook_depth_ratio", context.get("orderbook_depth_ratio", 0.5) if context else 0.5)
-                ctx_extra.setdefault("volatility", context.get("volatility", 0.01) if context else 0.01)
-                outputs = strategy(symbol, prices, ctx_extra)
-                for signal in outputs:
-                    base = self._strategy_base(signal.strategy, weight_map)
-                    weight = float(weight_map.get(base, 0.0))
-                    if weight <= 0:
-                        rejected.append({"strategy": signal.strategy, "reason": "weight-zero"})
-                        continue
-                    priority = self._ai_weight(symbol)
-                    combined_score = signal.score * weight * priority
-                    notional_cap = allocation.per_strategy.get(base, 0.0)
-                    risk_size = allocator.risk_size(
-                        equity=allocation.tradable_equity,
-                        stop_pct=max(signal.stop_pct, 0.0001),
-                    )
-                    notional = min(notional_cap, risk_size)
-                    qty = self._compute_qty(notional, signal.price)
-                    if qty <= 0:
-                        rejected.append({"strategy": signal.strategy, "reason": "no-budget"})
-                        continue
-                    signals_total.labels(symbol=symbol, side=signal.side).inc()
-                    accepted.append(
-                        {
-                            "symbol": symbol,
-                            "side": signal.side,
-                            "strategy": signal.strategy,
-                            "qty": qty,
-                            "price": signal.price,
-                            "notional_usd": notional,
-                            "score": combined_score,
-                            "stop_pct": signal.stop_pct,
-                            "take_pct": signal.take_pct,
-                        }
-                    )
+        if only:
+            # partial re-evaluation always runs in-process
+            outputs, warming_up, profile = self._evaluate(symbols, params, only)
+            accepted, rejected = self._score(outputs, **scoring)
+        else:
+            accepted, rejected, warming_up, profile = self._generate(symbols, params, **scoring)
+        for (symbol, side), count in Counter((item["symbol"], item["side"]) for item in accepted).items():
+            signals_total.labels(symbol=symbol, side=side).inc(count)
 
         accepted.sort(key=lambda item: item.get("score", 0.0), reverse=True)
-        timestamp = datetime.utcnow().isoformat()
-        _write_log(f"{timestamp} signals={len(accepted)} rejected={len(rejected)}")
-        for entry in rejected:
-            spot_risk_reject_total.labels(reason=entry.get("reason", "unknown")).inc()
+        for reason, count in Counter(entry.get("reason", "unknown") for entry in rejected).items():
+            spot_risk_reject_total.labels(reason=reason).inc(count)
         return {
             "enable": {"SPOT": 1},
             "signals": accepted,
             "meta": {
                 "rejected": rejected,
+                "warming_up": warming_up,
+                "deferred": {name: int(entry["deferred"]) for name, entry in profile.items() if entry["deferred"]},
+                "strategy_errors": {name: int(entry["errors"]) for name, entry in profile.items() if entry["errors"]},
                 "allocation": allocation.per_strategy,
                 "tradable_equity": allocation.tradable_equity,
             },
         }
 
+    def gather_signals(
+        self,
+        *,
+        symbols: Optional[Iterable[str]] = None,
+        context: Optional[Mapping[str, float]] = None,
+    ) -> Dict[str, object]:
+        runtime = get_state()
+        halted = self._halted(runtime)
+        if halted is not None:
+            return halted
+
+        symbols = list(symbols or [runtime.get("default_pair", "BTCUSDT") or "BTCUSDT"])
+        if self.client is not None:
+            self._refresh_prices(symbols)
+
+        try:
+            request_key: Optional[Tuple[object, ...]] = (tuple(symbols), tuple(sorted((context or {}).items())))
+            hash(request_key)
+        except TypeError:
+            request_key = None
+        versions = self._memo_versions(symbols, runtime) if request_key is not None else ()
+        if request_key is not None:
+            with self._memo_lock:
+                cached = self._memo.get(request_key)
+                if cached is not None and cached[0] == versions:
+                    self._memo.move_to_end(request_key)
+                    spot_signal_cache_total.labels(result="hit").inc()
+                    return copy.deepcopy(cached[1])
+            spot_signal_cache_total.labels(result="miss").inc()
+
+        with self._push_lock:
+            decision = self._decide(symbols, runtime, context)
+        meta = decision["meta"]
+        _write_log(f"{datetime.utcnow().isoformat()} signals={len(decision['signals'])} rejected={len(meta['rejected'])}")
+        # a budget-truncated cycle must be re-run, not replayed
+        if request_key is not None and not meta["deferred"]:
+            with self._memo_lock:
+                self._memo[request_key] = (versions, copy.deepcopy(decision))
+                self._memo.move_to_end(request_key)
+                while len(self._memo) > max(0, self.memo_size):
+                    self._memo.popitem(last=False)
+        return decision
+
     def get_signals(self, symbol: str = "BTCUSDT") -> Dict[str, object]:
         return self.gather_signals(symbols=[symbol])
+
+    # Push mode -----------------------------------------------------------------
+    def subscribe(
+        self,
+        bus: Optional[Any] = None,
+        *,
+        channel: str = PRICES_CHANNEL,
+        symbols: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Consume ``{"symbol", "price", "ts"?}`` ticks from ``channel``.
+
+        Signals are published on ``bus`` (the one subscribed to by default).
+        With ``symbols`` only those are evaluated; other ticks still update
+        history so they remain available as references.
+        """
+
+        if bus is not None:
+            self.bus = bus
+        if self.bus is None:
+            raise ValueError("push mode needs a bus")
+        self._push_symbols = frozenset(symbols) if symbols is not None else None
+        self.bus.subscribe(channel, self.on_tick)
+
+    def on_tick(self, message: Mapping[str, object]) -> None:
+        """Bus handler for one price tick; malformed ticks are logged and dropped."""
+
+        try:
+            symbol = str(message["symbol"])
+            price = float(message["price"])
+            ts = message.get("ts")
+            ts = None if ts is None else float(ts)
+        except (KeyError, TypeError, ValueError) as exc:
+            logger.warning("Ignoring malformed tick %s: %s", message, exc)
+            return
+        self.push_price(symbol, price, ts)
+
+    def push_price(self, symbol: str, price: float, ts: Optional[float] = None) -> Dict[str, object]:
+        """Record a tick, re-evaluate what depends on it and publish the signals."""
+
+        started = time.perf_counter()
+        with self._push_lock:
+            self.update_price(symbol, price, ts)
+            runtime = get_state()
+            decision = self._halted(runtime)
+            if decision is None:
+                dependents = self._dependents(symbol)
+                if self._push_symbols is not None:
+                    dependents = {s: names for s, names in dependents.items() if s in self._push_symbols}
+                targets = [symbol] if self._push_symbols is None or symbol in self._push_symbols else []
+                targets.extend(dependents)
+                if targets:
+                    decision = self._decide(targets, runtime, only=dependents)
+                else:
+                    decision = {"enable": {"SPOT": 1}, "signals": [], "meta": {"reason": "not-watched"}}
+        if self.bus is not None:
+            for signal in decision["signals"]:
+                try:
+                    self.bus.publish(SIGNALS_CHANNEL, signal)
+                except Exception as exc:  # pragma: no cover - bus errors
+                    logger.warning("Failed to publish signal: %s", exc)
+        spot_tick_signal_ms.observe((time.perf_counter() - started) * 1000)
+        return decision
+
+    def _dependents(self, symbol: str) -> Dict[str, AbstractSet[str]]:
+        """Other known symbols whose strategies read ``symbol``, with those strategies."""
+
+        key = (tuple(REGISTRY.items()), len(self.price_history))
+        if key != self._dependents_key:
+            index: Dict[str, Dict[str, set]] = {}
+            referencing = [spec for spec in map(spec_for, list(REGISTRY)) if spec.references is not None]
+            for other in self.price_history.symbols():
+                for spec in referencing:
+                    for reference in spec.reference_symbols(other):
+                        if reference != other:
+                            index.setdefault(reference, {}).setdefault(other, set()).add(spec.name)
+            self._dependents_index = {
+                ref: {other: frozenset(names) for other, names in deps.items()} for ref, deps in index.items()
+            }
+            self._dependents_key = key
+        return dict(self._dependents_index.get(symbol, {}))
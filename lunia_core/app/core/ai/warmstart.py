@@ -0,0 +1,253 @@
+"""Warm-start snapshots of the Supervisor's price history and indicator state.
+
+Strategies need up to ``min_history`` ticks per symbol before they trade,
+so without a snapshot every restart leaves them idle while history
+refills. :class:`WarmStart` writes the retained prices, their timestamps
+and the incremental indicator state to one file every ``interval_sec``
+seconds and on shutdown, and :meth:`WarmStart.restore` loads it back before
+the first tick::
+
+    <magic><table length><body length><crc32><zlib(table json + float64 arrays)>
+
+The table lists each symbol with its sample count and indicator state; the
+arrays follow in the same order, prices then timestamps. A file with a bad
+magic, checksum or layout is ignored as a whole; a symbol whose last tick
+is older than ``max_age_sec`` is dropped, as is indicator state that does
+not end on the symbol's last restored price (it is re-seeded from history
+instead). Snapshots are written to a temporary file and renamed, so a
+crash mid-write keeps the previous one.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.compat.dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+WARMSTART_PATH = Path(
+    os.getenv("SPOT_WARMSTART_PATH") or Path(__file__).resolve().parents[3] / "data" / "warmstart" / "supervisor.lws"
+)
+WARMSTART_INTERVAL_SEC = float(os.getenv("SPOT_WARMSTART_INTERVAL_SEC", "60"))
+WARMSTART_MAX_AGE_SEC = float(os.getenv("SPOT_WARMSTART_MAX_AGE_SEC", "900"))
+
+_MAGIC = b"LWS1"
+_HEADER = struct.Struct("<4sIII")
+
+
+def encode_snapshot(supervisor: Any, *, now: Optional[float] = None) -> bytes:
+    """Serialise ``supervisor``'s price history and indicator state."""
+
+    history = supervisor.price_history.snapshot()
+    indicators = supervisor.indicators.snapshot()
+    symbols: List[Dict[str, Any]] = []
+    arrays: List[bytes] = []
+    for symbol, (prices, stamps) in history.items():
+        if not prices:
+            continue
+        entry: Dict[str, Any] = {"symbol": symbol, "count": len(prices)}
+        if symbol in indicators:
+            entry["indicators"] = indicators[symbol]
+        symbols.append(entry)
+        arrays.append(prices.tobytes())
+        arrays.append(stamps.tobytes())
+    table = json.dumps(
+        {
+            "saved_at": time.time() if now is None else now,
+            "capacity": supervisor.price_history.capacity,
+            "byteorder": sys.byteorder,
+            "symbols": symbols,
+        },
+        separators=(",", ":"),
+    ).encode()
+    body = zlib.compress(table + b"".join(arrays), 1)
+    return _HEADER.pack(_MAGIC, len(table), len(body), zlib.crc32(body)) + body
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    """Inverse of :func:`encode_snapshot`; raises ``ValueError`` on a damaged file.
+
+    Returns the table with ``prices`` and ``stamps`` arrays added to each
+    symbol entry.
+    """
+
+    if len(data) < _HEADER.size:
+        raise ValueError("snapshot truncated")
+    magic, table_len, body_len, checksum = _HEADER.unpack_from(data)
+    body = data[_HEADER.size :]
+    if magic != _MAGIC:
+        raise ValueError(f"not a warm-start snapshot (magic {magic!r})")
+    if len(body) != body_len or zlib.crc32(body) != checksum:
+        raise ValueError("snapshot checksum mismatch")
+    try:
+        raw = zlib.decompress(body)
+    except zlib.error as exc:
+        raise ValueError(f"snapshot body corrupt: {exc}") from None
+    table = json.loads(raw[:table_len])
+    offset = table_len
+    for entry in table["symbols"]:
+        size = int(entry["count"]) * 8
+        prices, stamps = array("d"), array("d")
+        prices.frombytes(raw[offset : offset + size])
+        stamps.frombytes(raw[offset + size : offset + 2 * size])
+        offset += 2 * size
+        if len(stamps) != int(entry["count"]):
+            raise ValueError(f"snapshot truncated at {entry['symbol']}")
+        if table.get("byteorder", sys.byteorder) != sys.byteorder:
+            prices.byteswap()
+            stamps.byteswap()
+        entry["prices"], entry["stamps"] = prices, stamps
+    if offset != len(raw):
+        raise ValueError("snapshot has trailing data")
+    return table
+
+
+def _valid_series(prices: array, stamps: array) -> bool:
+    if not all(math.isfinite(p) and p > 0 for p in prices):
+        return False
+    return all(math.isfinite(t) for t in stamps) and all(a <= b for a, b in zip(stamps, stamps[1:]))
+
+
+def apply_snapshot(
+    supervisor: Any,
+    table: Dict[str, Any],
+    *,
+    max_age_sec: float = WARMSTART_MAX_AGE_SEC,
+    now: Optional[float] = None,
+) -> Dict[str, int]:
+    """Load a decoded snapshot into ``supervisor``; returns restored samples per symbol.
+
+    Symbols the supervisor already holds ticks for are left alone.
+    """
+
+    now = time.time() if now is None else now
+    restored: Dict[str, int] = {}
+    for entry in table.get("symbols", []):
+        symbol, prices, stamps = entry["symbol"], entry["prices"], entry["stamps"]
+        if supervisor.price_history.count(symbol):
+            continue
+        if not prices or now - stamps[-1] > max_age_sec:
+            logger.info("Warm start: dropping stale history for %s", symbol)
+            continue
+        if not _valid_series(prices, stamps):
+            logger.warning("Warm start: dropping invalid history for %s", symbol)
+            continue
+        supervisor.price_history.load(symbol, prices, stamps)
+        kept = supervisor.price_history.count(symbol)
+        state = entry.get("indicators")
+        if state and state.get("last") == prices[-1] and int(state.get("ticks", 0)) >= kept:
+            try:
+                supervisor.indicators.restore(symbol, state)
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.warning("Warm start: re-seeding indicators for %s: %s", symbol, exc)
+                supervisor.indicators.reset(symbol)
+        restored[symbol] = kept
+    supervisor.invalidate()
+    return restored
+
+
+class WarmStart:
+    """Periodically snapshot a Supervisor and restore it on startup."""
+
+    def __init__(
+        self,
+        supervisor: Any,
+        path: Optional[Path] = None,
+        *,
+        interval_sec: float = WARMSTART_INTERVAL_SEC,
+        max_age_sec: float = WARMSTART_MAX_AGE_SEC,
+    ) -> None:
+        self.supervisor = supervisor
+        self.path = Path(path) if path is not None else WARMSTART_PATH
+        self.interval_sec = max(1.0, float(interval_sec))
+        self.max_age_sec = float(max_age_sec)
+        self.restored: Dict[str, int] = {}
+        self.saved_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def restore(self, *, now: Optional[float] = None) -> Dict[str, int]:
+        """Load the snapshot file, if there is a usable one."""
+
+        try:
+            table = decode_snapshot(self.path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            logger.warning("Ignoring warm-start snapshot %s: %s", self.path, exc)
+            return {}
+        self.restored = apply_snapshot(self.supervisor, table, max_age_sec=self.max_age_sec, now=now)
+        logger.info("Warm start restored %d symbols from %s", len(self.restored), self.path)
+        return self.restored
+
+    def save(self) -> int:
+        """Write a snapshot now; returns its size in bytes."""
+
+        data = encode_snapshot(self.supervisor)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self.path)
+        self.saved_at = time.time()
+        return len(data)
+
+    def start(self) -> "WarmStart":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="warm-start", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:  # pragma: no cover - background thread
+        while not self._stop.wait(self.interval_sec):
+            try:
+                self.save()
+            except Exception as exc:
+                logger.warning("Warm-start snapshot failed: %s", exc)
+
+    def close(self) -> None:
+        """Stop the snapshot thread and write a final snapshot."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.save()
+        except Exception as exc:  # pragma: no cover - disk errors at shutdown
+            logger.warning("Final warm-start snapshot failed: %s", exc)
+
+
+def attach_warm_start(supervisor: Any) -> Optional[WarmStart]:
+    """Restore ``supervisor`` and keep snapshotting it, or ``None`` when disabled."""
+
+    if os.getenv("SPOT_WARMSTART_ENABLED", "false").lower() != "true":
+        return None
+    warm = WarmStart(supervisor)
+    warm.restore()
+    atexit.register(warm.close)
+    return warm.start()
+
+
+__all__ = [
+    "WARMSTART_PATH",
+    "WarmStart",
+    "apply_snapshot",
+    "attach_warm_start",
+    "decode_snapshot",
+    "encode_snapshot",
+]
@@ -13,6 +13,7 @@ from ..exchange.base import IExchange
 from ..exchange.binance_spot import BinanceSpot
 from ..exchange.bybit_spot import BybitSpot
 from ..exchange.okx_spot import OKXSpot
+from ..marketdata.recorder import instrument
 from ..metrics import (
     arbitrage_avg_spread_pct,
     arbitrage_opportunities_total,
@@ -198,14 +199,17 @@ class ArbitrageEngine:
         api_key = os.getenv("BINANCE_API_KEY")
         api_secret = os.getenv("BINANCE_API_SECRET")
         return {
-            "binance": BinanceSpot(
-                api_key=api_key,
-                api_secret=api_secret,
-                use_testnet=use_testnet,
-                mock=not use_testnet,
+            "binance": instrument(
+                BinanceSpot(
+                    api_key=api_key,
+                    api_secret=api_secret,
+                    use_testnet=use_testnet,
+                    mock=not use_testnet,
+                ),
+                "binance",
             ),
-            "okx": OKXSpot(),
-            "bybit": BybitSpot(),
+            "okx": instrument(OKXSpot(), "okx"),
+            "bybit": instrument(BybitSpot(), "bybit"),
         }
 
     def _get_price(self, exchange: str, symbol: str) -> Optional[float]:
@@ -12,6 +12,7 @@ from typing import Dict, Optional
 from app.compat.requests import requests
 
 from .base import IExchange
+from .klines import Klines, interval_seconds, paginate, synthetic_klines
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,11 @@ class BinanceFutures(IExchange):
     use_testnet: bool = True
     mock: bool = False
     session: requests.Session = field(default_factory=requests.Session)
+    # mock as configured; ``mock`` itself also flips on after a failed request
+    _configured_mock: bool = field(default=False, init=False, repr=False)
+
+    kline_limit = 1000  # bars per klines request
+    kline_weight = 5  # request weight of one such request
 
     def __post_init__(self) -> None:
         self.base_url = "https://testnet.binancefuture.com"
@@ -49,6 +55,7 @@ class BinanceFutures(IExchange):
             logger.info("BinanceFutures forced into mock mode")
         else:
             logger.info("BinanceFutures initialized for testnet API calls")
+        self._configured_mock = self.mock
 
     # Helpers -----------------------------------------------------------------
     def _build_headers(self) -> Dict[str, str]:
@@ -95,8 +102,10 @@ class BinanceFutures(IExchange):
         path: str,
         params: Optional[Dict[str, object]] = None,
         signed: bool = False,
+        live: bool = False,
     ) -> Dict[str, object]:
-        if self.mock:
+        # live requests go out even after a failure switched the client to mock
+        if self.mock and not live:
             raise BinanceFuturesError("mock-mode")
         if signed and (not self.api_key or not self.api_secret):
             raise BinanceFuturesError("credentials-missing")
@@ -157,6 +166,44 @@ class BinanceFutures(IExchange):
             self.mock = True
             return self._mock_price(symbol)
 
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        *,
+        limit: Optional[int] = None,
+    ) -> Klines:
+        """OHLCV bars opening in ``[start, end)`` (epoch seconds), oldest first.
+
+        ``limit`` caps the bars per request (at most :attr:`kline_limit`);
+        without ``start`` the latest ``limit`` bars are returned. Synthetic
+        bars are served only to clients configured for mock mode; unlike
+        prices, bars never fall back to mock data on errors, even after an
+        earlier failure switched the client to mock, so a backfill cannot
+        store invented history.
+        """
+
+        step = interval_seconds(interval)
+        limit = max(1, min(int(limit or self.kline_limit), self.kline_limit))
+        end = time.time() if end is None else float(end)
+        start = end - limit * step if start is None else float(start)
+        if self._configured_mock:
+            return synthetic_klines(symbol, interval, start, end, price=MOCK_PRICES.get(symbol.upper(), 1.0))
+
+        def fetch(cursor: float, stop: float, count: int):
+            params = {
+                "symbol": symbol.upper(),
+                "interval": interval,
+                "startTime": int(cursor * 1000),
+                "endTime": int(stop * 1000) - 1,
+                "limit": count,
+            }
+            return self._request("GET", "/fapi/v1/klines", params, live=True)
+
+        return paginate(fetch, start, end, step, limit)
+
     def set_leverage(self, symbol: str, leverage: int) -> Dict[str, object]:
         logger.info("Setting leverage=%s for %s", leverage, symbol)
         if self.mock:
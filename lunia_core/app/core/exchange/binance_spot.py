@@ -12,9 +12,13 @@ from typing import Dict, Optional
 from app.compat.requests import requests
 
 from .base import IExchange
+from .klines import Klines, interval_seconds, paginate, synthetic_klines
 
 logger = logging.getLogger(__name__)
 
+PRODUCTION_URL = "https://api.binance.com"
+TESTNET_URL = "https://testnet.binance.vision"
+
 MOCK_PRICES: Dict[str, float] = {
     "BTCUSDT": 30000.0,
     "ETHUSDT": 2000.0,
@@ -35,12 +39,23 @@ class BinanceSpot(IExchange):
     use_testnet: bool = False
     mock: bool = True
     session: requests.Session = field(default_factory=requests.Session)
+    # unsigned market data (klines, prices) from the production API; needs no
+    # credentials, and testnet bars are not market history
+    public: bool = False
+    # mock as configured; ``mock`` itself also flips on after a failed request
+    _configured_mock: bool = field(default=False, init=False, repr=False)
+
+    kline_limit = 1000  # bars per klines request
+    kline_weight = 2  # request weight of one such request
 
     def __post_init__(self) -> None:
-        self.base_url = "https://testnet.binance.vision"
+        self.base_url = PRODUCTION_URL if self.public else TESTNET_URL
         self.timeout = 10
         self.retries = 3
-        if not self.use_testnet:
+        if self.public:
+            self.mock = False
+            logger.info("BinanceSpot initialized for public production market data")
+        elif not self.use_testnet:
             self.mock = True
             logger.info("BinanceSpot testnet disabled; using mock mode")
         elif not self.api_key or not self.api_secret:
@@ -50,6 +65,7 @@ class BinanceSpot(IExchange):
             logger.info("BinanceSpot forced into mock mode")
         else:
             logger.info("BinanceSpot initialized for testnet API calls")
+        self._configured_mock = self.mock
 
     # Utilities
     def _build_headers(self) -> Dict[str, str]:
@@ -97,8 +113,10 @@ class BinanceSpot(IExchange):
         path: str,
         params: Optional[Dict[str, object]] = None,
         signed: bool = False,
+        live: bool = False,
     ) -> Dict[str, object]:
-        if self.mock:
+        # live requests go out even after a failure switched the client to mock
+        if self.mock and not live:
             raise BinanceSpotError("mock-mode")
         if signed and (not self.api_key or not self.api_secret):
             raise BinanceSpotError("credentials-missing")
@@ -163,6 +181,58 @@ class BinanceSpot(IExchange):
             self.mock = True
             return self._mock_price(symbol)
 
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        *,
+        limit: Optional[int] = None,
+    ) -> Klines:
+        """OHLCV bars opening in ``[start, end)`` (epoch seconds), oldest first.
+
+        ``limit`` caps the bars per request (at most :attr:`kline_limit`);
+        without ``start`` the latest ``limit`` bars are returned. Synthetic
+        bars are served only to clients configured for mock mode; unlike
+        prices, bars never fall back to mock data on errors, even after an
+        earlier failure switched the client to mock, so a backfill cannot
+        store invented history.
+        """
+
+        step = interval_seconds(interval)
+        limit = max(1, min(int(limit or self.kline_limit), self.kline_limit))
+        end = time.time() if end is None else float(end)
+        start = end - limit * step if start is None else float(start)
+        if self._configured_mock:
+            return synthetic_klines(symbol, interval, start, end, price=MOCK_PRICES.get(symbol.upper(), 1.0))
+
+        def fetch(cursor: float, stop: float, count: int):
+            params = {
+                "symbol": symbol.upper(),
+                "interval": interval,
+                "startTime": int(cursor * 1000),
+                "endTime": int(stop * 1000) - 1,
+                "limit": count,
+            }
+            return self._request("GET", "/api/v3/klines", params, live=True)
+
+        return paginate(fetch, start, end, step, limit)
+
+    def get_book_ticker(self, symbol: str) -> Dict[str, object]:
+        """Best bid/ask with sizes (``bidPrice``, ``bidQty``, ``askPrice``, ``askQty``)."""
+
+        if not self.mock:
+            try:
+                return self._request("GET", "/api/v3/ticker/bookTicker", {"symbol": symbol.upper()})
+            except BinanceSpotError as exc:  # pragma: no cover - network issues
+                logger.warning("Book ticker request failed (%s); falling back to mock", exc)
+                self.mock = True
+        price = self._mock_price(symbol)
+        return self._mock_response(
+            {"symbol": symbol.upper(), "bidPrice": price, "bidQty": 0.0, "askPrice": price, "askQty": 0.0}
+        )
+
     def place_order(
         self,
         symbol: str,
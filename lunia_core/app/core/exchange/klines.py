@@ -0,0 +1,135 @@
+"""Shared kline (OHLCV bar) helpers for the exchange clients.
+
+Clients return bars as columns, ``{"ts", "open", "high", "low", "close",
+"volume"}`` with ``ts`` the bar's open time in epoch seconds, which is the
+layout the :class:`MarketDataStore` appends. :func:`paginate` walks a range
+in pages of at most ``limit`` bars for clients whose API caps the page
+size, and :func:`synthetic_klines` serves mock clients: each bar is a pure
+function of the symbol and its open time, so pages of any size line up and
+a refetch returns identical bars.
+"""
+from __future__ import annotations
+
+import math
+import zlib
+from typing import Callable, Dict, List, Sequence
+
+KLINE_COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+
+INTERVALS: Dict[str, int] = {
+    "1m": 60,
+    "3m": 180,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1_800,
+    "1h": 3_600,
+    "2h": 7_200,
+    "4h": 14_400,
+    "6h": 21_600,
+    "8h": 28_800,
+    "12h": 43_200,
+    "1d": 86_400,
+}
+
+Klines = Dict[str, List[float]]
+PageFetcher = Callable[[float, float, int], Sequence[Sequence[object]]]
+
+_MASK = (1 << 64) - 1
+_TAU = 2 * math.pi
+
+
+def interval_seconds(interval: str) -> int:
+    try:
+        return INTERVALS[interval]
+    except KeyError:
+        raise ValueError(f"unsupported kline interval {interval!r}") from None
+
+
+def empty_klines() -> Klines:
+    return {name: [] for name in KLINE_COLUMNS}
+
+
+def parse_rows(rows: Sequence[Sequence[object]], out: Klines, end: float) -> int:
+    """Append Binance-style ``[open_ms, open, high, low, close, volume, ...]`` rows before ``end``."""
+
+    added = 0
+    for row in rows:
+        ts = int(row[0]) / 1000
+        if ts >= end:
+            break
+        out["ts"].append(ts)
+        for name, value in zip(KLINE_COLUMNS[1:], row[1:6]):
+            out[name].append(float(value))
+        added += 1
+    return added
+
+
+def paginate(fetch: PageFetcher, start: float, end: float, step: int, limit: int) -> Klines:
+    """Collect bars opening in ``[start, end)`` from ``fetch(start, end, limit)`` pages."""
+
+    out = empty_klines()
+    cursor = start
+    while cursor < end:
+        rows = fetch(cursor, end, limit)
+        if not rows or not parse_rows(rows, out, end):
+            break
+        if len(rows) < limit:
+            break
+        cursor = out["ts"][-1] + step
+    return out
+
+
+def _hash(seed: int, index: int) -> int:
+    """splitmix64 of ``(seed, index)``."""
+
+    z = (seed * 0x9E3779B97F4A7C15 + index * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def synthetic_klines(symbol: str, interval: str, start: float, end: float, *, price: float = 100.0) -> Klines:
+    """Deterministic bars around ``price`` for mock clients and simulations.
+
+    The path is a sum of daily, hourly and five-minute cycles with a
+    per-symbol phase, so consecutive bars join up (each open is the previous
+    close); wicks and volume come from a hash of the bar's index.
+    """
+
+    step = interval_seconds(interval)
+    seed = zlib.crc32(symbol.upper().encode())
+    p1, p2, p3 = ((seed >> shift & 0xFF) / 256 * _TAU for shift in (0, 8, 16))
+    sin, exp = math.sin, math.exp
+
+    def level(t: float) -> float:
+        return price * exp(
+            0.02 * sin(_TAU * t / 86_400 + p1) + 0.005 * sin(_TAU * t / 3_600 + p2) + 0.001 * sin(_TAU * t / 300 + p3)
+        )
+
+    out = empty_klines()
+    ts_col, open_col, high_col, low_col, close_col, volume_col = (out[name] for name in KLINE_COLUMNS)
+    first = math.ceil(start / step)
+    close = level(first * step)
+    for index in range(first, math.ceil(end / step)):
+        ts = index * step
+        open_, close = close, level(ts + step)
+        bits = _hash(seed, index)
+        ts_col.append(float(ts))
+        open_col.append(open_)
+        high_col.append(max(open_, close) * (1 + 0.001 * (bits & 0xFFFFF) / 0x100000))
+        low_col.append(min(open_, close) * (1 - 0.001 * (bits >> 20 & 0xFFFFF) / 0x100000))
+        close_col.append(close)
+        volume_col.append(10.0 + 90.0 * (bits >> 40) / 0x1000000)
+    return out
+
+
+__all__ = [
+    "INTERVALS",
+    "KLINE_COLUMNS",
+    "Klines",
+    "empty_klines",
+    "interval_seconds",
+    "paginate",
+    "parse_rows",
+    "synthetic_klines",
+]
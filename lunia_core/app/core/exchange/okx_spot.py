@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Dict, Optional
 
 from .base import IExchange
+from .klines import Klines, interval_seconds, synthetic_klines
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,10 @@ logger = logging.getLogger(__name__)
 class OKXSpot(IExchange):
     """Lightweight OKX spot client providing deterministic mock prices."""
 
+    mock = True  # every answer is invented; never recorded as market data
+    kline_limit = 1000
+    kline_weight = 0  # served locally
+
     def __init__(self, price_map: Optional[Dict[str, float]] = None) -> None:
         self.price_map = price_map or {
             "BTCUSDT": 60050.0,
@@ -23,6 +29,22 @@ class OKXSpot(IExchange):
         logger.debug("OKX mock price for %s: %.2f", symbol, price)
         return price
 
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        *,
+        limit: Optional[int] = None,
+    ) -> Klines:
+        """Synthetic bars around the mock price; see :func:`synthetic_klines`."""
+
+        step = interval_seconds(interval)
+        end = time.time() if end is None else float(end)
+        start = end - (limit or self.kline_limit) * step if start is None else float(start)
+        return synthetic_klines(symbol, interval, start, end, price=self.get_price(symbol))
+
     def place_order(self, symbol: str, side: str, qty: float, type: str = "MARKET") -> Dict[str, object]:  # noqa: D401
         logger.info("OKX mock place_order symbol=%s side=%s qty=%.6f", symbol, side, qty)
         return {
@@ -0,0 +1,323 @@
+"""Append-only write-ahead journal for spot and arbitrage executions.
+
+Every process writes to its own directory under ``EXEC_JOURNAL_DIR`` and
+holds an exclusive ``flock`` on it for its lifetime. Records are framed as
+``<length><crc32><json>`` and appended to size-rotated segment files with a
+single ``os.write``, so a crashed process never loses an acknowledged
+record; ``fsync`` is group-committed so concurrent writers share one flush.
+
+On startup a process claims the directories of dead processes (their lock
+is free), replays them and returns the executions that began but never
+reached an ``end`` record, so they can be reconciled.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import shutil
+import socket
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.compat.dotenv import load_dotenv
+
+from .metrics import exec_journal_fsyncs_total, exec_journal_records_total
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_ROOT = Path(os.getenv("EXEC_JOURNAL_DIR") or Path(__file__).resolve().parents[3] / "logs" / "journal")
+
+_HEADER = struct.Struct("<II")
+_SEGMENT_GLOB = "segment-*.wal"
+
+
+def _segment_name(seq: int) -> str:
+    return f"segment-{seq:08d}.wal"
+
+
+def _segment_seq(path: Path) -> int:
+    return int(path.stem.split("-", 1)[1])
+
+
+def read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield valid records from a segment, stopping at the first torn or corrupt frame."""
+
+    data = path.read_bytes()
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        length, checksum = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        payload = data[start : start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            logger.warning("journal %s: corrupt frame at offset %s; ignoring tail", path, offset)
+            return
+        try:
+            yield json.loads(payload)
+        except ValueError:
+            logger.warning("journal %s: undecodable frame at offset %s; ignoring tail", path, offset)
+            return
+        offset = start + length
+
+
+@dataclass
+class InFlightExecution:
+    """Execution that began but has no terminal record in the journal."""
+
+    exec_id: str
+    kind: str
+    data: Dict[str, Any]
+    started_at: float
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def completed_stages(self) -> List[str]:
+        return [name for name, stage in self.stages.items() if "outcome" in stage]
+
+    def open_stages(self) -> List[str]:
+        """Stages whose exchange call was issued but whose outcome is unknown."""
+
+        return [name for name, stage in self.stages.items() if "outcome" not in stage]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "exec_id": self.exec_id,
+            "kind": self.kind,
+            "data": self.data,
+            "started_at": self.started_at,
+            "stages": self.stages,
+            "completed_stages": self.completed_stages(),
+            "open_stages": self.open_stages(),
+        }
+
+
+def replay(records: Iterator[Dict[str, Any]]) -> List[InFlightExecution]:
+    """Fold journal records into the executions that are still in flight."""
+
+    live: Dict[str, InFlightExecution] = {}
+    for record in records:
+        exec_id = str(record.get("exec_id", ""))
+        rtype = record.get("type")
+        if rtype == "begin":
+            live[exec_id] = InFlightExecution(
+                exec_id=exec_id,
+                kind=str(record.get("kind", "unknown")),
+                data=dict(record.get("data") or {}),
+                started_at=float(record.get("ts", 0.0)),
+            )
+            continue
+        entry = live.get(exec_id)
+        if entry is None:
+            continue
+        if rtype == "end":
+            live.pop(exec_id, None)
+        elif rtype in {"intent", "outcome"}:
+            stage = entry.stages.setdefault(str(record.get("stage")), {})
+            stage[rtype] = record.get("data") or {}
+    return list(live.values())
+
+
+class ExecutionJournal:
+    """Segment-rotated, checksummed execution journal with group commit."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        segment_bytes: int = 8 * 1024 * 1024,
+        commit_delay: float = 0.0,
+        keep_segments: int = 4,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = max(4096, int(segment_bytes))
+        self.commit_delay = max(0.0, float(commit_delay))
+        self.keep_segments = max(1, int(keep_segments))
+        self._lock_fd = os.open(self.directory / "LOCK", os.O_CREAT | os.O_RDWR, 0o644)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._write_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._lsn = 0
+        self._synced_lsn = 0
+        self._open: Dict[str, int] = {}
+        existing = sorted(self.directory.glob(_SEGMENT_GLOB), key=_segment_seq)
+        self._seq = _segment_seq(existing[-1]) + 1 if existing else 1
+        self._fd = -1
+        self._size = 0
+        self._open_segment()
+
+    # Segment management ----------------------------------------------------
+    def _open_segment(self) -> None:
+        path = self.directory / _segment_name(self._seq)
+        self._fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o644)
+        self._size = os.fstat(self._fd).st_size
+
+    def _rotate(self) -> None:
+        os.fsync(self._fd)
+        os.close(self._fd)
+        self._synced_lsn = self._lsn
+        self._seq += 1
+        self._open_segment()
+        self._prune()
+
+    def _prune(self) -> None:
+        oldest_needed = min(self._open.values(), default=self._seq)
+        floor = min(oldest_needed, self._seq - self.keep_segments + 1)
+        for path in self.directory.glob(_SEGMENT_GLOB):
+            if _segment_seq(path) < floor:
+                path.unlink(missing_ok=True)
+
+    # Writing ---------------------------------------------------------------
+    def append(self, record: Dict[str, Any], *, sync: bool) -> int:
+        """Append a record and return its sequence number.
+
+        With ``sync=True`` the call returns only once the record is on disk.
+        """
+
+        payload = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+        frame = _HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._write_lock:
+            if self._size and self._size + len(frame) > self.segment_bytes:
+                self._rotate()
+            os.write(self._fd, frame)
+            self._size += len(frame)
+            self._lsn += 1
+            lsn = self._lsn
+            exec_id = str(record.get("exec_id", ""))
+            if record.get("type") == "begin":
+                self._open[exec_id] = self._seq
+            elif record.get("type") == "end":
+                self._open.pop(exec_id, None)
+        exec_journal_records_total.labels(type=str(record.get("type"))).inc()
+        if sync:
+            self.sync(lsn)
+        return lsn
+
+    def sync(self, lsn: Optional[int] = None) -> None:
+        """Make every record up to ``lsn`` durable, sharing fsyncs between waiters."""
+
+        target = self._lsn if lsn is None else lsn
+        if self._synced_lsn >= target:
+            return
+        with self._sync_lock:
+            if self._synced_lsn >= target:
+                return
+            if self.commit_delay:
+                time.sleep(self.commit_delay)
+            with self._write_lock:
+                fd = self._fd
+                covered = self._lsn
+            os.fsync(fd)
+            exec_journal_fsyncs_total.inc()
+            self._synced_lsn = max(self._synced_lsn, covered)
+
+    def _record(self, exec_id: str, rtype: str, *, sync: bool, **fields: Any) -> None:
+        self.append({"ts": time.time(), "exec_id": exec_id, "type": rtype, **fields}, sync=sync)
+
+    def begin(self, exec_id: str, kind: str, data: Dict[str, Any]) -> None:
+        """Open an execution; made durable by the first :meth:`intent`."""
+
+        self._record(exec_id, "begin", sync=False, kind=kind, data=data)
+
+    def intent(self, exec_id: str, stage: str, data: Optional[Dict[str, Any]] = None, *, sync: bool = True) -> None:
+        """Record that an exchange call is about to be issued (durable before returning).
+
+        Batches pass ``sync=False`` for each intent and call :meth:`sync` once
+        before issuing any of the calls.
+        """
+
+        self._record(exec_id, "intent", sync=sync, stage=stage, data=data or {})
+
+    def outcome(self, exec_id: str, stage: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Record the result of an exchange call; flushed with the next durable record."""
+
+        self._record(exec_id, "outcome", sync=False, stage=stage, data=data or {})
+
+    def end(self, exec_id: str, status: str, data: Optional[Dict[str, Any]] = None) -> None:
+        self._record(exec_id, "end", sync=False, status=status, data=data or {})
+
+    def close(self) -> None:
+        with self._write_lock:
+            if self._fd >= 0:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = -1
+        os.close(self._lock_fd)
+
+    # Recovery --------------------------------------------------------------
+    def recover_orphans(self) -> List[InFlightExecution]:
+        """Claim journals left by dead processes and return their in-flight executions.
+
+        Claimed directories are removed after being read; the returned
+        executions are re-journaled here so they survive until reconciled.
+        """
+
+        recovered: List[InFlightExecution] = []
+        for candidate in sorted(p for p in self.directory.parent.iterdir() if p.is_dir()):
+            if candidate == self.directory:
+                continue
+            lock_path = candidate / "LOCK"
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+            except OSError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                continue  # owner still alive
+            try:
+                segments = sorted(candidate.glob(_SEGMENT_GLOB), key=_segment_seq)
+                entries = replay(record for path in segments for record in read_segment(path))
+                for entry in entries:
+                    self.begin(entry.exec_id, entry.kind, entry.data)
+                    for stage, stage_data in entry.stages.items():
+                        if "intent" in stage_data:
+                            self._record(entry.exec_id, "intent", sync=False, stage=stage, data=stage_data["intent"])
+                        if "outcome" in stage_data:
+                            self.outcome(entry.exec_id, stage, stage_data["outcome"])
+                self.sync()
+                recovered.extend(entries)
+                shutil.rmtree(candidate, ignore_errors=True)
+                logger.info("journal recovered %s in-flight executions from %s", len(entries), candidate)
+            finally:
+                os.close(fd)
+        return recovered
+
+
+_journal: Optional[ExecutionJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> Optional[ExecutionJournal]:
+    """Return this process's journal, or ``None`` when journaling is disabled."""
+
+    global _journal
+    if os.getenv("EXEC_JOURNAL_ENABLED", "true").lower() != "true":
+        return None
+    with _journal_lock:
+        if _journal is None:
+            name = f"{socket.gethostname()}-{os.getpid()}-{int(time.time())}"
+            _journal = ExecutionJournal(
+                JOURNAL_ROOT / name,
+                segment_bytes=int(os.getenv("EXEC_JOURNAL_SEGMENT_BYTES", str(8 * 1024 * 1024))),
+                commit_delay=float(os.getenv("EXEC_JOURNAL_COMMIT_DELAY_MS", "1")) / 1000,
+                keep_segments=int(os.getenv("EXEC_JOURNAL_KEEP_SEGMENTS", "4")),
+            )
+    return _journal
+
+
+__all__ = [
+    "ExecutionJournal",
+    "InFlightExecution",
+    "get_journal",
+    "read_segment",
+    "replay",
+]
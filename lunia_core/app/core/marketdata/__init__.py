@@ -0,0 +1,21 @@
+"""Historical market data storage and recording."""
+
+from .backfill import BackfillManager, BackfillReport, Checkpoint, WeightBudget
+from .recorder import QuoteRecorder, get_recorder, import_recordings, instrument
+from .store import BAR_COLUMNS, QUOTE_COLUMNS, Frame, MarketDataStore, venue_key
+
+__all__ = [
+    "BAR_COLUMNS",
+    "BackfillManager",
+    "BackfillReport",
+    "Checkpoint",
+    "Frame",
+    "MarketDataStore",
+    "QUOTE_COLUMNS",
+    "QuoteRecorder",
+    "WeightBudget",
+    "get_recorder",
+    "import_recordings",
+    "instrument",
+    "venue_key",
+]
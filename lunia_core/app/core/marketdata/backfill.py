@@ -0,0 +1,337 @@
+"""Concurrent, resumable backfill of exchange klines into the market data store.
+
+:class:`BackfillManager` splits every ``(symbol, range)`` into pages of at
+most one request each (the client's ``kline_limit`` bars), leaves out what
+the checkpoint already covers, and fetches the rest on a thread pool. Each
+request first takes its ``kline_weight`` from a shared :class:`WeightBudget`,
+a sliding one-minute window, so the backfill stays inside the exchange's
+request-weight limit however many workers run; the default budget is half
+of Binance's 6000 per minute, which leaves headroom for live trading.
+
+A page is recorded in the checkpoint only after its bars are in the
+store, so an interrupted backfill resumes where it stopped and never
+leaves a gap behind a covered range. Ranges are clipped to closed bars.
+Touched symbols are compacted at the end, merging the per-page parts.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.compat.dotenv import load_dotenv
+
+from ..exchange.klines import interval_seconds
+from .store import DATA_ROOT, venue_key
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_WORKERS = int(os.getenv("MARKET_BACKFILL_WORKERS", "16") or 16)
+BACKFILL_WEIGHT_PER_MIN = float(os.getenv("MARKET_BACKFILL_WEIGHT_PER_MIN", "3000") or 3000)
+CHECKPOINT_PATH = Path(os.getenv("MARKET_BACKFILL_CHECKPOINT") or DATA_ROOT.parent / "backfill" / "checkpoint.json")
+
+Range = Tuple[float, float]
+
+
+class WeightBudget:
+    """Request weight allowed per sliding ``window_sec``; :meth:`acquire` blocks until it fits."""
+
+    def __init__(
+        self,
+        per_window: float,
+        *,
+        window_sec: float = 60.0,
+        time_fn: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if per_window <= 0:
+            raise ValueError("weight budget must be positive")
+        self.per_window = float(per_window)
+        self.window_sec = float(window_sec)
+        self._time_fn = time_fn
+        self._sleep = sleep
+        self._spent: Deque[Tuple[float, float]] = deque()
+        self._used = 0.0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._spent and self._spent[0][0] <= now - self.window_sec:
+            self._used -= self._spent.popleft()[1]
+
+    @property
+    def used(self) -> float:
+        with self._lock:
+            self._expire(self._time_fn())
+            return self._used
+
+    def acquire(self, weight: float) -> None:
+        if weight <= 0:
+            return
+        if weight > self.per_window:
+            raise ValueError(f"request weight {weight} exceeds the budget of {self.per_window}")
+        while True:
+            with self._lock:
+                now = self._time_fn()
+                self._expire(now)
+                if self._used + weight <= self.per_window:
+                    self._spent.append((now, weight))
+                    self._used += weight
+                    return
+                wait = self._spent[0][0] + self.window_sec - now
+            self._sleep(max(wait, 0.001))
+
+
+def _merge(ranges: Sequence[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class Checkpoint:
+    """Covered ``[start, end)`` ranges per store symbol and interval, kept in a JSON file."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = Path(path) if path is not None else CHECKPOINT_PATH
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable backfill checkpoint %s: %s", self.path, exc)
+            data = {}
+        self._ranges: Dict[str, List[Range]] = {
+            key: _merge([(float(start), float(end)) for start, end in ranges]) for key, ranges in data.items()
+        }
+
+    @staticmethod
+    def key(symbol: str, interval: str) -> str:
+        return f"{symbol}|{interval}"
+
+    def covered(self, key: str) -> List[Range]:
+        with self._lock:
+            return list(self._ranges.get(key, []))
+
+    def missing(self, key: str, start: float, end: float) -> List[Range]:
+        """Parts of ``[start, end)`` not yet covered."""
+
+        gaps: List[Range] = []
+        cursor = start
+        for lo, hi in self.covered(key):
+            if hi <= cursor:
+                continue
+            if lo >= end:
+                break
+            if lo > cursor:
+                gaps.append((cursor, lo))
+            cursor = max(cursor, hi)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def add(self, key: str, start: float, end: float) -> None:
+        with self._lock:
+            self._ranges[key] = _merge([*self._ranges.get(key, []), (start, end)])
+
+    def save(self) -> None:
+        with self._lock:
+            payload = json.dumps({key: [list(r) for r in ranges] for key, ranges in self._ranges.items()})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class BackfillReport:
+    interval: str
+    symbols: int
+    pages: int = 0
+    bars: int = 0
+    weight: float = 0.0
+    elapsed_sec: float = 0.0
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "symbols": self.symbols,
+            "pages": self.pages,
+            "bars": self.bars,
+            "weight": self.weight,
+            "elapsed_sec": round(self.elapsed_sec, 3),
+            "failed": dict(self.failed),
+        }
+
+
+class BackfillManager:
+    """Fetch klines for many symbols concurrently into a :class:`MarketDataStore`.
+
+    Bars are stored under the plain symbol, where backtests look for them,
+    or under :func:`venue_key` when ``venue`` is given.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: Any,
+        *,
+        venue: Optional[str] = None,
+        workers: Optional[int] = None,
+        budget: Optional[WeightBudget] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        retries: int = 3,
+        retry_delay: float = 0.5,
+        checkpoint_every_sec: float = 1.0,
+        time_fn: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.client = client
+        self.store = store
+        self.venue = venue
+        self.workers = max(1, int(workers if workers is not None else BACKFILL_WORKERS))
+        self.budget = budget or WeightBudget(BACKFILL_WEIGHT_PER_MIN)
+        self.checkpoint = checkpoint or Checkpoint()
+        self.retries = max(1, int(retries))
+        self.retry_delay = float(retry_delay)
+        self.checkpoint_every_sec = float(checkpoint_every_sec)
+        self.page_bars = int(getattr(client, "kline_limit", 1000))
+        self.page_weight = float(getattr(client, "kline_weight", 1))
+        self._time_fn = time_fn
+        self._sleep = sleep
+
+    def store_key(self, symbol: str) -> str:
+        return venue_key(self.venue, symbol) if self.venue else symbol.upper()
+
+    def pages(self, symbols: Sequence[str], interval: str, start: float, end: float) -> List[Tuple[str, float, float]]:
+        """Requests still needed: ``(symbol, start, end)`` of at most one page of closed bars each."""
+
+        step = interval_seconds(interval)
+        start = math.ceil(start / step) * step
+        end = min(math.ceil(end / step), math.floor(self._time_fn() / step)) * step
+        span = self.page_bars * step
+        pages: List[Tuple[str, float, float]] = []
+        for symbol in symbols:
+            key = Checkpoint.key(self.store_key(symbol), interval)
+            for lo, hi in self.checkpoint.missing(key, start, end):
+                cursor = lo
+                while cursor < hi:
+                    pages.append((symbol, cursor, min(cursor + span, hi)))
+                    cursor += span
+        return pages
+
+    def _fetch(self, symbol: str, interval: str, start: float, end: float) -> int:
+        last: Optional[Exception] = None
+        for attempt in range(self.retries):
+            self.budget.acquire(self.page_weight)
+            try:
+                bars = self.client.get_klines(symbol, interval, start, end, limit=self.page_bars)
+                break
+            except Exception as exc:
+                last = exc
+                logger.warning("Backfill %s %s [%s, %s) attempt %s failed: %s", symbol, interval, start, end, attempt + 1, exc)
+                if attempt + 1 < self.retries:
+                    self._sleep(self.retry_delay * 2**attempt)
+        else:
+            raise RuntimeError(str(last))
+        rows = len(bars["ts"])
+        if rows:
+            self.store.append("bars", self.store_key(symbol), bars)
+        self.checkpoint.add(Checkpoint.key(self.store_key(symbol), interval), start, end)
+        return rows
+
+    def run(
+        self,
+        symbols: Sequence[str],
+        interval: str = "1m",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        *,
+        days: float = 1.0,
+    ) -> BackfillReport:
+        """Backfill ``[start, end)``; by default the last ``days`` up to now."""
+
+        started = time.perf_counter()
+        end = self._time_fn() if end is None else float(end)
+        start = end - days * 86_400 if start is None else float(start)
+        pages = self.pages(symbols, interval, start, end)
+        report = BackfillReport(interval=interval, symbols=len(symbols))
+        touched: Dict[str, None] = {}
+        last_save = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as pool:
+            futures = {pool.submit(self._fetch, symbol, interval, lo, hi): symbol for symbol, lo, hi in pages}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    report.bars += future.result()
+                except Exception as exc:
+                    report.failed[symbol] = str(exc)
+                    continue
+                report.pages += 1
+                report.weight += self.page_weight
+                touched[self.store_key(symbol)] = None
+                if time.monotonic() - last_save >= self.checkpoint_every_sec:
+                    self.checkpoint.save()
+                    last_save = time.monotonic()
+        self.checkpoint.save()
+        for key in touched:
+            self.store.compact("bars", key)
+        report.elapsed_sec = time.perf_counter() - started
+        logger.info(
+            "Backfilled %s bars of %s symbols in %.2fs (%s failed)",
+            report.bars,
+            report.symbols,
+            report.elapsed_sec,
+            len(report.failed),
+        )
+        return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from ..exchange.binance_spot import BinanceSpot
+    from .store import MarketDataStore
+
+    parser = argparse.ArgumentParser(description="Backfill Binance spot klines into the market data store")
+    parser.add_argument("symbols", nargs="+", help="symbols such as BTCUSDT")
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--days", type=float, default=1.0, help="how far back from now")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    # klines are public: no credentials, and never the testnet or mock data
+    client = BinanceSpot(public=True)
+    if client._configured_mock:
+        print("refusing to backfill: a mock client would store synthetic bars", file=sys.stderr)
+        return 2
+    manager = BackfillManager(client, MarketDataStore(), workers=args.workers)
+    report = manager.run(args.symbols, args.interval, days=args.days)
+    print(json.dumps(report.to_dict(), indent=2))
+    return 0 if not report.failed else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
+
+
+__all__ = [
+    "BackfillManager",
+    "BackfillReport",
+    "Checkpoint",
+    "WeightBudget",
+]
@@ -0,0 +1,415 @@
+"""Opt-in recorder for every quote the exchange clients observe.
+
+:func:`instrument` wraps a client's ``get_price`` and, where the client has
+one, ``get_book_ticker``, so each answer is also handed to the process-wide
+:class:`QuoteRecorder`. Recording costs the caller one ``struct.pack`` of
+the quote into a fixed-width record (timestamp, venue id, symbol id, bid,
+ask, bid size, ask size; 35 bytes) and one ``deque.append``: the deque is
+the lock-free hand-off to a writer thread that drains it every
+``flush_interval`` seconds.
+
+The writer joins a drained batch, views it as a NumPy record array without
+a per-quote Python step, splits it into columns and appends it to the
+current segment as one zlib-compressed block::
+
+    <magic><count><table length><payload length><crc32><table json><payload>
+
+The table maps the venue and symbol ids of the block back to names, so
+every block decodes on its own. Segments are written as ``.part`` files
+and renamed to ``.lqr`` when they reach ``segment_bytes`` or
+``segment_seconds``; readers stop at the first torn block, so a crash only
+loses the batch that was being written. :func:`import_recordings` loads
+recordings into the :class:`MarketDataStore`, where replays and backtests
+read them.
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import itertools
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from app.compat.dotenv import load_dotenv
+
+from ..metrics import marketdata_quotes_dropped_total, marketdata_quotes_recorded_total
+from .store import DATA_ROOT, np, venue_key
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RECORDER_ROOT = Path(os.getenv("MARKET_RECORDER_DIR") or DATA_ROOT.parent / "recordings")
+
+_MAGIC = b"LQR1"
+_HEADER = struct.Struct("<4sIIII")
+_FIELDS = (
+    ("ts", "<f8"),
+    ("venue", "u1"),
+    ("symbol", "<u2"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("bid_size", "<f4"),
+    ("ask_size", "<f4"),
+)
+_RECORD = struct.Struct("<dBHddff")  # byte layout of _FIELDS
+_PART = ".part"
+_SUFFIX = ".lqr"
+_now = time.time
+
+
+def _dtype() -> "np.dtype":
+    return np.dtype(list(_FIELDS))
+
+
+class QuoteRecorder:
+    """Buffers quotes in memory and writes them to rotating compressed segments."""
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        *,
+        segment_bytes: int = 64 * 1024 * 1024,
+        segment_seconds: float = 3600.0,
+        flush_interval: float = 0.5,
+        capacity: int = 1_000_000,
+        level: int = 1,
+    ) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for the market data recorder")
+        self.root = Path(root) if root is not None else RECORDER_ROOT
+        self.segment_bytes = max(1, int(segment_bytes))
+        self.segment_seconds = max(1.0, float(segment_seconds))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.capacity = max(1, int(capacity))
+        self.level = int(level)
+        self.recorded = 0
+        self.dropped = 0
+        self._buffer: Deque[bytes] = deque()
+        self._ids: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._venues: Dict[str, int] = {}
+        self._symbols: Dict[str, int] = {}
+        self._ids_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._segment: Optional[Path] = None
+        self._fd: Optional[int] = None
+        self._segment_size = 0
+        self._segment_opened = 0.0
+        self._segment_seq = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Hot path --------------------------------------------------------------------------
+    def record(
+        self,
+        venue: str,
+        symbol: str,
+        bid: float,
+        ask: float,
+        bid_size: float = math.nan,
+        ask_size: float = math.nan,
+        ts: Optional[float] = None,
+    ) -> None:
+        """Queue one quote; never blocks and never raises on a full buffer."""
+
+        if len(self._buffer) >= self.capacity:
+            self.dropped += 1
+            return
+        ids = self._ids.get((venue, symbol)) or self._register(venue, symbol)
+        self._buffer.append(_RECORD.pack(ts or _now(), ids[0], ids[1], bid, ask, bid_size, ask_size))
+
+    def _register(self, venue: str, symbol: str) -> Tuple[int, int]:
+        with self._ids_lock:
+            ids = self._ids.get((venue, symbol))
+            if ids is None:
+                venue_id = self._venues.setdefault(venue, len(self._venues))
+                symbol_id = self._symbols.setdefault(symbol.upper(), len(self._symbols))
+                if venue_id > 0xFF or symbol_id > 0xFFFF:
+                    raise ValueError("too many venues or symbols for one recorder")
+                ids = self._ids[(venue, symbol)] = (venue_id, symbol_id)
+            return ids
+
+    # Writer ----------------------------------------------------------------------------
+    def start(self) -> "QuoteRecorder":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="quote-recorder", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as exc:  # pragma: no cover - disk errors must not kill the thread
+                logger.error("quote recorder flush failed: %s", exc)
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of quotes written."""
+
+        with self._write_lock:
+            pending = len(self._buffer)
+            if self.dropped:
+                marketdata_quotes_dropped_total.inc(self.dropped)
+                logger.warning("quote recorder buffer full: dropped %d quotes", self.dropped)
+                self.dropped = 0
+            if not pending:
+                self._maybe_rotate()
+                return 0
+            pop = self._buffer.popleft
+            rows = np.frombuffer(b"".join([pop() for _ in itertools.repeat(None, pending)]), dtype=_dtype())
+            with self._ids_lock:
+                table = {"venues": list(self._venues), "symbols": list(self._symbols)}
+            self._write_block(rows, table)
+            self.recorded += pending
+            marketdata_quotes_recorded_total.inc(pending)
+            return pending
+
+    def _write_block(self, rows: "np.ndarray", table: Mapping[str, List[str]]) -> None:
+        self._maybe_rotate()
+        if self._fd is None:
+            self._open_segment()
+        meta = json.dumps(table, separators=(",", ":")).encode()
+        # column by column: similar values sit together and compress far better
+        payload = zlib.compress(b"".join(rows[name].tobytes() for name, _ in _FIELDS), self.level)
+        header = _HEADER.pack(_MAGIC, len(rows), len(meta), len(payload), zlib.crc32(meta + payload))
+        block = header + meta + payload
+        os.write(self._fd, block)
+        self._segment_size += len(block)
+
+    def _open_segment(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(now))
+        self._segment_seq += 1
+        name = f"quotes-{stamp}-{os.getpid()}-{self._segment_seq:06d}{_SUFFIX}{_PART}"
+        self._segment = self.root / name
+        self._fd = os.open(self._segment, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._segment_size = 0
+        self._segment_opened = now
+
+    def _maybe_rotate(self) -> None:
+        if self._fd is None:
+            return
+        if self._segment_size >= self.segment_bytes or time.time() - self._segment_opened >= self.segment_seconds:
+            self._close_segment()
+
+    def _close_segment(self) -> None:
+        if self._fd is None or self._segment is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        os.replace(self._segment, self._segment.with_name(self._segment.name[: -len(_PART)]))
+        self._segment = None
+
+    def close(self) -> None:
+        """Stop the writer, flush what is buffered and seal the current segment."""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self.flush()
+        with self._write_lock:
+            self._close_segment()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "recorded": self.recorded,
+            "buffered": len(self._buffer),
+            "dropped": self.dropped,
+            "segment": self._segment.name if self._segment is not None else None,
+        }
+
+
+# Reading ---------------------------------------------------------------------------
+def read_segment(path: Path) -> Iterator[Tuple[Dict[str, List[str]], "np.ndarray"]]:
+    """Yield ``(table, rows)`` per block, stopping at the first torn or corrupt block."""
+
+    if np is None:
+        raise RuntimeError("numpy is required to read market data recordings")
+    dtype = _dtype()
+    data = Path(path).read_bytes()
+    offset = 0
+    while offset + _HEADER.size <= len(data):
+        magic, count, meta_len, payload_len, checksum = _HEADER.unpack_from(data, offset)
+        start = offset + _HEADER.size
+        body = data[start : start + meta_len + payload_len]
+        if magic != _MAGIC or len(body) < meta_len + payload_len or zlib.crc32(body) != checksum:
+            logger.warning("recording %s: corrupt block at offset %s; ignoring tail", path, offset)
+            return
+        table = json.loads(body[:meta_len])
+        columns = zlib.decompress(body[meta_len:])
+        rows = np.empty(count, dtype=dtype)
+        position = 0
+        for name, _ in _FIELDS:
+            size = count * dtype[name].itemsize
+            rows[name] = np.frombuffer(columns, dtype=dtype[name], count=count, offset=position)
+            position += size
+        yield table, rows
+        offset = start + meta_len + payload_len
+
+
+def segments(root: Optional[Path] = None, *, include_open: bool = False) -> List[Path]:
+    """Segment files under ``root`` in name (time) order."""
+
+    root = Path(root) if root is not None else RECORDER_ROOT
+    if not root.exists():
+        return []
+    paths = list(root.glob(f"quotes-*{_SUFFIX}"))
+    if include_open:
+        paths += root.glob(f"quotes-*{_SUFFIX}{_PART}")
+    return sorted(paths, key=lambda path: path.name)
+
+
+def load_quotes(
+    root: Optional[Path] = None,
+    *,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    include_open: bool = False,
+) -> Dict[Tuple[str, str], Dict[str, "np.ndarray"]]:
+    """Recorded quotes in ``[start, end)`` as columns per ``(venue, symbol)``, in time order."""
+
+    chunks: Dict[Tuple[str, str], List["np.ndarray"]] = {}
+    for path in segments(root, include_open=include_open):
+        for table, rows in read_segment(path):
+            mask = np.ones(len(rows), dtype=bool)
+            if start is not None:
+                mask &= rows["ts"] >= start
+            if end is not None:
+                mask &= rows["ts"] < end
+            rows = rows[mask]
+            if not len(rows):
+                continue
+            pair = rows["venue"].astype(np.uint32) << 16 | rows["symbol"]
+            for key in np.unique(pair).tolist():
+                name = (table["venues"][key >> 16], table["symbols"][key & 0xFFFF])
+                chunks.setdefault(name, []).append(rows[pair == key])
+    result: Dict[Tuple[str, str], Dict[str, "np.ndarray"]] = {}
+    for name, parts in chunks.items():
+        rows = np.concatenate(parts)
+        rows = rows[np.argsort(rows["ts"], kind="stable")]
+        result[name] = {
+            "ts": rows["ts"],
+            "bid": rows["bid"],
+            "ask": rows["ask"],
+            "bid_size": rows["bid_size"].astype(np.float64),
+            "ask_size": rows["ask_size"].astype(np.float64),
+        }
+    return result
+
+
+def import_recordings(
+    store: Any,
+    root: Optional[Path] = None,
+    *,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Dict[str, int]:
+    """Append recorded quotes to ``store`` under :func:`venue_key` names."""
+
+    counts: Dict[str, int] = {}
+    for (venue, symbol), columns in load_quotes(root, start=start, end=end).items():
+        key = venue_key(venue, symbol)
+        counts[key] = store.append_quotes(key, columns)
+    return counts
+
+
+# Client hooks ----------------------------------------------------------------------
+_BOOK_KEYS = (("bid", "bidPrice"), ("ask", "askPrice"), ("bid_size", "bidQty"), ("ask_size", "askQty"))
+
+
+def _book_values(book: Mapping[str, Any]) -> Tuple[float, float, float, float]:
+    values = []
+    for plain, binance in _BOOK_KEYS:
+        value = book.get(plain, book.get(binance))
+        values.append(float(value) if value is not None else math.nan)
+    return values[0], values[1], values[2], values[3]
+
+
+def _mock_only(client: Any) -> bool:
+    return bool(getattr(client, "_configured_mock", getattr(client, "mock", False)))
+
+
+def instrument(client: Any, venue: str, recorder: Optional[QuoteRecorder] = None) -> Any:
+    """Record the quotes ``client`` returns; a no-op unless a recorder is active.
+
+    Mock answers are never recorded: mock-only clients are left alone, and
+    a live client is skipped while a failure has switched it to mock.
+    """
+
+    recorder = recorder if recorder is not None else get_recorder()
+    if recorder is None or _mock_only(client) or getattr(client, "_quote_recorder", None) is recorder:
+        return client
+    get_price = client.get_price
+
+    @functools.wraps(get_price)
+    def recorded_price(symbol: str, *args: Any, **kwargs: Any) -> float:
+        price = get_price(symbol, *args, **kwargs)
+        if not getattr(client, "mock", False):
+            recorder.record(venue, symbol, price, price)
+        return price
+
+    client.get_price = recorded_price
+    get_book = getattr(client, "get_book_ticker", None)
+    if get_book is not None:
+
+        @functools.wraps(get_book)
+        def recorded_book(symbol: str, *args: Any, **kwargs: Any) -> Mapping[str, Any]:
+            book = get_book(symbol, *args, **kwargs)
+            if not getattr(client, "mock", False):
+                bid, ask, bid_size, ask_size = _book_values(book)
+                recorder.record(venue, symbol, bid, ask, bid_size, ask_size)
+            return book
+
+        client.get_book_ticker = recorded_book
+    client._quote_recorder = recorder
+    return client
+
+
+_recorder: Optional[QuoteRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> Optional[QuoteRecorder]:
+    """Return this process's recorder, or ``None`` when recording is disabled."""
+
+    global _recorder
+    if os.getenv("MARKET_RECORDER_ENABLED", "false").lower() != "true":
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            if np is None:
+                logger.warning("numpy not installed; market data recording disabled")
+                return None
+            _recorder = QuoteRecorder(
+                segment_bytes=int(os.getenv("MARKET_RECORDER_SEGMENT_BYTES", str(64 * 1024 * 1024))),
+                segment_seconds=float(os.getenv("MARKET_RECORDER_SEGMENT_SEC", "3600")),
+                flush_interval=float(os.getenv("MARKET_RECORDER_FLUSH_MS", "500")) / 1000,
+                capacity=int(os.getenv("MARKET_RECORDER_BUFFER", "1000000")),
+            ).start()
+            atexit.register(_recorder.close)
+    return _recorder
+
+
+__all__ = [
+    "QuoteRecorder",
+    "RECORDER_ROOT",
+    "get_recorder",
+    "import_recordings",
+    "instrument",
+    "load_quotes",
+    "read_segment",
+    "segments",
+]
@@ -0,0 +1,377 @@
+"""Columnar, memory-mapped store for historical bars and top-of-book quotes.
+
+Layout under ``MARKET_DATA_DIR``::
+
+    <kind>/<SYMBOL>/index.json
+    <kind>/<SYMBOL>/<YYYY-MM-DD>/part-00000042/<column>.npy
+
+Every append sorts its rows by timestamp, splits them into UTC days and
+writes one immutable part per day: each column is its own ``.npy`` file,
+staged in a temporary directory and renamed into place. ``index.json``
+lists every part with its first and last timestamp. Parts are sorted by
+first timestamp, with a running maximum of last timestamps, so the parts
+covering a time range are found by bisection. Within a part, ``ts`` is
+sorted, so rows are found with ``searchsorted`` on the memory map. Reads
+hand out slices of the memory maps without copying, and the most
+recently used maps stay open. :meth:`compact` merges the small parts of
+a day into one; the old parts are deleted only after the new index is in
+place, and readers that lose a part to a concurrent compaction re-read
+the index once. Quotes from several venues
+for the same instrument are kept apart under :func:`venue_key` names such
+as ``BTCUSDT@BINANCE``.
+"""
+from __future__ import annotations
+
+import bisect
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from app.compat.dotenv import load_dotenv
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy optional
+    np = None  # type: ignore
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DATA_ROOT = Path(os.getenv("MARKET_DATA_DIR") or Path(__file__).resolve().parents[3] / "data" / "market")
+
+BAR_COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+QUOTE_COLUMNS = ("ts", "bid", "ask", "bid_size", "ask_size")
+KINDS: Dict[str, Tuple[str, ...]] = {"bars": BAR_COLUMNS, "quotes": QUOTE_COLUMNS}
+
+_DAY = 86_400
+_INDEX = "index.json"
+
+
+def venue_key(venue: str, symbol: str) -> str:
+    """Store symbol for ``symbol`` as quoted on ``venue``."""
+
+    return f"{symbol}@{venue}".upper()
+
+
+def _day_name(day: int) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(day * _DAY))
+
+
+@dataclass
+class Frame:
+    """Aligned columns for one symbol; ``ts`` is always present."""
+
+    columns: Dict[str, "np.ndarray"]
+
+    def __getitem__(self, column: str) -> "np.ndarray":
+        return self.columns[column]
+
+    def __len__(self) -> int:
+        return len(self.columns["ts"])
+
+    @property
+    def ts(self) -> "np.ndarray":
+        return self.columns["ts"]
+
+    @classmethod
+    def empty(cls, columns: Sequence[str]) -> "Frame":
+        return cls({name: np.empty(0, dtype=np.float64) for name in columns})
+
+    @classmethod
+    def concat(cls, frames: Sequence["Frame"]) -> "Frame":
+        """Join frames in time order. A single frame is returned as is."""
+
+        if len(frames) == 1:
+            return frames[0]
+        names = list(frames[0].columns)
+        columns = {name: np.concatenate([frame[name] for frame in frames]) for name in names}
+        ts = columns["ts"]
+        if ts.size > 1 and (ts[1:] < ts[:-1]).any():
+            order = np.argsort(ts, kind="stable")
+            columns = {name: values[order] for name, values in columns.items()}
+        return cls(columns)
+
+
+@dataclass
+class _Index:
+    parts: List[Dict[str, object]] = field(default_factory=list)
+    seq: int = 0
+    firsts: List[float] = field(default_factory=list)
+    reach: List[float] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, parts: List[Dict[str, object]], seq: int) -> "_Index":
+        parts = sorted(parts, key=lambda part: (part["first"], part["part"]))
+        reach: List[float] = []
+        for part in parts:
+            reach.append(max(reach[-1], float(part["last"])) if reach else float(part["last"]))
+        return cls(parts, seq, [float(part["first"]) for part in parts], reach)
+
+    def covering(self, start: float, end: float) -> List[Dict[str, object]]:
+        """Parts that may hold rows in ``[start, end)``."""
+
+        lo = bisect.bisect_left(self.reach, start)
+        hi = bisect.bisect_left(self.firsts, end)
+        return [part for part in self.parts[lo:hi] if float(part["last"]) >= start]
+
+
+class MarketDataStore:
+    """Append-only, per-symbol, per-day partitioned column store."""
+
+    def __init__(self, root: Optional[Path] = None, *, max_maps: int = 1024) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for the market data store")
+        self.root = Path(root) if root is not None else DATA_ROOT
+        self.max_maps = max(1, int(max_maps))
+        self._lock = threading.RLock()
+        self._indexes: Dict[Tuple[str, str], Tuple[int, _Index]] = {}
+        self._maps: "OrderedDict[Path, np.ndarray]" = OrderedDict()
+
+    # Paths and locking -------------------------------------------------------------
+    def _dir(self, kind: str, symbol: str) -> Path:
+        if kind not in KINDS:
+            raise ValueError(f"unknown market data kind {kind!r}")
+        return self.root / kind / symbol.upper()
+
+    @contextmanager
+    def _writing(self, kind: str, symbol: str) -> Iterator[Path]:
+        base = self._dir(kind, symbol)
+        base.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(base / ".lock", "a+") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield base
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    # Index -------------------------------------------------------------------------
+    def _index(self, kind: str, symbol: str) -> _Index:
+        path = self._dir(kind, symbol) / _INDEX
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return _Index()
+        with self._lock:
+            cached = self._indexes.get((kind, symbol.upper()))
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            data = json.loads(path.read_text(encoding="utf-8"))
+            index = _Index.build(list(data.get("parts", [])), int(data.get("seq", 0)))
+            self._indexes[(kind, symbol.upper())] = (mtime, index)
+            return index
+
+    def _save_index(self, kind: str, symbol: str, parts: List[Dict[str, object]], seq: int) -> None:
+        base = self._dir(kind, symbol)
+        tmp = base / f".{_INDEX}.tmp"
+        tmp.write_text(json.dumps({"seq": seq, "parts": parts}), encoding="utf-8")
+        os.replace(tmp, base / _INDEX)
+        # cache eagerly: a second write within the mtime resolution must not read stale parts
+        self._indexes[(kind, symbol.upper())] = ((base / _INDEX).stat().st_mtime_ns, _Index.build(parts, seq))
+
+    # Writing -----------------------------------------------------------------------
+    def _write_part(self, base: Path, day: int, seq: int, columns: Mapping[str, "np.ndarray"]) -> Dict[str, object]:
+        name = f"part-{seq:08d}"
+        day_dir = base / _day_name(day)
+        day_dir.mkdir(exist_ok=True)
+        staging = day_dir / f".{name}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir()
+        for column, values in columns.items():
+            np.save(staging / f"{column}.npy", values)
+        # left behind by a compaction that died before saving its index; nothing points at it
+        shutil.rmtree(day_dir / name, ignore_errors=True)
+        os.replace(staging, day_dir / name)
+        ts = columns["ts"]
+        return {
+            "day": day_dir.name,
+            "part": name,
+            "first": float(ts[0]),
+            "last": float(ts[-1]),
+            "rows": int(ts.size),
+        }
+
+    def append(self, kind: str, symbol: str, data: Mapping[str, Sequence[float]]) -> int:
+        """Append rows given as ``column -> values``; returns the row count."""
+
+        names = KINDS.get(kind)
+        if names is None:
+            raise ValueError(f"unknown market data kind {kind!r}")
+        missing = [name for name in names if name not in data]
+        if missing:
+            raise ValueError(f"missing columns: {', '.join(missing)}")
+        columns = {name: np.asarray(data[name], dtype=np.float64).ravel() for name in names}
+        rows = {values.size for values in columns.values()}
+        if len(rows) != 1:
+            raise ValueError("all columns need the same number of rows")
+        if not columns["ts"].size:
+            return 0
+        order = np.argsort(columns["ts"], kind="stable")
+        columns = {name: values[order] for name, values in columns.items()}
+        days = (columns["ts"] // _DAY).astype(np.int64)
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        with self._writing(kind, symbol) as base:
+            index = self._index(kind, symbol)
+            parts, seq = list(index.parts), index.seq
+            for lo, hi in zip([0, *bounds.tolist()], [*bounds.tolist(), days.size]):
+                seq += 1
+                chunk = {name: values[lo:hi] for name, values in columns.items()}
+                parts.append(self._write_part(base, int(days[lo]), seq, chunk))
+            self._save_index(kind, symbol, parts, seq)
+        return int(columns["ts"].size)
+
+    def append_bars(self, symbol: str, data: Mapping[str, Sequence[float]]) -> int:
+        return self.append("bars", symbol, data)
+
+    def append_quotes(self, symbol: str, data: Mapping[str, Sequence[float]]) -> int:
+        return self.append("quotes", symbol, data)
+
+    # Reading -----------------------------------------------------------------------
+    def _column(self, path: Path) -> "np.ndarray":
+        with self._lock:
+            mapped = self._maps.get(path)
+            if mapped is not None:
+                self._maps.move_to_end(path)
+                return mapped
+        mapped = np.load(path, mmap_mode="r")
+        with self._lock:
+            self._maps[path] = mapped
+            while len(self._maps) > self.max_maps:
+                # evicted maps stay valid for as long as a frame still holds them
+                self._maps.popitem(last=False)
+        return mapped
+
+    def _frames(self, kind: str, symbol: str, lo_ts: float, hi_ts: float, names: Sequence[str]) -> List[Frame]:
+        base = self._dir(kind, symbol)
+        frames: List[Frame] = []
+        for part in self._index(kind, symbol).covering(lo_ts, hi_ts):
+            folder = base / str(part["day"]) / str(part["part"])
+            ts = self._column(folder / "ts.npy")
+            lo = int(np.searchsorted(ts, lo_ts, side="left"))
+            hi = int(np.searchsorted(ts, hi_ts, side="left"))
+            if hi > lo:
+                frames.append(Frame({name: self._column(folder / f"{name}.npy")[lo:hi] for name in names}))
+        return frames
+
+    def segments(
+        self,
+        kind: str,
+        symbol: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Iterator[Frame]:
+        """Zero-copy frames of rows with ``start <= ts < end``, one per part."""
+
+        names = ["ts", *[name for name in (columns or KINDS[kind]) if name != "ts"]]
+        lo_ts = -np.inf if start is None else float(start)
+        hi_ts = np.inf if end is None else float(end)
+        try:
+            frames = self._frames(kind, symbol, lo_ts, hi_ts, names)
+        except FileNotFoundError:
+            # a compaction replaced the parts after we read the index
+            with self._lock:
+                self._indexes.pop((kind, symbol.upper()), None)
+            frames = self._frames(kind, symbol, lo_ts, hi_ts, names)
+        yield from frames
+
+    def read(
+        self,
+        kind: str,
+        symbol: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Frame:
+        """All rows in ``[start, end)`` in time order; zero-copy when they sit in one part."""
+
+        frames = list(self.segments(kind, symbol, start, end, columns))
+        if not frames:
+            return Frame.empty(["ts", *[name for name in (columns or KINDS[kind]) if name != "ts"]])
+        return Frame.concat(frames)
+
+    def bars(self, symbol: str, start: Optional[float] = None, end: Optional[float] = None, **kwargs) -> Frame:
+        return self.read("bars", symbol, start, end, **kwargs)
+
+    def quotes(self, symbol: str, start: Optional[float] = None, end: Optional[float] = None, **kwargs) -> Frame:
+        return self.read("quotes", symbol, start, end, **kwargs)
+
+    def symbols(self, kind: str = "bars") -> List[str]:
+        folder = self.root / kind
+        if not folder.is_dir():
+            return []
+        return sorted(path.name for path in folder.iterdir() if (path / _INDEX).exists())
+
+    def span(self, kind: str, symbol: str) -> Optional[Tuple[float, float]]:
+        """First and last stored timestamp, or ``None`` when nothing is stored."""
+
+        index = self._index(kind, symbol)
+        if not index.parts:
+            return None
+        return index.firsts[0], index.reach[-1]
+
+    # Maintenance -------------------------------------------------------------------
+    def compact(self, kind: Optional[str] = None, symbol: Optional[str] = None, *, min_parts: int = 2) -> int:
+        """Merge the parts of every day holding at least ``min_parts`` into one.
+
+        Rows are merged in time order. Rows with equal timestamps keep only
+        the most recently appended one, so re-recorded or backfilled
+        overlaps collapse. Returns the number of parts removed.
+        """
+
+        removed = 0
+        for name in [kind] if kind else list(KINDS):
+            for sym in [symbol.upper()] if symbol else self.symbols(name):
+                removed += self._compact_symbol(name, sym, max(2, int(min_parts)))
+        return removed
+
+    def _compact_symbol(self, kind: str, symbol: str, min_parts: int) -> int:
+        with self._writing(kind, symbol) as base:
+            index = self._index(kind, symbol)
+            by_day: Dict[str, List[Dict[str, object]]] = {}
+            for part in index.parts:
+                by_day.setdefault(str(part["day"]), []).append(part)
+            parts, seq, stale = [], index.seq, []
+            for day, group in by_day.items():
+                if len(group) < min_parts:
+                    parts.extend(group)
+                    continue
+                group.sort(key=lambda part: str(part["part"]))
+                folders = [base / day / str(part["part"]) for part in group]
+                columns = {
+                    name: np.concatenate([np.load(folder / f"{name}.npy") for folder in folders])
+                    for name in KINDS[kind]
+                }
+                order = np.argsort(columns["ts"], kind="stable")
+                columns = {name: values[order] for name, values in columns.items()}
+                ts = columns["ts"]
+                keep = np.append(ts[1:] != ts[:-1], True)
+                columns = {name: values[keep] for name, values in columns.items()}
+                seq += 1
+                parts.append(self._write_part(base, int(ts[0] // _DAY), seq, columns))
+                stale.extend(folders)
+            if not stale:
+                return 0
+            # publish the merged parts before deleting anything the old index points at
+            self._save_index(kind, symbol, parts, seq)
+            folders = set(stale)
+            with self._lock:
+                for path in [path for path in self._maps if path.parent in folders]:
+                    # open memory maps keep the unlinked files readable
+                    del self._maps[path]
+            for folder in stale:
+                shutil.rmtree(folder, ignore_errors=True)
+            logger.info("Compacted %s/%s: merged %d parts", kind, symbol, len(stale))
+            return len(stale)
+
+
+__all__ = ["BAR_COLUMNS", "DATA_ROOT", "Frame", "KINDS", "MarketDataStore", "QUOTE_COLUMNS", "venue_key"]
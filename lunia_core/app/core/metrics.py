@@ -129,6 +129,16 @@ arb_auto_execs_total = Counter(
     "Automatic arbitrage executions",
     labelnames=("mode",),
 )
+arb_auto_decisions_total = Counter(
+    "lunia_arb_auto_decisions_total",
+    "Auto-mode decisions by outcome",
+    labelnames=("reason",),
+)
+arb_auto_reaction_ms = Histogram(
+    "lunia_arb_auto_reaction_ms",
+    "Delay between opportunity detection and auto execution in milliseconds",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
 arb_daily_pnl_usd = Gauge(
     "lunia_arb_daily_pnl_usd",
     "Daily arbitrage PnL (USD)",
@@ -142,6 +152,23 @@ arb_rate_limited_total = Counter(
     "Executions blocked by rate limits",
     labelnames=("reason",),
 )
+arb_exec_registry_lookups_total = Counter(
+    "lunia_arb_exec_registry_lookups_total",
+    "Execution lookups by source (memory, db, miss)",
+    labelnames=("source",),
+)
+arb_exec_registry_evictions_total = Counter(
+    "lunia_arb_exec_registry_evictions_total",
+    "Executions evicted from the in-memory registry",
+)
+arb_exec_registry_hit_ratio = Gauge(
+    "lunia_arb_exec_registry_hit_ratio",
+    "Share of execution lookups served from memory",
+)
+arb_exec_registry_size = Gauge(
+    "lunia_arb_exec_registry_size",
+    "Executions held in the in-memory registry",
+)
 arb_filter_changes_total = Counter(
     "lunia_arb_filter_changes_total",
     "Updates to arbitrage filter configuration",
@@ -242,6 +269,69 @@ alerts_sent_total = Counter(
     "Alerts sent to operators",
     labelnames=("level",),
 )
+exec_journal_records_total = Counter(
+    "lunia_exec_journal_records_total",
+    "Records appended to the execution journal",
+    labelnames=("type",),
+)
+exec_journal_fsyncs_total = Counter(
+    "lunia_exec_journal_fsyncs_total",
+    "Group-committed fsyncs of the execution journal",
+)
+exec_journal_recovered_total = Counter(
+    "lunia_exec_journal_recovered_total",
+    "In-flight executions recovered from journals of dead processes",
+    labelnames=("kind",),
+)
+marketdata_quotes_recorded_total = Counter(
+    "lunia_marketdata_quotes_recorded_total",
+    "Quotes written to market data recordings",
+)
+marketdata_quotes_dropped_total = Counter(
+    "lunia_marketdata_quotes_dropped_total",
+    "Quotes dropped because the recorder buffer was full",
+)
+spot_strategy_cycle_ms = Histogram(
+    "lunia_spot_strategy_cycle_ms",
+    "Time each strategy spends per signal cycle in milliseconds",
+    labelnames=("strategy",),
+    buckets=(0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+spot_strategy_calls_total = Counter(
+    "lunia_spot_strategy_calls_total",
+    "Strategy invocations by evaluation mode",
+    labelnames=("strategy", "mode"),
+)
+spot_strategy_signals_total = Counter(
+    "lunia_spot_strategy_signals_total",
+    "Raw signals emitted per strategy before weighting",
+    labelnames=("strategy",),
+)
+spot_strategy_errors_total = Counter(
+    "lunia_spot_strategy_errors_total",
+    "Strategy calls that raised",
+    labelnames=("strategy",),
+)
+spot_strategy_deferred_total = Counter(
+    "lunia_spot_strategy_deferred_total",
+    "Symbol evaluations deferred because a time budget was spent",
+    labelnames=("strategy", "reason"),
+)
+spot_signal_cache_total = Counter(
+    "lunia_spot_signal_cache_total",
+    "Supervisor decision cache lookups",
+    labelnames=("result",),
+)
+spot_signals_netted_total = Counter(
+    "lunia_spot_signals_netted_total",
+    "Spot signals folded into another order for the same symbol (merged) or offset to nothing (cancelled)",
+    labelnames=("outcome",),
+)
+spot_tick_signal_ms = Histogram(
+    "lunia_spot_tick_signal_ms",
+    "Time from a pushed price tick to its signals being published in milliseconds",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250),
+)
 
 _metrics_lock = threading.Lock()
 _started_servers: Set[int] = set()
@@ -3,9 +3,9 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Mapping, Optional
 
-from ...db.reporting import record_trade
+from ...db.reporting import record_trade, record_trades
 
 logger = logging.getLogger(__name__)
 
@@ -60,10 +60,15 @@ class Position:
 class Portfolio:
     """Minimal portfolio implementation keeping track of open positions."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, record: bool = True) -> None:
+        # record=False keeps fills out of the trade database (backtests)
+        self.record = record
         self.positions: Dict[str, Position] = {}
         self.market_prices: Dict[str, float] = {}
         self.realized_pnl: float = 0.0
+        # per-strategy books, so netted fills can be attributed back
+        self.strategy_positions: Dict[str, Dict[str, Position]] = {}
+        self.strategy_realized_pnl: Dict[str, float] = {}
 
     def update_on_fill(
         self,
@@ -76,6 +81,74 @@ class Portfolio:
         fees: float = 0.0,
         stop_pct: float | None = None,
         take_pct: float | None = None,
+        allocations: Optional[Iterable[Mapping[str, object]]] = None,
+    ) -> float:
+        """Apply a fill to the symbol position and the strategy books.
+
+        ``allocations`` lists the ``{"strategy", "side", "qty"}`` legs a netted
+        order was built from; the fill is split across them pro rata. Without
+        it the whole fill belongs to ``strategy``.
+        """
+        pnl_delta = self._apply_fill(
+            symbol,
+            side,
+            qty,
+            price,
+            strategy=strategy,
+            fees=fees,
+            stop_pct=stop_pct,
+            take_pct=take_pct,
+            allocations=allocations,
+        )
+        if self.record:
+            record_trade(
+                timestamp=None,
+                symbol=symbol,
+                side=side,
+                qty=qty,
+                price=price,
+                pnl=pnl_delta,
+                strategy=strategy,
+            )
+        return pnl_delta
+
+    def update_on_fills(self, fills: Iterable[Mapping[str, object]]) -> List[float]:
+        """Apply several fills and record them in one database transaction.
+
+        Each fill maps :meth:`update_on_fill`'s argument names to values;
+        returns the realized PnL of each fill.
+        """
+        pnls: List[float] = []
+        rows: List[Dict[str, object]] = []
+        for fill in fills:
+            pnl_delta = self._apply_fill(**fill)
+            pnls.append(pnl_delta)
+            rows.append(
+                {
+                    "symbol": fill["symbol"],
+                    "side": fill["side"],
+                    "qty": fill["qty"],
+                    "price": fill["price"],
+                    "pnl": pnl_delta,
+                    "strategy": fill.get("strategy"),
+                }
+            )
+        if self.record:
+            record_trades(rows)
+        return pnls
+
+    def _apply_fill(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        price: float,
+        *,
+        strategy: str | None = None,
+        fees: float = 0.0,
+        stop_pct: float | None = None,
+        take_pct: float | None = None,
+        allocations: Optional[Iterable[Mapping[str, object]]] = None,
     ) -> float:
         logger.info("Applying fill for %s side=%s qty=%.8f price=%.2f", symbol, side, qty, price)
         position = self.positions.setdefault(symbol, Position(symbol=symbol))
@@ -86,17 +159,40 @@ class Portfolio:
         position.stop_pct = stop_pct if stop_pct is not None else position.stop_pct
         position.take_pct = take_pct if take_pct is not None else position.take_pct
         position.fees_paid += fees
-        record_trade(
-            timestamp=None,
-            symbol=symbol,
-            side=side,
-            qty=qty,
-            price=price,
-            pnl=pnl_delta,
-            strategy=strategy,
-        )
+        legs = list(allocations or [{"strategy": strategy or "unknown", "side": side, "qty": qty}])
+        self._allocate(symbol, side, qty, price, legs, fees)
         return pnl_delta
 
+    def _allocate(
+        self,
+        symbol: str,
+        side: str,
+        qty: float,
+        price: float,
+        legs: Iterable[Mapping[str, object]],
+        fees: float,
+    ) -> None:
+        legs = list(legs)
+        signed = sum(
+            float(leg["qty"]) * (-1 if str(leg["side"]).upper() == "SELL" else 1) for leg in legs
+        )
+        # legs net to the order size; scale them to what was actually filled
+        scale = qty / abs(signed) if signed else 0.0
+        gross = sum(float(leg["qty"]) for leg in legs)
+        for leg in legs:
+            name = str(leg["strategy"])
+            leg_qty = float(leg["qty"]) * scale
+            book = self.strategy_positions.setdefault(name, {})
+            position = book.setdefault(symbol, Position(symbol=symbol, strategy=name))
+            self.strategy_realized_pnl[name] = self.strategy_realized_pnl.get(name, 0.0) + position.apply_fill(
+                str(leg["side"]), leg_qty, price
+            )
+            if gross:
+                position.fees_paid += fees * float(leg["qty"]) / gross
+
+    def strategy_position(self, strategy: str, symbol: str) -> Optional[Position]:
+        return self.strategy_positions.get(strategy, {}).get(symbol)
+
     def mark_price(self, symbol: str, price: float) -> None:
         self.market_prices[symbol] = price
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import List, Mapping, Sequence, Tuple
 
 LOG_PATH = Path(__file__).resolve().parents[4] / "logs" / "risk.log"
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
@@ -48,28 +48,29 @@ class RiskManager:
             order_value_usd,
             leverage,
         )
-
-        if equity_usd <= 0:
-            reason = "equity must be positive"
+        reason = self._order_reason(equity_usd, order_value_usd, leverage)
+        if reason:
             logger.warning(reason)
             _append_log(reason)
             return False, reason
 
+        logger.info("Order validated successfully")
+        _append_log("ok")
+        return True, ""
+
+    def _order_reason(self, equity_usd: float, order_value_usd: float, leverage: float) -> str:
+        if equity_usd <= 0:
+            return "equity must be positive"
+
         if leverage > self.limits.max_pos_leverage:
-            reason = "max leverage exceeded"
-            logger.warning(reason)
-            _append_log(reason)
-            return False, reason
+            return "max leverage exceeded"
 
         exposure_pct = 0.0
         if equity_usd > 0:
             exposure_pct = (order_value_usd / equity_usd) * 100 if order_value_usd else 0.0
 
         if exposure_pct > self.limits.max_symbol_risk_pct:
-            reason = "max symbol risk exceeded"
-            logger.warning(reason)
-            _append_log(reason)
-            return False, reason
+            return "max symbol risk exceeded"
 
         if self.daily_pnl < 0:
             reference_equity = equity_usd if equity_usd > 0 else order_value_usd
@@ -79,14 +80,8 @@ class RiskManager:
             loss_pct = abs(self.daily_pnl) / reference_equity * 100
             limit = self.limits.daily_max_drawdown_pct or self.limits.max_daily_loss_pct
             if loss_pct >= limit:
-                reason = "max daily loss exceeded"
-                logger.warning(reason)
-                _append_log(reason)
-                return False, reason
-
-        logger.info("Order validated successfully")
-        _append_log("ok")
-        return True, ""
+                return "max daily loss exceeded"
+        return ""
 
     def register_pnl(self, pnl_delta: float) -> None:
         """Update daily PnL tracking."""
@@ -163,3 +158,44 @@ class RiskManager:
             "Spot order validated symbol=%s notional=%.2f open_positions=%d", symbol, notional_usd, open_positions
         )
         return True, ""
+
+    def validate_spot_batch(
+        self,
+        *,
+        equity_usd: float,
+        orders: Sequence[Mapping[str, object]],
+        open_positions: int,
+        limits: dict[str, float] | None = None,
+    ) -> List[Tuple[bool, str]]:
+        """Run :meth:`validate_order` and :meth:`validate_spot_order` over a batch.
+
+        Every order is checked against the same equity snapshot and gets the
+        same reason the one-by-one path would give. Each order maps
+        ``symbol``, ``notional_usd``, ``current_symbol_exposure_pct`` and
+        ``position_exists``; an accepted order opening a new position takes a
+        ``max_concurrent_pos`` slot from the orders after it. One summary line
+        is logged instead of one per order.
+        """
+
+        verdicts: List[Tuple[bool, str]] = []
+        for order in orders:
+            notional = float(order["notional_usd"])
+            reason = self._order_reason(equity_usd, notional, 1.0)
+            if reason:
+                verdicts.append((False, reason))
+                continue
+            order_limits = dict(limits or {}, position_exists=bool(order.get("position_exists")))
+            ok, reason = self.validate_spot_order(
+                equity_usd=equity_usd,
+                notional_usd=notional,
+                symbol=str(order["symbol"]),
+                open_positions=open_positions,
+                current_symbol_exposure_pct=float(order.get("current_symbol_exposure_pct", 0.0)),
+                limits=order_limits,
+            )
+            if ok and not order_limits["position_exists"]:
+                open_positions += 1
+            verdicts.append((ok, reason))
+        rejected = [reason for ok, reason in verdicts if not ok]
+        _append_log(f"batch orders={len(verdicts)} rejected={len(rejected)} reasons={sorted(set(rejected))}")
+        return verdicts
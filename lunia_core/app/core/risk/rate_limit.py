@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import logging
 import os
+import threading
 import time
-from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Deque, Dict, Tuple
+from typing import Callable, Dict, List, Optional, Protocol, Sequence, Tuple
 
 from app.core.metrics import arb_rate_limited_total
 
+try:  # pragma: no cover - optional dependency
+    import redis  # type: ignore
+except Exception:  # pragma: no cover - redis optional
+    redis = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class RateLimitConfig:
@@ -15,49 +23,236 @@ class RateLimitConfig:
     window_minutes: int = int(os.getenv("ARB_RATE_LIMIT_WINDOW_MIN", "10"))
     max_per_exchange: int = int(os.getenv("ARB_RATE_LIMIT_MAX_EXEC_PER_EXCHANGE", "3"))
     max_per_symbol: int = int(os.getenv("ARB_RATE_LIMIT_MAX_EXEC_PER_SYMBOL", "5"))
+    buckets: int = int(os.getenv("ARB_RATE_LIMIT_BUCKETS", "10"))
+    backend: str = os.getenv("ARB_RATE_LIMIT_BACKEND", "auto").lower()
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    key_prefix: str = os.getenv("ARB_RATE_LIMIT_PREFIX", "lunia:arb:rl")
 
     def window_seconds(self) -> int:
         return max(60, self.window_minutes * 60)
 
+    def bucket_seconds(self) -> float:
+        return self.window_seconds() / max(1, self.buckets)
+
+
+# A limit is a (key, max hits per window) pair.
+Limit = Tuple[str, int]
+
+
+class RateLimitBackend(Protocol):
+    """Storage for bucketed sliding-window counters.
+
+    Each key owns a ring of ``buckets`` slots, one per ``bucket_seconds`` of
+    the window; a hit lands in the slot for the current epoch and the window
+    count is the sum of slots whose epoch is still inside the window, so every
+    operation touches a constant number of slots.
+    """
+
+    def try_acquire(self, limits: Sequence[Limit], *, epoch: int, buckets: int, commit: bool = True) -> Optional[str]:
+        """Atomically check every limit and, if all pass, count one hit on each.
+
+        Returns the first exhausted key, or ``None`` when the hit was granted.
+        With ``commit=False`` only the check is performed.
+        """
+
+    def hit(self, keys: Sequence[str], *, epoch: int, buckets: int) -> None:
+        """Count one hit on each key without checking limits."""
+
+
+class MemoryRateLimitBackend:
+    """Process-local backend; the stand-in when no shared store is configured."""
+
+    def __init__(self) -> None:
+        self._rings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._lock = threading.Lock()
+
+    def _ring(self, key: str, buckets: int) -> Tuple[List[int], List[int]]:
+        ring = self._rings.get(key)
+        if ring is None or len(ring[0]) != buckets:
+            ring = ([-1] * buckets, [0] * buckets)
+            self._rings[key] = ring
+        return ring
+
+    def _count(self, key: str, epoch: int, buckets: int) -> int:
+        epochs, counts = self._ring(key, buckets)
+        oldest = epoch - buckets + 1
+        return sum(count for slot_epoch, count in zip(epochs, counts) if slot_epoch >= oldest)
+
+    def _hit(self, key: str, epoch: int, buckets: int) -> None:
+        epochs, counts = self._ring(key, buckets)
+        slot = epoch % buckets
+        if epochs[slot] != epoch:
+            epochs[slot] = epoch
+            counts[slot] = 0
+        counts[slot] += 1
+
+    def try_acquire(self, limits: Sequence[Limit], *, epoch: int, buckets: int, commit: bool = True) -> Optional[str]:
+        with self._lock:
+            for key, limit in limits:
+                if self._count(key, epoch, buckets) >= limit:
+                    return key
+            if commit:
+                for key, _ in limits:
+                    self._hit(key, epoch, buckets)
+        return None
+
+    def hit(self, keys: Sequence[str], *, epoch: int, buckets: int) -> None:
+        with self._lock:
+            for key in keys:
+                self._hit(key, epoch, buckets)
+
+
+# Ring slots live in one hash per key: e<slot> holds the slot epoch, c<slot> its count.
+_ACQUIRE_SCRIPT = """
+local epoch = tonumber(ARGV[1])
+local buckets = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local commit = ARGV[4] == '1'
+local oldest = epoch - buckets + 1
+for i, key in ipairs(KEYS) do
+  local limit = tonumber(ARGV[4 + i])
+  if limit >= 0 then
+    local total = 0
+    for slot = 0, buckets - 1 do
+      local slot_epoch = tonumber(redis.call('HGET', key, 'e' .. slot) or '-1')
+      if slot_epoch >= oldest then
+        total = total + tonumber(redis.call('HGET', key, 'c' .. slot) or '0')
+      end
+    end
+    if total >= limit then
+      return i
+    end
+  end
+end
+if commit then
+  local slot = epoch % buckets
+  for _, key in ipairs(KEYS) do
+    if tonumber(redis.call('HGET', key, 'e' .. slot) or '-1') ~= epoch then
+      redis.call('HSET', key, 'e' .. slot, epoch, 'c' .. slot, 0)
+    end
+    redis.call('HINCRBY', key, 'c' .. slot, 1)
+    redis.call('EXPIRE', key, ttl)
+  end
+end
+return 0
+"""
+
+
+class RedisRateLimitBackend:
+    """Redis backend shared by every process (API, worker, bot).
+
+    Check and increment run inside one Lua script, so concurrent callers in
+    different processes cannot both take the last slot of a budget.
+    """
+
+    def __init__(self, client: "redis.Redis", *, prefix: str, ttl_seconds: int) -> None:
+        self._client = client
+        self._prefix = prefix
+        self._ttl = max(1, int(ttl_seconds))
+        self._script = client.register_script(_ACQUIRE_SCRIPT)
+
+    def _run(self, limits: Sequence[Limit], *, epoch: int, buckets: int, commit: bool) -> Optional[str]:
+        keys = [f"{self._prefix}:{key}" for key, _ in limits]
+        args = [epoch, buckets, self._ttl, "1" if commit else "0", *[limit for _, limit in limits]]
+        index = int(self._script(keys=keys, args=args))
+        if index <= 0:
+            return None
+        return limits[index - 1][0]
+
+    def try_acquire(self, limits: Sequence[Limit], *, epoch: int, buckets: int, commit: bool = True) -> Optional[str]:
+        return self._run(limits, epoch=epoch, buckets=buckets, commit=commit)
+
+    def hit(self, keys: Sequence[str], *, epoch: int, buckets: int) -> None:
+        self._run([(key, -1) for key in keys], epoch=epoch, buckets=buckets, commit=True)
+
+
+def build_backend(config: RateLimitConfig) -> RateLimitBackend:
+    """Select the configured backend, degrading to memory when Redis is unavailable."""
+
+    wanted = config.backend
+    if wanted == "auto":
+        wanted = "redis" if os.getenv("ENABLE_REDIS", "false").lower() == "true" else "memory"
+    if wanted != "redis":
+        return MemoryRateLimitBackend()
+    if redis is None:
+        logger.warning("redis-py not installed; rate limits are enforced per process")
+        return MemoryRateLimitBackend()
+    try:
+        client = redis.from_url(config.redis_url, socket_timeout=5)
+        client.ping()
+        return RedisRateLimitBackend(client, prefix=config.key_prefix, ttl_seconds=config.window_seconds() * 2)
+    except Exception as exc:  # pragma: no cover - network/redis errors
+        logger.warning("Redis rate limit backend unavailable (%s); enforcing limits per process", exc)
+        return MemoryRateLimitBackend()
+
 
 class RateLimiter:
-    """Simple in-memory rate limiter for arbitrage executions."""
+    """Sliding-window rate limiter for arbitrage executions."""
 
-    def __init__(self, config: RateLimitConfig | None = None) -> None:
+    def __init__(
+        self,
+        config: RateLimitConfig | None = None,
+        *,
+        backend: RateLimitBackend | None = None,
+        time_fn: Optional[Callable[[], float]] = None,
+    ) -> None:
         self.config = config or RateLimitConfig()
-        self._per_exchange: Dict[str, Deque[float]] = defaultdict(deque)
-        self._per_symbol: Dict[str, Deque[float]] = defaultdict(deque)
+        self.backend = backend or build_backend(self.config)
+        self._time_fn = time_fn or time.time
 
-    def _prune(self, queue: Deque[float], now: float) -> None:
-        window = self.config.window_seconds()
-        while queue and now - queue[0] > window:
-            queue.popleft()
+    def _epoch(self) -> int:
+        return int(self._time_fn() // self.config.bucket_seconds())
 
-    def allow(self, buy_exchange: str, sell_exchange: str, symbol: str) -> Tuple[bool, str]:
+    def _limits(self, buy_exchange: str, sell_exchange: str, symbol: str) -> List[Limit]:
+        return [
+            (f"exchange:{buy_exchange}", self.config.max_per_exchange),
+            (f"exchange:{sell_exchange}", self.config.max_per_exchange),
+            (f"symbol:{symbol}", self.config.max_per_symbol),
+        ]
+
+    def _check(self, buy_exchange: str, sell_exchange: str, symbol: str, *, commit: bool) -> Tuple[bool, str]:
         if not self.config.enabled:
             return True, ""
-        now = time.time()
-        for key in (buy_exchange, sell_exchange):
-            q = self._per_exchange[key]
-            self._prune(q, now)
-            if len(q) >= self.config.max_per_exchange:
-                arb_rate_limited_total.labels(reason="exchange").inc()
-                return False, f"rate limit exchange {key}"
-        q_symbol = self._per_symbol[symbol]
-        self._prune(q_symbol, now)
-        if len(q_symbol) >= self.config.max_per_symbol:
-            arb_rate_limited_total.labels(reason="symbol").inc()
-            return False, f"rate limit symbol {symbol}"
-        return True, ""
+        limits = self._limits(buy_exchange, sell_exchange, symbol)
+        try:
+            blocked = self.backend.try_acquire(
+                limits,
+                epoch=self._epoch(),
+                buckets=max(1, self.config.buckets),
+                commit=commit,
+            )
+        except Exception as exc:  # pragma: no cover - runtime redis failures
+            logger.warning("Rate limit backend failed (%s); falling back to memory", exc)
+            self.backend = MemoryRateLimitBackend()
+            return self._check(buy_exchange, sell_exchange, symbol, commit=commit)
+        if blocked is None:
+            return True, ""
+        kind, _, name = blocked.partition(":")
+        arb_rate_limited_total.labels(reason=kind).inc()
+        return False, f"rate limit {kind} {name}"
+
+    def try_acquire(self, buy_exchange: str, sell_exchange: str, symbol: str) -> Tuple[bool, str]:
+        """Check and consume one execution slot atomically."""
+
+        return self._check(buy_exchange, sell_exchange, symbol, commit=True)
+
+    def allow(self, buy_exchange: str, sell_exchange: str, symbol: str) -> Tuple[bool, str]:
+        """Check limits without consuming a slot (prefer :meth:`try_acquire`)."""
+
+        return self._check(buy_exchange, sell_exchange, symbol, commit=False)
 
     def record(self, buy_exchange: str, sell_exchange: str, symbol: str) -> None:
         if not self.config.enabled:
             return
-        now = time.time()
-        for key in (buy_exchange, sell_exchange):
-            q = self._per_exchange[key]
-            q.append(now)
-        self._per_symbol[symbol].append(now)
+        keys = [key for key, _ in self._limits(buy_exchange, sell_exchange, symbol)]
+        self.backend.hit(keys, epoch=self._epoch(), buckets=max(1, self.config.buckets))
 
 
-__all__ = ["RateLimiter", "RateLimitConfig"]
+__all__ = [
+    "RateLimiter",
+    "RateLimitConfig",
+    "RateLimitBackend",
+    "MemoryRateLimitBackend",
+    "RedisRateLimitBackend",
+    "build_backend",
+]
@@ -109,6 +109,7 @@ _DEFAULT_STATE: Dict[str, Any] = {
 }
 
 _CURRENT_STATE: Dict[str, Any] | None = None
+_STATE_VERSION = 0
 
 
 def _read_state_file() -> Dict[str, Any]:
@@ -269,6 +270,11 @@ def _ensure_state_loaded() -> None:
         ops_global_stop.set(1.0 if _CURRENT_STATE.get("global_stop") else 0.0)
 
 
+def state_version() -> int:
+    """Counter bumped on every state update; lets readers cache derived values."""
+    return _STATE_VERSION
+
+
 def get_state() -> Dict[str, Any]:
     """Return a copy of the current runtime state."""
     _ensure_state_loaded()
@@ -277,6 +283,7 @@ def get_state() -> Dict[str, Any]:
 
 def set_state(update: Dict[str, Any]) -> Dict[str, Any]:
     """Merge provided keys into the runtime state."""
+    global _STATE_VERSION
     _ensure_state_loaded()
     assert _CURRENT_STATE is not None  # for type-checkers
     state = _CURRENT_STATE
@@ -314,13 +321,15 @@ def set_state(update: Dict[str, Any]) -> Dict[str, Any]:
             ops_auto_mode.set(1.0 if bool(state[key]) else 0.0)
         if key == "global_stop":
             ops_global_stop.set(1.0 if bool(state[key]) else 0.0)
+    _STATE_VERSION += 1
     _write_state_file(state)
     return get_state()
 
 
 def reset_state() -> Dict[str, Any]:
     """Reset state to defaults (primarily for tests)."""
-    global _CURRENT_STATE
+    global _CURRENT_STATE, _STATE_VERSION
     _CURRENT_STATE = deepcopy(_DEFAULT_STATE)
+    _STATE_VERSION += 1
     _write_state_file(_CURRENT_STATE)
     return get_state()
@@ -5,13 +5,17 @@ import csv
 import json
 import os
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Mapping, Optional
 
 from app.compat.dotenv import load_dotenv
 
+from .rolling import RollingArbitrageStats
+
 if TYPE_CHECKING:  # pragma: no cover - type hints only
     from app.services.arbitrage.executor_safe import ArbitrageExecutionResult
     from app.services.arbitrage.scanner import ArbitrageOpportunity
@@ -33,6 +37,11 @@ def _resolve_sqlite_path(url: str) -> Path:
 
 _DB_PATH = _resolve_sqlite_path(_DB_URL)
 
+_DAILY_BUCKET_SEC = int(os.getenv("ARB_DAILY_STATS_BUCKET_SEC", "60"))
+_DAILY_RESYNC_SEC = float(os.getenv("ARB_DAILY_STATS_RESYNC_SEC", "300"))
+_DAILY_STATS: Optional[RollingArbitrageStats] = None
+_DAILY_LOCK = threading.Lock()
+
 
 @contextmanager
 def _connect() -> Iterator[sqlite3.Connection]:
@@ -125,6 +134,35 @@ def record_trade(
         )
 
 
+def record_trades(rows: Iterable[Mapping[str, object]]) -> None:
+    """Insert several trades (``record_trade`` keyword mappings) in one transaction."""
+
+    now = datetime.utcnow().isoformat()
+    values = [
+        (
+            row.get("timestamp") or now,
+            row["symbol"],
+            row["side"],
+            row["qty"],
+            row["price"],
+            row["pnl"],
+            row.get("strategy"),
+            row.get("mode"),
+        )
+        for row in rows
+    ]
+    if not values:
+        return
+    with _connect() as conn:
+        conn.executemany(
+            """
+            INSERT INTO trades (timestamp, symbol, side, qty, price, pnl, strategy, mode)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            values,
+        )
+
+
 def record_arbitrage_proposal(
     opportunity: "ArbitrageOpportunity",
     *,
@@ -157,6 +195,10 @@ def record_arbitrage_proposal(
                 json.dumps(opportunity.meta),
             ),
         )
+    if not filtered_out:
+        with _DAILY_LOCK:
+            if _DAILY_STATS is not None:
+                _DAILY_STATS.record_proposal(opportunity.net_roi_pct)
 
 
 def record_arbitrage_execution(result: "ArbitrageExecutionResult", *, auto_trigger: bool) -> None:
@@ -179,6 +221,9 @@ def record_arbitrage_execution(result: "ArbitrageExecutionResult", *, auto_trigg
                 json.dumps(result.to_dict()),
             ),
         )
+    with _DAILY_LOCK:
+        if _DAILY_STATS is not None:
+            _DAILY_STATS.record_execution(result.status, result.pnl_usd)
 
 
 def arbitrage_daily_pnl() -> float:
@@ -239,6 +284,71 @@ def arbitrage_daily_summary() -> Dict[str, object]:
     }
 
 
+def _seed_daily_stats(stats: RollingArbitrageStats) -> None:
+    start_ts = (datetime.utcnow() - timedelta(seconds=stats.window_seconds)).isoformat()
+    width = stats.bucket_seconds
+    with _connect() as conn:
+        exec_rows = conn.execute(
+            """
+            SELECT CAST(strftime('%s', ts) AS INTEGER) / ? AS bucket,
+                   SUM(CASE WHEN status = 'FILLED' THEN pnl_usd ELSE 0 END) AS pnl,
+                   SUM(CASE WHEN status = 'FILLED' THEN 1 ELSE 0 END) AS filled,
+                   SUM(CASE WHEN status IN ('FAILED', 'REJECTED') THEN 1 ELSE 0 END) AS failed
+            FROM arbitrage_execs
+            WHERE datetime(ts) >= datetime(?)
+            GROUP BY bucket
+            """,
+            (width, start_ts),
+        ).fetchall()
+        proposal_rows = conn.execute(
+            """
+            SELECT CAST(strftime('%s', ts) AS INTEGER) / ? AS bucket,
+                   SUM(net_roi_pct) AS roi_sum, COUNT(*) AS roi_count
+            FROM arbitrage_proposals
+            WHERE datetime(ts) >= datetime(?) AND filtered_out = 0
+            GROUP BY bucket
+            """,
+            (width, start_ts),
+        ).fetchall()
+    for row in exec_rows:
+        stats.add(
+            ts=float(row["bucket"]) * width,
+            pnl=float(row["pnl"] or 0.0),
+            filled=int(row["filled"] or 0),
+            failed=int(row["failed"] or 0),
+        )
+    for row in proposal_rows:
+        stats.add(
+            ts=float(row["bucket"]) * width,
+            roi_sum=float(row["roi_sum"] or 0.0),
+            roi_count=int(row["roi_count"] or 0),
+        )
+
+
+def arbitrage_daily_stats() -> RollingArbitrageStats:
+    """Return the in-memory rolling 24h arbitrage aggregates.
+
+    The aggregator is seeded from the database on first use and then kept up
+    to date by the ``record_arbitrage_*`` writers. It is re-seeded every
+    ``ARB_DAILY_STATS_RESYNC_SEC`` seconds (0 disables) so that rows written
+    by other processes are eventually reflected.
+    """
+
+    global _DAILY_STATS
+    with _DAILY_LOCK:
+        stats = _DAILY_STATS
+        stale = (
+            stats is not None
+            and _DAILY_RESYNC_SEC > 0
+            and time.time() - stats.created_at >= _DAILY_RESYNC_SEC
+        )
+        if stats is None or stale:
+            stats = RollingArbitrageStats(bucket_seconds=_DAILY_BUCKET_SEC)
+            _seed_daily_stats(stats)
+            _DAILY_STATS = stats
+    return stats
+
+
 def fetch_arbitrage_records(limit: int = 1000, table: str = "proposals") -> List[Dict[str, object]]:
     if table not in {"proposals", "execs"}:
         raise ValueError("table must be proposals or execs")
@@ -294,6 +404,20 @@ def list_arbitrage_executions(limit: int = 20) -> List[Dict[str, object]]:
     return [dict(row) for row in rows]
 
 
+def get_arbitrage_execution(exec_id: str) -> Optional[Dict[str, object]]:
+    """Load one execution by primary key, preferring the stored result payload."""
+
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM arbitrage_execs WHERE exec_id = ?", (exec_id,)).fetchone()
+    if row is None:
+        return None
+    if row["payload_json"]:
+        return json.loads(row["payload_json"])
+    payload = dict(row)
+    payload.pop("payload_json", None)
+    return payload
+
+
 def _period_start(period: str) -> datetime:
     now = datetime.utcnow()
     if period == "day":
@@ -381,9 +505,11 @@ __all__ = [
     "arbitrage_daily_pnl",
     "arbitrage_success_counts",
     "arbitrage_daily_summary",
+    "arbitrage_daily_stats",
     "fetch_arbitrage_records",
     "list_arbitrage_proposals",
     "list_arbitrage_executions",
+    "get_arbitrage_execution",
     "list_trades",
     "pnl_summary",
     "equity_curve",
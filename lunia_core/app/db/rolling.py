@@ -0,0 +1,155 @@
+"""Rolling time-bucketed counters for daily arbitrage statistics."""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class _Bucket:
+    epoch: int = -1
+    pnl: float = 0.0
+    filled: int = 0
+    failed: int = 0
+    roi_sum: float = 0.0
+    roi_count: int = 0
+
+
+class RollingArbitrageStats:
+    """Ring of time buckets covering the trailing window (24h by default).
+
+    Every event lands in the bucket for its timestamp and updates running
+    totals, so both recording and reading are O(1) regardless of how many
+    executions the database holds. Buckets falling out of the window are
+    subtracted from the totals as the clock advances.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: int = 86_400,
+        bucket_seconds: int = 60,
+        time_fn: Optional[Callable[[], float]] = None,
+    ) -> None:
+        if bucket_seconds <= 0 or window_seconds < bucket_seconds:
+            raise ValueError("bucket_seconds must be positive and not exceed window_seconds")
+        self.bucket_seconds = int(bucket_seconds)
+        self.window_seconds = int(window_seconds)
+        self._size = self.window_seconds // self.bucket_seconds
+        self._buckets: List[_Bucket] = [_Bucket() for _ in range(self._size)]
+        self._time_fn = time_fn or time.time
+        self._lock = threading.Lock()
+        self._head: Optional[int] = None
+        self._totals = _Bucket()
+        self.created_at = self._time_fn()
+
+    # ------------------------------------------------------------------
+    def _epoch(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    def _drop(self, bucket: _Bucket) -> None:
+        totals = self._totals
+        totals.pnl -= bucket.pnl
+        totals.filled -= bucket.filled
+        totals.failed -= bucket.failed
+        totals.roi_sum -= bucket.roi_sum
+        totals.roi_count -= bucket.roi_count
+
+    def _advance(self, epoch: int) -> None:
+        if self._head is None:
+            self._head = epoch
+            return
+        if epoch <= self._head:
+            return
+        steps = epoch - self._head
+        if steps >= self._size:
+            # the whole ring expired; reset instead of subtracting to avoid drift
+            self._buckets = [_Bucket() for _ in range(self._size)]
+            self._totals = _Bucket()
+        else:
+            for current in range(self._head + 1, epoch + 1):
+                bucket = self._buckets[current % self._size]
+                if bucket.epoch != -1:
+                    self._drop(bucket)
+                self._buckets[current % self._size] = _Bucket(epoch=current)
+        self._head = epoch
+
+    def _slot(self, ts: float) -> Optional[_Bucket]:
+        epoch = self._epoch(ts)
+        self._advance(max(epoch, self._epoch(self._time_fn())))
+        assert self._head is not None
+        if epoch <= self._head - self._size:
+            return None
+        index = epoch % self._size
+        bucket = self._buckets[index]
+        if bucket.epoch != epoch:
+            if bucket.epoch != -1:
+                self._drop(bucket)
+            bucket = _Bucket(epoch=epoch)
+            self._buckets[index] = bucket
+        return bucket
+
+    # ------------------------------------------------------------------
+    def add(
+        self,
+        *,
+        ts: Optional[float] = None,
+        pnl: float = 0.0,
+        filled: int = 0,
+        failed: int = 0,
+        roi_sum: float = 0.0,
+        roi_count: int = 0,
+    ) -> None:
+        """Add raw aggregates to the bucket covering ``ts`` (used for seeding)."""
+
+        with self._lock:
+            bucket = self._slot(self._time_fn() if ts is None else ts)
+            if bucket is None:
+                return
+            for target in (bucket, self._totals):
+                target.pnl += pnl
+                target.filled += filled
+                target.failed += failed
+                target.roi_sum += roi_sum
+                target.roi_count += roi_count
+
+    def record_execution(self, status: str, pnl_usd: float, *, ts: Optional[float] = None) -> None:
+        """Account an execution row with the same rules as the SQL summary."""
+
+        status = status.upper()
+        if status == "FILLED":
+            self.add(ts=ts, pnl=float(pnl_usd), filled=1)
+        elif status in {"FAILED", "REJECTED"}:
+            self.add(ts=ts, failed=1)
+
+    def record_proposal(self, net_roi_pct: float, *, ts: Optional[float] = None) -> None:
+        """Account a proposal that survived filtering."""
+
+        self.add(ts=ts, roi_sum=float(net_roi_pct), roi_count=1)
+
+    def pnl(self) -> float:
+        with self._lock:
+            self._advance(self._epoch(self._time_fn()))
+            return self._totals.pnl
+
+    def summary(self) -> Dict[str, object]:
+        """Return the same payload as :func:`arbitrage_daily_summary`."""
+
+        with self._lock:
+            self._advance(self._epoch(self._time_fn()))
+            totals = self._totals
+            filled = totals.filled
+            failed = totals.failed
+            avg_roi = totals.roi_sum / totals.roi_count if totals.roi_count else 0.0
+            return {
+                "pnl": totals.pnl,
+                "success": filled,
+                "fail": failed,
+                "success_rate": filled / max(1, filled + failed),
+                "avg_roi": avg_roi,
+            }
+
+
+__all__ = ["RollingArbitrageStats"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
 from collections import deque
 from datetime import datetime
@@ -14,13 +15,20 @@ from flask import Flask, Response, g, jsonify, request
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
+from ...backtester.jobs import BacktestJobs, QueueFull
+from ...backtester.synthetic import generate_gbm
 from ...boot import CORES
 from ...core.ai.agent import Agent
-from ...core.ai.supervisor import Supervisor
-from ...core.ai.strategies import REGISTRY, StrategySignal
+from ...core.ai.parallel import SIGNAL_WORKERS, ShardedSupervisor
+from ...core.ai.runner import StrategyStats
+from ...core.ai.supervisor import PUSH_MODE, Supervisor
+from ...core.ai.strategies import REGISTRY
+from ...core.ai.warmstart import attach_warm_start
 from ...core.exchange.binance_futures import BinanceFutures
 from ...core.exchange.binance_spot import BinanceSpot
 from ...core.capital.allocator import CapitalAllocator
+from ...core.marketdata import MarketDataStore
+from ...core.marketdata.recorder import instrument
 from ...core.metrics import (
     api_latency_ms,
     ensure_metrics_server,
@@ -39,6 +47,7 @@ from ..auth.users import create_user, ensure_seed_admin, list_users, touch_last_
 from ..ai_research import run_research_now
 from ..arbitrage import bp as arbitrage_bp
 from ..arbitrage.worker import get_state as get_arbitrage_state
+from ..guard.reconcile import reconcile_in_flight
 from ..api.schemas import (
     ActivityItem,
     ActivityResponse,
@@ -157,13 +166,50 @@ def create_agent() -> Agent:
         use_testnet=use_testnet,
         mock=not use_testnet,
     )
+    instrument(client, "binance")
     risk = RiskManager()
-    supervisor = Supervisor(client=client)
-    return Agent(client=client, risk=risk, supervisor=supervisor)
+    # push mode evaluates each tick in-process, so it does not use shards
+    if SIGNAL_WORKERS > 1 and not PUSH_MODE:
+        supervisor = ShardedSupervisor(client=client, workers=SIGNAL_WORKERS)
+    else:
+        supervisor = Supervisor(client=client)
+    # before the first tick, so strategies resume with the pre-restart history
+    attach_warm_start(supervisor)
+    agent = Agent(client=client, risk=risk, supervisor=supervisor)
+    if PUSH_MODE:
+        supervisor.subscribe(agent.bus)
+    return agent
 
 
 agent = create_agent()
 supervisor = agent.supervisor
+try:
+    market_data: Optional[MarketDataStore] = MarketDataStore()
+except RuntimeError:  # numpy missing
+    market_data = None
+backtest_jobs = BacktestJobs()
+_startup_lock = threading.Lock()
+_started = False
+
+
+def startup() -> None:
+    """Run once per serving process: reconcile executions a crashed process left in flight.
+
+    Kept out of import so tools and tests that import this module do not
+    claim other processes' journals or raise recovery alerts.
+    """
+
+    global _started
+    with _startup_lock:
+        if _started:
+            return
+        _started = True
+    try:
+        reconcile_in_flight()
+    except Exception as exc:  # pragma: no cover - recovery must not block startup
+        logger.error("execution journal recovery failed: %s", exc)
+
+
 futures_risk = RiskManager()
 
 
@@ -171,12 +217,13 @@ def create_futures_client() -> BinanceFutures:
     use_testnet = os.getenv("BINANCE_FUTURES_TESTNET", "true").lower() == "true"
     api_key = os.getenv("BINANCE_FUTURES_API_KEY")
     api_secret = os.getenv("BINANCE_FUTURES_API_SECRET")
-    return BinanceFutures(
+    client = BinanceFutures(
         api_key=api_key,
         api_secret=api_secret,
         use_testnet=use_testnet,
         mock=not use_testnet,
     )
+    return instrument(client, "binance_futures")
 
 
 futures_client = create_futures_client()
@@ -200,6 +247,12 @@ def _add_cors_headers(response: Response) -> Response:
     return response
 
 
+@app.before_request
+def _startup_once() -> None:
+    # ``flask run`` has no startup hook, so the first request triggers it
+    startup()
+
+
 @app.before_request
 def _inject_db_and_user() -> None:
     g.db = get_session()
@@ -610,6 +663,26 @@ def admin_audit() -> Any:
     return jsonify({"items": payload})
 
 
+@app.get("/admin/strategies/hot")
+@_measure_latency
+@require_role("ADMIN", ops_token=OPS_TOKEN)
+def admin_hot_strategies() -> Any:
+    args = request.args
+    limit = min(int(args.get("limit", 10)), 100)
+    sort = args.get("sort", "total_ms")
+    if sort not in StrategyStats.__dataclass_fields__ and sort != "avg_call_ms":
+        return jsonify({"error": "invalid_sort"}), 400
+    runner = supervisor.runner
+    return jsonify(
+        {
+            "items": runner.hottest(limit, key=sort),
+            "sort": sort,
+            "cycle_budget_ms": runner.cycle_budget_ms,
+            "strategy_budget_ms": runner.strategy_budget_ms,
+        }
+    )
+
+
 @app.get("/ops/activity")
 @_measure_latency
 def ops_activity() -> Any:
@@ -828,41 +901,127 @@ def spot_risk_update() -> Any:
     return jsonify(OpsState.parse_obj(state).dict())
 
 
+def _backtest_prices(body: Dict[str, Any], symbol: str, days: int) -> Any:
+    """Prices to backtest: the request's, stored bars, recent ticks, or synthetic bars."""
+
+    prices = [float(price) for price in body.get("prices") or []]
+    if not prices and market_data is not None:
+        stored = market_data.bars(symbol, start=time.time() - max(days, 1) * 86_400, columns=["close"])
+        prices = stored["close"] if len(stored) >= 2 else []
+    if not len(prices):
+        prices = list(supervisor.price_history.window(symbol))
+    if len(prices) < 2:
+        # no recorded history: replay synthetic minute bars from the last known price
+        prices = generate_gbm(prices[-1] if prices else 100.0, max(days, 1) * 1440, seed=body.get("seed"))
+    return prices
+
+
+def _submit_backtest(body: Dict[str, Any], strategies: List[str]) -> Any:
+    """Queue a backtest job for ``body``; identical requests share a job or a cached result."""
+
+    symbol = str(body.get("symbol", "BTCUSDT"))
+    days = int(body.get("days", 7))
+    job_request = {
+        "strategies": strategies,
+        "symbol": symbol,
+        "params": dict(body.get("params") or {}),
+        "weights": dict(body.get("weights") or {}),
+        "state": get_runtime_state(),
+    }
+    # seed synthetic fallbacks so identical requests hit the result cache
+    prices = _backtest_prices({"seed": 0, **body}, symbol, days)
+    return backtest_jobs.submit(job_request, prices)
+
+
 @app.post("/spot/backtest")
 @_measure_latency
 @require_role("ADMIN", ops_token=OPS_TOKEN)
 def spot_backtest() -> Any:
+    """Backtest one strategy on the job pool; 202 with the job until its result is cached."""
+
     body = request.get_json(force=True) or {}
     strategy = str(body.get("strategy", "scalping_breakout"))
     symbol = str(body.get("symbol", "BTCUSDT"))
-    days = int(body.get("days", 7))
-    func = REGISTRY.get(strategy)
-    if func is None:
+    if strategy not in REGISTRY:
         return jsonify({"error": "unknown strategy"}), 400
-    state = get_runtime_state()
-    prices = list(supervisor.price_history.get(symbol, deque([100.0], maxlen=200)))
-    if not prices:
-        prices = [100.0]
-    results: List[StrategySignal] = []
-    ctx = {
-        "sl_pct_default": state.get("spot", {}).get("sl_pct_default", 0.15),
-        "tp_pct_default": state.get("spot", {}).get("tp_pct_default", 0.30),
-        "reference_prices": {symbol: prices},
-    }
-    for _ in range(max(days, 1)):
-        outputs = func(symbol, prices, ctx)
-        results.extend(outputs)
-        prices.append(prices[-1] * 1.001)
-    pnl_estimate = sum(signal.take_pct - signal.stop_pct for signal in results)
+    try:
+        job = _submit_backtest(body, [strategy])
+    except QueueFull as exc:
+        return jsonify({"error": str(exc)}), 429
+    if job.status != "done":
+        return jsonify({"strategy": strategy, "symbol": symbol, **job.to_dict()}), 202
+    result = job.result or {}
     payload = {
         "strategy": strategy,
         "symbol": symbol,
-        "trades": len(results),
-        "pnl_estimate_pct": pnl_estimate,
+        "job_id": job.job_id,
+        "bars": result.get("bars", 0),
+        "trades": result.get("trades", 0),
+        "win_rate": result.get("win_rate", 0.0),
+        "total_return_pct": result.get("total_return_pct", 0.0),
+        "max_drawdown_pct": result.get("max_drawdown_pct", 0.0),
+        "per_strategy": result.get("per_strategy", {}),
+        "pnl_estimate_pct": result.get("total_return_pct", 0.0),
     }
     return jsonify(payload)
 
 
+@app.post("/spot/backtest/jobs")
+@_measure_latency
+@require_role("ADMIN", ops_token=OPS_TOKEN)
+def spot_backtest_submit() -> Any:
+    body = request.get_json(force=True) or {}
+    strategies = body.get("strategies") or [body.get("strategy", "scalping_breakout")]
+    strategies = [str(name) for name in strategies]
+    unknown = [name for name in strategies if name not in REGISTRY]
+    if unknown:
+        return jsonify({"error": "unknown strategy", "strategies": unknown}), 400
+    try:
+        job = _submit_backtest(body, strategies)
+    except QueueFull as exc:
+        return jsonify({"error": str(exc)}), 429
+    return jsonify(job.to_dict()), 200 if job.finished else 202
+
+
+@app.get("/spot/backtest/jobs")
+@_measure_latency
+@require_role("ADMIN", ops_token=OPS_TOKEN)
+def spot_backtest_jobs() -> Any:
+    return jsonify({"jobs": [job.to_dict() for job in backtest_jobs.list()]})
+
+
+@app.get("/spot/backtest/jobs/<job_id>")
+@_measure_latency
+@require_role("ADMIN", ops_token=OPS_TOKEN)
+def spot_backtest_job(job_id: str) -> Any:
+    job = backtest_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.post("/spot/backtest/jobs/<job_id>/cancel")
+@_measure_latency
+@require_role("ADMIN", ops_token=OPS_TOKEN)
+def spot_backtest_cancel(job_id: str) -> Any:
+    job = backtest_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.get("/spot/backtest/jobs/<job_id>/result")
+@_measure_latency
+@require_role("ADMIN", ops_token=OPS_TOKEN)
+def spot_backtest_result(job_id: str) -> Any:
+    job = backtest_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job"}), 404
+    if job.status != "done":
+        return jsonify(job.to_dict()), 409
+    return jsonify({"job_id": job.job_id, "cached": job.cached, "result": job.result})
+
+
 @app.post("/trade/spot/demo")
 @_measure_latency
 @require_role("TRADER", "ADMIN", ops_token=OPS_TOKEN)
@@ -995,7 +1154,7 @@ def signals_feed() -> Any:
         )
         for item in signals
     ]
-    payload = SignalsFeed(items=feed, cursor=None)
+    payload = SignalsFeed(items=feed, cursor=None, warmup=supervisor.warmup_status())
     return jsonify(payload.dict())
 
 
@@ -1145,4 +1304,5 @@ def metrics_endpoint() -> Response:
 if __name__ == "__main__":  # pragma: no cover
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8080"))
+    startup()
     app.run(host=host, port=port)
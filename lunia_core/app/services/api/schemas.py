@@ -230,9 +230,16 @@ class SignalFeedItem(BaseModel):
     source: str
 
 
+class SymbolWarmup(BaseModel):
+    samples: int
+    ready: bool
+    waiting: Dict[str, int] = Field(default_factory=dict)
+
+
 class SignalsFeed(BaseModel):
     items: List[SignalFeedItem]
     cursor: Optional[str] = None
+    warmup: Dict[str, SymbolWarmup] = Field(default_factory=dict)
 
 
 class PortfolioAggregate(BaseModel):
@@ -115,6 +115,7 @@ def get_status() -> Any:
     return jsonify(data)
 
 
+@bp.get("/exec/<exec_id>")
 @bp.get("/status/<exec_id>")
 def get_exec_status(exec_id: str) -> Any:
     execution = get_execution(exec_id)
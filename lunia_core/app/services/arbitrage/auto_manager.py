@@ -2,10 +2,15 @@
 from __future__ import annotations
 
 import logging
+import queue
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Deque, List, Optional, Set, Tuple
 
+from app.core.metrics import arb_auto_decisions_total, arb_auto_reaction_ms
+from app.core.risk.rate_limit import RateLimiter
 from app.core.state import get_state
 
 from .scanner import ArbitrageFilters, ArbitrageOpportunity
@@ -13,6 +18,8 @@ from .strategy import ArbitrageStrategy, StrategyDecision
 
 logger = logging.getLogger(__name__)
 
+ScanBatch = Tuple[List[ArbitrageOpportunity], ArbitrageFilters]
+
 
 @dataclass
 class AutoResult:
@@ -21,38 +28,152 @@ class AutoResult:
 
 
 class ArbitrageAutoManager:
-    """Runs periodic scans & executions when auto mode is enabled."""
+    """Executes fresh scan results as soon as they arrive when auto mode is enabled.
+
+    ``submit`` is called with every scan result; a dispatcher thread evaluates
+    the newest batch against the strategy and the rate limiter. Each proposal
+    is evaluated at most once. ``maybe_run`` keeps the interval-gated
+    scan-and-execute path for explicit ticks.
+    """
 
     def __init__(
         self,
         scanner_callback: Callable[[ArbitrageFilters], list[ArbitrageOpportunity]],
         executor_callback: Callable[[ArbitrageOpportunity], None],
         strategy: Optional[ArbitrageStrategy] = None,
+        *,
+        rate_limiter: Optional[RateLimiter] = None,
+        on_result: Optional[Callable[[AutoResult], None]] = None,
+        seen_limit: int = 2048,
     ) -> None:
         self._scanner = scanner_callback
         self._executor = executor_callback
         self._strategy = strategy or ArbitrageStrategy()
+        self._rate_limiter = rate_limiter
+        self._on_result = on_result
         self._last_run: float = 0.0
+        self._seen: Deque[str] = deque()
+        self._seen_ids: Set[str] = set()
+        self._seen_limit = max(1, seen_limit)
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[ScanBatch]" = queue.Queue(maxsize=1)
+        self._thread: Optional[threading.Thread] = None
+        self.last_result: Optional[AutoResult] = None
 
-    def maybe_run(self, filters: ArbitrageFilters) -> AutoResult:
+    # Event path ------------------------------------------------------------
+    def start(self) -> None:
+        """Start the dispatcher thread; without it ``submit`` evaluates inline."""
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._dispatch_loop, name="arbitrage-auto", daemon=True)
+        self._thread.start()
+
+    def submit(self, opportunities: List[ArbitrageOpportunity], filters: ArbitrageFilters) -> None:
+        """Hand a fresh scan result to auto mode.
+
+        Only the newest batch matters, so a batch still waiting in the queue is
+        replaced rather than evaluated late.
+        """
+
+        if self._thread is None or not self._thread.is_alive():
+            self.handle(opportunities, filters)
+            return
+        batch = (list(opportunities), filters)
+        while True:
+            try:
+                self._queue.put_nowait(batch)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _dispatch_loop(self) -> None:  # pragma: no cover - background thread
+        while True:
+            opportunities, filters = self._queue.get()
+            try:
+                self.handle(opportunities, filters)
+            except Exception as exc:
+                logger.error("auto arbitrage dispatch failed: %s", exc)
+
+    def _gate(self) -> Optional[AutoResult]:
         state = get_state()
         if state.get("global_stop") or not state.get("arb_on", True):
             logger.info("auto arbitrage skipped due to global stop/arb_off")
             return AutoResult(decision=StrategyDecision(None, "stopped"), executed=False)
         if not state.get("arb", {}).get("auto_mode", False):
             return AutoResult(decision=StrategyDecision(None, "auto_disabled"), executed=False)
+        return None
+
+    def _claim(self, opportunities: List[ArbitrageOpportunity]) -> List[ArbitrageOpportunity]:
+        fresh: List[ArbitrageOpportunity] = []
+        for opportunity in opportunities:
+            if opportunity.proposal_id in self._seen_ids:
+                continue
+            self._seen_ids.add(opportunity.proposal_id)
+            self._seen.append(opportunity.proposal_id)
+            fresh.append(opportunity)
+        while len(self._seen) > self._seen_limit:
+            self._seen_ids.discard(self._seen.popleft())
+        return fresh
+
+    def _finish(self, result: AutoResult) -> AutoResult:
+        self.last_result = result
+        arb_auto_decisions_total.labels(reason=result.decision.reason).inc()
+        if self._on_result is not None:
+            self._on_result(result)
+        return result
+
+    def handle(self, opportunities: List[ArbitrageOpportunity], filters: ArbitrageFilters) -> AutoResult:
+        """Evaluate a scan result immediately and execute the selected proposal."""
+
+        with self._lock:
+            gated = self._gate()
+            if gated is not None:
+                return self._finish(gated)
+            fresh = self._claim(opportunities)
+            if not fresh:
+                return self._finish(AutoResult(decision=StrategyDecision(None, "no_fresh"), executed=False))
+            candidates = fresh
+            if self._rate_limiter is not None:
+                candidates = [
+                    opp
+                    for opp in fresh
+                    if self._rate_limiter.allow(opp.buy_exchange, opp.sell_exchange, opp.symbol)[0]
+                ]
+                if not candidates:
+                    return self._finish(AutoResult(decision=StrategyDecision(None, "rate_limited"), executed=False))
+            decision = self._strategy.select(candidates, filters)
+            if decision.opportunity is None:
+                return self._finish(AutoResult(decision=decision, executed=False))
+            created_at = decision.opportunity.created_at
+            if created_at:
+                arb_auto_reaction_ms.observe(max(0.0, (time.time() - created_at) * 1000))
+            try:
+                self._executor(decision.opportunity)
+            except Exception as exc:
+                logger.warning("auto arbitrage execution failed proposal=%s: %s", decision.opportunity.proposal_id, exc)
+                return self._finish(AutoResult(decision=StrategyDecision(decision.opportunity, "exec_failed"), executed=False))
+            self._last_run = time.time()
+            return self._finish(AutoResult(decision=decision, executed=True))
+
+    # Tick path -------------------------------------------------------------
+    def maybe_run(self, filters: ArbitrageFilters) -> AutoResult:
+        gated = self._gate()
+        if gated is not None:
+            return gated
+        state = get_state()
         now = time.time()
         interval = max(5, int(state.get("arb", {}).get("interval", 60)))
         if now - self._last_run < interval:
             return AutoResult(decision=StrategyDecision(None, "interval_wait"), executed=False)
         opportunities = self._scanner(filters)
-        decision = self._strategy.select(opportunities, filters)
-        if decision.opportunity is None:
+        result = self.handle(opportunities, filters)
+        if not result.executed:
             self._last_run = now
-            return AutoResult(decision=decision, executed=False)
-        self._executor(decision.opportunity)
-        self._last_run = time.time()
-        return AutoResult(decision=decision, executed=True)
+        return result
 
 
 __all__ = ["ArbitrageAutoManager", "AutoResult"]
@@ -9,9 +9,10 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 from app.compat.dotenv import load_dotenv
+from app.core.journal import ExecutionJournal, get_journal
 from app.core.metrics import (
     arb_execution_latency_ms,
     arb_execs_total,
@@ -82,12 +83,23 @@ class SafeArbitrageExecutor:
         *,
         admin_pin_hash: Optional[str] = None,
         rate_limiter: RateLimiter | None = None,
+        journal: ExecutionJournal | None = None,
+        record: bool = True,
+        state: Optional[Mapping[str, Any]] = None,
     ) -> None:
+        # record=False keeps executions out of the journal, the execution log
+        # and the reporting database; state pins global_stop, exec_mode and
+        # portfolio_equity instead of reading the live runtime state (replays)
+        self.record = record
+        self._state = dict(state) if state is not None else None
         self.portfolio = portfolio
         self.risk = risk
         self.admin_pin_hash = admin_pin_hash or os.getenv("ADMIN_PIN_HASH", "")
         self.total_pnl = 0.0
         self.rate_limiter = rate_limiter or RateLimiter(RateLimitConfig())
+        if journal is None and record:
+            journal = get_journal()
+        self.journal = journal
 
     def _verify_pin(self, pin: Optional[str]) -> bool:
         if not self.admin_pin_hash:
@@ -107,7 +119,7 @@ class SafeArbitrageExecutor:
         double_confirm: bool = False,
         auto_trigger: bool = False,
     ) -> ArbitrageExecutionResult:
-        state = get_state()
+        state = self._state if self._state is not None else get_state()
         if state.get("global_stop"):
             raise RuntimeError("Global stop enabled")
         mode = (mode or state.get("exec_mode") or "dry").lower()
@@ -118,16 +130,6 @@ class SafeArbitrageExecutor:
         steps: List[Dict[str, Any]] = []
         arb_execs_total.labels(mode=mode).inc()
 
-        if self.rate_limiter:
-            allowed, reason = self.rate_limiter.allow(
-                opportunity.buy_exchange,
-                opportunity.sell_exchange,
-                opportunity.symbol,
-            )
-            if not allowed:
-                arb_fail_total.labels(mode=mode, stage="rate_limit").inc()
-                raise ValueError(reason)
-
         if mode == "real":
             if not double_confirm:
                 arb_fail_total.labels(mode=mode, stage="confirm").inc()
@@ -153,9 +155,55 @@ class SafeArbitrageExecutor:
             arb_fail_total.labels(mode=mode, stage="risk").inc()
             raise ValueError(f"risk rejected: {reason}")
 
+        # Acquire last so that only executions that actually go out consume budget;
+        # check-and-increment is atomic across every process sharing the backend.
+        if self.rate_limiter:
+            allowed, reason = self.rate_limiter.try_acquire(
+                opportunity.buy_exchange,
+                opportunity.sell_exchange,
+                opportunity.symbol,
+            )
+            if not allowed:
+                arb_fail_total.labels(mode=mode, stage="rate_limit").inc()
+                raise ValueError(reason)
+
         steps.append({"stage": "reserve", "status": "ok", "qty_usd": opportunity.qty_usd})
+        if self.journal is not None:
+            self.journal.begin(
+                exec_id,
+                "arbitrage",
+                {
+                    "proposal_id": opportunity.proposal_id,
+                    "mode": mode,
+                    "symbol": opportunity.symbol,
+                    "buy_exchange": opportunity.buy_exchange,
+                    "sell_exchange": opportunity.sell_exchange,
+                    "qty_usd": opportunity.qty_usd,
+                    "auto_trigger": auto_trigger,
+                },
+            )
+        try:
+            return self._run_legs(exec_id, opportunity, mode, start, steps, transfer_preference, auto_trigger)
+        except Exception as exc:
+            self._journal_end(exec_id, "FAILED", {"error": str(exc), "steps": steps})
+            raise
 
+    def _run_legs(
+        self,
+        exec_id: str,
+        opportunity: ArbitrageOpportunity,
+        mode: str,
+        start: float,
+        steps: List[Dict[str, Any]],
+        transfer_preference: str,
+        auto_trigger: bool,
+    ) -> ArbitrageExecutionResult:
         asset_qty = opportunity.qty_usd / max(opportunity.buy_price, 1e-6)
+        self._journal_intent(
+            exec_id,
+            "buy",
+            {"exchange": opportunity.buy_exchange, "price": opportunity.buy_price, "qty": asset_qty},
+        )
         steps.append(
             {
                 "stage": "buy",
@@ -171,10 +219,18 @@ class SafeArbitrageExecutor:
             qty=asset_qty,
             price=opportunity.buy_price,
         )
+        self._journal_outcome(exec_id, "buy", steps[-1])
 
+        self._journal_intent(exec_id, "transfer", {"preference": transfer_preference, "qty": asset_qty})
         transfer_result = self._handle_transfer(opportunity, transfer_preference)
         steps.append({"stage": "transfer", **transfer_result.to_dict()})
+        self._journal_outcome(exec_id, "transfer", steps[-1])
 
+        self._journal_intent(
+            exec_id,
+            "sell",
+            {"exchange": opportunity.sell_exchange, "price": opportunity.sell_price, "qty": asset_qty},
+        )
         steps.append(
             {
                 "stage": "sell",
@@ -190,6 +246,7 @@ class SafeArbitrageExecutor:
             qty=asset_qty,
             price=opportunity.sell_price,
         )
+        self._journal_outcome(exec_id, "sell", steps[-1])
 
         pnl_usd = sell_pnl or opportunity.net_profit_usd
         fees_usd = opportunity.meta.get("fees", {}).get("transfer_fee_usd", 0.0)
@@ -206,12 +263,6 @@ class SafeArbitrageExecutor:
         arb_success_total.labels(mode=mode).inc()
         arb_net_profit_total_usd.set(self.total_pnl)
         arb_execution_latency_ms.labels(mode=mode).observe((completed - start) * 1000)
-        if self.rate_limiter:
-            self.rate_limiter.record(
-                opportunity.buy_exchange,
-                opportunity.sell_exchange,
-                opportunity.symbol,
-            )
 
         result = ArbitrageExecutionResult(
             exec_id=exec_id,
@@ -225,10 +276,24 @@ class SafeArbitrageExecutor:
             message="executed",
             steps=steps,
         )
-        self._write_log(result)
-        record_arbitrage_execution(result, auto_trigger=auto_trigger)
+        if self.record:
+            self._write_log(result)
+            record_arbitrage_execution(result, auto_trigger=auto_trigger)
+        self._journal_end(exec_id, result.status, {"pnl_usd": pnl_usd})
         return result
 
+    def _journal_intent(self, exec_id: str, stage: str, data: Dict[str, Any]) -> None:
+        if self.journal is not None:
+            self.journal.intent(exec_id, stage, data)
+
+    def _journal_outcome(self, exec_id: str, stage: str, data: Dict[str, Any]) -> None:
+        if self.journal is not None:
+            self.journal.outcome(exec_id, stage, data)
+
+    def _journal_end(self, exec_id: str, status: str, data: Dict[str, Any]) -> None:
+        if self.journal is not None:
+            self.journal.end(exec_id, status, data)
+
     def _handle_transfer(
         self, opportunity: ArbitrageOpportunity, transfer_preference: str
     ) -> TransferResult:
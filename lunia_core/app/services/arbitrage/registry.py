@@ -0,0 +1,86 @@
+"""Bounded in-memory registry of arbitrage executions backed by the database."""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from app.core.metrics import (
+    arb_exec_registry_evictions_total,
+    arb_exec_registry_hit_ratio,
+    arb_exec_registry_lookups_total,
+    arb_exec_registry_size,
+)
+from app.db.reporting import get_arbitrage_execution
+
+Payload = Dict[str, object]
+
+
+class ExecutionRegistry:
+    """LRU cache of execution payloads keyed by ``exec_id``.
+
+    The most recently stored or read executions stay in memory; older ones
+    are evicted and, when requested again, reloaded from ``arbitrage_execs``
+    through ``loader`` so any recorded execution can still be looked up.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        *,
+        loader: Optional[Callable[[str], Optional[Payload]]] = None,
+    ) -> None:
+        if capacity is None:
+            capacity = int(os.getenv("ARB_EXEC_REGISTRY_SIZE", "1000"))
+        self.capacity = max(1, int(capacity))
+        self._loader = loader or get_arbitrage_execution
+        self._items: "OrderedDict[str, Payload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.lookups = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, exec_id: object) -> bool:
+        return exec_id in self._items
+
+    def _store(self, exec_id: str, payload: Payload) -> None:
+        self._items[exec_id] = payload
+        self._items.move_to_end(exec_id)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+            self.evictions += 1
+            arb_exec_registry_evictions_total.inc()
+        arb_exec_registry_size.set(len(self._items))
+
+    def put(self, exec_id: str, payload: Payload) -> None:
+        with self._lock:
+            self._store(exec_id, payload)
+
+    def get(self, exec_id: str) -> Optional[Payload]:
+        with self._lock:
+            self.lookups += 1
+            payload = self._items.get(exec_id)
+            if payload is not None:
+                self._items.move_to_end(exec_id)
+                self.hits += 1
+                arb_exec_registry_lookups_total.labels(source="memory").inc()
+                arb_exec_registry_hit_ratio.set(self.hit_ratio())
+                return payload
+        # the database read happens outside the lock so slow lookups do not block writers
+        payload = self._loader(exec_id)
+        with self._lock:
+            arb_exec_registry_lookups_total.labels(source="db" if payload is not None else "miss").inc()
+            arb_exec_registry_hit_ratio.set(self.hit_ratio())
+            if payload is not None and exec_id not in self._items:
+                self._store(exec_id, payload)
+        return payload
+
+    def hit_ratio(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+__all__ = ["ExecutionRegistry"]
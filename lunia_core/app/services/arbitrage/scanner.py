@@ -95,7 +95,14 @@ class ArbitrageScanner:
         symbols: Sequence[str],
         qty_usd: float,
         limits_path: Optional[Path] = None,
+        *,
+        arb_state: Optional[Mapping[str, Any]] = None,
+        priority_scores: Optional[Mapping[str, float]] = None,
     ) -> None:
+        # arb_state / priority_scores pin sizing and ranking inputs instead of
+        # reading the live runtime state and research worker (replays)
+        self._arb_state = dict(arb_state) if arb_state is not None else None
+        self._priority_scores = dict(priority_scores) if priority_scores is not None else None
         self._exchanges = dict(exchanges)
         self._symbols = list(symbols)
         self._qty_usd = float(qty_usd)
@@ -122,7 +129,7 @@ class ArbitrageScanner:
 
         arb_scans_total.inc()
         start = time.time()
-        self._priority_cache = get_priority_scores()
+        self._priority_cache = self._load_priority_scores()
         raw: List[ArbitrageOpportunity] = []
         for symbol in self._symbols:
             for buy, sell in itertools.permutations(self._exchanges.keys(), 2):
@@ -243,9 +250,14 @@ class ArbitrageScanner:
         )
         return opportunity
 
+    def _load_priority_scores(self) -> Dict[str, float]:
+        if self._priority_scores is not None:
+            return dict(self._priority_scores)
+        return get_priority_scores()
+
     def _priority_weight(self, symbol: str) -> float:
         if not self._priority_cache:
-            self._priority_cache = get_priority_scores()
+            self._priority_cache = self._load_priority_scores()
         score = self._priority_cache.get(symbol)
         if score is None:
             return 0.0
@@ -261,8 +273,7 @@ class ArbitrageScanner:
         depth_buy: float,
         depth_sell: float,
     ) -> float:
-        state = get_state()
-        arb_state = state.get("arb", {})
+        arb_state = self._arb_state if self._arb_state is not None else get_state().get("arb", {})
         base_qty = float(arb_state.get("qty_usd", self._qty_usd))
         min_qty = float(arb_state.get("qty_min_usd", base_qty))
         max_qty = float(arb_state.get("qty_max_usd", max(base_qty, min_qty)))
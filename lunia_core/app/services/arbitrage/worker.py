@@ -12,6 +12,7 @@ from app.core.bus import get_bus
 from app.core.exchange.binance_spot import BinanceSpot
 from app.core.exchange.bybit_spot import BybitSpot
 from app.core.exchange.okx_spot import OKXSpot
+from app.core.marketdata.recorder import instrument
 from app.core.metrics import (
     arb_auto_execs_total,
     arb_daily_pnl_usd,
@@ -23,13 +24,13 @@ from app.core.portfolio.portfolio import Portfolio
 from app.core.risk.manager import RiskManager
 from app.core.risk.rate_limit import RateLimiter
 from app.core.state import get_state as get_runtime_state, set_state
-from app.db.reporting import arbitrage_daily_pnl
+from app.db.reporting import arbitrage_daily_stats
 from app.services.guard.alerts import evaluate_and_alert
 from app.services.reports.exporter import get_exporter
-from app.db.reporting import arbitrage_daily_summary
 
-from .auto_manager import ArbitrageAutoManager
+from .auto_manager import ArbitrageAutoManager, AutoResult
 from .executor_safe import ArbitrageExecutionResult, SafeArbitrageExecutor
+from .registry import ExecutionRegistry
 from .scanner import ArbitrageFilters, ArbitrageOpportunity, ArbitrageScanner
 from .strategy import ArbitrageStrategy
 
@@ -44,7 +45,7 @@ class RuntimeSnapshot:
     last_opportunities: List[Dict[str, object]] = field(default_factory=list)
     last_objects: List[ArbitrageOpportunity] = field(default_factory=list)
     history: Deque[Dict[str, object]] = field(default_factory=lambda: deque(maxlen=50))
-    executions: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    executions: ExecutionRegistry = field(default_factory=ExecutionRegistry)
     last_execution: Optional[Dict[str, object]] = None
     total_executions: int = 0
     total_pnl: float = 0.0
@@ -73,7 +74,7 @@ class RuntimeSnapshot:
 
     def register_execution(self, result: ArbitrageExecutionResult, auto_trigger: bool) -> None:
         payload = result.to_dict()
-        self.executions[result.exec_id] = payload
+        self.executions.put(result.exec_id, payload)
         self.last_execution = payload
         self.total_executions += 1
         self.total_pnl = payload.get("pnl_usd", 0.0) + self.total_pnl
@@ -86,8 +87,12 @@ class RuntimeSnapshot:
             self.fail_count += 1
         total_attempts = max(1, self.success_count + self.fail_count)
         arb_success_rate.set(self.success_count / total_attempts)
-        arb_daily_pnl_usd.set(arbitrage_daily_pnl())
-        evaluate_and_alert(arbitrage_daily_summary())
+        self._publish_daily()
+
+    def _publish_daily(self) -> None:
+        stats = arbitrage_daily_stats().summary()
+        arb_daily_pnl_usd.set(float(stats["pnl"]))
+        evaluate_and_alert(stats)
 
     def get_execution(self, exec_id: str) -> Optional[Dict[str, object]]:
         return self.executions.get(exec_id)
@@ -96,8 +101,7 @@ class RuntimeSnapshot:
         self.fail_count += 1
         total_attempts = max(1, self.success_count + self.fail_count)
         arb_success_rate.set(self.success_count / total_attempts)
-        arb_daily_pnl_usd.set(arbitrage_daily_pnl())
-        evaluate_and_alert(arbitrage_daily_summary())
+        self._publish_daily()
 
 
 _RUNTIME = RuntimeSnapshot()
@@ -108,12 +112,12 @@ _AUTO_MANAGER: ArbitrageAutoManager | None = None
 
 
 def _init_components() -> None:
-    global _SCANNER, _EXECUTOR, _AUTO_MANAGER
+    global _SCANNER, _EXECUTOR
     if _SCANNER is None:
         exchanges = {
-            "binance": BinanceSpot(),
-            "okx": OKXSpot(),
-            "bybit": BybitSpot(),
+            "binance": instrument(BinanceSpot(), "binance"),
+            "okx": instrument(OKXSpot(), "okx"),
+            "bybit": instrument(BybitSpot(), "bybit"),
         }
         state = get_runtime_state()
         qty_usd = float(state.get("arb", {}).get("qty_usd", 100.0))
@@ -125,11 +129,41 @@ def _init_components() -> None:
             risk=RiskManager(),
             rate_limiter=RateLimiter(),
         )
-    if _AUTO_MANAGER is None:
-        _AUTO_MANAGER = ArbitrageAutoManager(_scan_for_auto, _execute_for_auto)
+        _recover_executions()
     ensure_metrics_server(9102)
 
 
+def _auto_manager() -> ArbitrageAutoManager:
+    """The auto manager; only :func:`run_worker` starts its dispatcher thread."""
+
+    global _AUTO_MANAGER
+    _init_components()
+    assert _EXECUTOR is not None
+    if _AUTO_MANAGER is None:
+        _AUTO_MANAGER = ArbitrageAutoManager(
+            _scan_for_auto,
+            _execute_for_auto,
+            _STRATEGY,
+            rate_limiter=_EXECUTOR.rate_limiter,
+            on_result=_record_auto_result,
+        )
+    return _AUTO_MANAGER
+
+
+def _recover_executions() -> None:
+    from app.services.guard.reconcile import reconcile_in_flight
+
+    try:
+        reports = reconcile_in_flight()
+    except Exception as exc:  # pragma: no cover - recovery must not block startup
+        logger.error("execution journal recovery failed: %s", exc)
+        return
+    for report in reports:
+        if report.get("kind") == "arbitrage":
+            _RUNTIME.executions.put(str(report["exec_id"]), report)
+            _RUNTIME.last_execution = report
+
+
 def _build_filters() -> ArbitrageFilters:
     state = get_runtime_state()
     arb_state = state.get("arb", {})
@@ -144,7 +178,10 @@ def _build_filters() -> ArbitrageFilters:
     )
 
 
-def scan_now() -> List[Dict[str, object]]:
+def scan_now(*, auto: bool = False) -> List[Dict[str, object]]:
+    """Scan once. Only the worker loop passes ``auto=True`` to hand results to auto mode;
+    status views must not place trades."""
+
     _init_components()
     assert _SCANNER is not None
     filters = _build_filters()
@@ -157,6 +194,8 @@ def scan_now() -> List[Dict[str, object]]:
     _RUNTIME.last_latency_ms = latency_ms
     _RUNTIME.last_opportunities = serialized
     _RUNTIME.last_objects = opportunities
+    if auto:
+        _auto_manager().submit(opportunities, filters)
     exporter = get_exporter()
     if exporter:
         try:
@@ -193,6 +232,10 @@ def _execute_for_auto(opportunity: ArbitrageOpportunity) -> None:
     execute_opportunity(opportunity, auto_trigger=True)
 
 
+def _record_auto_result(result: AutoResult) -> None:
+    _RUNTIME.last_decision = result.decision.reason
+
+
 def execute_opportunity(
     opportunity: ArbitrageOpportunity,
     *,
@@ -272,23 +315,16 @@ def get_execution(exec_id: str) -> Optional[Dict[str, object]]:
 
 def run_worker() -> None:  # pragma: no cover - long running loop
     interval = int(os.getenv("ARB_SCAN_INTERVAL", "60"))
-    _init_components()
+    _auto_manager().start()
     while True:
-        filters = _build_filters()
-        scan_now()
-        if _AUTO_MANAGER is not None:
-            outcome = _AUTO_MANAGER.maybe_run(filters)
-            _RUNTIME.last_decision = outcome.decision.reason
+        # every paced scan goes to the auto manager as it is produced
+        scan_now(auto=True)
         time.sleep(max(5, interval))
 
 
 def auto_tick() -> str:
-    _init_components()
-    if _AUTO_MANAGER is None:
-        return "auto_manager_missing"
     filters = _build_filters()
-    outcome = _AUTO_MANAGER.maybe_run(filters)
-    _RUNTIME.last_decision = outcome.decision.reason
+    outcome = _auto_manager().maybe_run(filters)
     return outcome.decision.reason
 
 
@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Dict, Optional
 
 from app.core.metrics import alerts_sent_total
-from app.db.reporting import arbitrage_daily_summary
+from app.db.reporting import arbitrage_daily_stats
 
 LOG_DIR = Path(__file__).resolve().parents[4] / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -35,7 +35,7 @@ def evaluate_and_alert(stats: Optional[Dict[str, float]] = None) -> None:
     """Evaluate thresholds based on stats and emit alerts if needed."""
     if not _enabled():
         return
-    stats = stats or arbitrage_daily_summary()
+    stats = stats or arbitrage_daily_stats().summary()
     threshold = float(os.getenv("ALERTS_FAIL_THRESHOLD", "5"))
     warn_roi = float(os.getenv("ALERTS_NET_ROI_WARN_PCT", "0.5"))
     if stats.get("fail", 0) >= threshold:
@@ -0,0 +1,90 @@
+"""Reconcile executions left in flight by a crashed process."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+from app.core.journal import ExecutionJournal, InFlightExecution, get_journal
+from app.core.metrics import exec_journal_recovered_total
+from app.db.reporting import record_arbitrage_execution
+from app.services.arbitrage.executor_safe import ArbitrageExecutionResult
+
+from .alerts import send_alert
+
+logger = logging.getLogger(__name__)
+
+
+def _describe_arbitrage(entry: InFlightExecution) -> str:
+    done = entry.completed_stages()
+    data = entry.data
+    if "buy" not in done:
+        if "buy" in entry.stages:
+            return f"buy on {data.get('buy_exchange')} sent without confirmation; verify order state"
+        return "no leg was sent"
+    if "sell" in done:
+        return "all legs filled; settlement was not recorded"
+    return (
+        f"open {data.get('symbol')} inventory bought on {data.get('buy_exchange')}; "
+        f"completed stages: {', '.join(done)}; close or sell on {data.get('sell_exchange')} manually"
+    )
+
+
+def _reconcile_arbitrage(entry: InFlightExecution) -> ArbitrageExecutionResult:
+    result = ArbitrageExecutionResult(
+        exec_id=entry.exec_id,
+        proposal_id=str(entry.data.get("proposal_id", "")),
+        mode=str(entry.data.get("mode", "dry")),
+        status="RECOVERED",
+        started_at=entry.started_at,
+        completed_at=time.time(),
+        pnl_usd=0.0,
+        fees_usd=0.0,
+        message=_describe_arbitrage(entry),
+        steps=[{"stage": name, **stage.get("outcome", {})} for name, stage in entry.stages.items()],
+    )
+    record_arbitrage_execution(result, auto_trigger=bool(entry.data.get("auto_trigger")))
+    return result
+
+
+def _describe_spot(entry: InFlightExecution) -> str:
+    data = entry.data
+    order = f"{data.get('side')} {data.get('qty')} {data.get('symbol')}"
+    if "order" in entry.completed_stages():
+        return f"{order} was accepted by the exchange but not applied to the portfolio"
+    return f"{order} was sent without confirmation; verify order state on the exchange"
+
+
+def reconcile_in_flight(journal: Optional[ExecutionJournal] = None) -> List[Dict[str, object]]:
+    """Claim orphaned journals, report their in-flight executions and close them.
+
+    Arbitrage executions are stored as ``RECOVERED`` rows so they show up in
+    the execution history; every recovered execution raises an operator alert.
+    """
+
+    journal = journal or get_journal()
+    if journal is None:
+        return []
+    reports: List[Dict[str, object]] = []
+    for entry in journal.recover_orphans():
+        if entry.kind == "arbitrage":
+            result = _reconcile_arbitrage(entry)
+            report: Dict[str, object] = result.to_dict()
+        else:
+            report = {
+                "exec_id": entry.exec_id,
+                "status": "RECOVERED",
+                "message": _describe_spot(entry),
+                "started_at": entry.started_at,
+            }
+        report["kind"] = entry.kind
+        exec_journal_recovered_total.labels(kind=entry.kind).inc()
+        send_alert("error", f"recovered in-flight {entry.kind} execution {entry.exec_id}: {report['message']}")
+        journal.end(entry.exec_id, "RECOVERED", {"message": report["message"]})
+        reports.append(report)
+    if reports:
+        journal.sync()
+    return reports
+
+
+__all__ = ["reconcile_in_flight"]
@@ -0,0 +1,28 @@
+"""Scheduler task merging small market data appends into one part per day."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Optional
+
+from ...core.marketdata import MarketDataStore
+
+logger = logging.getLogger(__name__)
+
+
+def run_compaction(store: Optional[MarketDataStore] = None) -> int:
+    store = store or MarketDataStore()
+    removed = store.compact()
+    logger.info("Market data compaction merged %s parts", removed)
+    return removed
+
+
+def start_compaction_loop(store: Optional[MarketDataStore] = None, interval_seconds: int = 3600) -> None:
+    logger.info("Starting market data compaction loop interval=%s", interval_seconds)
+    store = store or MarketDataStore()
+    while True:  # pragma: no cover - long-running loop
+        try:
+            run_compaction(store)
+        except Exception as exc:
+            logger.warning("Market data compaction failed: %s", exc)
+        time.sleep(interval_seconds)
@@ -1,19 +1,22 @@
-"""Scheduler entrypoint running rebalancer and digest loops."""
+"""Scheduler entrypoint running rebalancer, digest and market data compaction loops."""
 from __future__ import annotations
 
 import threading
 
 from ...core.metrics import ensure_metrics_server
-from ..api.flask_app import agent
+from ..api.flask_app import agent, startup
+from .compaction import start_compaction_loop
 from .digest import start_digest_loop
 from .rebalancer import start_rebalancer
 
 
 def run_scheduler() -> None:
     ensure_metrics_server(9101)
+    startup()
     threads = [
         threading.Thread(target=start_rebalancer, args=(agent,), kwargs={"interval_seconds": 900}, daemon=True),
         threading.Thread(target=start_digest_loop, args=(agent,), kwargs={"interval_seconds": 3600}, daemon=True),
+        threading.Thread(target=start_compaction_loop, kwargs={"interval_seconds": 3600}, daemon=True),
     ]
     for thread in threads:
         thread.start()
@@ -13,7 +13,7 @@ from app.compat.dotenv import load_dotenv
 
 from ...core.metrics import bot_commands_total, bot_errors_total, bot_latency_ms
 from ...core.state import get_state, set_state
-from ...db.reporting import arbitrage_daily_summary, equity_curve, list_trades, pnl_summary
+from ...db.reporting import arbitrage_daily_stats, equity_curve, list_trades, pnl_summary
 from ...services.arbitrage.worker import (
     get_filters as get_arbitrage_filters,
     get_state as get_arbitrage_state,
@@ -29,7 +29,7 @@ from ...services.arbitrage.ui import (
 from ...services.reports.charts import plot_equity_curve
 from ...services.reports.exporter import get_exporter
 from ...services.guard.alerts import evaluate_and_alert
-from ..api.flask_app import agent, supervisor
+from ..api.flask_app import agent, startup, supervisor
 
 load_dotenv()
 
@@ -141,7 +141,7 @@ def set_sorting(key: str, direction: Optional[str] = None) -> Dict[str, object]:
 
 
 def daily_summary_text() -> str:
-    stats = arbitrage_daily_summary()
+    stats = arbitrage_daily_stats().summary()
     evaluate_and_alert(stats)
     pnl_icon = "✅" if stats.get("avg_roi", 0.0) >= 1.0 else ("⚠️" if stats.get("avg_roi", 0.0) >= 0.5 else "❌")
     fail_icon = "❌" if stats.get("fail", 0) >= float(os.getenv("ALERTS_FAIL_THRESHOLD", "5")) else "✅"
@@ -201,7 +201,6 @@ def spot_status() -> Dict[str, object]:
 
 
 def build_status_report() -> str:
-    active = {name: cfg for name, cfg in supervisor.price_history.__dict__.items() if cfg}
     report = ["<b>Lunia Status</b>", _format_state()]
     positions = agent.portfolio.positions
     if positions:
@@ -448,6 +447,7 @@ async def run_bot() -> None:
         raise RuntimeError("aiogram is not installed")
     bot = Bot(token=BOT_TOKEN, parse_mode=ParseMode.HTML)
     dp = create_dispatcher()
+    startup()
     logger.info("Starting Telegram bot polling")
     await dp.start_polling(bot)
 
@@ -1,7 +1,10 @@
 """Pytest configuration for Lunia core tests."""
 from __future__ import annotations
 
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -10,8 +13,62 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+# Keep execution journals out of the repository's logs/ directory; set before
+# any app module reads the variable at import.
+_JOURNAL_DIR = tempfile.mkdtemp(prefix="lunia-journal-")
+os.environ.setdefault("EXEC_JOURNAL_DIR", _JOURNAL_DIR)
+
+
+class FakeClock:
+    """Settable wall clock for code that takes a ``time_fn``."""
+
+    def __init__(self, now: float = 1_700_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def plugin_registry():
+    """Give a test an empty strategy registry and restore the real one afterwards."""
+
+    from app.core.ai.strategies import REGISTRY, SPECS
+
+    saved_registry = dict(REGISTRY)
+    saved_specs = dict(SPECS)
+    REGISTRY.clear()
+    SPECS.clear()
+    yield
+    REGISTRY.clear()
+    REGISTRY.update(saved_registry)
+    SPECS.clear()
+    SPECS.update(saved_specs)
+
+
+def make_signal(symbol, price, name):
+    """Build a BUY signal for ``symbol`` as emitted by strategy ``name``."""
+
+    from app.core.ai.strategies import StrategySignal
+
+    return StrategySignal(
+        symbol=symbol, side="BUY", score=1.0, price=price, stop_pct=0.1, take_pct=0.2, strategy=name, meta={}
+    )
+
 
 def pytest_configure(config: pytest.Config) -> None:  # pragma: no cover - pytest hook
     """Register custom markers used across the test-suite."""
 
     config.addinivalue_line("markers", "requires_flask: marks tests that need Flask")
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:  # pragma: no cover - pytest hook
+    shutil.rmtree(_JOURNAL_DIR, ignore_errors=True)
@@ -0,0 +1,96 @@
+import json
+import threading
+
+import pytest
+from app.core.ai import agent as agent_module
+from app.core.ai.agent import Agent
+from app.core.ai.supervisor import Supervisor
+from app.core.risk.manager import RiskLimits, RiskManager
+from app.core.state import get_state, set_state
+
+
+class ThreadedExchange:
+    def __init__(self, price=100.0, failing=()):
+        self.price = price
+        self.failing = set(failing)
+        self.quotes = []
+        self.orders = []
+        self._lock = threading.Lock()
+
+    def get_price(self, symbol):
+        self.quotes.append(symbol)
+        return self.price
+
+    def place_order(self, symbol, side, qty, type="MARKET"):
+        with self._lock:
+            self.orders.append((symbol, side, qty))
+        if symbol in self.failing:
+            raise RuntimeError("exchange down")
+        return {"symbol": symbol, "side": side, "origQty": qty, "status": "FILLED", "orderId": f"id-{symbol}"}
+
+
+@pytest.fixture
+def make_agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent_module, "LOG_PATH", tmp_path / "trades.jsonl")
+    set_state({"global_stop": False, "trading_on": True})
+
+    def factory(client, **kwargs):
+        risk = RiskManager(RiskLimits(max_symbol_risk_pct=5.0, max_concurrent_pos=2))
+        return Agent(client=client, risk=risk, supervisor=Supervisor(client=None), subscribe_bus=False, **kwargs)
+
+    return factory
+
+
+def _signal(symbol, qty, price=None):
+    return {"symbol": symbol, "side": "BUY", "qty": qty, "price": price, "strategy": "test"}
+
+
+def test_batch_uses_one_snapshot_and_bulk_commit(make_agent, tmp_path, monkeypatch):
+    client = ThreadedExchange()
+    agent = make_agent(client, batch_workers=4)
+    snapshots = []
+    bulk_writes = []
+    monkeypatch.setattr(agent_module, "get_state", lambda: snapshots.append(1) or get_state())
+    monkeypatch.setattr("app.core.portfolio.portfolio.record_trades", lambda rows: bulk_writes.append(list(rows)))
+
+    result = agent.execute_signals(
+        {
+            "signals": [
+                _signal("BTCUSDT", 1.0),
+                _signal("ETHUSDT", 2.0, price=100.0),
+                _signal("SOLUSDT", 50.0, price=100.0),
+                _signal("XRPUSDT", 1.0, price=100.0),
+            ]
+        }
+    )
+
+    assert len(snapshots) == 1
+    assert client.quotes == ["BTCUSDT"]
+    assert {item["symbol"] for item in result["executed"]} == {"BTCUSDT", "ETHUSDT"}
+    reasons = {item["symbol"]: item["reason"] for item in result["errors"]}
+    # SOL is too large; XRP would be a third position
+    assert reasons == {"SOLUSDT": "max symbol risk exceeded", "XRPUSDT": "max_positions"}
+    assert [len(rows) for rows in bulk_writes] == [2]
+    assert agent.portfolio.get_position("ETHUSDT").quantity == pytest.approx(2.0)
+    lines = [json.loads(line) for line in (tmp_path / "trades.jsonl").read_text().splitlines()]
+    assert [line["status"] for line in lines] == ["FILLED", "FILLED", "REJECTED", "REJECTED"]
+
+
+def test_exchange_error_fails_only_its_order(make_agent):
+    client = ThreadedExchange(failing={"ETHUSDT"})
+    agent = make_agent(client)
+
+    result = agent.execute_batch([_signal("BTCUSDT", 1.0, 100.0), _signal("ETHUSDT", 1.0, 100.0)])
+
+    assert [item["symbol"] for item in result["executed"]] == ["BTCUSDT"]
+    assert result["errors"] == [{"symbol": "ETHUSDT", "side": "BUY", "reason": "exchange down"}]
+    assert agent.portfolio.get_position("ETHUSDT") is None
+    assert (agent.executed_count, agent.success_count) == (2, 1)
+
+
+def test_batch_matches_sequential_outcome(make_agent):
+    signals = [_signal("BTCUSDT", 1.0, 100.0), _signal("ETHUSDT", 3.0, 100.0), _signal("SOLUSDT", 80.0, 100.0)]
+    batched = make_agent(ThreadedExchange()).execute_signals({"signals": signals})
+    sequential = make_agent(ThreadedExchange(), batch_execution=False).execute_signals({"signals": signals})
+
+    assert batched == sequential
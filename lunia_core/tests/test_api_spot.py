@@ -1,4 +1,5 @@
 import json
+import time
 
 import pytest
 
@@ -29,6 +30,17 @@ def test_spot_strategy_and_risk_endpoints():
         data=json.dumps({"strategy": "scalping_breakout", "symbol": "BTCUSDT", "days": 3}),
         content_type="application/json",
     )
+    assert backtest.status_code in (200, 202)
+    job_id = backtest.get_json()["job_id"]
+    deadline = time.time() + 60
+    while backtest.status_code == 202 and time.time() < deadline:
+        time.sleep(0.05)
+        if client.get(f"/spot/backtest/jobs/{job_id}").get_json()["status"] == "done":
+            backtest = client.post(
+                "/spot/backtest",
+                data=json.dumps({"strategy": "scalping_breakout", "symbol": "BTCUSDT", "days": 3}),
+                content_type="application/json",
+            )
     assert backtest.status_code == 200
     payload = backtest.get_json()
     assert payload["strategy"] == "scalping_breakout"
@@ -0,0 +1,122 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.backtester.arbitrage import ArbitrageReplay
+from app.backtester.synthetic import Quotes, Venue, simulate_paths, venue_quotes
+from app.core.marketdata import MarketDataStore, venue_key
+from app.core.risk.manager import RiskLimits
+from app.core.risk.rate_limit import RateLimitConfig
+from app.services.arbitrage.scanner import ArbitrageFilters, ArbitrageScanner
+
+OPEN = dict(
+    arb_state={"qty_usd": 1_000.0},
+    priority_scores={},
+    rate_limit=RateLimitConfig(enabled=False),
+    risk_limits=RiskLimits(max_symbol_risk_pct=100.0),
+)
+
+
+class _Client:
+    def __init__(self, price):
+        self.price = price
+
+    def get_price(self, symbol):
+        return self.price
+
+
+def _flat(mid, size, spread_bps=1.0):
+    mid = np.broadcast_to(np.asarray(mid, dtype=float), (size,))
+    return Quotes(bid=mid * (1 - spread_bps / 20_000), ask=mid * (1 + spread_bps / 20_000))
+
+
+def test_estimates_match_the_scanner():
+    mid = simulate_paths(100.0, 500, sigma=0.001, seed=3)[0]
+    quotes = venue_quotes(mid, {"binance": Venue(0, 5), "okx": Venue(20, 5), "bybit": Venue(-20, 5)}, seed=4)
+    replay = ArbitrageReplay(quotes, symbol="BTCUSDT", **OPEN)
+    assert len(replay.routes) == 6
+    tick = 321
+    clients = {v: _Client((q.bid[tick] + q.ask[tick]) / 2) for v, q in quotes.items()}
+    scanner = ArbitrageScanner(
+        clients, ["BTCUSDT"], 1_000.0, replay.limits_path, arb_state=OPEN["arb_state"], priority_scores={}
+    )
+    for row, route in enumerate(replay.routes):
+        buy, sell = route.split("->")
+        expected = scanner._evaluate("BTCUSDT", buy, sell)
+        assert replay.estimates[row, tick] == pytest.approx(expected.net_roi_pct, abs=1e-9)
+        opportunity = replay.opportunity(row, tick)
+        assert opportunity.buy_price == pytest.approx(expected.buy_price)
+        assert opportunity.meta["transfer"] == expected.meta["transfer"]
+
+
+def test_quote_decay_during_transfer_shows_in_realised_roi():
+    size = 200
+    okx = np.full(size, 100.0)
+    okx[50:53] = 101.0  # a 3s dislocation, gone before an 8s internal transfer lands
+    replay = ArbitrageReplay({"binance": _flat(100.0, size), "okx": _flat(okx, size)}, symbol="BTCUSDT", **OPEN)
+    result = replay.run(ArbitrageFilters(min_net_roi_pct=0.1))
+
+    assert [fill.ts for fill in result.fills] == [50.0]
+    fill = result.fills[0]
+    assert fill.route == "binance->okx" and fill.transfer_type == "internal"
+    # buys one snapshot later (160ms venue latency), sells 8s after that
+    assert fill.settled_ts == 59.0 and fill.sell_price == pytest.approx(100.0 * (1 - 0.5 / 10_000))
+    assert fill.estimated_roi_pct > 0.5 > 0 > fill.realised_roi_pct
+    assert result.rejected == {"in_transit": 2}
+    report = result.to_dict()["routes"]["binance->okx"]
+    assert report["executions"] == 1 and report["win_rate"] == 0.0
+
+
+def test_rate_limits_use_the_replay_clock():
+    size = 3_600
+    okx = np.where(np.arange(size) % 60 < 30, 101.0, 100.0)
+    quotes = {"binance": _flat(100.0, size), "okx": _flat(okx, size)}
+    limited = dict(OPEN, rate_limit=RateLimitConfig(enabled=True, window_minutes=10, max_per_exchange=3, max_per_symbol=5))
+    result = ArbitrageReplay(quotes, symbol="BTCUSDT", **limited).run(ArbitrageFilters(min_net_roi_pct=0.1))
+    assert len(result.fills) == 3 * 6  # three per ten minutes for an hour
+    assert result.rejected["rate_limited"] > 0
+
+
+def test_from_store_and_parallel_sweep(tmp_path):
+    store = MarketDataStore(tmp_path)
+    t0 = 1_700_006_400.0
+    mid = simulate_paths(100.0, 1_800, sigma=0.0005, seed=8)[0]
+    quotes = venue_quotes(mid, {"binance": Venue(0, 10, 2), "okx": Venue(25, 10, 2), "bybit": Venue(-25, 10, 2)}, seed=9)
+    for venue, q in quotes.items():
+        offset = 5.0 if venue == "bybit" else 0.0  # bybit starts quoting later
+        ts = t0 + offset + np.arange(mid.size) * 1.0
+        sizes = np.ones(mid.size)
+        store.append_quotes(
+            venue_key(venue, "BTCUSDT"), {"ts": ts, "bid": q.bid, "ask": q.ask, "bid_size": sizes, "ask_size": sizes}
+        )
+
+    replay = ArbitrageReplay.from_store(store, "BTCUSDT", ["binance", "okx", "bybit"], start=t0, end=t0 + 1_800, **OPEN)
+    assert replay.ts[0] == t0 + 5 and len(replay.ts) == 1_795
+    assert replay.bids["okx"][0] == quotes["okx"].bid[5] and replay.asks["bybit"][0] == quotes["bybit"].ask[0]
+
+    space = {"min_net_roi_pct": [0.0, 0.1], "top_k": [1, 3]}
+    results = replay.sweep(space, workers=2)
+    assert len(results) == 4
+    assert [r.realised_pnl_usd for r in results] == sorted((r.realised_pnl_usd for r in results), reverse=True)
+    serial = {(r.filters.min_net_roi_pct, r.filters.top_k): r.to_dict() for r in replay.sweep(space, workers=1)}
+    assert {(r.filters.min_net_roi_pct, r.filters.top_k): r.to_dict() for r in results} == serial
+    assert any(r.fills for r in results)
+
+
+def test_replay_ignores_live_state_and_sizes_equity_from_arb_state(monkeypatch):
+    from app.services.arbitrage import executor_safe
+
+    monkeypatch.setattr(executor_safe, "get_state", lambda: {"global_stop": True, "portfolio_equity": 10.0})
+    size = 200
+    okx = np.full(size, 100.0)
+    okx[50:53] = 101.0
+    quotes = {"binance": _flat(100.0, size), "okx": _flat(okx, size)}
+    defaults = dict(OPEN, risk_limits=None)  # stock 1% per-symbol risk limit
+    replay = ArbitrageReplay(quotes, symbol="BTCUSDT", **defaults)
+    assert replay.equity_usd == 100_000.0
+    assert [fill.ts for fill in replay.run(ArbitrageFilters(min_net_roi_pct=0.1)).fills] == [50.0]
+
+    pinned = dict(defaults, arb_state={"qty_usd": 1_000.0, "portfolio_equity": 10_000.0})
+    small = ArbitrageReplay(quotes, symbol="BTCUSDT", **pinned)
+    result = small.run(ArbitrageFilters(min_net_roi_pct=0.1))
+    assert not result.fills and result.rejected == {"risk rejected: max symbol risk exceeded": 3}
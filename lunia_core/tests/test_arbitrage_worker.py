@@ -0,0 +1,37 @@
+from app.services.arbitrage import worker
+from app.services.arbitrage.scanner import ArbitrageFilters
+
+
+class _Scanner:
+    def __init__(self):
+        self.scans = 0
+        self.last_opportunities = []
+
+    def scan(self, filters):
+        self.scans += 1
+        return []
+
+
+class _Executor:
+    rate_limiter = None
+
+
+def test_scan_now_is_a_pure_scan_unless_the_worker_asks_for_auto(monkeypatch):
+    scanner = _Scanner()
+    monkeypatch.setattr(worker, "_SCANNER", scanner)
+    monkeypatch.setattr(worker, "_EXECUTOR", _Executor())
+    monkeypatch.setattr(worker, "_AUTO_MANAGER", None)
+    monkeypatch.setattr(worker, "ensure_metrics_server", lambda port: None)
+    monkeypatch.setattr(worker, "get_exporter", lambda: None)
+    monkeypatch.setattr(worker, "get_bus", lambda: None)
+
+    assert worker.scan_now() == []
+    assert scanner.scans == 1 and worker._AUTO_MANAGER is None
+
+    submitted = []
+    monkeypatch.setattr(
+        worker.ArbitrageAutoManager, "submit", lambda self, opportunities, filters: submitted.append(filters)
+    )
+    worker.scan_now(auto=True)
+    assert len(submitted) == 1 and isinstance(submitted[0], ArbitrageFilters)
+    assert worker._AUTO_MANAGER._thread is None  # only run_worker starts the dispatcher
@@ -0,0 +1,69 @@
+from app.core.risk.rate_limit import RateLimitConfig, RateLimiter
+from app.core.state import set_state
+from app.services.arbitrage.auto_manager import ArbitrageAutoManager
+from app.services.arbitrage.scanner import ArbitrageFilters, ArbitrageOpportunity
+
+
+def make_opportunity(proposal_id: str, buy: str = "binance", sell: str = "okx") -> ArbitrageOpportunity:
+    return ArbitrageOpportunity(
+        proposal_id=proposal_id,
+        symbol="BTCUSDT",
+        buy_exchange=buy,
+        sell_exchange=sell,
+        buy_price=100.0,
+        sell_price=102.0,
+        gross_spread_pct=2.0,
+        fees_total_pct=0.2,
+        slippage_est_pct=0.1,
+        net_roi_pct=1.7,
+        net_profit_usd=10.0,
+        qty_usd=100.0,
+        created_at=0.0,
+        transfer_type="internal",
+        latency_ms=5.0,
+    )
+
+
+def _no_scan(_filters):
+    raise AssertionError("event path must not rescan")
+
+
+def test_submit_executes_fresh_proposal_once():
+    set_state({"arb": {"auto_mode": True}})
+    executed = []
+    manager = ArbitrageAutoManager(_no_scan, executed.append)
+    filters = ArbitrageFilters(min_net_roi_pct=1.0, min_net_usd=5.0)
+    batch = [make_opportunity("p1")]
+    try:
+        manager.submit(batch, filters)
+        manager.submit(batch, filters)
+    finally:
+        set_state({"arb": {"auto_mode": False}})
+    assert [opp.proposal_id for opp in executed] == ["p1"]
+    assert manager.last_result is not None
+    assert manager.last_result.decision.reason == "no_fresh"
+
+
+def test_submit_skips_rate_limited_routes():
+    set_state({"arb": {"auto_mode": True}})
+    config = RateLimitConfig(enabled=True, max_per_exchange=1, max_per_symbol=10, backend="memory")
+    limiter = RateLimiter(config)
+    limiter.try_acquire("binance", "bybit", "ETHUSDT")
+    executed = []
+    manager = ArbitrageAutoManager(_no_scan, executed.append, rate_limiter=limiter)
+    filters = ArbitrageFilters()
+    try:
+        result = manager.handle([make_opportunity("p1"), make_opportunity("p2", buy="okx", sell="kraken")], filters)
+    finally:
+        set_state({"arb": {"auto_mode": False}})
+    assert result.executed
+    assert [opp.proposal_id for opp in executed] == ["p2"]
+
+
+def test_submit_respects_auto_mode_off():
+    set_state({"arb": {"auto_mode": False}})
+    executed = []
+    manager = ArbitrageAutoManager(_no_scan, executed.append)
+    result = manager.handle([make_opportunity("p1")], ArbitrageFilters())
+    assert result.decision.reason == "auto_disabled"
+    assert executed == []
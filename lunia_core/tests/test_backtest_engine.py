@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+from app.backtester.engine import BacktestEngine, FillModel
+
+np = pytest.importorskip("numpy")
+
+
+def _walk(n, seed=7, vol=0.004):
+    rng = random.Random(seed)
+    price, prices = 100.0, []
+    for _ in range(n):
+        price *= math.exp(rng.gauss(0, vol))
+        prices.append(price)
+    return prices
+
+
+def _engine(strategy, **kwargs):
+    return BacktestEngine(
+        strategies=[strategy],
+        weights={strategy: 1.0},
+        context={"sl_pct_default": 0.02, "tp_pct_default": 0.04},
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("strategy", ["ema_rsi_trend", "bollinger_reversion", "macd_crossover"])
+def test_batch_and_bar_by_bar_runs_agree(strategy):
+    prices = _walk(600)
+    fast = _engine(strategy).run(prices)
+    slow = _engine(strategy, batch_mode=False).run(prices)
+    assert fast.trades
+    assert [(t.entry_bar, t.exit_bar, t.reason) for t in fast.trades] == [
+        (t.entry_bar, t.exit_bar, t.reason) for t in slow.trades
+    ]
+    assert fast.total_return_pct == pytest.approx(slow.total_return_pct)
+
+
+def test_trades_close_on_stop_take_or_signal_and_curve_matches_pnl():
+    prices = _walk(3000, seed=11)
+    result = _engine("ema_rsi_trend", fill_model=FillModel(fee_bps=10, slippage_bps=5)).run(prices)
+    assert result.bars == len(prices) == len(result.equity_curve)
+    for trade in result.trades:
+        assert trade.entry_bar < trade.exit_bar or trade.reason == "end-of-data"
+        assert trade.reason in {"stop", "take", "signal", "end-of-data"}
+        assert trade.fees > 0
+        move = prices[trade.exit_bar] / prices[trade.entry_bar] - 1
+        if trade.reason == "stop":
+            assert move <= -0.02 + 1e-3
+        if trade.reason == "take":
+            assert move >= 0.04 - 1e-3
+    final = 10_000 + sum(trade.pnl for trade in result.trades)
+    assert result.equity_curve[-1] == pytest.approx(final)
+    assert result.per_strategy["ema_rsi_trend"]["trades"] == len(result.trades)
+    assert 0 <= result.max_drawdown_pct <= 100
+
+
+def test_positions_never_exceed_cash():
+    prices = _walk(2000, seed=3)
+    engine = BacktestEngine(
+        strategies=["ema_rsi_trend", "bollinger_reversion", "macd_crossover"],
+        weights={"ema_rsi_trend": 1.0, "bollinger_reversion": 1.0, "macd_crossover": 1.0},
+        initial_equity=1_000.0,
+    )
+    result = engine.run({"ETHUSDT": prices})
+    assert result.trades
+    assert {trade.symbol for trade in result.trades} == {"ETHUSDT"}
+    assert min(result.equity_curve) > 0
+    assert result.to_dict(curve_points=10)["trades"] == len(result.trades)
@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import Future
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.backtester.jobs import BacktestJob, BacktestJobs, QueueFull, content_key
+from app.backtester.synthetic import simulate_paths
+
+
+def _wait(jobs, job_id, statuses=("done", "failed", "cancelled"), timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get(job_id)
+        if job.status in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} stuck in {jobs.get(job_id).status}")
+
+
+REQUEST = {"strategies": ["ema_rsi_trend"], "symbol": "BTCUSDT", "params": {"sl_pct_default": 0.02}}
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    manager = BacktestJobs(workers=1, queue_depth=1, nice=0, cache_dir=tmp_path)
+    yield manager
+    manager.shutdown()
+
+
+def test_job_runs_in_background_and_results_are_memoised(jobs, tmp_path):
+    prices = simulate_paths(100.0, 5_000, sigma=0.003, seed=1)[0]
+    job = jobs.submit(REQUEST, prices)
+    assert job.status in ("queued", "running")
+    done = _wait(jobs, job.job_id)
+    assert done.status == "done" and done.progress == 1.0
+    assert done.result["bars"] == 5_000 and done.result["trades"] > 0
+    assert done.to_dict()["request"]["strategies"] == ["ema_rsi_trend"]
+
+    again = jobs.submit(REQUEST, prices)
+    assert again.status == "done" and again.result == done.result
+    fresh = BacktestJobs(workers=1, queue_depth=0, nice=0, cache_dir=tmp_path)
+    replay = fresh.submit(REQUEST, prices.copy())
+    assert replay.cached and replay.result == done.result
+    assert not fresh.submit(dict(REQUEST, params={"sl_pct_default": 0.03}), prices).cached
+    fresh.shutdown()
+
+
+def test_cancel_queue_limit_and_dedupe(jobs):
+    long_run = simulate_paths(100.0, 400_000, sigma=0.002, seed=2)[0]
+    request = dict(REQUEST, strategies=["ema_rsi_trend", "macd_crossover", "bollinger_reversion"])
+    running = jobs.submit(request, long_run)
+    assert jobs.submit(request, long_run) is running
+    queued = jobs.submit(REQUEST, long_run[:1_000])
+    with pytest.raises(QueueFull):
+        jobs.submit(REQUEST, long_run[:2_000])
+
+    assert jobs.cancel(queued.job_id).status == "cancelled"
+    _wait(jobs, running.job_id, statuses=("running",))
+    jobs.cancel(running.job_id)
+    cancelled = _wait(jobs, running.job_id)
+    assert cancelled.status == "cancelled" and cancelled.result is None
+    assert jobs.get("missing") is None
+    # slots were released, so new work is accepted again
+    assert _wait(jobs, jobs.submit(REQUEST, long_run[:3_000]).job_id).status == "done"
+
+
+def test_cache_key_ignores_unrelated_state():
+    prices = [100.0, 101.0, 102.0]
+    state = {
+        "spot": {"enabled": True, "sl_pct_default": 0.02, "weights": {"grid_light": 0.3}},
+        "ops": {"auto_mode": True},
+    }
+    key = content_key(dict(REQUEST, state=state), prices)
+    toggled = {
+        "spot": dict(state["spot"], enabled=False, weights={}),
+        "ops": {"auto_mode": False},
+        "futures": {"enabled": True},
+    }
+    assert content_key(dict(REQUEST, state=toggled), prices) == key
+    assert content_key(dict(REQUEST, state={"spot": {"sl_pct_default": 0.03}}), prices) != key
+    assert content_key(dict(REQUEST, state={"spot": {"max_positions": 2, "sl_pct_default": 0.02}}), prices) != key
+    assert content_key(dict(REQUEST, state=state, weights={"ema_rsi_trend": 0.5}), prices) != key
+    assert content_key(dict(REQUEST, state=state), prices[:2]) != key
+
+
+def test_finish_keeps_a_cancelled_job_cancelled(jobs):
+    job = BacktestJob(job_id="j1", key="k1", request=dict(REQUEST), status="cancelled", finished_at=1.0)
+    future = Future()
+    future.set_result({"bars": 3})
+    jobs._finish(job, future)
+    assert job.status == "cancelled" and job.result is None and job.finished_at == 1.0
+
+
+def test_pool_never_forks_the_api_process(tmp_path):
+    from app.core.ai.parallel import DEFAULT_START_METHOD
+
+    manager = BacktestJobs(workers=1, queue_depth=0, nice=0, cache_dir=tmp_path)
+    assert manager._ctx.get_start_method() == DEFAULT_START_METHOD != "fork"
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.ai import supervisor as supervisor_module
+from app.core.ai.price_history import PriceHistory
+from app.core.ai.strategies import REGISTRY, spec_for
+from app.core.ai.supervisor import Supervisor
+from app.core.state import set_state
+
+BATCH_STRATEGIES = [
+    "bollinger_reversion",
+    "scalping_breakout",
+    "ema_rsi_trend",
+    "macd_crossover",
+    "vwap_reversion",
+    "grid_light",
+    "volatility_breakout",
+    "micro_trend_scalper",
+    "liquidity_snipe",
+    "stat_pairs",
+]
+# liquidity_snipe signals carry variant names; stat_pairs needs reference symbols
+FIRED = [name for name in BATCH_STRATEGIES if name not in ("liquidity_snipe", "stat_pairs")]
+
+
+def _feed(supervisors, symbols, ticks, seed=7):
+    rng = random.Random(seed)
+    for symbol in symbols:
+        price = rng.uniform(5.0, 500.0)
+        for _ in range(ticks):
+            price *= 1 + rng.gauss(0, 0.01)
+            for supervisor in supervisors:
+                supervisor.update_price(symbol, price)
+
+
+def _keyed(decision):
+    return {(item["symbol"], item["strategy"]): item for item in decision["signals"]}
+
+
+def test_matrix_stacks_latest_windows():
+    history = PriceHistory(4, initial_slots=1)
+    for idx in range(6):
+        history.append("A", float(idx))
+        history.append("B", float(idx) * 10)
+    matrix = history.matrix(["B", "A"], 3)
+    assert matrix.tolist() == [[30.0, 40.0, 50.0], [3.0, 4.0, 5.0]]
+    with pytest.raises(ValueError):
+        history.matrix(["A"], 5)
+
+
+def test_builtin_strategies_provide_batch_path():
+    assert {name for name in REGISTRY if spec_for(name).batch is not None} == set(BATCH_STRATEGIES)
+    assert spec_for("bollinger_reversion").batch_window == 20
+
+
+@pytest.mark.parametrize("ticks", [12, 40, 120])
+def test_batch_matches_scalar(ticks):
+    set_state({"spot": {"enabled": True, "weights": {name: 1.0 for name in REGISTRY}}})
+    symbols = [f"SYM{idx}USDT" for idx in range(60)]
+    vectorised = Supervisor(client=None)
+    scalar = Supervisor(client=None, batch_mode=False)
+    _feed([vectorised, scalar], symbols, ticks)
+
+    batch_signals = _keyed(vectorised.gather_signals(symbols=symbols))
+    scalar_signals = _keyed(scalar.gather_signals(symbols=symbols))
+
+    assert batch_signals.keys() == scalar_signals.keys()
+    for key, expected in scalar_signals.items():
+        got = batch_signals[key]
+        assert got["side"] == expected["side"]
+        for field in ("score", "price", "stop_pct", "take_pct", "qty"):
+            assert got[field] == pytest.approx(expected[field], rel=1e-9), (key, field)
+    if ticks >= 40:
+        fired = {strategy for _, strategy in batch_signals}
+        assert set(FIRED) <= fired
+
+
+def test_pairs_batch_matches_scalar():
+    set_state({"spot": {"enabled": True, "weights": {"stat_pairs": 1.0}}})
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"]
+    vectorised = Supervisor(client=None)
+    scalar = Supervisor(client=None, batch_mode=False)
+    _feed([vectorised, scalar], symbols, 40, seed=3)
+
+    batch_signals = _keyed(vectorised.gather_signals(symbols=symbols))
+    scalar_signals = _keyed(scalar.gather_signals(symbols=symbols))
+    assert batch_signals.keys() == scalar_signals.keys()
+    assert any(strategy == "stat_pairs" for _, strategy in batch_signals)
+    for key, expected in scalar_signals.items():
+        got = batch_signals[key]
+        assert got["side"] == expected["side"]
+        assert got["score"] == pytest.approx(expected["score"], rel=1e-9)
+
+
+def test_supervisor_falls_back_without_numpy(monkeypatch):
+    set_state({"spot": {"enabled": True, "weights": {name: 1.0 for name in REGISTRY}}})
+    symbols = [f"SYM{idx}USDT" for idx in range(20)]
+    vectorised = Supervisor(client=None)
+    fallback = Supervisor(client=None)
+    _feed([vectorised, fallback], symbols, 60)
+    expected = _keyed(vectorised.gather_signals(symbols=symbols))
+    monkeypatch.setattr(supervisor_module, "np", None)
+    assert _keyed(fallback.gather_signals(symbols=symbols)).keys() == expected.keys()
@@ -0,0 +1,84 @@
+import importlib
+
+import pytest
+from app.db.rolling import RollingArbitrageStats
+from app.services.arbitrage.executor_safe import ArbitrageExecutionResult
+from app.services.arbitrage.scanner import ArbitrageOpportunity
+
+
+def test_rolling_stats_expire_after_window(clock):
+    stats = RollingArbitrageStats(window_seconds=3600, bucket_seconds=60, time_fn=clock)
+    stats.record_execution("FILLED", 5.0)
+    stats.record_execution("REJECTED", -1.0)
+    stats.record_proposal(1.5)
+    stats.record_proposal(0.5)
+    summary = stats.summary()
+    assert summary["pnl"] == pytest.approx(5.0)
+    assert (summary["success"], summary["fail"]) == (1, 1)
+    assert summary["avg_roi"] == pytest.approx(1.0)
+
+    clock.advance(1800)
+    stats.record_execution("FILLED", 2.0)
+    assert stats.pnl() == pytest.approx(7.0)
+
+    clock.advance(1860)
+    summary = stats.summary()
+    assert summary["pnl"] == pytest.approx(2.0)
+    assert (summary["success"], summary["fail"]) == (1, 0)
+    assert summary["avg_roi"] == 0.0
+
+    clock.advance(86_400)
+    assert stats.summary()["success"] == 0
+
+
+def test_rolling_stats_match_sql_summary(monkeypatch, tmp_path):
+    monkeypatch.setenv("DB_URL", f"sqlite:///{tmp_path / 'daily.db'}")
+    import app.db.reporting as reporting  # type: ignore
+
+    reporting = importlib.reload(reporting)
+    opportunity = ArbitrageOpportunity(
+        proposal_id="p1",
+        symbol="BTCUSDT",
+        buy_exchange="binance",
+        sell_exchange="okx",
+        buy_price=100.0,
+        sell_price=101.0,
+        gross_spread_pct=1.0,
+        fees_total_pct=0.2,
+        slippage_est_pct=0.1,
+        net_roi_pct=0.7,
+        net_profit_usd=0.7,
+        qty_usd=100.0,
+        created_at=0.0,
+        transfer_type="internal",
+        latency_ms=10.0,
+        meta={},
+    )
+
+    def execution(exec_id: str, status: str, pnl: float) -> ArbitrageExecutionResult:
+        return ArbitrageExecutionResult(
+            exec_id=exec_id,
+            proposal_id="p1",
+            mode="dry",
+            status=status,
+            started_at=0.0,
+            completed_at=0.0,
+            pnl_usd=pnl,
+            fees_usd=0.0,
+            message="",
+        )
+
+    reporting.record_arbitrage_proposal(opportunity, filtered_out=False, reason=None)
+    reporting.record_arbitrage_execution(execution("e1", "FILLED", 3.0), auto_trigger=False)
+    seeded = reporting.arbitrage_daily_stats()
+    reporting.record_arbitrage_proposal(opportunity, filtered_out=True, reason="roi_low")
+    reporting.record_arbitrage_execution(execution("e2", "FAILED", 0.0), auto_trigger=True)
+    reporting.record_arbitrage_execution(execution("e3", "FILLED", 1.5), auto_trigger=True)
+
+    assert reporting.arbitrage_daily_stats() is seeded
+    rolling = seeded.summary()
+    expected = reporting.arbitrage_daily_summary()
+    assert rolling["pnl"] == pytest.approx(expected["pnl"])
+    assert rolling["success"] == expected["success"] == 2
+    assert rolling["fail"] == expected["fail"] == 1
+    assert rolling["avg_roi"] == pytest.approx(expected["avg_roi"])
@@ -0,0 +1,61 @@
+from app.core.portfolio.portfolio import Portfolio
+from app.core.risk.manager import RiskManager
+from app.services.arbitrage.executor_safe import SafeArbitrageExecutor
+from app.services.arbitrage.registry import ExecutionRegistry
+from app.services.arbitrage.scanner import ArbitrageOpportunity
+
+
+def test_registry_evicts_least_recently_used():
+    loads = []
+
+    def loader(exec_id):
+        loads.append(exec_id)
+        return None
+
+    registry = ExecutionRegistry(2, loader=loader)
+    registry.put("a", {"exec_id": "a"})
+    registry.put("b", {"exec_id": "b"})
+    assert registry.get("a") == {"exec_id": "a"}
+    registry.put("c", {"exec_id": "c"})
+
+    assert "a" in registry and "c" in registry
+    assert "b" not in registry
+    assert len(registry) == 2
+    assert registry.evictions == 1
+    assert registry.get("b") is None
+    assert loads == ["b"]
+    assert registry.hit_ratio() == 0.5
+
+
+def test_evicted_execution_is_served_from_database():
+    opportunity = ArbitrageOpportunity(
+        proposal_id="registry",
+        symbol="BTCUSDT",
+        buy_exchange="binance",
+        sell_exchange="okx",
+        buy_price=100.0,
+        sell_price=101.0,
+        gross_spread_pct=1.5,
+        fees_total_pct=0.5,
+        slippage_est_pct=0.1,
+        net_roi_pct=1.0,
+        net_profit_usd=1.0,
+        qty_usd=100.0,
+        created_at=0.0,
+        transfer_type="internal",
+        latency_ms=5.0,
+        meta={"fees": {"transfer_fee_usd": 0.0}},
+    )
+    executor = SafeArbitrageExecutor(portfolio=Portfolio(), risk=RiskManager(), admin_pin_hash="")
+    result = executor.execute(opportunity, mode="dry")
+
+    registry = ExecutionRegistry(1)
+    registry.put(result.exec_id, result.to_dict())
+    registry.put("newer", {"exec_id": "newer"})
+    assert result.exec_id not in registry
+
+    payload = registry.get(result.exec_id)
+    assert payload is not None
+    assert payload["exec_id"] == result.exec_id
+    assert payload["status"] == "FILLED"
+    assert result.exec_id in registry
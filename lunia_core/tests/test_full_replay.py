@@ -0,0 +1,80 @@
+import json
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.backtester.replay import FullReplay, VirtualClock, replay_state, virtualised
+from app.backtester.synthetic import Venue
+from app.core.ai import agent as agent_module
+from app.core.ai import supervisor as supervisor_module
+from app.core.bus.redis_bus import RedisBus, RedisBusConfig
+from app.core.marketdata import QuoteRecorder
+from app.core.state import get_state
+from app.services.arbitrage.scanner import ArbitrageFilters
+
+T0 = 1_700_000_000.0
+VENUES = {"binance": Venue(0, 3, 2), "okx": Venue(30, 3, 2)}
+
+
+def _replay(**kwargs):
+    return FullReplay.synthetic(
+        {"BTCUSDT": 30_000.0, "ETHUSDT": 2_000.0},
+        VENUES,
+        300,
+        start_ts=T0,
+        seed=7,
+        filters=ArbitrageFilters(min_net_roi_pct=0.0),
+        **kwargs,
+    )
+
+
+def test_replays_are_deterministic(tmp_path):
+    first = _replay().run(tmp_path / "a")
+    second = _replay().run(tmp_path / "b")
+
+    assert first.digest == second.digest
+    assert (tmp_path / "a" / "events.jsonl").read_bytes() == (tmp_path / "b" / "events.jsonl").read_bytes()
+    counts = first.counts()
+    assert counts["signal"] > 0 and counts["trade"] == counts["signal"]
+    assert counts["arb_decision"] == 60  # one scan every 5 replay seconds
+    assert [e["ts"] for e in first.events] == sorted(e["ts"] for e in first.events)
+
+    report = json.loads((tmp_path / "a" / "report.json").read_text())
+    assert report["ticks"] == 4 * 300 and report["virtual_sec"] == 299.0
+    assert report["latency"]["tick"]["count"] == 2 * 300
+    assert report["latency"]["scan"]["count"] == 60 and report["speedup"] > 0
+
+
+def test_state_overrides_change_behaviour(tmp_path):
+    halted = _replay(state={"trading_on": False}).run(tmp_path)
+    assert "trade" not in halted.counts() and "signal" not in halted.counts()
+    assert replay_state({"arb": {"qty_usd": 5.0}})["arb"]["auto_mode"] is True
+
+
+def test_virtualised_patches_are_scoped(tmp_path):
+    clock = VirtualClock(T0)
+    bus = RedisBus(RedisBusConfig(enabled=False))
+    with virtualised(clock, replay_state({"portfolio_equity": 123.0}), bus, tmp_path):
+        assert supervisor_module.time.time() == T0
+        assert agent_module.datetime.utcnow().timestamp() == pytest.approx(T0, abs=86_400)
+        assert agent_module.get_state()["portfolio_equity"] == 123.0
+        assert agent_module.get_bus() is bus
+        clock.advance(T0 + 5)
+        assert supervisor_module.time.time() == T0 + 5
+    assert supervisor_module.time is time
+    assert agent_module.get_state is get_state
+
+
+def test_replays_recorded_quotes(tmp_path):
+    recorder = QuoteRecorder(tmp_path / "rec")
+    for i in range(120):
+        recorder.record("binance", "BTCUSDT", 100.0 + i * 0.01, 100.02 + i * 0.01, ts=T0 + i)
+        recorder.record("bybit", "BTCUSDT", 100.5 + i * 0.01, 100.52 + i * 0.01, ts=T0 + i + 0.5)
+    recorder.close()
+
+    report = FullReplay.from_recordings(tmp_path / "rec", start=T0 + 20).run(tmp_path / "out")
+    assert report.ticks == 200 and report.virtual_sec == 99.5
+    assert report.latency["tick"]["count"] == 100
+    assert report.counts()["arb_decision"] == 20
@@ -0,0 +1,129 @@
+import random
+from statistics import mean, median, median_high, pstdev, stdev
+
+import pytest
+from app.core.ai.indicators import (
+    EMA,
+    MACD,
+    IndicatorEngine,
+    IndicatorView,
+    WilderRSI,
+    ema_series,
+    indicator_view,
+    macd_series,
+    rsi_series,
+)
+from app.core.ai.supervisor import Supervisor
+
+
+def _walk(n: int, seed: int = 7) -> list[float]:
+    rng = random.Random(seed)
+    prices = [30_000.0]
+    for _ in range(n - 1):
+        prices.append(prices[-1] * (1 + rng.gauss(0, 0.002)))
+    return prices
+
+
+def _ema(prices, period):
+    alpha = 2 / (period + 1)
+    value = prices[0]
+    for price in prices[1:]:
+        value = (price - value) * alpha + value
+    return value
+
+
+def _streamed_view(prices):
+    engine = IndicatorEngine()
+    view = IndicatorView(engine, "BTCUSDT", prices[:1])
+    engine.update("BTCUSDT", prices[0])
+    # register every indicator up front, then stream the remaining ticks through the engine
+    view.ema(9), view.rsi(14), view.macd(), view.mean(20), view.min(10), view.median_high(12), view.wma(15)
+    for price in prices[1:]:
+        engine.update("BTCUSDT", price)
+    return IndicatorView(engine, "BTCUSDT", prices)
+
+
+def test_streaming_matches_batch_formulas():
+    prices = _walk(500)
+    view = _streamed_view(prices)
+    assert view.ema(9) == pytest.approx(_ema(prices, 9))
+    assert view.mean(20) == pytest.approx(mean(prices[-20:]))
+    assert view.stdev(20) == pytest.approx(stdev(prices[-20:]), rel=1e-6)
+    assert view.pstdev(20) == pytest.approx(pstdev(prices[-20:]), rel=1e-6)
+    assert view.min(10) == min(prices[-10:])
+    assert view.max(10) == max(prices[-10:])
+    assert view.median_high(12) == median_high(prices[-12:])
+    assert view.median(12) == pytest.approx(median(prices[-12:]))
+    weights = range(1, 16)
+    assert view.wma(15) == pytest.approx(sum(p * w for p, w in zip(prices[-15:], weights)) / sum(weights))
+
+
+def test_macd_and_rsi_match_reference():
+    prices = _walk(300, seed=3)
+    view = _streamed_view(prices)
+    fast = slow = signal = None
+    line_values = []
+    for price in prices:
+        fast = price if fast is None else fast + (price - fast) * 2 / 13
+        slow = price if slow is None else slow + (price - slow) * 2 / 27
+        line_values.append(fast - slow)
+    signal = _ema(line_values, 9)
+    line, sig, hist = view.macd(12, 26, 9)
+    assert line == pytest.approx(line_values[-1])
+    assert sig == pytest.approx(signal)
+    assert hist == pytest.approx(line_values[-1] - signal)
+
+    deltas = [b - a for a, b in zip(prices, prices[1:])]
+    avg_gain = sum(max(d, 0) for d in deltas[:14]) / 14
+    avg_loss = sum(max(-d, 0) for d in deltas[:14]) / 14
+    for d in deltas[14:]:
+        avg_gain = (avg_gain * 13 + max(d, 0)) / 14
+        avg_loss = (avg_loss * 13 + max(-d, 0)) / 14
+    assert view.rsi(14) == pytest.approx(100 - 100 / (1 + avg_gain / avg_loss))
+
+
+def test_series_match_streaming_indicators():
+    prices = _walk(500, seed=11)
+    for name, indicator, series in (
+        ("ema", EMA(21), ema_series(prices, 21)),
+        ("rsi", WilderRSI(14), rsi_series(prices, 14)),
+        ("macd", MACD(12, 26, 9), macd_series(prices, 12, 26, 9)),
+    ):
+        streamed = []
+        for price in prices:
+            indicator.update(price)
+            streamed.append(indicator.value)
+        assert series == streamed, name
+    assert ema_series([], 5) == rsi_series([], 14) == macd_series([]) == []
+
+
+def test_indicator_state_is_shared_between_readers():
+    prices = _walk(50)
+    engine = IndicatorEngine()
+    for price in prices:
+        engine.update("BTCUSDT", price)
+    first = engine.indicator("BTCUSDT", ("ema", 9), lambda: EMA(9), prices)
+    ctx = {"indicators": engine}
+    assert indicator_view("BTCUSDT", prices, ctx).ema(9) == first.value
+    assert engine.indicator("BTCUSDT", ("ema", 9), lambda: EMA(9), prices) is first
+
+
+def test_engine_rebuilds_when_history_diverges():
+    engine = IndicatorEngine()
+    for price in [1.0, 2.0, 3.0]:
+        engine.update("BTCUSDT", price)
+    view = IndicatorView(engine, "BTCUSDT", [10.0, 20.0, 30.0, 40.0])
+    assert view.mean(4) == pytest.approx(25.0)
+
+
+def test_supervisor_feeds_engine():
+    supervisor = Supervisor(client=None)
+    prices = _walk(60)
+    for price in prices:
+        supervisor.update_price("BTCUSDT", price)
+    view = IndicatorView(supervisor.indicators, "BTCUSDT", list(supervisor.price_history["BTCUSDT"]))
+    assert view.mean(20) == pytest.approx(mean(prices[-20:]))
+    supervisor.update_price("BTCUSDT", prices[-1] * 1.01)
+    view = IndicatorView(supervisor.indicators, "BTCUSDT", list(supervisor.price_history["BTCUSDT"]))
+    assert view.mean(20) == pytest.approx(mean((prices + [prices[-1] * 1.01])[-20:]))
+    assert supervisor.indicators.ticks("BTCUSDT") == 61
@@ -0,0 +1,160 @@
+import os
+
+import pytest
+from app.core.journal import ExecutionJournal, read_segment, replay
+from app.core.portfolio.portfolio import Portfolio
+from app.core.risk.manager import RiskManager
+from app.services.arbitrage.executor_safe import SafeArbitrageExecutor
+from app.services.arbitrage.scanner import ArbitrageOpportunity
+from app.services.guard import reconcile
+from app.services.guard.reconcile import reconcile_in_flight
+
+
+def _crash(journal: ExecutionJournal) -> None:
+    """Drop the journal's descriptors without writing anything, like a killed process."""
+    os.close(journal._fd)
+    os.close(journal._lock_fd)
+
+
+def make_opportunity() -> ArbitrageOpportunity:
+    return ArbitrageOpportunity(
+        proposal_id="journal",
+        symbol="BTCUSDT",
+        buy_exchange="binance",
+        sell_exchange="okx",
+        buy_price=100.0,
+        sell_price=101.0,
+        gross_spread_pct=1.5,
+        fees_total_pct=0.5,
+        slippage_est_pct=0.1,
+        net_roi_pct=1.0,
+        net_profit_usd=1.0,
+        qty_usd=100.0,
+        created_at=0.0,
+        transfer_type="internal",
+        latency_ms=5.0,
+        meta={"fees": {"transfer_fee_usd": 0.0}},
+    )
+
+
+def _segments(directory):
+    return sorted(directory.glob("segment-*.wal"))
+
+
+def _records(directory):
+    return [record for path in _segments(directory) for record in read_segment(path)]
+
+
+def test_recovers_in_flight_execution_from_dead_process(tmp_path):
+    crashed = ExecutionJournal(tmp_path / "a")
+    crashed.begin("done", "spot", {"symbol": "BTCUSDT"})
+    crashed.intent("done", "order")
+    crashed.outcome("done", "order", {"status": "FILLED"})
+    crashed.end("done", "FILLED")
+    crashed.begin("arb-1", "arbitrage", {"symbol": "BTCUSDT", "buy_exchange": "binance"})
+    crashed.intent("arb-1", "buy", {"qty": 1.0})
+    crashed.outcome("arb-1", "buy", {"status": "ok"})
+    crashed.intent("arb-1", "transfer")
+    _crash(crashed)
+
+    journal = ExecutionJournal(tmp_path / "b")
+    recovered = journal.recover_orphans()
+
+    assert [entry.exec_id for entry in recovered] == ["arb-1"]
+    entry = recovered[0]
+    assert entry.completed_stages() == ["buy"]
+    assert entry.open_stages() == ["transfer"]
+    assert not (tmp_path / "a").exists()
+    # re-journaled so a second crash before reconciliation loses nothing
+    assert [item.exec_id for item in replay(iter(_records(tmp_path / "b")))] == ["arb-1"]
+
+
+def test_live_journal_is_not_claimed(tmp_path):
+    alive = ExecutionJournal(tmp_path / "a")
+    alive.begin("x", "spot", {})
+    alive.intent("x", "order")
+    journal = ExecutionJournal(tmp_path / "b")
+    assert journal.recover_orphans() == []
+    assert (tmp_path / "a").exists()
+
+
+def test_torn_tail_is_ignored(tmp_path):
+    journal = ExecutionJournal(tmp_path / "a")
+    journal.begin("x", "spot", {})
+    journal.intent("x", "order")
+    journal.close()
+    segment = _segments(tmp_path / "a")[-1]
+    with segment.open("ab") as handle:
+        handle.write(b"\x40\x00\x00\x00\x01\x02\x03\x04{\"partial")
+    assert [record["type"] for record in read_segment(segment)] == ["begin", "intent"]
+
+
+def test_rotation_keeps_segments_with_open_executions(tmp_path):
+    journal = ExecutionJournal(tmp_path / "a", segment_bytes=4096, keep_segments=1)
+    journal.begin("open", "arbitrage", {})
+    journal.intent("open", "buy")
+    for idx in range(300):
+        journal.begin(f"e{idx}", "spot", {"pad": "x" * 32})
+        journal.end(f"e{idx}", "FILLED")
+    segments = _segments(tmp_path / "a")
+    assert len(segments) > 1
+    assert segments[0].name == "segment-00000001.wal"
+    journal.end("open", "FILLED")
+    journal.begin("tail", "spot", {"pad": "x" * 4096})
+    assert len(_segments(tmp_path / "a")) == 1
+    assert [entry.exec_id for entry in replay(iter(_records(tmp_path / "a")))] == ["tail"]
+
+
+def test_executor_journals_every_leg(tmp_path):
+    journal = ExecutionJournal(tmp_path / "a")
+    executor = SafeArbitrageExecutor(portfolio=Portfolio(), risk=RiskManager(), admin_pin_hash="", journal=journal)
+    result = executor.execute(make_opportunity(), mode="dry")
+    records = [record for record in _records(tmp_path / "a") if record["exec_id"] == result.exec_id]
+    assert [(record["type"], record.get("stage")) for record in records] == [
+        ("begin", None),
+        ("intent", "buy"),
+        ("outcome", "buy"),
+        ("intent", "transfer"),
+        ("outcome", "transfer"),
+        ("intent", "sell"),
+        ("outcome", "sell"),
+        ("end", None),
+    ]
+    assert replay(iter(records)) == []
+
+
+def test_reconcile_reports_open_arbitrage_leg(tmp_path, monkeypatch):
+    recorded, alerts = [], []
+    monkeypatch.setattr(reconcile, "record_arbitrage_execution", lambda result, **kw: recorded.append(result))
+    monkeypatch.setattr(reconcile, "send_alert", lambda level, message: alerts.append((level, message)))
+    crashed = ExecutionJournal(tmp_path / "a")
+    crashed.begin(
+        "arb-open",
+        "arbitrage",
+        {"proposal_id": "p1", "mode": "dry", "symbol": "BTCUSDT", "buy_exchange": "binance", "sell_exchange": "okx"},
+    )
+    crashed.intent("arb-open", "buy")
+    crashed.outcome("arb-open", "buy", {"status": "ok"})
+    _crash(crashed)
+
+    journal = ExecutionJournal(tmp_path / "b")
+    reports = reconcile_in_flight(journal)
+
+    assert len(reports) == 1
+    assert reports[0]["status"] == "RECOVERED"
+    assert "binance" in str(reports[0]["message"])
+    assert [result.exec_id for result in recorded] == ["arb-open"]
+    assert len(alerts) == 1 and alerts[0][0] == "error"
+    assert replay(iter(_records(tmp_path / "b"))) == []
+
+
+def test_api_reconciles_on_startup_not_import(monkeypatch):
+    pytest.importorskip("flask", reason="Flask not available in offline/proxy env")
+    from app.services.api import flask_app
+
+    calls = []
+    monkeypatch.setattr(flask_app, "reconcile_in_flight", lambda: calls.append(1) or [])
+    monkeypatch.setattr(flask_app, "_started", False)
+    flask_app.startup()
+    flask_app.startup()
+    assert calls == [1]
@@ -0,0 +1,198 @@
+import threading
+import time
+
+import pytest
+import requests
+
+np = pytest.importorskip("numpy")
+
+from app.core.exchange.binance_futures import BinanceFutures
+from app.core.exchange.binance_spot import BinanceSpot
+from app.core.exchange.klines import paginate, synthetic_klines
+from app.core.exchange.okx_spot import OKXSpot
+from app.core.marketdata import (
+    BackfillManager,
+    Checkpoint,
+    MarketDataStore,
+    WeightBudget,
+)
+
+DAY = 86_400
+T0 = 1_700_006_400.0  # midnight UTC
+
+
+def _rows(start, end, limit):
+    bars = synthetic_klines("BTCUSDT", "1m", start, end)
+    return [
+        [int(ts * 1000), o, h, low, c, v, 0]
+        for ts, o, h, low, c, v in zip(*(bars[name] for name in ("ts", "open", "high", "low", "close", "volume")))
+    ][:limit]
+
+
+class _Client:
+    kline_limit = 500
+    kline_weight = 2
+
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+
+    def get_klines(self, symbol, interval="1m", start=None, end=None, *, limit=None):
+        with self._lock:
+            self.calls.append((symbol, start, end))
+        assert limit == self.kline_limit and (end - start) / 60 <= limit
+        if symbol in self.fail:
+            raise RuntimeError("HTTP 418")
+        return synthetic_klines(symbol, interval, start, end)
+
+
+def test_paginate_and_synthetic_pages_line_up():
+    calls = []
+
+    def fetch(start, end, limit):
+        calls.append(start)
+        return _rows(start, end, limit)
+
+    bars = paginate(fetch, T0, T0 + 2_500 * 60, 60, 1_000)
+    assert len(calls) == 3 and len(bars["ts"]) == 2_500
+    whole = synthetic_klines("BTCUSDT", "1m", T0, T0 + 2_500 * 60)
+    assert bars["ts"] == whole["ts"] and bars["close"] == whole["close"]
+    assert whole["open"][1:] == whole["close"][:-1]
+    assert all(low <= min(o, c) and high >= max(o, c) for o, high, low, c in zip(
+        whole["open"], whole["high"], whole["low"], whole["close"]
+    ))
+
+    spot = BinanceSpot(mock=True).get_klines("BTCUSDT", "5m", T0, T0 + 3_600)
+    assert spot["ts"] == [T0 + 300 * i for i in range(12)]
+    assert spot == synthetic_klines("BTCUSDT", "5m", T0, T0 + 3_600, price=spot_price())
+    okx = OKXSpot().get_klines("ETHUSDT", "1h", end=T0, limit=24)
+    assert len(okx["ts"]) == 24 and okx["ts"][-1] == T0 - 3_600
+    with pytest.raises(ValueError):
+        BinanceSpot(mock=True).get_klines("BTCUSDT", "7m")
+
+
+def spot_price():
+    from app.core.exchange.binance_spot import MOCK_PRICES
+
+    return MOCK_PRICES["BTCUSDT"]
+
+
+def test_weight_budget_waits_for_the_window():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    budget = WeightBudget(10, window_sec=60, time_fn=lambda: now[0], sleep=sleep)
+    for _ in range(5):
+        budget.acquire(2)
+    assert budget.used == 10 and not slept
+    now[0] = 15.0
+    budget.acquire(4)
+    assert slept == [45.0] and budget.used == 4  # everything spent at t=0 has expired
+    budget.acquire(0)
+    with pytest.raises(ValueError):
+        budget.acquire(11)
+
+
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    store = MarketDataStore(tmp_path / "market")
+    checkpoint_path = tmp_path / "checkpoint.json"
+    client = _Client(fail={"ETHUSDT"})
+    manager = BackfillManager(
+        client,
+        store,
+        workers=4,
+        budget=WeightBudget(10_000),
+        checkpoint=Checkpoint(checkpoint_path),
+        retries=2,
+        retry_delay=0,
+        time_fn=lambda: T0 + DAY + 30,  # the bar opening at T0 + DAY is still open
+    )
+    report = manager.run(["BTCUSDT", "ETHUSDT"], "1m", T0 - 30, T0 + 2 * DAY)
+    assert report.pages == 3 and report.bars == 1_440 and report.weight == 6
+    assert "HTTP 418" in report.failed["ETHUSDT"]
+    frame = store.bars("BTCUSDT")
+    assert len(frame) == 1_440 and frame.ts[0] == T0 and frame.ts[-1] == T0 + DAY - 60
+    assert np.all(np.diff(frame.ts) == 60)
+
+    client.fail.clear()
+    client.calls.clear()
+    resumed = BackfillManager(
+        client,
+        store,
+        budget=WeightBudget(10_000),
+        checkpoint=Checkpoint(checkpoint_path),
+        time_fn=lambda: T0 + DAY + 600,
+    ).run(["BTCUSDT", "ETHUSDT"], "1m", T0, T0 + 2 * DAY)
+    assert not resumed.failed
+    assert sorted(call[0] for call in client.calls) == ["BTCUSDT"] + ["ETHUSDT"] * 3
+    assert [call[1:] for call in client.calls if call[0] == "BTCUSDT"] == [(T0 + DAY, T0 + DAY + 600)]
+    assert len(store.bars("BTCUSDT")) == 1_450 and len(store.bars("ETHUSDT")) == 1_450
+    assert Checkpoint(checkpoint_path).covered("BTCUSDT|1m") == [(T0, T0 + DAY + 600)]
+
+
+def test_backfill_warms_300_symbols_quickly(tmp_path):
+    symbols = [f"SYM{i:03d}USDT" for i in range(300)]
+    manager = BackfillManager(
+        BinanceSpot(mock=True),
+        MarketDataStore(tmp_path / "market"),
+        venue="BINANCE",
+        checkpoint=Checkpoint(tmp_path / "checkpoint.json"),
+        time_fn=lambda: T0 + DAY,
+    )
+    started = time.perf_counter()
+    report = manager.run(symbols, "1m", T0, T0 + DAY)
+    assert report.bars == 300 * 1_440 and not report.failed
+    assert report.weight == 2 * report.pages == 2 * 600
+    assert time.perf_counter() - started < 30
+    assert len(manager.store.bars("SYM123USDT@BINANCE")) == 1_440
+
+
+class _DownSession:
+    def get(self, *args, **kwargs):
+        raise requests.ConnectionError("exchange unreachable")
+
+
+@pytest.mark.parametrize("client_cls", [BinanceSpot, BinanceFutures])
+def test_live_clients_never_serve_synthetic_bars_after_a_fallback(client_cls, monkeypatch):
+    monkeypatch.setattr("app.core.exchange.binance_spot.time.sleep", lambda seconds: None)
+    client = client_cls(api_key="key", api_secret="secret", use_testnet=True, mock=False, session=_DownSession())
+    assert client.get_price("BTCUSDT") > 0  # prices still fall back to mock
+    assert client.mock
+    with pytest.raises(RuntimeError):
+        client.get_klines("BTCUSDT", "1m", T0, T0 + 3_600)
+
+
+def test_backfill_retries_with_backoff_but_no_trailing_sleep(tmp_path):
+    slept = []
+    manager = BackfillManager(
+        _Client(fail={"ETHUSDT"}),
+        MarketDataStore(tmp_path / "market"),
+        budget=WeightBudget(10_000),
+        checkpoint=Checkpoint(tmp_path / "checkpoint.json"),
+        retries=3,
+        retry_delay=1.0,
+        time_fn=lambda: T0 + DAY,
+        sleep=slept.append,
+    )
+    report = manager.run(["ETHUSDT"], "1m", T0, T0 + 60 * 500)
+    assert "HTTP 418" in report.failed["ETHUSDT"]
+    assert slept == [1.0, 2.0]
+
+
+def test_cli_backfills_public_production_bars_and_refuses_mock_clients(monkeypatch):
+    from app.core.exchange import binance_spot
+    from app.core.marketdata import backfill
+
+    public = BinanceSpot(public=True)
+    assert not public.mock and not public._configured_mock
+    assert public.base_url == binance_spot.PRODUCTION_URL
+    assert BinanceSpot()._configured_mock  # no credentials: mock, as before
+
+    monkeypatch.setattr(binance_spot, "BinanceSpot", lambda **kwargs: BinanceSpot(mock=True))
+    monkeypatch.setattr(backfill, "BackfillManager", None)  # must not get this far
+    assert backfill.main(["BTCUSDT", "--days", "0.1"]) == 2
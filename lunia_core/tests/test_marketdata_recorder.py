@@ -0,0 +1,137 @@
+import math
+
+import pytest
+import requests
+
+np = pytest.importorskip("numpy")
+
+from app.core.exchange.binance_spot import BinanceSpot
+from app.core.exchange.bybit_spot import BybitSpot
+from app.core.exchange.okx_spot import OKXSpot
+from app.core.marketdata import (
+    MarketDataStore,
+    QuoteRecorder,
+    import_recordings,
+    instrument,
+    venue_key,
+)
+from app.core.marketdata.recorder import (
+    get_recorder,
+    load_quotes,
+    read_segment,
+    segments,
+)
+
+T0 = 1_700_006_400.0
+
+
+def test_round_trip_through_compressed_segments(tmp_path):
+    recorder = QuoteRecorder(tmp_path)
+    recorder.record("binance", "BTCUSDT", 100.0, 100.5, 1.5, 2.5, ts=T0)
+    recorder.record("okx", "btcusdt", 101.0, 101.5, ts=T0 + 1)
+    recorder.record("binance", "ETHUSDT", 10.0, 10.1, ts=T0 + 2)
+    assert recorder.flush() == 3
+    assert segments(tmp_path) == [] and len(segments(tmp_path, include_open=True)) == 1
+    recorder.close()
+
+    [path] = segments(tmp_path)
+    [(table, rows)] = list(read_segment(path))
+    assert table == {"venues": ["binance", "okx"], "symbols": ["BTCUSDT", "ETHUSDT"]}
+    assert rows["ts"].tolist() == [T0, T0 + 1, T0 + 2]
+    assert rows["venue"].tolist() == [0, 1, 0] and rows["symbol"].tolist() == [0, 0, 1]
+    assert rows["bid_size"][0] == 1.5 and math.isnan(rows["ask_size"][1])
+
+    quotes = load_quotes(tmp_path, start=T0, end=T0 + 2)
+    assert sorted(quotes) == [("binance", "BTCUSDT"), ("okx", "BTCUSDT")]
+    assert quotes[("okx", "BTCUSDT")]["ask"].tolist() == [101.5]
+
+
+def test_segments_rotate_and_torn_tail_is_ignored(tmp_path):
+    recorder = QuoteRecorder(tmp_path, segment_bytes=1)
+    for block in range(3):
+        for i in range(100):
+            recorder.record("binance", "BTCUSDT", 100.0 + i, 100.5 + i, ts=T0 + block * 100 + i)
+        recorder.flush()
+    recorder.close()
+    paths = segments(tmp_path)
+    assert len(paths) == 3
+    assert len(load_quotes(tmp_path)[("binance", "BTCUSDT")]["ts"]) == 300
+
+    data = paths[-1].read_bytes()
+    paths[-1].write_bytes(data[:-5])
+    assert list(read_segment(paths[-1])) == []
+    assert len(load_quotes(tmp_path)[("binance", "BTCUSDT")]["ts"]) == 200
+
+
+def test_full_buffer_drops_instead_of_blocking(tmp_path):
+    recorder = QuoteRecorder(tmp_path, capacity=5)
+    for i in range(8):
+        recorder.record("okx", "BTCUSDT", 1.0, 2.0)
+    assert recorder.stats()["buffered"] == 5 and recorder.dropped == 3
+    assert recorder.flush() == 5 and recorder.dropped == 0
+    recorder.close()
+
+
+class _LiveVenue:
+    mock = False
+
+    def __init__(self, price):
+        self.price = price
+
+    def get_price(self, symbol):
+        return self.price
+
+    def get_book_ticker(self, symbol):
+        return {"bidPrice": self.price - 1, "askPrice": self.price + 1, "bidQty": 0.0, "askQty": 2.0}
+
+
+class _DownSession:
+    def get(self, *args, **kwargs):
+        raise requests.ConnectionError("exchange unreachable")
+
+
+def test_instrumented_clients_record_prices_and_books(tmp_path, monkeypatch):
+    monkeypatch.delenv("MARKET_RECORDER_ENABLED", raising=False)
+    assert get_recorder() is None
+    plain = _LiveVenue(1.0)
+    assert instrument(plain, "okx") is plain and "get_price" not in vars(plain)
+
+    recorder = QuoteRecorder(tmp_path)
+    okx = instrument(_LiveVenue(60_000.0), "okx", recorder)
+    binance = instrument(instrument(_LiveVenue(30_000.0), "binance", recorder), "binance", recorder)
+    assert okx.get_price("BTCUSDT") == 60_000.0
+    book = binance.get_book_ticker("BTCUSDT")
+    assert book["bidPrice"] == 29_999.0
+    binance.get_price("ETHUSDT")
+    recorder.close()
+
+    quotes = load_quotes(tmp_path)
+    assert quotes[("okx", "BTCUSDT")]["bid"].tolist() == [60_000.0]
+    assert quotes[("binance", "BTCUSDT")]["bid_size"].tolist() == [0.0]
+    assert len(quotes[("binance", "ETHUSDT")]["ts"]) == 1  # wrapped once despite instrumenting twice
+
+
+def test_mock_answers_are_never_recorded(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.exchange.binance_spot.time.sleep", lambda seconds: None)
+    recorder = QuoteRecorder(tmp_path)
+    # mock-only clients are not instrumented at all
+    for client in (BinanceSpot(), OKXSpot(), BybitSpot()):
+        assert instrument(client, "mock", recorder) is client and "get_price" not in vars(client)
+    # a live client that falls back to mock after a failure stops recording
+    live = BinanceSpot(api_key="key", api_secret="secret", use_testnet=True, mock=False, session=_DownSession())
+    instrument(live, "binance", recorder)
+    assert live.get_price("BTCUSDT") == 30_000.0 and live.mock
+    live.get_book_ticker("BTCUSDT")
+    recorder.close()
+    assert load_quotes(tmp_path) == {}
+
+
+def test_import_into_the_market_data_store(tmp_path):
+    recorder = QuoteRecorder(tmp_path / "rec")
+    for i in range(50):
+        recorder.record("bybit", "BTCUSDT", 100.0 + i, 100.1 + i, 3.0, 4.0, ts=T0 + i)
+    recorder.close()
+    store = MarketDataStore(tmp_path / "store")
+    assert import_recordings(store, tmp_path / "rec", start=T0 + 10) == {"BTCUSDT@BYBIT": 40}
+    frame = store.quotes(venue_key("bybit", "BTCUSDT"))
+    assert frame.ts[0] == T0 + 10 and frame["ask_size"][0] == 4.0
@@ -0,0 +1,105 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.marketdata import BAR_COLUMNS, MarketDataStore
+from app.core.marketdata.store import Frame
+
+DAY = 86_400
+T0 = 1_700_006_400.0  # midnight UTC
+
+
+def _bars(ts, close=None):
+    ts = np.asarray(ts, dtype=float)
+    close = np.asarray(close if close is not None else 100 + np.arange(ts.size), dtype=float)
+    return {"ts": ts, "open": close, "high": close + 1, "low": close - 1, "close": close, "volume": np.ones(ts.size)}
+
+
+def test_appends_partition_by_day_and_range_queries(tmp_path):
+    store = MarketDataStore(tmp_path)
+    ts = T0 + 60.0 * np.arange(3 * 1440)
+    assert store.append_bars("btcusdt", _bars(ts)) == ts.size
+    assert sorted(p.name for p in (tmp_path / "bars" / "BTCUSDT").iterdir() if p.is_dir()) == [
+        "2023-11-15",
+        "2023-11-16",
+        "2023-11-17",
+    ]
+    assert store.span("bars", "BTCUSDT") == (ts[0], ts[-1])
+    assert store.symbols() == ["BTCUSDT"]
+
+    frame = store.bars("BTCUSDT", T0 + 600, T0 + 1200)
+    assert frame.ts.tolist() == (T0 + 60.0 * np.arange(10, 20)).tolist()
+    assert frame["close"].tolist() == list(range(110, 120))
+    assert isinstance(frame["close"], np.memmap)  # a slice of the mapped column, not a copy
+
+    across = store.bars("BTCUSDT", T0 + DAY - 120, T0 + DAY + 120, columns=["close"])
+    assert list(across.columns) == ["ts", "close"]
+    assert len(across) == 4
+    assert len(store.bars("BTCUSDT", T0 - 10 * DAY, T0 - DAY)) == 0
+    assert len(store.bars("ETHUSDT")) == 0
+
+
+def test_out_of_order_appends_read_sorted_and_compact_with_last_write_winning(tmp_path):
+    store = MarketDataStore(tmp_path)
+    store.append_bars("BTCUSDT", _bars([T0 + 120, T0 + 180], [3, 4]))
+    store.append_bars("BTCUSDT", _bars([T0, T0 + 60], [1, 2]))
+    store.append_bars("BTCUSDT", _bars([T0 + 60], [20]))
+    before = store.bars("BTCUSDT")
+    assert before.ts.tolist() == [T0, T0 + 60, T0 + 60, T0 + 120, T0 + 180]
+
+    assert store.compact() == 3
+    day = tmp_path / "bars" / "BTCUSDT" / "2023-11-15"
+    assert len([p for p in day.iterdir()]) == 1
+    after = MarketDataStore(tmp_path).bars("BTCUSDT")
+    assert after.ts.tolist() == [T0, T0 + 60, T0 + 120, T0 + 180]
+    assert after["close"].tolist() == [1, 20, 3, 4]
+    assert store.compact() == 0
+
+
+def test_quotes_and_validation(tmp_path):
+    store = MarketDataStore(tmp_path)
+    store.append_quotes("ETHUSDT", {"ts": [T0], "bid": [10.0], "ask": [10.1], "bid_size": [1.0], "ask_size": [2.0]})
+    assert store.quotes("ETHUSDT")["ask"].tolist() == [10.1]
+    with pytest.raises(ValueError):
+        store.append_bars("ETHUSDT", {"ts": [T0], "close": [1.0]})
+    with pytest.raises(ValueError):
+        store.append("trades", "ETHUSDT", {})
+    assert Frame.empty(BAR_COLUMNS).ts.size == 0
+
+
+def test_compaction_that_dies_before_its_index_leaves_the_data_readable(tmp_path, monkeypatch):
+    store = MarketDataStore(tmp_path)
+    for ts in (T0, T0 + 60, T0 + 120):
+        store.append_bars("BTCUSDT", _bars([ts]))
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("killed")
+
+    monkeypatch.setattr(store, "_save_index", crash)
+    with pytest.raises(RuntimeError):
+        store.compact("bars", "BTCUSDT")
+    assert MarketDataStore(tmp_path).bars("BTCUSDT").ts.tolist() == [T0, T0 + 60, T0 + 120]
+
+    monkeypatch.undo()
+    assert store.compact("bars", "BTCUSDT") == 3
+    assert MarketDataStore(tmp_path).bars("BTCUSDT").ts.tolist() == [T0, T0 + 60, T0 + 120]
+
+
+def test_reader_retries_after_a_concurrent_compaction(tmp_path):
+    reader = MarketDataStore(tmp_path)
+    reader.append_bars("BTCUSDT", _bars([T0, T0 + 60]))
+    reader.append_bars("BTCUSDT", _bars([T0 + 120]))
+    stale = reader._index("bars", "BTCUSDT")
+    assert MarketDataStore(tmp_path).compact() == 2
+    # the reader still trusts the index it read before the parts were merged
+    mtime = (tmp_path / "bars" / "BTCUSDT" / "index.json").stat().st_mtime_ns
+    reader._indexes[("bars", "BTCUSDT")] = (mtime, stale)
+    reader._maps.clear()
+    assert reader.bars("BTCUSDT").ts.tolist() == [T0, T0 + 60, T0 + 120]
+
+
+def test_open_memory_maps_are_bounded(tmp_path):
+    store = MarketDataStore(tmp_path, max_maps=8)
+    store.append_bars("BTCUSDT", _bars(T0 + 60.0 * np.arange(5 * 1440)))
+    assert len(store.bars("BTCUSDT")) == 5 * 1440
+    assert len(store._maps) == 8
@@ -0,0 +1,75 @@
+import json
+from dataclasses import replace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.backtester.optimize import Optimizer, Trial, grid, random_search, write_report
+from app.backtester.synthetic import simulate_paths
+
+SPACE = {"sl_pct_default": [0.01, 0.03], "tp_pct_default": [0.02, 0.05]}
+
+
+@pytest.fixture(scope="module")
+def prices():
+    return simulate_paths(100.0, 6_000, sigma=0.003, seed=4)[0]
+
+
+def test_grid_and_random_points():
+    assert grid(SPACE) == [
+        {"sl_pct_default": 0.01, "tp_pct_default": 0.02},
+        {"sl_pct_default": 0.01, "tp_pct_default": 0.05},
+        {"sl_pct_default": 0.03, "tp_pct_default": 0.02},
+        {"sl_pct_default": 0.03, "tp_pct_default": 0.05},
+    ]
+    points = random_search({"bollinger_k": (1.0, 3.0), "tp_pct_default": [0.02, 0.04]}, 20, seed=1)
+    assert points == random_search({"bollinger_k": (1.0, 3.0), "tp_pct_default": [0.02, 0.04]}, 20, seed=1)
+    assert all(1.0 <= point["bollinger_k"] <= 3.0 and point["tp_pct_default"] in (0.02, 0.04) for point in points)
+
+
+def test_search_ranks_and_caches(prices, tmp_path):
+    with Optimizer(prices, workers=1, cache_dir=tmp_path, objective="total_return_pct") as opt:
+        first = opt.search("ema_rsi_trend", SPACE)
+        assert len(first) == 4 and not any(result.cached for result in first)
+        assert [r.score for r in first] == sorted((r.score for r in first), reverse=True)
+        assert all(r.score == r.total_return_pct for r in first)
+        again = opt.search("ema_rsi_trend", SPACE)
+    assert all(result.cached for result in again)
+    assert [r.to_dict() | {"cached": False} for r in again] == [r.to_dict() for r in first]
+    assert len(list(tmp_path.glob("*.json"))) == 4
+    with Optimizer(prices[:-1], workers=1, cache_dir=tmp_path) as other:
+        assert not any(result.cached for result in other.search("ema_rsi_trend", SPACE))
+
+
+def test_process_pool_matches_in_process(prices, tmp_path):
+    trials = [Trial.of("bollinger_reversion", {"bollinger_k": k}) for k in (1.5, 2.0, 2.5)]
+    with Optimizer({"BTCUSDT": prices}, workers=1, use_cache=False) as local:
+        expected = local.run(trials)
+    with Optimizer({"BTCUSDT": prices}, workers=2, use_cache=False) as pooled:
+        assert [r.to_dict() for r in pooled.run(trials)] == [r.to_dict() for r in expected]
+        assert pooled._shm is not None
+    assert pooled._shm is None
+
+
+def test_walk_forward_weights_and_report(prices, tmp_path):
+    with Optimizer(prices, workers=1, cache_dir=tmp_path) as opt:
+        wf = opt.walk_forward("ema_rsi_trend", SPACE, train_bars=2_000, test_bars=1_000)
+        assert [fold["train"] for fold in wf.folds] == [[0, 2_000], [1_000, 3_000], [2_000, 4_000], [3_000, 5_000]]
+        assert [fold["test"]["bars"] for fold in wf.folds][0] == [2_000, 3_000]
+        assert wf.best_params() in grid(SPACE)
+        ranked = {"ema_rsi_trend": opt.search("ema_rsi_trend", SPACE)}
+    best = ranked["ema_rsi_trend"][0]
+    scored = {name: [replace(best, score=score)] for name, score in {"a": 3.0, "b": 1.0, "c": -2.0}.items()}
+    weights = opt.propose_weights(scored)
+    assert weights == {"a": 0.75, "b": 0.25, "c": 0.0}
+    path = write_report(tmp_path / "report.json", ranked, walk_forward={"ema_rsi_trend": wf}, weights=weights)
+    report = json.loads(path.read_text())
+    assert report["proposed"] == {"weights": weights}
+    assert len(report["strategies"]["ema_rsi_trend"]) == 4
+    assert len(report["walk_forward"]["ema_rsi_trend"]["folds"]) == 4
+
+
+def test_unknown_strategy_is_rejected(prices):
+    with Optimizer(prices, workers=1, use_cache=False) as opt, pytest.raises(ValueError):
+        opt.run([Trial.of("nope", {})])
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+from app.core.ai.parallel import ShardedSupervisor, shard_of
+from app.core.ai.strategies import REGISTRY
+from app.core.ai.supervisor import Supervisor
+from app.core.state import set_state
+
+
+def _feed(supervisors, symbols, ticks, seed=11):
+    rng = random.Random(seed)
+    prices = {symbol: rng.uniform(5.0, 500.0) for symbol in symbols}
+    for tick in range(ticks):
+        for symbol in symbols:
+            prices[symbol] *= 1 + rng.gauss(0, 0.01)
+            for supervisor in supervisors:
+                supervisor.update_price(symbol, prices[symbol], ts=1_000.0 + tick)
+
+
+def _keyed(decision):
+    return {(item["symbol"], item["strategy"]): item for item in decision["signals"]}
+
+
+@pytest.fixture
+def sharded():
+    supervisor = ShardedSupervisor(client=None, workers=3)
+    yield supervisor
+    supervisor.close()
+
+
+def test_shard_of_is_stable():
+    assert shard_of("BTCUSDT", 4) == shard_of("BTCUSDT", 4)
+    assert {shard_of(f"SYM{idx}", 3) for idx in range(30)} == {0, 1, 2}
+
+
+def test_sharded_matches_single_process(sharded):
+    set_state({"spot": {"enabled": True, "weights": {name: 1.0 for name in REGISTRY}}})
+    symbols = ["BTCUSDT", "ETHUSDT"] + [f"SYM{idx}USDT" for idx in range(30)]
+    single = Supervisor(client=None)
+
+    _feed([single, sharded], symbols, 30)
+    sharded.start()
+    _feed([single, sharded], symbols, 20, seed=12)
+    expected = single.gather_signals(symbols=symbols)
+    got = sharded.gather_signals(symbols=symbols)
+
+    assert _keyed(got).keys() == _keyed(expected).keys()
+    for key, item in _keyed(expected).items():
+        assert _keyed(got)[key]["score"] == pytest.approx(item["score"])
+        assert _keyed(got)[key]["qty"] == pytest.approx(item["qty"])
+    assert [item["score"] for item in got["signals"]] == sorted(
+        (item["score"] for item in got["signals"]), reverse=True
+    )
+    assert got["meta"]["warming_up"] == expected["meta"]["warming_up"]
+    assert len(sharded.price_history.window("BTCUSDT")) == 50
+
+
+def test_reference_symbols_reach_owner_shard(sharded):
+    sharded.update_price("BTCUSDT", 100.0)
+    owner = shard_of("BTCUSDT", 3)
+    assert owner in sharded._route("ETHUSDT")
+
+
+def test_dead_shard_is_restarted_and_reseeded(sharded):
+    set_state({"spot": {"enabled": True, "weights": {name: 1.0 for name in REGISTRY}}})
+    symbols = ["BTCUSDT", "ETHUSDT"] + [f"SYM{idx}USDT" for idx in range(12)]
+    single = Supervisor(client=None)
+    _feed([single, sharded], symbols, 30)
+    sharded.gather_signals(symbols=symbols)
+
+    victim = sharded._processes[1]
+    victim.kill()
+    victim.join()
+    _feed([single, sharded], symbols, 10, seed=13)  # buffered for the dead shard
+    got = sharded.gather_signals(symbols=symbols)
+    assert sharded._processes[1] is not victim and sharded._processes[1].is_alive()
+    assert _keyed(got).keys() == _keyed(single.gather_signals(symbols=symbols)).keys()
+
+    # a shard that dies mid-cycle: the other replies are still read and the pipes stay in step
+    sharded._processes[2].kill()
+    sharded._processes[2].join()
+    sharded._processes[2].is_alive = lambda: True  # not noticed before sending
+    _feed([single, sharded], symbols, 2, seed=14)
+    dead = sharded._processes[2]
+    got = sharded.gather_signals(symbols=symbols)
+    expected = single.gather_signals(symbols=symbols)
+    assert sharded._processes[2] is not dead
+    assert _keyed(got).keys() == _keyed(expected).keys()
+    assert got["meta"]["warming_up"] == expected["meta"]["warming_up"]
+
+
+def test_shard_that_keeps_failing_falls_back_in_process(sharded, monkeypatch):
+    set_state({"spot": {"enabled": True, "weights": {name: 1.0 for name in REGISTRY}}})
+    symbols = ["BTCUSDT", "ETHUSDT"] + [f"SYM{idx}USDT" for idx in range(12)]
+    single = Supervisor(client=None)
+    _feed([single, sharded], symbols, 40)
+    send = sharded._send
+    monkeypatch.setattr(sharded, "_send", lambda shard, *args: shard != 0 and send(shard, *args))
+    got = sharded.gather_signals(symbols=symbols)
+    expected = single.gather_signals(symbols=symbols)
+    assert _keyed(got).keys() == _keyed(expected).keys()
+    for key, item in _keyed(expected).items():
+        assert _keyed(got)[key]["score"] == pytest.approx(item["score"])
+
+
+def test_ticks_are_stamped_by_the_injected_clock():
+    clock = [5_000.0]
+    supervisor = ShardedSupervisor(client=None, workers=2, time_fn=lambda: clock[0])
+    try:
+        supervisor.update_price("BTCUSDT", 100.0)
+        clock[0] += 60.0
+        supervisor.update_price("BTCUSDT", 101.0)
+        assert list(supervisor.price_history.timestamps("BTCUSDT")) == [5_000.0, 5_060.0]
+    finally:
+        supervisor.close()
@@ -0,0 +1,58 @@
+import pytest
+from app.core.ai import price_history as module
+from app.core.ai.price_history import PriceHistory
+from app.core.ai.supervisor import Supervisor
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(module, "np", None)
+    return request.param
+
+
+def test_window_is_latest_values_in_order(backend):
+    history = PriceHistory(5, initial_slots=1)
+    for idx in range(12):
+        history.append("BTCUSDT", float(idx), ts=1000.0 + idx)
+    assert list(history.window("BTCUSDT")) == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert list(history.window("BTCUSDT", 3)) == [9.0, 10.0, 11.0]
+    assert list(history.timestamps("BTCUSDT", 2)) == [1010.0, 1011.0]
+    assert history.last_timestamp("BTCUSDT") == 1011.0
+    assert history.count("BTCUSDT") == 5
+
+
+def test_window_is_a_view_not_a_copy(backend):
+    history = PriceHistory(4)
+    for price in (1.0, 2.0, 3.0):
+        history.append("ETHUSDT", price)
+    view = history.window("ETHUSDT")
+    if backend == "numpy":
+        assert view.base is not None
+    else:
+        assert isinstance(view, memoryview)
+
+
+def test_symbols_grow_slots_without_losing_data(backend):
+    history = PriceHistory(3, initial_slots=1)
+    for idx in range(10):
+        history.append(f"SYM{idx}", float(idx))
+        history.append(f"SYM{idx}", float(idx) + 0.5)
+    assert len(history) == 10
+    assert history.slot("SYM0") == 0
+    assert list(history.window("SYM0")) == [0.0, 0.5]
+    assert list(history.window("SYM9")) == [9.0, 9.5]
+    assert len(history.window("missing")) == 0
+    assert history.get("missing") is None
+
+
+def test_supervisor_uses_ring_history():
+    supervisor = Supervisor(client=None, history_limit=10)
+    for idx in range(25):
+        supervisor.update_price("BTCUSDT", 100.0 + idx)
+    prices = supervisor.price_history["BTCUSDT"]
+    assert len(prices) == 10
+    assert prices[-1] == 124.0
+    assert prices[0] == 115.0
@@ -1,4 +1,9 @@
-from app.core.risk.rate_limit import RateLimitConfig, RateLimiter
+from app.core.risk.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimitConfig,
+    RateLimiter,
+    build_backend,
+)
 
 
 def test_rate_limiter_blocks_after_threshold(monkeypatch):
@@ -16,3 +21,38 @@ def test_rate_limiter_blocks_after_threshold(monkeypatch):
     allowed, reason = limiter.allow("binance", "okx", "BTCUSDT")
     assert not allowed
     assert "rate limit" in reason
+
+
+def _limiter(clock, backend=None):
+    config = RateLimitConfig(enabled=True, window_minutes=10, max_per_exchange=2, max_per_symbol=5, buckets=10)
+    return RateLimiter(config, backend=backend, time_fn=clock)
+
+
+def test_try_acquire_slides_window(clock):
+    limiter = _limiter(clock)
+    assert limiter.try_acquire("binance", "okx", "BTCUSDT")[0]
+    clock.advance(300)
+    assert limiter.try_acquire("binance", "bybit", "ETHUSDT")[0]
+    allowed, reason = limiter.try_acquire("binance", "okx", "ETHUSDT")
+    assert not allowed
+    assert reason == "rate limit exchange binance"
+    # the rejected attempt must not consume okx budget
+    assert limiter.try_acquire("okx", "bybit", "SOLUSDT")[0]
+    assert not limiter.try_acquire("okx", "bybit", "SOLUSDT")[0]
+    clock.advance(360)
+    assert limiter.try_acquire("binance", "okx", "ETHUSDT")[0]
+
+
+def test_limiters_sharing_backend_enforce_one_budget(clock):
+    backend = MemoryRateLimitBackend()
+    api_side = _limiter(clock, backend)
+    worker_side = _limiter(clock, backend)
+    assert api_side.try_acquire("binance", "okx", "BTCUSDT")[0]
+    assert worker_side.try_acquire("binance", "okx", "BTCUSDT")[0]
+    assert not api_side.try_acquire("binance", "okx", "BTCUSDT")[0]
+    assert not worker_side.allow("binance", "okx", "BTCUSDT")[0]
+
+
+def test_build_backend_falls_back_to_memory():
+    config = RateLimitConfig(backend="memory")
+    assert isinstance(build_backend(config), MemoryRateLimitBackend)
@@ -0,0 +1,95 @@
+import pytest
+from app.core.ai.strategies import REGISTRY, SPECS, StrategySignal, strategy
+from app.core.ai.supervisor import Supervisor
+from app.core.state import set_state
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_price(self, symbol):
+        self.calls += 1
+        return 100.0 + self.calls
+
+
+@pytest.fixture
+def counted_strategy():
+    saved_registry = dict(REGISTRY)
+    saved_specs = dict(SPECS)
+    REGISTRY.clear()
+    SPECS.clear()
+    calls = []
+
+    @strategy("counted")
+    def counted(symbol, prices, ctx):
+        calls.append(symbol)
+        return [
+            StrategySignal(
+                symbol=symbol,
+                side="BUY",
+                score=1.0,
+                price=prices[-1],
+                stop_pct=0.1,
+                take_pct=0.2,
+                strategy="counted",
+                meta={},
+            )
+        ]
+
+    set_state({"spot": {"enabled": True, "weights": {"counted": 1.0}}})
+    yield calls
+    REGISTRY.clear()
+    REGISTRY.update(saved_registry)
+    SPECS.clear()
+    SPECS.update(saved_specs)
+
+
+def test_unchanged_inputs_return_cached_decision(counted_strategy):
+    supervisor = Supervisor(client=None)
+    supervisor.update_price("BTCUSDT", 100.0)
+
+    first = supervisor.gather_signals(symbols=["BTCUSDT"])
+    first["signals"].clear()
+    second = supervisor.gather_signals(symbols=["BTCUSDT"])
+
+    assert counted_strategy == ["BTCUSDT"]
+    assert [item["strategy"] for item in second["signals"]] == ["counted"]
+
+
+def test_tick_state_and_priority_changes_invalidate(counted_strategy):
+    supervisor = Supervisor(client=None)
+    supervisor.update_price("BTCUSDT", 100.0)
+    supervisor.gather_signals(symbols=["BTCUSDT"])
+
+    supervisor.update_price("BTCUSDT", 101.0)
+    assert supervisor.gather_signals(symbols=["BTCUSDT"])["signals"][0]["price"] == 101.0
+    assert len(counted_strategy) == 2
+
+    set_state({"spot": {"weights": {"counted": 0.5}}})
+    supervisor.gather_signals(symbols=["BTCUSDT"])
+    assert len(counted_strategy) == 3
+
+    supervisor.ai_priorities["BTCUSDT"] = 2.0
+    supervisor.gather_signals(symbols=["BTCUSDT"])
+    assert len(counted_strategy) == 4
+
+    supervisor.gather_signals(symbols=["BTCUSDT"], context={"volatility": 0.02})
+    assert len(counted_strategy) == 5
+    supervisor.gather_signals(symbols=["BTCUSDT"])
+    assert len(counted_strategy) == 5
+
+
+def test_fresh_prices_are_not_refetched(counted_strategy, clock):
+    client = CountingClient()
+    supervisor = Supervisor(client=client, time_fn=clock, price_refresh_ms=500)
+
+    supervisor.get_signals("BTCUSDT")
+    supervisor.get_signals("BTCUSDT")
+    assert client.calls == 1
+    assert len(counted_strategy) == 1
+
+    clock.advance(1.0)
+    supervisor.get_signals("BTCUSDT")
+    assert client.calls == 2
+    assert len(counted_strategy) == 2
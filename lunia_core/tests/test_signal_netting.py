@@ -0,0 +1,102 @@
+import pytest
+from app.core.ai.agent import Agent
+from app.core.ai.netting import net_signals
+from app.core.ai.supervisor import Supervisor
+from app.core.portfolio.portfolio import Portfolio
+from app.core.risk.manager import RiskLimits, RiskManager
+from app.core.state import set_state
+
+
+class RecordingExchange:
+    def __init__(self, price):
+        self.price = price
+        self.orders = []
+
+    def get_price(self, symbol):
+        return self.price
+
+    def place_order(self, symbol, side, qty, type="MARKET"):
+        order = {"symbol": symbol, "side": side, "origQty": qty, "status": "FILLED", "orderId": "mock-1"}
+        self.orders.append(order)
+        return order
+
+
+def _signal(symbol, side, qty, strategy, stop=0.1, take=0.2, price=100.0):
+    return {
+        "symbol": symbol,
+        "side": side,
+        "qty": qty,
+        "price": price,
+        "strategy": strategy,
+        "stop_pct": stop,
+        "take_pct": take,
+        "score": 1.0,
+    }
+
+
+def test_net_signals_aggregates_per_symbol():
+    orders, cancelled = net_signals(
+        [
+            _signal("BTCUSDT", "BUY", 3.0, "liquidity_snipe_safe", stop=0.1, take=0.2),
+            _signal("BTCUSDT", "BUY", 1.0, "liquidity_snipe_aggressive", stop=0.2, take=0.4),
+            _signal("BTCUSDT", "SELL", 2.0, "bollinger", stop=0.5, take=0.5),
+            _signal("ETHUSDT", "SELL", 1.0, "ema_rsi_trend"),
+            _signal("SOLUSDT", "BUY", 1.0, "bollinger"),
+            _signal("SOLUSDT", "SELL", 1.0, "micro_trend_scalper"),
+        ]
+    )
+
+    by_symbol = {order["symbol"]: order for order in orders}
+    btc = by_symbol["BTCUSDT"]
+    assert (btc["side"], btc["qty"], btc["strategy"]) == ("BUY", 2.0, "liquidity_snipe_safe")
+    assert btc["stop_pct"] == pytest.approx(0.125)
+    assert btc["take_pct"] == pytest.approx(0.25)
+    assert btc["notional_usd"] == pytest.approx(200.0)
+    assert [leg["strategy"] for leg in btc["allocations"]] == [
+        "liquidity_snipe_safe",
+        "liquidity_snipe_aggressive",
+        "bollinger",
+    ]
+    assert by_symbol["ETHUSDT"]["side"] == "SELL"
+    assert "SOLUSDT" not in by_symbol
+    assert [entry["symbol"] for entry in cancelled] == ["SOLUSDT"]
+
+
+def test_portfolio_attributes_netted_fill_to_strategies():
+    portfolio = Portfolio()
+    legs = [
+        {"strategy": "a", "side": "BUY", "qty": 3.0},
+        {"strategy": "b", "side": "SELL", "qty": 1.0},
+    ]
+    # half of the net 2.0 fills
+    portfolio.update_on_fill("BTCUSDT", "BUY", 1.0, 100.0, strategy="a", fees=0.4, allocations=legs)
+
+    assert portfolio.get_position("BTCUSDT").quantity == pytest.approx(1.0)
+    assert portfolio.strategy_position("a", "BTCUSDT").quantity == pytest.approx(1.5)
+    assert portfolio.strategy_position("b", "BTCUSDT").quantity == pytest.approx(-0.5)
+    assert portfolio.strategy_position("a", "BTCUSDT").fees_paid == pytest.approx(0.3)
+
+    portfolio.update_on_fill("BTCUSDT", "SELL", 1.0, 110.0, strategy="a")
+    assert portfolio.strategy_realized_pnl["a"] == pytest.approx(10.0)
+
+
+def test_agent_places_one_order_per_symbol(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.ai.agent.LOG_PATH", tmp_path / "trades.jsonl")
+    set_state({"global_stop": False, "trading_on": True})
+    client = RecordingExchange(price=100.0)
+    risk = RiskManager(RiskLimits(max_symbol_risk_pct=100.0))
+    agent = Agent(client=client, risk=risk, supervisor=Supervisor(client=None), subscribe_bus=False)
+
+    result = agent.execute_signals(
+        {
+            "signals": [
+                _signal("BTCUSDT", "BUY", 0.03, "liquidity_snipe_safe"),
+                _signal("BTCUSDT", "BUY", 0.01, "liquidity_snipe_aggressive"),
+                _signal("BTCUSDT", "SELL", 0.02, "bollinger"),
+            ]
+        }
+    )
+
+    assert len(result["executed"]) == 1
+    assert [(order["side"], order["origQty"]) for order in client.orders] == [("BUY", pytest.approx(0.02))]
+    assert agent.portfolio.strategy_position("bollinger", "BTCUSDT").quantity == pytest.approx(-0.02)
@@ -0,0 +1,79 @@
+import pytest
+from app.core.ai.runner import StrategyRunner, merge_profiles
+from app.core.ai.strategies import strategy
+from app.core.ai.supervisor import Supervisor
+from app.core.state import set_state
+from conftest import make_signal
+
+
+def _supervisor(clock, **budgets):
+    supervisor = Supervisor(client=None, runner=StrategyRunner(time_fn=clock, **budgets))
+    for symbol in ("AAAUSDT", "BBBUSDT", "CCCUSDT", "DDDUSDT"):
+        supervisor.update_price(symbol, 100.0)
+    return supervisor
+
+
+def test_strategy_budget_defers_remaining_symbols(plugin_registry, clock):
+    clock.now = 0.0  # keep sub-millisecond resolution for the budget arithmetic
+    set_state({"spot": {"enabled": True, "weights": {"slow": 1.0, "fast": 1.0}}})
+    seen = []
+
+    @strategy("slow")
+    def slow(symbol, prices, ctx):
+        seen.append(symbol)
+        clock.advance(0.06)
+        return [make_signal(symbol, prices[-1], "slow")]
+
+    @strategy("fast")
+    def fast(symbol, prices, ctx):
+        return [make_signal(symbol, prices[-1], "fast")]
+
+    supervisor = _supervisor(clock, cycle_budget_ms=0, strategy_budget_ms=100)
+    symbols = ["AAAUSDT", "BBBUSDT", "CCCUSDT", "DDDUSDT"]
+    decision = supervisor.gather_signals(symbols=symbols)
+
+    assert seen == ["AAAUSDT", "BBBUSDT"]
+    assert decision["meta"]["deferred"] == {"slow": 2}
+    assert sum(item["strategy"] == "fast" for item in decision["signals"]) == 4
+
+    seen.clear()
+    supervisor.gather_signals(symbols=symbols)
+    assert seen == ["CCCUSDT", "DDDUSDT"]
+
+    stats = supervisor.runner.stats()["slow"]
+    assert stats["calls"] == 4
+    assert stats["deferred"] == 4
+    assert stats["over_budget_cycles"] == 2
+    assert stats["total_ms"] == pytest.approx(240)
+
+
+def test_cycle_budget_and_errors_are_flagged(plugin_registry, clock):
+    clock.now = 0.0  # keep sub-millisecond resolution for the budget arithmetic
+    set_state({"spot": {"enabled": True, "weights": {"broken": 1.0, "heavy": 1.0}}})
+
+    @strategy("broken")
+    def broken(symbol, prices, ctx):
+        raise ValueError("bad model")
+
+    @strategy("heavy")
+    def heavy(symbol, prices, ctx):
+        clock.advance(0.3)
+        return [make_signal(symbol, prices[-1], "heavy")]
+
+    supervisor = _supervisor(clock, cycle_budget_ms=500, strategy_budget_ms=0)
+    decision = supervisor.gather_signals(symbols=["AAAUSDT", "BBBUSDT", "CCCUSDT"])
+
+    assert decision["meta"]["strategy_errors"] == {"broken": 2}
+    assert decision["meta"]["deferred"] == {"broken": 1, "heavy": 1}
+    assert [item["strategy"] for item in supervisor.runner.hottest(2)] == ["heavy", "broken"]
+    assert supervisor.runner.hottest(1, key="errors")[0]["strategy"] == "broken"
+
+
+def test_merge_profiles_sums_counts_and_keeps_max():
+    merged = merge_profiles(
+        [
+            {"a": {"calls": 2, "signals": 1, "errors": 0, "deferred": 0, "total_ms": 4.0, "max_ms": 3.0}},
+            {"a": {"calls": 1, "signals": 0, "errors": 1, "deferred": 2, "total_ms": 5.0, "max_ms": 5.0}},
+        ]
+    )
+    assert merged["a"] == {"calls": 3, "signals": 1, "errors": 1, "deferred": 2, "total_ms": 9.0, "max_ms": 5.0}
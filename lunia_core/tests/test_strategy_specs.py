@@ -0,0 +1,61 @@
+import pytest
+from app.core.ai.strategies import (
+    REGISTRY,
+    Feature,
+    StrategyContext,
+    spec_for,
+    strategy,
+)
+from app.core.ai.supervisor import Supervisor
+from app.core.state import set_state
+from conftest import make_signal
+
+
+def test_builtin_strategies_declare_warmup():
+    assert spec_for("bollinger_reversion").min_history == 20
+    assert Feature("ema", (9,)) in spec_for("ema_rsi_trend").features
+    assert spec_for("stat_pairs").reference_symbols("BTCUSDT") == ["ETHUSDT"]
+
+
+def test_supervisor_skips_strategies_until_warm(plugin_registry):
+    set_state({"spot": {"enabled": True, "weights": {"slow": 1.0, "fast": 1.0}}})
+    calls = []
+
+    @strategy("slow", min_history=10)
+    def slow(symbol, prices, ctx):
+        calls.append("slow")
+        return [make_signal(symbol, prices[-1], "slow")]
+
+    @strategy("fast", min_history=2, features=(Feature("mean", (2,)), Feature("context", ("volatility", 0.0))))
+    def fast(symbol, prices, ctx):
+        calls.append("fast")
+        assert isinstance(ctx, StrategyContext)
+        assert ctx.feature("mean", 2) == pytest.approx((prices[-1] + prices[-2]) / 2)
+        assert ctx.feature("context", "volatility", 0.0) == 0.01
+        assert ctx.get("sl_pct_default") == ctx.sl_pct_default
+        with pytest.raises(TypeError):
+            ctx["sl_pct_default"] = 1.0  # type: ignore[index]
+        return [make_signal(symbol, prices[-1], "fast")]
+
+    supervisor = Supervisor(client=None)
+    for price in (100.0, 101.0, 102.0):
+        supervisor.update_price("BTCUSDT", price)
+    decision = supervisor.gather_signals(symbols=["BTCUSDT"])
+
+    assert calls == ["fast"]
+    assert [item["strategy"] for item in decision["signals"]] == ["fast"]
+    assert decision["meta"]["warming_up"] == {"slow": 1}
+
+
+def test_plain_registry_functions_are_wrapped(plugin_registry):
+    set_state({"spot": {"enabled": True, "weights": {"legacy": 1.0}}})
+
+    def legacy(symbol, prices, ctx):
+        return [make_signal(symbol, prices[-1], "legacy")]
+
+    REGISTRY["legacy"] = legacy
+    supervisor = Supervisor(client=None)
+    supervisor.update_price("BTCUSDT", 100.0)
+    decision = supervisor.gather_signals(symbols=["BTCUSDT"])
+    assert [item["strategy"] for item in decision["signals"]] == ["legacy"]
+    assert spec_for("legacy").min_history == 0
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+from app.core.ai.strategies import strategy
+from app.core.ai.supervisor import Supervisor
+from app.core.bus import RedisBus
+from app.core.state import set_state
+from conftest import make_signal
+
+
+@pytest.fixture
+def calls(plugin_registry):
+    seen = []
+
+    @strategy("own")
+    def own(symbol, prices, ctx):
+        seen.append(("own", symbol))
+        return [make_signal(symbol, prices[-1], "own")]
+
+    @strategy("lead", references=lambda symbol: ["BTCUSDT"])
+    def lead(symbol, prices, ctx):
+        seen.append(("lead", symbol))
+        return []
+
+    set_state({"global_stop": False, "trading_on": True, "spot": {"enabled": True, "weights": {"own": 1.0, "lead": 1.0}}})
+    return seen
+
+
+@pytest.fixture
+def bus():
+    bus = RedisBus()
+    published = []
+    bus.subscribe("signals", published.append)
+    bus.published = published
+    return bus
+
+
+def test_tick_publishes_signals(calls, bus):
+    supervisor = Supervisor(client=None)
+    supervisor.subscribe(bus)
+
+    bus.publish("prices", {"symbol": "ETHUSDT", "price": 2000.0, "ts": 1.0})
+
+    assert calls == [("own", "ETHUSDT"), ("lead", "ETHUSDT")]
+    assert [(item["symbol"], item["strategy"]) for item in bus.published] == [("ETHUSDT", "own")]
+    assert bus.published[0]["price"] == 2000.0
+    assert list(supervisor.price_history.window("ETHUSDT")) == [2000.0]
+
+
+def test_tick_reevaluates_only_dependent_strategies(calls, bus):
+    supervisor = Supervisor(client=None)
+    supervisor.subscribe(bus)
+    bus.publish("prices", {"symbol": "ETHUSDT", "price": 2000.0})
+    bus.publish("prices", {"symbol": "SOLUSDT", "price": 150.0})
+    calls.clear()
+
+    bus.publish("prices", {"symbol": "BTCUSDT", "price": 60_000.0})
+
+    # the ticked symbol runs everything, its dependents only the strategy reading it
+    assert sorted(calls) == [("lead", "BTCUSDT"), ("lead", "ETHUSDT"), ("lead", "SOLUSDT"), ("own", "BTCUSDT")]
+
+
+def test_watched_symbols_and_malformed_ticks(calls, bus):
+    supervisor = Supervisor(client=None)
+    supervisor.subscribe(bus, symbols=["ETHUSDT"])
+
+    bus.publish("prices", {"symbol": "BTCUSDT", "price": 60_000.0})
+    bus.publish("prices", {"symbol": "ETHUSDT"})
+    bus.publish("prices", {"symbol": "ETHUSDT", "price": "n/a"})
+
+    assert calls == []
+    assert bus.published == []
+    assert supervisor.price_history.count("BTCUSDT") == 1
+
+
+def test_halted_state_publishes_nothing(calls, bus):
+    supervisor = Supervisor(client=None, bus=bus)
+    set_state({"global_stop": True})
+    try:
+        decision = supervisor.push_price("ETHUSDT", 2000.0)
+    finally:
+        set_state({"global_stop": False})
+
+    assert decision["meta"]["reason"] == "halted"
+    assert bus.published == []
+    assert supervisor.price_history.count("ETHUSDT") == 1
+
+
+def test_pulled_signals_see_a_stable_window_while_ticks_arrive(calls, bus):
+    supervisor = Supervisor(client=None, history_limit=5)
+    for price in (1.0, 2.0, 3.0, 4.0, 5.0):
+        supervisor.update_price("ETHUSDT", price)
+    supervisor.subscribe(bus)
+    seen = []
+
+    @strategy("reader")
+    def reader(symbol, prices, ctx):
+        before = list(prices)
+        pusher = threading.Thread(target=bus.publish, args=("prices", {"symbol": "ETHUSDT", "price": 6.0}))
+        pusher.start()
+        pusher.join(timeout=0.2)  # blocked until the pulled evaluation is done
+        seen.append((before, list(prices)))
+        return []
+
+    supervisor.gather_signals(symbols=["ETHUSDT"])
+    assert seen[0] == ([1.0, 2.0, 3.0, 4.0, 5.0], [1.0, 2.0, 3.0, 4.0, 5.0])
+    deadline = time.time() + 5
+    while supervisor.price_history.window("ETHUSDT")[-1] != 6.0:  # the tick lands once the lock is free
+        assert time.time() < deadline
+        time.sleep(0.01)
@@ -0,0 +1,84 @@
+import pytest
+from app.backtester.synthetic import (
+    Jumps,
+    RegimeSwitching,
+    Venue,
+    generate_gbm,
+    simulate_paths,
+    venue_quotes,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def _log_returns(paths):
+    return np.diff(np.log(paths), axis=1)
+
+
+def test_paths_are_seeded_and_start_at_start():
+    first = simulate_paths([100.0, 20.0], 5_000, sigma=0.002, seed=42)
+    second = simulate_paths([100.0, 20.0], 5_000, sigma=0.002, seed=42)
+    assert first.shape == (2, 5_000)
+    assert np.array_equal(first, second)
+    assert first[:, 0].tolist() == [100.0, 20.0]
+    assert not np.array_equal(first, simulate_paths([100.0, 20.0], 5_000, sigma=0.002, seed=43))
+    assert np.std(_log_returns(first)) == pytest.approx(0.002, rel=0.05)
+
+
+def test_writes_into_preallocated_float32_array():
+    out = np.empty((3, 10_000), dtype=np.float32)
+    result = simulate_paths(50.0, 10_000, assets=3, seed=1, out=out)
+    assert result is out
+    assert np.isfinite(out).all() and (out > 0).all()
+    with pytest.raises(ValueError):
+        simulate_paths(50.0, 10_000, assets=2, out=out)
+
+
+def test_correlation_follows_the_cholesky_factor():
+    corr = [[1.0, 0.8, -0.3], [0.8, 1.0, 0.0], [-0.3, 0.0, 1.0]]
+    paths = simulate_paths(100.0, 50_000, corr=corr, seed=7, chunk=4_096)
+    measured = np.corrcoef(_log_returns(paths))
+    assert measured == pytest.approx(np.asarray(corr), abs=0.03)
+
+
+def test_jumps_fatten_the_tails():
+    plain = _log_returns(simulate_paths(100.0, 100_000, sigma=0.001, seed=3))[0]
+    jumpy = _log_returns(simulate_paths(100.0, 100_000, sigma=0.001, jumps=Jumps(intensity=1e-3, std=0.02), seed=3))[0]
+    assert (np.abs(jumpy) > 0.01).sum() > 50
+    assert (np.abs(plain) > 0.01).sum() == 0
+
+
+def test_regimes_scale_volatility():
+    regimes = RegimeSwitching(vol_multipliers=(1.0, 4.0), transition=((0.99, 0.01), (0.02, 0.98)))
+    states = np.empty(100_000, dtype=np.int8)
+    paths = simulate_paths(100.0, 100_000, sigma=0.001, regimes=regimes, states_out=states, seed=5)
+    returns = _log_returns(paths)[0]
+    calm, stressed = returns[states[1:] == 0], returns[states[1:] == 1]
+    assert np.std(stressed) / np.std(calm) == pytest.approx(4.0, rel=0.1)
+    assert (states == 1).mean() == pytest.approx(1 / 3, abs=0.05)
+
+
+def test_venue_quotes_apply_basis_noise_and_spread():
+    mid = simulate_paths(100.0, 20_000, seed=9)[0]
+    quotes = venue_quotes(
+        mid,
+        {"binance": Venue(), "okx": Venue(basis_bps=10.0, noise_bps=2.0, spread_bps=4.0)},
+        seed=9,
+    )
+    okx = quotes["okx"]
+    assert (okx.ask > okx.bid).all()
+    assert np.mean((okx.ask + okx.bid) / 2 / mid - 1) * 10_000 == pytest.approx(10.0, abs=0.1)
+    assert np.mean(okx.ask / okx.bid - 1) * 10_000 == pytest.approx(4.0, abs=0.01)
+    assert np.mean(quotes["binance"].bid / mid - 1) * 10_000 == pytest.approx(-2.5, abs=0.1)
+
+
+def test_generate_gbm_returns_a_list():
+    prices = generate_gbm(250.0, 1_000, seed=11)
+    assert isinstance(prices, list) and len(prices) == 1_000
+    assert prices[0] == 250.0
+    assert prices == generate_gbm(250.0, 1_000, seed=11)
+
+
+def test_zero_steps_give_empty_paths():
+    assert generate_gbm(100.0, 0) == []
+    assert simulate_paths([1.0, 2.0], 0, corr=[[1.0, 0.5], [0.5, 1.0]]).shape == (2, 0)
@@ -0,0 +1,95 @@
+import math
+
+import pytest
+from app.core.ai.indicators import IndicatorView
+from app.core.ai.strategies import REGISTRY
+from app.core.ai.supervisor import Supervisor
+from app.core.ai.warmstart import WarmStart, decode_snapshot, encode_snapshot
+
+T0 = 1_700_000_000.0
+
+
+def _view(supervisor, symbol):
+    return IndicatorView(supervisor.indicators, symbol, supervisor.price_history.window(symbol))
+
+
+def _readings(supervisor, symbol):
+    view = _view(supervisor, symbol)
+    return view.ema(9), view.macd(), view.median(15)
+
+
+def _fed(ticks=150):
+    supervisor = Supervisor(client=None, history_limit=100)
+    for i in range(ticks):
+        for symbol, base in (("BTCUSDT", 30_000.0), ("ETHUSDT", 2_000.0)):
+            supervisor.update_price(symbol, base * (1 + 0.01 * math.sin(i / 7)), T0 + i)
+            if i == 10:
+                _readings(supervisor, symbol)  # registered early: state spans more than the window
+    return supervisor
+
+
+def test_restored_supervisor_continues_where_it_stopped(tmp_path):
+    source = _fed()
+    expected = {s: _readings(source, s) for s in ("BTCUSDT", "ETHUSDT")}
+
+    assert WarmStart(source, tmp_path / "snap.lws").save() > 0
+    target = Supervisor(client=None, history_limit=100)
+    restored = WarmStart(target, tmp_path / "snap.lws").restore(now=T0 + 200)
+    assert restored == {"BTCUSDT": 100, "ETHUSDT": 100}
+
+    reseeded = Supervisor(client=None, history_limit=100)
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        assert list(target.price_history.window(symbol)) == list(source.price_history.window(symbol))
+        assert list(target.price_history.timestamps(symbol)) == list(source.price_history.timestamps(symbol))
+        assert _readings(target, symbol) == expected[symbol]
+        reseeded.price_history.load(
+            symbol, source.price_history.window(symbol), source.price_history.timestamps(symbol)
+        )
+        assert _readings(reseeded, symbol)[1] != expected[symbol][1]  # history alone is not enough
+        # the restored indicators keep updating incrementally, like the originals
+        for supervisor in (source, target):
+            supervisor.update_price(symbol, 31_000.0, T0 + 500)
+        assert _readings(target, symbol) == _readings(source, symbol)
+
+    status = target.warmup_status()
+    assert status["BTCUSDT"]["samples"] == 100 and status["BTCUSDT"]["ready"]
+    assert set(Supervisor(client=None).warmup_status(["BTCUSDT"])["BTCUSDT"]["waiting"]) == set(REGISTRY)
+
+
+def test_stale_and_damaged_snapshots_are_discarded(tmp_path):
+    source = _fed()
+    data = encode_snapshot(source, now=T0 + 120)
+    table = decode_snapshot(data)
+    assert [entry["symbol"] for entry in table["symbols"]] == ["BTCUSDT", "ETHUSDT"]
+
+    path = tmp_path / "snap.lws"
+    path.write_bytes(data)
+    stale = Supervisor(client=None, history_limit=100)
+    assert WarmStart(stale, path, max_age_sec=60).restore(now=T0 + 500) == {}
+    assert stale.price_history.count("BTCUSDT") == 0
+
+    live = Supervisor(client=None, history_limit=50)
+    live.update_price("ETHUSDT", 2_100.0, T0 + 130)
+    assert WarmStart(live, path).restore(now=T0 + 130) == {"BTCUSDT": 50}  # keeps live ETH ticks
+    assert live.price_history.count("ETHUSDT") == 1
+
+    damaged = bytearray(data)
+    damaged[-3] ^= 0xFF
+    path.write_bytes(bytes(damaged))
+    with pytest.raises(ValueError):
+        decode_snapshot(bytes(damaged))
+    assert WarmStart(Supervisor(client=None), path).restore(now=T0 + 130) == {}
+    assert WarmStart(Supervisor(client=None), tmp_path / "missing.lws").restore() == {}
+
+
+def test_signals_feed_reports_warmup(monkeypatch):
+    pytest.importorskip("flask", reason="Flask not available in offline/proxy env")
+    monkeypatch.setenv("BINANCE_USE_TESTNET", "false")
+    from app.services.api import flask_app
+
+    monkeypatch.setattr(flask_app, "AUTH_REQUIRED_FOR_TELEMETRY", False)
+    flask_app.supervisor.update_price("WARMUSDT", 1.0, T0)
+    data = flask_app.app.test_client().get("/ai/signals").get_json()
+    warm = data["warmup"]["WARMUSDT"]
+    assert warm["samples"] == 1 and warm["ready"] is False
+    assert warm["waiting"]["ema_rsi_trend"] > 0
@@ -0,0 +1,74 @@
+"""Benchmark spot signal generation: single Supervisor vs sharded workers.
+
+Usage: python scripts/bench_signals.py [--symbols 2000] [--cycles 20] [--workers 1,2,4]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Tuple
+
+ROOT = Path(__file__).resolve().parents[1] / "lunia_core"
+sys.path.append(str(ROOT))
+
+from app.core.ai.parallel import ShardedSupervisor  # type: ignore  # noqa: E402
+from app.core.ai.strategies import REGISTRY  # type: ignore  # noqa: E402
+from app.core.ai.supervisor import Supervisor  # type: ignore  # noqa: E402
+from app.core.state import set_state  # type: ignore  # noqa: E402
+
+
+def _walk(symbols, ticks, seed):
+    rng = random.Random(seed)
+    prices = {symbol: rng.uniform(5.0, 500.0) for symbol in symbols}
+    for _ in range(ticks):
+        for symbol in symbols:
+            prices[symbol] *= 1 + rng.gauss(0, 0.01)
+        yield dict(prices)
+
+
+def run(supervisor, symbols, warmup, cycles) -> Tuple[float, float]:
+    """Return (wall seconds, parent CPU seconds) per cycle of one tick per symbol plus a gather."""
+
+    for tick, prices in enumerate(_walk(symbols, warmup, seed=1)):
+        for symbol, price in prices.items():
+            supervisor.update_price(symbol, price, ts=float(tick))
+    supervisor.gather_signals(symbols=symbols)
+    started, cpu_started = time.perf_counter(), time.process_time()
+    for tick, prices in enumerate(_walk(symbols, cycles, seed=2), start=warmup):
+        for symbol, price in prices.items():
+            supervisor.update_price(symbol, price, ts=float(tick))
+        supervisor.gather_signals(symbols=symbols)
+    return (time.perf_counter() - started) / cycles, (time.process_time() - cpu_started) / cycles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, os.cpu_count() or 1)))
+    args = parser.parse_args()
+
+    set_state({"spot": {"enabled": True, "weights": {name: 1.0 for name in REGISTRY}}})
+    symbols = [f"SYM{idx}USDT" for idx in range(args.symbols)]
+
+    # Parent CPU is the serial share of a sharded cycle (routing, pickling,
+    # merge and ranking); with enough cores the cycle approaches it.
+    print(f"cores={os.cpu_count()} symbols={args.symbols}")
+    baseline, _ = run(Supervisor(client=None), symbols, args.warmup, args.cycles)
+    print(f"single      {baseline * 1000:8.1f} ms/cycle  {args.symbols / baseline:10.0f} symbols/s")
+    for workers in sorted({int(n) for n in args.workers.split(",") if n}):
+        with ShardedSupervisor(client=None, workers=workers) as supervisor:
+            elapsed, parent_cpu = run(supervisor, symbols, args.warmup, args.cycles)
+        print(
+            f"workers={workers:<3} {elapsed * 1000:8.1f} ms/cycle  {args.symbols / elapsed:10.0f} symbols/s"
+            f"  speedup x{baseline / elapsed:.2f}  parent cpu {parent_cpu * 1000:.1f} ms/cycle"
+        )
+
+
+if __name__ == "__main__":
+    main()